@@ -10,150 +10,588 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-"""This file contains tests of code performance to reveal bottlenecks."""
-import numpy
+"""Benchmark suite for the performance-critical code paths of OpenFermion.
+
+Each benchmark is swept over a range of problem sizes. For every size the
+suite records the wall time of several repetitions and the peak memory
+allocated by one more, with the random number generator seeded so that
+runs are comparable across versions. Results can be written to JSON and
+compared against an earlier run to catch regressions:
+
+.. code-block:: bash
+
+    python performance_benchmarks.py --output baseline.json
+    # ... change the code ...
+    python performance_benchmarks.py --compare baseline.json
+
+Use --quick to run only the smallest size of every benchmark and --filter
+to select benchmarks by name.
+"""
+from __future__ import print_function
+
+import argparse
+import collections
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
 import time
+import timeit
+
+import numpy
+import scipy
 
-from openfermion.ops import (FermionOperator,
-                             InteractionOperator,
-                             normal_ordered)
-from openfermion.transforms import get_fermion_operator, jordan_wigner
-from openfermion.utils import jordan_wigner_sparse
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 cannot trace allocations; peak memory is then not recorded.
+    tracemalloc = None
+
+import openfermion
+from openfermion.config import DATA_DIRECTORY
+from openfermion.hamiltonians import (
+    MolecularData, fermi_hubbard,
+    hypercube_grid_with_given_wigner_seitz_radius_and_filling, jellium_model,
+    plane_wave_potential)
+from openfermion.measurements import (apply_constraints,
+                                      partition_pauli_terms)
+from openfermion.ops import FermionOperator, normal_ordered
+from openfermion.transforms import (
+    binary_code_transform, bravyi_kitaev, bravyi_kitaev_fast,
+    bravyi_kitaev_tree, get_fermion_operator, get_interaction_operator,
+    get_sparse_operator, jordan_wigner, parity_code, reverse_jordan_wigner,
+    verstraete_cirac_2d_square)
+from openfermion.utils import (FCIHamiltonian, Grid, SpectralWindowSolver,
+                               davidson, error_bound, error_operator,
+                               evolve_state, get_ground_state,
+                               jordan_wigner_sparse, jw_configuration_state,
+                               low_depth_second_order_trotter_error_operator,
+                               qubit_operator_sparse,
+                               trotterize_exp_qubop_to_qasm,
+                               trotterize_exp_qubop_to_state,
+                               write_trotterized_qasm)
+from openfermion.utils import _rdm_mapping_functions
+from openfermion.utils._low_depth_trotter_error import (
+    simulation_ordered_grouped_low_depth_terms_with_info)
 from openfermion.utils._testing_utils import random_interaction_operator
 
 
+# Benchmarks by name, each with the function preparing it and its sweep.
+BENCHMARKS = collections.OrderedDict()
+
+# Seed of the random number generator, set before preparing each benchmark.
+DEFAULT_SEED = 8
+
+# Ratio of new to old measurements above which a change is reported.
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+
+
+def benchmark(**sweep):
+    """Register a benchmark swept over the given parameter values.
+
+    The decorated function takes one value of each parameter as keyword
+    arguments, prepares the inputs and returns a function of no arguments
+    running the code to be measured, so that preparation is not timed.
+    Benchmarks are named after the decorated function without its
+    benchmark_ prefix.
+
+    Args:
+        sweep: Sequences of values of each parameter. All combinations are
+            run; the first value of each is the one used by quick runs.
+    """
+    def register(function):
+        name = function.__name__[len('benchmark_'):]
+        BENCHMARKS[name] = (function, sweep)
+        return function
+    return register
+
+
+def _random_fermion_operator(n_qubits):
+    return get_fermion_operator(random_interaction_operator(n_qubits))
+
+
+def _random_fermion_term(n_qubits, term_length):
+    """Return a random product of ladder operators that is not trivially 0."""
+    operators = [(numpy.random.randint(n_qubits), numpy.random.randint(2))]
+    while len(operators) < term_length:
+        operator = (numpy.random.randint(n_qubits), numpy.random.randint(2))
+        if operator != operators[-1]:
+            operators.append(operator)
+    return FermionOperator(tuple(operators))
+
+
+@benchmark(n_qubits=(8, 12, 16))
 def benchmark_molecular_operator_jordan_wigner(n_qubits):
-    """Test speed with which molecular operators transform to qubit operators.
+    molecular_operator = random_interaction_operator(n_qubits)
+    return lambda: jordan_wigner(molecular_operator)
+
+
+@benchmark(n_qubits=(6, 8, 10))
+def benchmark_fermion_operator_jordan_wigner(n_qubits):
+    fermion_operator = _random_fermion_operator(n_qubits)
+    return lambda: jordan_wigner(fermion_operator)
+
+
+@benchmark(n_qubits=(6, 8, 10))
+def benchmark_bravyi_kitaev(n_qubits):
+    fermion_operator = _random_fermion_operator(n_qubits)
+    return lambda: bravyi_kitaev(fermion_operator)
+
+
+@benchmark(n_qubits=(6, 8, 10))
+def benchmark_bravyi_kitaev_tree(n_qubits):
+    fermion_operator = _random_fermion_operator(n_qubits)
+    return lambda: bravyi_kitaev_tree(fermion_operator)
+
+
+@benchmark(n_qubits=(4, 6, 8))
+def benchmark_bravyi_kitaev_fast(n_qubits):
+    molecular_operator = random_interaction_operator(n_qubits)
+    return lambda: bravyi_kitaev_fast(molecular_operator)
+
+
+@benchmark(n_qubits=(4, 6, 8))
+def benchmark_binary_code_transform(n_qubits):
+    fermion_operator = _random_fermion_operator(n_qubits)
+    code = parity_code(n_qubits)
+    return lambda: binary_code_transform(fermion_operator, code)
+
+
+@benchmark(x_dimension=(2, 4, 6))
+def benchmark_verstraete_cirac_2d_square(x_dimension):
+    hubbard_model = fermi_hubbard(x_dimension, 2, 1., 4., spinless=True)
+    return lambda: verstraete_cirac_2d_square(hubbard_model, x_dimension, 2)
+
+
+@benchmark(n_qubits=(6, 8, 10))
+def benchmark_reverse_jordan_wigner(n_qubits):
+    qubit_operator = jordan_wigner(random_interaction_operator(n_qubits))
+    return lambda: reverse_jordan_wigner(qubit_operator)
+
+
+@benchmark(n_qubits=(8, 12, 16))
+def benchmark_get_interaction_operator(n_qubits):
+    fermion_operator = normal_ordered(_random_fermion_operator(n_qubits))
+    return lambda: get_interaction_operator(fermion_operator)
+
+
+@benchmark(n_qubits=(8, 12, 16))
+def benchmark_get_fermion_operator(n_qubits):
+    molecular_operator = random_interaction_operator(n_qubits)
+    return lambda: get_fermion_operator(molecular_operator)
+
+
+@benchmark(power=(5, 10, 15))
+def benchmark_fermion_power(power, n_qubits=20, term_length=10):
+    fermion_operator = (_random_fermion_term(n_qubits, term_length) +
+                        _random_fermion_term(n_qubits, term_length))
+    return lambda: fermion_operator ** power
+
+
+@benchmark(power=(5, 10, 15))
+def benchmark_normal_ordered(power, n_qubits=20, term_length=10):
+    fermion_operator = (_random_fermion_term(n_qubits, term_length) +
+                        _random_fermion_term(n_qubits, term_length)) ** power
+    return lambda: normal_ordered(fermion_operator)
+
+
+@benchmark(n_qubits=(4, 6, 8))
+def benchmark_jordan_wigner_sparse(n_qubits):
+    fermion_operator = _random_fermion_operator(n_qubits)
+    return lambda: jordan_wigner_sparse(fermion_operator)
+
+
+@benchmark(n_qubits=(6, 8, 10))
+def benchmark_qubit_operator_sparse(n_qubits):
+    qubit_operator = jordan_wigner(random_interaction_operator(n_qubits))
+    return lambda: qubit_operator_sparse(qubit_operator)
+
+
+@benchmark(n_qubits=(4, 6, 8))
+def benchmark_interaction_operator_sparse(n_qubits):
+    molecular_operator = random_interaction_operator(n_qubits)
+    return lambda: get_sparse_operator(molecular_operator)
+
+
+# Molecules of increasing size from the data directory.
+_MOLECULES = ('H2_sto-3g_singlet_0.7414', 'H2_6-31g_singlet_0.75',
+              'H1-Li1_sto-3g_singlet_1.45')
+
+
+def _molecular_sparse_operator(molecule):
+    molecule = MolecularData(filename=os.path.join(DATA_DIRECTORY, molecule))
+    return get_sparse_operator(molecule.get_molecular_hamiltonian())
+
+
+@benchmark(molecule=_MOLECULES)
+def benchmark_get_ground_state(molecule):
+    sparse_operator = _molecular_sparse_operator(molecule)
+    return lambda: get_ground_state(sparse_operator)
+
+
+@benchmark(molecule=_MOLECULES)
+def benchmark_davidson(molecule):
+    sparse_operator = _molecular_sparse_operator(molecule)
+    return lambda: davidson(sparse_operator)
+
+
+@benchmark(molecule=_MOLECULES)
+def benchmark_fci_davidson(molecule):
+    molecule = MolecularData(filename=os.path.join(DATA_DIRECTORY, molecule))
+    n_alpha = molecule.n_electrons // 2
+    fci_hamiltonian = FCIHamiltonian(molecule, n_alpha,
+                                     molecule.n_electrons - n_alpha)
+    return lambda: davidson(fci_hamiltonian)
+
+
+@benchmark(n_orbitals=(4, 6, 8))
+def benchmark_fci_sigma(n_orbitals):
+    molecular_operator = random_interaction_operator(2 * n_orbitals)
+    spins = (slice(0, None, 2), slice(1, None, 2))
+    molecular_operator.one_body_tensor[spins[0], spins[1]] = 0.
+    molecular_operator.one_body_tensor[spins[1], spins[0]] = 0.
+    for pattern in itertools.product((0, 1), repeat=4):
+        if pattern[0] + pattern[1] != pattern[2] + pattern[3]:
+            molecular_operator.two_body_tensor[
+                tuple(spins[spin] for spin in pattern)] = 0.
+    fci_hamiltonian = FCIHamiltonian(molecular_operator, n_orbitals // 2,
+                                     n_orbitals // 2)
+    vector = numpy.random.randn(fci_hamiltonian.shape[0])
+    return lambda: fci_hamiltonian.dot(vector)
+
+
+@benchmark(n_sites=(5, 6, 7), method=('shift-invert', 'polynomial'))
+def benchmark_spectral_window(n_sites, method):
+    sparse_operator = get_sparse_operator(
+        fermi_hubbard(n_sites, 1, 1., 4., periodic=True))
+    energy, _ = get_ground_state(sparse_operator)
+
+    # A new solver is made for each run, so no factorization is reused.
+    return lambda: SpectralWindowSolver(
+        sparse_operator, particle_number=n_sites).eigenpairs(
+            energy - .1, energy + 1., method=method)
+
+
+@benchmark(n_sites=(6, 7, 8), method=('krylov', 'expm_multiply'))
+def benchmark_evolve_state(n_sites, method):
+    sparse_operator = get_sparse_operator(
+        fermi_hubbard(n_sites, 1, 1., 4., periodic=True))
+    state = jw_configuration_state(range(0, 2 * n_sites, 2), 2 * n_sites)
+    times = numpy.linspace(0., 5., 20)
+    return lambda: evolve_state(sparse_operator, state, times, method=method,
+                                particle_number=n_sites)
+
+
+@benchmark(n_sites=(6, 8, 10))
+def benchmark_trotter_step_state(n_sites):
+    hamiltonian = jordan_wigner(fermi_hubbard(n_sites, 1, 1., 4.,
+                                              periodic=True))
+    state = numpy.zeros(2 ** (2 * n_sites), dtype=complex)
+    state[0] = 1.
+    return lambda: trotterize_exp_qubop_to_state(hamiltonian, state,
+                                                 evolution_time=.1,
+                                                 trotter_order=2)
+
+
+@benchmark(molecule=_MOLECULES, term_grouping=(None, 'commuting'))
+def benchmark_trotter_qasm(molecule, term_grouping):
+    molecule = MolecularData(filename=os.path.join(DATA_DIRECTORY, molecule))
+    hamiltonian = jordan_wigner(molecule.get_molecular_hamiltonian())
+    return lambda: collections.deque(trotterize_exp_qubop_to_qasm(
+        hamiltonian, trotter_number=10, trotter_order=2,
+        term_grouping=term_grouping), maxlen=0)
+
+
+@benchmark(molecule=_MOLECULES)
+def benchmark_write_trotterized_qasm(molecule):
+    molecule = MolecularData(filename=os.path.join(DATA_DIRECTORY, molecule))
+    hamiltonian = jordan_wigner(molecule.get_molecular_hamiltonian())
+
+    def write():
+        with open(os.devnull, 'w') as output:
+            write_trotterized_qasm(output, hamiltonian, trotter_number=10,
+                                   trotter_order=2)
+    return write
+
+
+@benchmark(grid_length=(3, 5, 7))
+def benchmark_plane_wave_potential(grid_length):
+    grid = Grid(dimensions=2, length=grid_length, scale=1.)
+    return lambda: plane_wave_potential(grid, spinless=True)
+
+
+@benchmark(x_dimension=(2, 3))
+def benchmark_trotter_error_operator(x_dimension):
+    hamiltonian = jordan_wigner(fermi_hubbard(x_dimension, 2, 1., 4.))
+    terms = [type(hamiltonian)(term, coefficient)
+             for term, coefficient in sorted(hamiltonian.terms.items())]
+    return lambda: error_operator(terms)
+
+
+@benchmark(x_dimension=(2, 3, 4))
+def benchmark_trotter_error_bound(x_dimension):
+    hamiltonian = jordan_wigner(fermi_hubbard(x_dimension, 2, 1., 4.))
+    terms = [type(hamiltonian)(term, coefficient)
+             for term, coefficient in sorted(hamiltonian.terms.items())]
+    return lambda: error_bound(terms)
+
+
+@benchmark(grid_length=(4, 6, 8))
+def benchmark_low_depth_trotter_error_operator(grid_length):
+    grid = hypercube_grid_with_given_wigner_seitz_radius_and_filling(
+        dimension=1, grid_length=grid_length, wigner_seitz_radius=10.)
+    hamiltonian = normal_ordered(jellium_model(grid, spinless=True,
+                                               plane_wave=False))
+    hamiltonian.compress()
+    terms, indices, is_hopping = (
+        simulation_ordered_grouped_low_depth_terms_with_info(hamiltonian))
+    return lambda: low_depth_second_order_trotter_error_operator(
+        terms, indices, is_hopping, jellium_only=True)
+
+
+@benchmark(n_orbitals=(4, 8, 16))
+def benchmark_molecular_data_save_load(n_orbitals):
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, 'benchmark_molecule')
+    geometry = [('H', (0., 0., 0.)), ('H', (0., 0., 0.7414))]
+    molecule = MolecularData(geometry, 'sto-3g', 1, filename=filename)
+    molecule.n_orbitals = n_orbitals
+    molecule.n_qubits = 2 * n_orbitals
+    molecule.one_body_integrals = numpy.random.randn(n_orbitals, n_orbitals)
+    molecule.two_body_integrals = numpy.random.randn(
+        n_orbitals, n_orbitals, n_orbitals, n_orbitals)
+
+    def save_and_load():
+        molecule.save()
+        MolecularData(filename=filename).get_integrals()
+        os.remove(filename + '.hdf5')
+    return save_and_load
+
+
+@benchmark(mapping=('map_two_pdm_to_one_pdm', 'map_two_pdm_to_two_hole_dm',
+                    'map_two_hole_dm_to_two_pdm',
+                    'map_two_pdm_to_particle_hole_dm',
+                    'map_particle_hole_dm_to_two_pdm'),
+           n_qubits=(8, 16, 24))
+def benchmark_rdm_mapping(mapping, n_qubits):
+    function = getattr(_rdm_mapping_functions, mapping)
+    two_body_dm = numpy.random.randn(n_qubits, n_qubits, n_qubits, n_qubits)
+    if mapping == 'map_two_pdm_to_one_pdm':
+        return lambda: function(two_body_dm, n_qubits // 2)
+    one_body_dm = numpy.random.randn(n_qubits, n_qubits)
+    return lambda: function(two_body_dm, one_body_dm)
+
+
+@benchmark(n_qubits=(4, 6))
+def benchmark_apply_constraints(n_qubits):
+    fermion_operator = normal_ordered(_random_fermion_operator(n_qubits))
+    return lambda: apply_constraints(fermion_operator, n_qubits // 2)
+
+
+@benchmark(n_qubits=(12, 16, 20), grouping=('qubit_wise', 'commuting'))
+def benchmark_partition_pauli_terms(n_qubits, grouping):
+    qubit_operator = jordan_wigner(random_interaction_operator(n_qubits,
+                                                               real=True))
+    return lambda: partition_pauli_terms(qubit_operator, grouping)
+
+
+@benchmark(statement=('import openfermion',
+                      'from openfermion import FermionOperator',
+                      'from openfermion import *'))
+def benchmark_import(statement):
+    """Time an import in a new interpreter.
+
+    A new process per run keeps modules cached by earlier imports from
+    hiding regressions, e.g. from a module that imports SciPy or h5py at
+    the top level. The times include interpreter start-up.
+    """
+    command = [sys.executable, '-c', statement]
+    return lambda: subprocess.check_call(command)
+
+
+def _sweep_parameters(sweep, quick):
+    """Yield the keyword arguments of each point of a sweep."""
+    names = sorted(sweep)
+    if quick:
+        yield {name: sweep[name][0] for name in names}
+        return
+    for values in itertools.product(*(sweep[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def _peak_memory(run):
+    """Return the peak memory in bytes allocated while running run."""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, parameters, repeat=3, seed=DEFAULT_SEED):
+    """Run one benchmark at one point of its sweep.
 
     Args:
-        n_qubits: The size of the molecular operator instance. Ideally, we
-            would be able to transform to a qubit operator for 50 qubit
-            instances in less than a minute. We are way too slow right now.
+        name (str): The name of the benchmark.
+        parameters (dict): The keyword arguments of the benchmark.
+        repeat (int): The number of timed runs.
+        seed (int): Seed of the random number generator.
 
     Returns:
-        runtime: The number of seconds required to make the conversion.
+        result (dict): The name and parameters of the benchmark, the wall
+            times of the runs in seconds, their minimum and median, and the
+            peak memory in bytes of a further run (None if not available).
     """
-    # Get an instance of InteractionOperator.
-    molecular_operator = random_interaction_operator(n_qubits)
+    function, _ = BENCHMARKS[name]
+    numpy.random.seed(seed)
+    run = function(**parameters)
 
-    # Convert to a qubit operator.
-    start = time.time()
-    qubit_operator = jordan_wigner(molecular_operator)
-    end = time.time()
+    times = []
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        run()
+        times.append(timeit.default_timer() - start)
 
-    # Return runtime.
-    runtime = end - start
-    return runtime
+    return {'name': name,
+            'parameters': parameters,
+            'times': times,
+            'min_time': min(times),
+            'median_time': float(numpy.median(times)),
+            'peak_memory': _peak_memory(run)}
 
 
-def benchmark_fermion_math_and_normal_order(n_qubits, term_length, power):
-    """Benchmark both arithmetic operators and normal ordering on fermions.
-
-    The idea is we generate two random FermionTerms, A and B, each acting
-    on n_qubits with term_length operators. We then compute
-    (A + B) ** power. This is costly that is the first benchmark. The second
-    benchmark is in normal ordering whatever comes out.
+def run_suite(names=None, quick=False, repeat=3, seed=DEFAULT_SEED,
+              verbose=False):
+    """Run benchmarks over their sweeps.
 
     Args:
-        n_qubits: The number of qubits on which these terms act.
-        term_length: The number of operators in each term.
-        power: Int, the exponent to which to raise sum of the two terms.
+        names (iterable of str): The benchmarks to run. Defaults to all.
+        quick (bool): Whether to run only the first point of each sweep.
+        repeat (int): The number of timed runs per point.
+        seed (int): Seed of the random number generator.
+        verbose (bool): Whether to print each result as it is measured.
 
     Returns:
-        runtime_math: The time it takes to perform (A + B) ** power
-        runtime_normal_order: The time it takes to perform
-            FermionOperator.normal_order()
+        results (dict): Metadata describing the environment under 'metadata'
+            and the results of measure under 'benchmarks'.
     """
-    # Generate random operator strings.
-    operators_a = [(numpy.random.randint(n_qubits),
-                    numpy.random.randint(2))]
-    operators_b = [(numpy.random.randint(n_qubits),
-                    numpy.random.randint(2))]
-    for operator_number in range(term_length):
-
-        # Make sure the operator is not trivially zero.
-        operator_a = (numpy.random.randint(n_qubits),
-                      numpy.random.randint(2))
-        while operator_a == operators_a[-1]:
-            operator_a = (numpy.random.randint(n_qubits),
-                          numpy.random.randint(2))
-        operators_a += [operator_a]
-
-        # Do the same for the other operator.
-        operator_b = (numpy.random.randint(n_qubits),
-                      numpy.random.randint(2))
-        while operator_b == operators_b[-1]:
-            operator_b = (numpy.random.randint(n_qubits),
-                          numpy.random.randint(2))
-        operators_b += [operator_b]
-
-    # Initialize FermionTerms and then sum them together.
-    fermion_term_a = FermionOperator(tuple(operators_a),
-                                     float(numpy.random.randn()))
-    fermion_term_b = FermionOperator(tuple(operators_b),
-                                     float(numpy.random.randn()))
-    fermion_operator = fermion_term_a + fermion_term_b
-
-    # Exponentiate.
-    start_time = time.time()
-    fermion_operator **= power
-    runtime_math = time.time() - start_time
-
-    # Normal order.
-    start_time = time.time()
-    normal_ordered(fermion_operator)
-    runtime_normal_order = time.time() - start_time
-
-    # Return.
-    return runtime_math, runtime_normal_order
+    if names is None:
+        names = list(BENCHMARKS)
+    results = {'metadata': {'openfermion': openfermion.__version__,
+                            'python': platform.python_version(),
+                            'numpy': numpy.__version__,
+                            'scipy': scipy.__version__,
+                            'platform': platform.platform(),
+                            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                            'seed': seed,
+                            'repeat': repeat},
+               'benchmarks': []}
+    for name in names:
+        _, sweep = BENCHMARKS[name]
+        for parameters in _sweep_parameters(sweep, quick):
+            result = measure(name, parameters, repeat, seed)
+            results['benchmarks'].append(result)
+            if verbose:
+                print(_format_result(result))
+    return results
 
 
-def benchmark_jordan_wigner_sparse(n_qubits):
-    """Benchmark the speed at which a FermionOperator is mapped to a matrix.
+def _format_parameters(parameters):
+    return ', '.join('{}={}'.format(key, parameters[key])
+                     for key in sorted(parameters))
+
+
+def _format_result(result):
+    memory = result['peak_memory']
+    memory = ('n/a' if memory is None else
+              '{:.1f} MiB'.format(memory / 2. ** 20))
+    return '{}({}): {:.4g} s, peak memory {}'.format(
+        result['name'], _format_parameters(result['parameters']),
+        result['min_time'], memory)
+
+
+def compare_results(baseline, results,
+                    threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Find benchmarks that became slower or use more memory.
 
     Args:
-        n_qubits: The number of qubits in the example.
+        baseline (dict): Earlier results of run_suite.
+        results (dict): Later results of run_suite.
+        threshold (float): Smallest ratio of later to earlier minimum time
+            or peak memory that counts as a regression.
 
     Returns:
-        runtime: The time in seconds that the benchmark took.
+        regressions (list): A (name, parameters, quantity, ratio) tuple for
+            each regression, where quantity is 'min_time' or 'peak_memory'.
     """
-    # Initialize a random FermionOperator.
-    molecular_operator = random_interaction_operator(n_qubits)
-    fermion_operator = get_fermion_operator(molecular_operator)
+    def key(result):
+        return result['name'], json.dumps(result['parameters'],
+                                          sort_keys=True)
+
+    earlier = {key(result): result for result in baseline['benchmarks']}
+    regressions = []
+    for result in results['benchmarks']:
+        if key(result) not in earlier:
+            continue
+        for quantity in ('min_time', 'peak_memory'):
+            old_value = earlier[key(result)][quantity]
+            new_value = result[quantity]
+            if not old_value or new_value is None:
+                continue
+            ratio = new_value / float(old_value)
+            if ratio > threshold:
+                regressions.append((result['name'], result['parameters'],
+                                    quantity, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--filter', action='append', default=[],
+                        help='run benchmarks whose name contains this; '
+                        'may be repeated')
+    parser.add_argument('--quick', action='store_true',
+                        help='run only the smallest size of each benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timed runs of each benchmark')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', help='write the results to this file')
+    parser.add_argument('--compare',
+                        help='report regressions against results in this '
+                        'file; the exit status is 1 if there are any')
+    parser.add_argument('--threshold', type=float,
+                        default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
 
-    # Map to SparseOperator class.
-    start_time = time.time()
-    sparse_operator = jordan_wigner_sparse(fermion_operator)
-    runtime = time.time() - start_time
-    return runtime
+    names = [name for name in BENCHMARKS
+             if not args.filter or any(pattern in name
+                                       for pattern in args.filter)]
+    results = run_suite(names, args.quick, args.repeat, args.seed,
+                        verbose=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        for name, parameters, quantity, ratio in regressions:
+            print('Regression in {}({}): {} is {:.2f} times the '
+                  'baseline.'.format(name, _format_parameters(parameters),
+                                     quantity, ratio))
+        if regressions:
+            return 1
+    return 0
 
 
 # Run benchmarks.
 if __name__ == '__main__':
-
-    # Seed random number generator.
-    numpy.random.seed(8)
-
-    # Run InteractionOperator.jordan_wigner_transform() benchmark.
-    n_qubits = 18
-    print('Starting test on InteractionOperator.jordan_wigner_transform()')
-    runtime = benchmark_molecular_operator_jordan_wigner(n_qubits)
-    print('InteractionOperator.jordan_wigner_transform() ' +
-          'takes {} seconds on {} qubits.\n'.format(runtime, n_qubits))
-
-    # Run benchmark on FermionOperator math and normal-ordering.
-    n_qubits = 20
-    term_length = 10
-    power = 15
-    print('Starting test on FermionOperator math and normal ordering.')
-    runtime_math, runtime_normal = benchmark_fermion_math_and_normal_order(
-        n_qubits, term_length, power)
-    print('Math took {} seconds. Normal ordering took {} seconds.\n'.format(
-        runtime_math, runtime_normal))
-
-    # Run FermionOperator.jordan_wigner_sparse() benchmark.
-    n_qubits = 10
-    print('Starting test on FermionOperator.jordan_wigner_sparse().')
-    runtime = benchmark_jordan_wigner_sparse(n_qubits)
-    print('Construction of SparseOperator took {} seconds.'.format(
-        runtime))
+    sys.exit(main())
@@ -18,10 +18,131 @@ For more information, examples, or tutorials visit our website:
 www.openfermion.org
 """
 
+import importlib
+import sys
+import types
+
 from ._version import __version__
 
-from openfermion.hamiltonians import *
-from openfermion.measurements import *
-from openfermion.ops import *
-from openfermion.transforms import *
-from openfermion.utils import *
+# Subpackages are imported when one of their public names is first accessed,
+# so that "import openfermion" does not load SciPy, h5py and the rest of the
+# package up front. Keep this table in sync with the subpackage __init__
+# files; openfermion/tests/_import_test.py checks that it is.
+_SUBPACKAGE_NAMES = {
+    'hamiltonians': (
+        'MolecularData', 'dual_basis_external_potential',
+        'dual_basis_jellium_model', 'dual_basis_kinetic',
+        'dual_basis_potential', 'fermi_hubbard',
+        'hypercube_grid_with_given_wigner_seitz_radius_and_filling',
+        'jellium_model', 'jordan_wigner_dual_basis_hamiltonian',
+        'jordan_wigner_dual_basis_jellium', 'make_atom', 'make_atomic_lattice',
+        'make_atomic_ring', 'mean_field_dwave', 'periodic_table',
+        'plane_wave_external_potential', 'plane_wave_hamiltonian',
+        'plane_wave_kinetic', 'plane_wave_potential',
+        'wigner_seitz_length_scale'),
+    'measurements': (
+        'ConstraintProjectionResult', 'PauliTermGroup', 'apply_constraints',
+        'constraint_matrix', 'linear_program_constraint_matrix',
+        'linearize_term', 'one_body_fermion_constraints',
+        'partition_pauli_terms', 'two_body_fermion_constraints',
+        'unlinearize_term'),
+    'ops': (
+        'BinaryCode', 'BinaryPolynomial', 'DiagonalCoulombHamiltonian',
+        'FermionOperator', 'InteractionOperator', 'InteractionRDM',
+        'PolynomialTensor', 'QuadraticHamiltonian', 'QubitOperator',
+        'SymbolicOperator', 'general_basis_change', 'intern_factor',
+        'intern_term', 'normal_ordered'),
+    'transforms': (
+        'binary_code_transform', 'bravyi_kitaev', 'bravyi_kitaev_code',
+        'bravyi_kitaev_fast', 'bravyi_kitaev_tree', 'checksum_code',
+        'dissolve', 'get_diagonal_coulomb_hamiltonian', 'get_fermion_operator',
+        'get_interaction_operator', 'get_interaction_rdm',
+        'get_molecular_data', 'get_quadratic_hamiltonian',
+        'get_sparse_operator', 'interleaved_code', 'jordan_wigner',
+        'jordan_wigner_code', 'linearize_decoder', 'parity_code',
+        'project_onto_sector', 'projection_error', 'reverse_jordan_wigner',
+        'verstraete_cirac_2d_square', 'weight_one_binary_addressing_code',
+        'weight_one_segment_code', 'weight_two_segment_code'),
+    'utils': (
+        'DavidsonError', 'FCIHamiltonian', 'Grid', 'KrylovPropagator',
+        'PauliTermCache', 'Profile', 'SpectralWindowSolver', 'TransformCache',
+        'amplitude_damping_channel', 'anticommutator', 'bch_expand',
+        'commutator', 'commuting_term_groups', 'count_qubits', 'davidson',
+        'dephasing_channel', 'depolarizing_channel', 'double_commutator',
+        'down_index', 'eigenspectrum', 'error_bound', 'error_operator',
+        'evolve_state', 'expectation', 'expectation_computational_basis_state',
+        'fourier_transform', 'freeze_orbitals',
+        'gaussian_state_preparation_circuit', 'get_density_matrix',
+        'get_eigenpairs_in_window', 'get_file_path', 'get_gap',
+        'get_ground_state', 'hartree_fock_state_jellium',
+        'hermitian_conjugated', 'inline_sum', 'inner_product',
+        'inverse_fourier_transform', 'is_hermitian', 'is_identity',
+        'iterate_operator_chunks', 'iterate_operator_terms',
+        'jordan_wigner_sparse', 'jw_configuration_state',
+        'jw_get_gaussian_state', 'jw_get_ground_states_by_particle_number',
+        'jw_get_interaction_rdm', 'jw_hartree_fock_state',
+        'jw_number_restrict_operator', 'jw_number_restrict_state',
+        'jw_operator_diagonal', 'jw_slater_determinant',
+        'jw_sz_restrict_operator', 'jw_sz_restrict_state', 'kronecker_delta',
+        'load_operator', 'low_depth_second_order_trotter_error_bound',
+        'low_depth_second_order_trotter_error_operator', 'majorana_operator',
+        'map_one_hole_dm_to_one_pdm', 'map_one_pdm_to_one_hole_dm',
+        'map_particle_hole_dm_to_one_pdm', 'map_particle_hole_dm_to_two_pdm',
+        'map_two_hole_dm_to_one_hole_dm', 'map_two_hole_dm_to_two_pdm',
+        'map_two_pdm_to_one_pdm', 'map_two_pdm_to_particle_hole_dm',
+        'map_two_pdm_to_two_hole_dm', 'number_operator', 'pauli_exp_to_qasm',
+        'pauli_exp_to_state',
+        'preprocess_lcu_coefficients_for_reversible_sampling', 'profiled',
+        'prune_unused_indices', 'qubit_operator_sparse', 'reorder',
+        's_minus_operator', 's_plus_operator', 's_squared_operator',
+        'save_operator', 'slater_determinant_preparation_circuit',
+        'sparse_eigenspectrum', 'sx_operator', 'sy_operator', 'sz_operator',
+        'transform_operator_file', 'trotter_operator_grouping',
+        'trotterize_exp_qubop_to_qasm', 'trotterize_exp_qubop_to_state',
+        'uccsd_convert_amplitude_format', 'uccsd_generator',
+        'uccsd_singlet_generator', 'uccsd_singlet_get_packed_amplitudes',
+        'uccsd_singlet_paramsize', 'up_index', 'up_then_down', 'variance',
+        'write_trotterized_qasm'),
+}
+
+_NAME_SUBPACKAGES = {name: subpackage
+                     for subpackage, names in _SUBPACKAGE_NAMES.items()
+                     for name in names}
+
+__all__ = sorted(_NAME_SUBPACKAGES)
+
+
+def __getattr__(name):
+    """Import the subpackage providing name and return its value."""
+    if name in _SUBPACKAGE_NAMES or name == 'config':
+        return importlib.import_module('openfermion.' + name)
+    if name not in _NAME_SUBPACKAGES:
+        raise AttributeError(
+            "module 'openfermion' has no attribute '{}'".format(name))
+    subpackage = importlib.import_module(
+        'openfermion.' + _NAME_SUBPACKAGES[name])
+    value = getattr(subpackage, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_NAME_SUBPACKAGES) |
+                  set(_SUBPACKAGE_NAMES))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ and __dir__ need Python 3.7 (PEP 562).
+    class _LazyModule(types.ModuleType):
+        def __getattr__(self, name):
+            return __getattr__(name)
+
+        def __dir__(self):
+            return __dir__()
+
+    try:
+        sys.modules[__name__].__class__ = _LazyModule
+    except TypeError:
+        # Python 2 cannot change the class of a module; import eagerly.
+        for _name in __all__:
+            __getattr__(_name)
@@ -0,0 +1,243 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Opt-in instrumentation of the major public functions of OpenFermion.
+
+Functions are only instrumented if config.PROFILING is set when they are
+decorated, i.e. if the environment variable OPENFERMION_PROFILING=1 is
+set before OpenFermion is imported; otherwise they are left as they are.
+
+This module sits at the top of the package, rather than in utils, so that
+ops can use it without a circular import. Its public names are exported
+by openfermion.utils.
+"""
+import functools
+import json
+import timeit
+import warnings
+
+from openfermion import config
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 cannot trace allocations; peak memory is then not recorded.
+    tracemalloc = None
+
+# Profiles that are currently recording, innermost last.
+_active_profiles = []
+
+# Number of profiled calls in progress, used to find top-level calls.
+_call_depth = [0]
+
+
+def _count_terms(value):
+    """Return the number of terms of an operator or entries of a matrix."""
+    terms = getattr(value, 'terms', None)
+    if isinstance(terms, dict):
+        return len(terms)
+    nnz = getattr(value, 'nnz', None)
+    if isinstance(nnz, int):
+        return nnz
+    return None
+
+
+def profiled(function=None, name=None):
+    """Decorate a function so that active Profiles record its calls.
+
+    If config.PROFILING is not set, the function is returned unchanged, so
+    that instrumentation costs nothing unless it was asked for. Otherwise,
+    when no Profile is active, the wrapper only checks whether one is
+    before calling the function, which costs about 0.25 microseconds per
+    call, and nothing is recorded.
+
+    Args:
+        function (callable): The function to instrument.
+        name (str, optional): The name under which calls are recorded.
+            Defaults to the name of the function.
+
+    Returns:
+        The instrumented function, or a decorator if function is None.
+    """
+    if function is None:
+        return lambda function: profiled(function, name)
+    if not config.PROFILING:
+        return function
+    if name is None:
+        name = function.__name__
+
+    @functools.wraps(function)
+    def profiled_function(*args, **kwargs):
+        if not _active_profiles:
+            return function(*args, **kwargs)
+        return _call_profiled(name, function, args, kwargs)
+    return profiled_function
+
+
+def _call_profiled(name, function, args, kwargs):
+    """Call function and record the call in the active profiles."""
+    profiles = list(_active_profiles)
+    trace_memory = (tracemalloc is not None and tracemalloc.is_tracing() and
+                    any(profile.trace_memory for profile in profiles))
+    if trace_memory:
+        if not _call_depth[0] and any(profile._started_tracing
+                                      for profile in profiles):
+            # Restart tracing so the peak of a top-level call is its own.
+            tracemalloc.stop()
+            tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+
+    terms_in = _count_terms(args[0]) if args else None
+    terms_out = None
+    _call_depth[0] += 1
+    start = timeit.default_timer()
+    try:
+        result = function(*args, **kwargs)
+        terms_out = _count_terms(result)
+        return result
+    finally:
+        # Calls that raise are recorded too, without terms out.
+        elapsed = timeit.default_timer() - start
+        _call_depth[0] -= 1
+        peak_memory = None
+        if trace_memory:
+            peak_memory = max(tracemalloc.get_traced_memory()[1] -
+                              memory_before, 0)
+        for profile in profiles:
+            profile._record(name, elapsed, terms_in, terms_out,
+                            peak_memory if profile.trace_memory else None)
+
+
+class Profile(object):
+    """Records calls of instrumented functions while used as a context.
+
+    For each instrumented function called inside the context, the profile
+    counts the calls and totals their wall time and the numbers of terms
+    of the operators, or stored entries of the sparse matrices, passed as
+    first argument and returned. With trace_memory, it also records the
+    largest peak of memory allocated by a call, as traced by tracemalloc:
+
+    .. code-block:: python
+
+        with Profile(trace_memory=True) as profile:
+            hamiltonian = get_sparse_operator(jordan_wigner(operator))
+            energy, state = get_ground_state(hamiltonian)
+        print(profile)
+        profile.save_json('profile.json')
+
+    Times include those of instrumented functions called from inside
+    others, e.g. jordan_wigner within get_sparse_operator. Memory peaks of
+    such nested calls are upper bounds.
+
+    Only functions instrumented with config.PROFILING set are recorded, so
+    the environment variable OPENFERMION_PROFILING=1 must be set before
+    OpenFermion is imported:
+
+    .. code-block:: bash
+
+        OPENFERMION_PROFILING=1 python script.py
+
+    Attributes:
+        trace_memory (bool): Whether peak memory is recorded.
+        wall_time (float): Total time in seconds spent inside the context.
+        functions (dict): Statistics of each instrumented function called,
+            keyed by name; see report.
+    """
+
+    def __init__(self, trace_memory=False):
+        """
+        Args:
+            trace_memory (bool, optional): Whether to trace allocations,
+                which slows down Python code noticeably. Ignored on
+                Python 2.
+        """
+        self.trace_memory = trace_memory and tracemalloc is not None
+        self.wall_time = 0.
+        self.functions = {}
+        self._started_tracing = False
+        self._start = None
+
+    def __enter__(self):
+        if not config.PROFILING:
+            warnings.warn('Profiling is disabled, so no calls are recorded; '
+                          'set OPENFERMION_PROFILING=1 before importing '
+                          'OpenFermion.', RuntimeWarning)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active_profiles.append(self)
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wall_time += timeit.default_timer() - self._start
+        _active_profiles.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, name, elapsed, terms_in, terms_out, peak_memory):
+        statistics = self.functions.get(name)
+        if statistics is None:
+            statistics = self.functions[name] = {
+                'calls': 0, 'total_time': 0., 'max_time': 0.,
+                'terms_in': 0, 'terms_out': 0, 'peak_memory': None}
+        statistics['calls'] += 1
+        statistics['total_time'] += elapsed
+        statistics['max_time'] = max(statistics['max_time'], elapsed)
+        if terms_in is not None:
+            statistics['terms_in'] += terms_in
+        if terms_out is not None:
+            statistics['terms_out'] += terms_out
+        if peak_memory is not None:
+            statistics['peak_memory'] = max(statistics['peak_memory'] or 0,
+                                            peak_memory)
+
+    def report(self):
+        """Return the recorded statistics.
+
+        Returns:
+            report (dict): The total 'wall_time' of the profile and, under
+                'functions', a dictionary for each function called with its
+                number of 'calls', 'total_time' and 'max_time' in seconds,
+                total 'terms_in' and 'terms_out', and 'peak_memory' in bytes
+                (None unless memory was traced).
+        """
+        return {'wall_time': self.wall_time,
+                'functions': {name: dict(statistics) for name, statistics
+                              in self.functions.items()}}
+
+    def save_json(self, file_name):
+        """Write the report to a JSON file.
+
+        Args:
+            file_name (str): The path of the file.
+        """
+        with open(file_name, 'w') as f:
+            json.dump(self.report(), f, indent=1, sort_keys=True)
+
+    def __str__(self):
+        """Return a table of the functions called, slowest first."""
+        lines = ['{:<40} {:>8} {:>12} {:>12} {:>12} {:>12}'.format(
+            'function', 'calls', 'time (s)', 'terms in', 'terms out',
+            'peak (MiB)')]
+        for name, statistics in sorted(
+                self.functions.items(),
+                key=lambda item: -item[1]['total_time']):
+            peak_memory = statistics['peak_memory']
+            lines.append('{:<40} {:>8} {:>12.4g} {:>12} {:>12} {:>12}'.format(
+                name, statistics['calls'], statistics['total_time'],
+                statistics['terms_in'], statistics['terms_out'],
+                'n/a' if peak_memory is None else
+                '{:.2f}'.format(peak_memory / 2. ** 20)))
+        lines.append('Total wall time: {:.4g} s'.format(self.wall_time))
+        return '\n'.join(lines)
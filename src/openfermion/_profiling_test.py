@@ -0,0 +1,158 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _profiling.py."""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import warnings
+
+import numpy
+
+from openfermion import config
+from openfermion._profiling import Profile, profiled, tracemalloc
+from openfermion.ops import QubitOperator
+
+
+def _square(operator):
+    return operator * operator
+
+
+def _allocate(n_bytes):
+    return numpy.ones(n_bytes, dtype=numpy.uint8)
+
+
+def _fail():
+    raise ValueError('failed')
+
+
+class ProfileTest(unittest.TestCase):
+
+    def setUp(self):
+        # Instrument the functions above as if profiling had been enabled
+        # when they were defined.
+        self.profiling = config.PROFILING
+        config.PROFILING = True
+        global _square, _allocate, _fail
+        self.functions = _square, _allocate, _fail
+        _square = profiled(_square)
+        _allocate = profiled(name='allocate')(_allocate)
+        _fail = profiled(_fail)
+
+    def tearDown(self):
+        global _square, _allocate, _fail
+        _square, _allocate, _fail = self.functions
+        config.PROFILING = self.profiling
+
+    def test_disabled(self):
+        config.PROFILING = False
+        square, _, _ = self.functions
+        self.assertIs(profiled(square), square)
+        self.assertIs(profiled(name='square')(square), square)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with Profile() as profile:
+                square(QubitOperator('X0'))
+        self.assertEqual(profile.functions, {})
+        self.assertEqual(len(caught), 1)
+
+    def test_nothing_recorded_when_inactive(self):
+        profile = Profile()
+        _square(QubitOperator('X0'))
+        self.assertEqual(profile.functions, {})
+        self.assertEqual(_square.__name__, '_square')
+
+    def test_records_calls_and_terms(self):
+        operator = QubitOperator('X0') + QubitOperator('Z1')
+        with Profile() as profile:
+            for _ in range(3):
+                _square(operator)
+        statistics = profile.report()['functions']['_square']
+        self.assertEqual(statistics['calls'], 3)
+        self.assertEqual(statistics['terms_in'], 6)
+        self.assertEqual(statistics['terms_out'], 6)
+        self.assertGreaterEqual(statistics['total_time'],
+                                statistics['max_time'])
+        self.assertIsNone(statistics['peak_memory'])
+        self.assertGreaterEqual(profile.wall_time,
+                                statistics['total_time'])
+
+        # Calls after the context are not recorded.
+        _square(operator)
+        self.assertEqual(profile.functions['_square']['calls'], 3)
+
+    def test_records_library_functions(self):
+        # Library functions are instrumented when OpenFermion is imported,
+        # so they are profiled in a new interpreter.
+        script = '\n'.join([
+            'import json',
+            'from openfermion import (Profile, fermi_hubbard,',
+            '                         get_ground_state, get_sparse_operator,',
+            '                         jordan_wigner)',
+            'hamiltonian = fermi_hubbard(2, 1, 1., 4.)',
+            'with Profile() as profile:',
+            '    get_ground_state(get_sparse_operator(',
+            '        jordan_wigner(hamiltonian)))',
+            'print(json.dumps([len(hamiltonian.terms), profile.report()]))'])
+        environment = dict(os.environ, OPENFERMION_PROFILING='1')
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         env=environment)
+        n_terms, report = json.loads(output.decode().splitlines()[-1])
+        functions = report['functions']
+        for name in ('jordan_wigner', 'get_sparse_operator',
+                     'qubit_operator_sparse', 'get_ground_state', 'eigsh'):
+            self.assertEqual(functions[name]['calls'], 1)
+        self.assertEqual(functions['jordan_wigner']['terms_in'], n_terms)
+
+    def test_nested_profiles(self):
+        with Profile() as outer:
+            _square(QubitOperator('X0'))
+            with Profile() as inner:
+                _square(QubitOperator('X0'))
+        self.assertEqual(outer.functions['_square']['calls'], 2)
+        self.assertEqual(inner.functions['_square']['calls'], 1)
+
+    def test_exceptions_propagate(self):
+        with self.assertRaises(ValueError):
+            with Profile() as profile:
+                _fail()
+        self.assertEqual(profile.functions['_fail']['calls'], 1)
+        with Profile() as profile:
+            pass
+        self.assertEqual(profile.functions, {})
+
+    @unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+    def test_trace_memory(self):
+        with Profile(trace_memory=True) as profile:
+            _allocate(10 ** 6)
+            _allocate(10 ** 3)
+        self.assertFalse(tracemalloc.is_tracing())
+        statistics = profile.functions['allocate']
+        self.assertEqual(statistics['calls'], 2)
+        self.assertGreaterEqual(statistics['peak_memory'], 10 ** 6)
+        self.assertLess(statistics['peak_memory'], 2 * 10 ** 6)
+
+    def test_save_json(self):
+        directory = tempfile.mkdtemp()
+        try:
+            file_name = os.path.join(directory, 'profile.json')
+            with Profile() as profile:
+                _square(QubitOperator('Y2'))
+            profile.save_json(file_name)
+            with open(file_name) as f:
+                self.assertEqual(json.load(f), profile.report())
+        finally:
+            shutil.rmtree(directory)
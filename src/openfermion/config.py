@@ -19,3 +19,15 @@ EQ_TOLERANCE = 1e-12
 THIS_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 DATA_DIRECTORY = os.path.abspath(
     os.path.join(THIS_DIRECTORY, 'data'))
+
+# Directory and size limit, in bytes, of the on-disk cache of transform
+# results used by openfermion.utils.TransformCache.
+TRANSFORM_CACHE_DIRECTORY = os.path.join(
+    os.path.expanduser('~'), '.cache', 'openfermion')
+TRANSFORM_CACHE_MAX_BYTES = 2 ** 30
+
+# Whether functions decorated with openfermion.utils.profiled are
+# instrumented. Set the environment variable OPENFERMION_PROFILING=1 before
+# importing OpenFermion to record calls with openfermion.utils.Profile;
+# otherwise the functions are left undecorated and cost nothing extra.
+PROFILING = os.environ.get('OPENFERMION_PROFILING', '0') not in ('', '0')
@@ -14,8 +14,7 @@
 from __future__ import absolute_import
 
 from openfermion.ops import FermionOperator
-from openfermion.utils import (hermitian_conjugated, number_operator,
-                               up_index, down_index)
+from openfermion.utils import up_index, down_index
 
 
 def fermi_hubbard(x_dimension, y_dimension, tunneling, coulomb,
@@ -112,42 +111,31 @@ def fermi_hubbard(x_dimension, y_dimension, tunneling, coulomb,
 
     # Initialize fermion operator class.
     n_sites = x_dimension * y_dimension
-    n_spin_orbitals = n_sites
-
-    if not spinless:
-        n_spin_orbitals *= 2
-
-    hubbard_model = FermionOperator.zero()
+    hubbard_model = FermionOperator.builder()
 
     # Select particle-hole symmetry
     if particle_hole_symmetry:
-        coulomb_shift = FermionOperator((), 0.5)
+        coulomb_shift = 0.5
     else:
-        coulomb_shift = FermionOperator.zero()
+        coulomb_shift = 0.
 
     # Loop through sites and add terms.
     for site in range(n_sites):
         # Add chemical potential to the spinless case. The magnetic field
         # doesn't contribute.
         if spinless and chemical_potential:
-            hubbard_model += number_operator(
-                n_spin_orbitals, site, -chemical_potential)
+            hubbard_model.add(((site, 1), (site, 0)), -chemical_potential)
 
         # With spin, add the chemical potential and magnetic field terms.
         elif not spinless:
-            hubbard_model += number_operator(
-                n_spin_orbitals, up_index(site),
-                -chemical_potential - magnetic_field)
-            hubbard_model += number_operator(
-                n_spin_orbitals, down_index(site),
-                -chemical_potential + magnetic_field)
+            hubbard_model.add(((up_index(site), 1), (up_index(site), 0)),
+                              -chemical_potential - magnetic_field)
+            hubbard_model.add(((down_index(site), 1), (down_index(site), 0)),
+                              -chemical_potential + magnetic_field)
 
             # Add local pair interaction terms.
-            operator_1 = number_operator(
-                n_spin_orbitals, up_index(site)) - coulomb_shift
-            operator_2 = number_operator(
-                n_spin_orbitals, down_index(site)) - coulomb_shift
-            hubbard_model += coulomb * operator_1 * operator_2
+            _add_interaction_term(hubbard_model, up_index(site),
+                                  down_index(site), coulomb, coulomb_shift)
 
         # Index coupled orbitals.
         right_neighbor = site + 1
@@ -164,11 +152,8 @@ def fermi_hubbard(x_dimension, y_dimension, tunneling, coulomb,
         if (right_neighbor) % x_dimension or (periodic and x_dimension > 2):
             if spinless:
                 # Add Coulomb term.
-                operator_1 = number_operator(
-                    n_spin_orbitals, site, 1.0) - coulomb_shift
-                operator_2 = number_operator(
-                    n_spin_orbitals, right_neighbor, 1.0) - coulomb_shift
-                hubbard_model += coulomb * operator_1 * operator_2
+                _add_interaction_term(hubbard_model, site, right_neighbor,
+                                      coulomb, coulomb_shift)
 
                 # Add hopping term.
                 operators = ((site, 1), (right_neighbor, 0))
@@ -177,26 +162,19 @@ def fermi_hubbard(x_dimension, y_dimension, tunneling, coulomb,
                 # Add hopping term.
                 operators = ((up_index(site), 1),
                              (up_index(right_neighbor), 0))
-                hopping_term = FermionOperator(operators, -tunneling)
-                hubbard_model += hopping_term
-                hubbard_model += hermitian_conjugated(hopping_term)
+                hubbard_model.add_hermitian_pair(operators, -tunneling)
 
                 operators = ((down_index(site), 1),
                              (down_index(right_neighbor), 0))
 
-            hopping_term = FermionOperator(operators, -tunneling)
-            hubbard_model += hopping_term
-            hubbard_model += hermitian_conjugated(hopping_term)
+            hubbard_model.add_hermitian_pair(operators, -tunneling)
 
         # Add transition to neighbor below.
         if site + x_dimension + 1 <= n_sites or (periodic and y_dimension > 2):
             if spinless:
                 # Add Coulomb term.
-                operator_1 = number_operator(
-                    n_spin_orbitals, site) - coulomb_shift
-                operator_2 = number_operator(
-                    n_spin_orbitals, bottom_neighbor) - coulomb_shift
-                hubbard_model += coulomb * operator_1 * operator_2
+                _add_interaction_term(hubbard_model, site, bottom_neighbor,
+                                      coulomb, coulomb_shift)
 
                 # Add hopping term.
                 operators = ((site, 1), (bottom_neighbor, 0))
@@ -205,15 +183,21 @@ def fermi_hubbard(x_dimension, y_dimension, tunneling, coulomb,
                 # Add hopping term.
                 operators = ((up_index(site), 1),
                              (up_index(bottom_neighbor), 0))
-                hopping_term = FermionOperator(operators, -tunneling)
-                hubbard_model += hopping_term
-                hubbard_model += hermitian_conjugated(hopping_term)
+                hubbard_model.add_hermitian_pair(operators, -tunneling)
 
                 operators = ((down_index(site), 1),
                              (down_index(bottom_neighbor), 0))
 
-            hopping_term = FermionOperator(operators, -tunneling)
-            hubbard_model += hopping_term
-            hubbard_model += hermitian_conjugated(hopping_term)
+            hubbard_model.add_hermitian_pair(operators, -tunneling)
+
+    return hubbard_model.build()
+
 
-    return hubbard_model
+def _add_interaction_term(builder, mode_a, mode_b, coulomb, coulomb_shift):
+    """Add coulomb * (n_a - shift) * (n_b - shift) to a builder."""
+    builder.add(((mode_a, 1), (mode_a, 0), (mode_b, 1), (mode_b, 0)),
+                coulomb)
+    if coulomb_shift:
+        builder.add(((mode_a, 1), (mode_a, 0)), -coulomb * coulomb_shift)
+        builder.add(((mode_b, 1), (mode_b, 0)), -coulomb * coulomb_shift)
+        builder.add((), coulomb * coulomb_shift ** 2)
@@ -15,6 +15,7 @@ from __future__ import absolute_import
 
 import numpy
 
+from openfermion._profiling import profiled
 from openfermion.ops import FermionOperator, normal_ordered, QubitOperator
 from openfermion.utils._grid import Grid
 
@@ -65,7 +66,7 @@ def plane_wave_kinetic(grid, spinless=False, e_cutoff=None):
         FermionOperator: The kinetic momentum operator.
     """
     # Initialize.
-    operator = FermionOperator()
+    operator = FermionOperator.builder()
     spins = [None] if spinless else [0, 1]
 
     # Loop once through all plane waves.
@@ -83,9 +84,9 @@ def plane_wave_kinetic(grid, spinless=False, e_cutoff=None):
 
             # Add interaction term.
             operators = ((orbital, 1), (orbital, 0))
-            operator += FermionOperator(operators, coefficient)
+            operator.add(operators, coefficient)
 
-    return operator
+    return operator.build()
 
 
 def plane_wave_potential(grid, spinless=False, e_cutoff=None):
@@ -101,7 +102,7 @@ def plane_wave_potential(grid, spinless=False, e_cutoff=None):
     """
     # Initialize.
     prefactor = 2. * numpy.pi / grid.volume_scale()
-    operator = FermionOperator((), 0.0)
+    operator = FermionOperator.builder()
     spins = [None] if spinless else [0, 1]
 
     # Pre-Computations.
@@ -165,10 +166,10 @@ def plane_wave_potential(grid, spinless=False, e_cutoff=None):
                                 (orbital_c != orbital_d)):
                             operators = ((orbital_a, 1), (orbital_b, 1),
                                          (orbital_c, 0), (orbital_d, 0))
-                            operator += FermionOperator(operators, coefficient)
+                            operator.add(operators, coefficient)
 
     # Return.
-    return operator
+    return operator.build()
 
 
 def dual_basis_jellium_model(grid, spinless=False,
@@ -191,7 +192,7 @@ def dual_basis_jellium_model(grid, spinless=False,
     # Initialize.
     n_points = grid.num_points
     position_prefactor = 2. * numpy.pi / grid.volume_scale()
-    operator = FermionOperator()
+    operator = FermionOperator.builder()
     spins = [None] if spinless else [0, 1]
 
     # Pre-Computations.
@@ -241,7 +242,7 @@ def dual_basis_jellium_model(grid, spinless=False,
             if kinetic:
                 for spin in spins:
                     operators = ((orbital_a[spin], 1), (orbital_b[spin], 0))
-                    operator += FermionOperator(operators, kinetic_coefficient)
+                    operator.add(operators, kinetic_coefficient)
             if potential:
                 for sa in spins:
                     for sb in spins:
@@ -249,17 +250,15 @@ def dual_basis_jellium_model(grid, spinless=False,
                             continue
                         operators = ((orbital_a[sa], 1), (orbital_a[sa], 0),
                                      (orbital_b[sb], 1), (orbital_b[sb], 0))
-                        operator += FermionOperator(operators,
-                                                    potential_coefficient)
+                        operator.add(operators, potential_coefficient)
 
     # Include the Madelung constant if requested.
     if include_constant:
         # TODO: Check for other unit cell shapes
-        operator += (FermionOperator.identity() *
-                     (2.8372 / grid.volume_scale()**(1./grid.dimensions)))
+        operator.add((), 2.8372 / grid.volume_scale()**(1./grid.dimensions))
 
     # Return.
-    return operator
+    return operator.build()
 
 
 def dual_basis_kinetic(grid, spinless=False):
@@ -288,6 +287,7 @@ def dual_basis_potential(grid, spinless=False):
     return dual_basis_jellium_model(grid, spinless, False, True)
 
 
+@profiled
 def jellium_model(grid, spinless=False, plane_wave=True,
                   include_constant=False, e_cutoff=None):
     """Return jellium Hamiltonian as FermionOperator class.
@@ -339,7 +339,7 @@ def jordan_wigner_dual_basis_jellium(grid, spinless=False,
         n_qubits = n_orbitals
     else:
         n_qubits = 2 * n_orbitals
-    hamiltonian = QubitOperator()
+    hamiltonian = QubitOperator.builder()
 
     # Compute vectors.
     momentum_vectors = {}
@@ -367,13 +367,11 @@ def jordan_wigner_dual_basis_jellium(grid, spinless=False,
         identity_coefficient /= 2.
 
     # Add identity term.
-    identity_term = QubitOperator((), identity_coefficient)
-    hamiltonian += identity_term
+    hamiltonian.add((), identity_coefficient)
 
     # Add local Z terms.
     for qubit in range(n_qubits):
-        qubit_term = QubitOperator(((qubit, 'Z'),), z_coefficient)
-        hamiltonian += qubit_term
+        hamiltonian.add(((qubit, 'Z'),), z_coefficient)
 
     # Add ZZ terms and XZX + YZY terms.
     zz_prefactor = numpy.pi / volume
@@ -409,8 +407,7 @@ def jordan_wigner_dual_basis_jellium(grid, spinless=False,
                                      momenta_squared)
 
             # Add ZZ term.
-            qubit_term = QubitOperator(((p, 'Z'), (q, 'Z')), zpzq_coefficient)
-            hamiltonian += qubit_term
+            hamiltonian.add(((p, 'Z'), (q, 'Z')), zpzq_coefficient)
 
             # Add XZX + YZY term.
             if skip_xzx_yzy:
@@ -418,17 +415,17 @@ def jordan_wigner_dual_basis_jellium(grid, spinless=False,
             z_string = tuple((i, 'Z') for i in range(p + 1, q))
             xzx_operators = ((p, 'X'),) + z_string + ((q, 'X'),)
             yzy_operators = ((p, 'Y'),) + z_string + ((q, 'Y'),)
-            hamiltonian += QubitOperator(xzx_operators, term_coefficient)
-            hamiltonian += QubitOperator(yzy_operators, term_coefficient)
+            hamiltonian.add(xzx_operators, term_coefficient)
+            hamiltonian.add(yzy_operators, term_coefficient)
 
     # Include the Madelung constant if requested.
     if include_constant:
         # TODO Generalize to other cells
-        hamiltonian += (QubitOperator((),) *
-                        (2.8372 / grid.volume_scale() ** (1./grid.dimensions)))
+        hamiltonian.add(
+            (), 2.8372 / grid.volume_scale() ** (1./grid.dimensions))
 
     # Return Hamiltonian.
-    return hamiltonian
+    return hamiltonian.build()
 
 
 def hypercube_grid_with_given_wigner_seitz_radius_and_filling(
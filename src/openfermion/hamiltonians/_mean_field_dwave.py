@@ -14,8 +14,7 @@
 from __future__ import absolute_import
 
 from openfermion.ops import FermionOperator
-from openfermion.utils import (hermitian_conjugated, number_operator,
-                               up_index, down_index)
+from openfermion.utils import up_index, down_index
 
 
 def mean_field_dwave(x_dimension, y_dimension, tunneling, sc_gap,
@@ -73,16 +72,16 @@ def mean_field_dwave(x_dimension, y_dimension, tunneling, sc_gap,
     """
     # Initialize fermion operator class.
     n_sites = x_dimension * y_dimension
-    n_spin_orbitals = 2 * n_sites
-    mean_field_dwave_model = FermionOperator()
+    mean_field_dwave_model = FermionOperator.builder()
 
     # Loop through sites and add terms.
     for site in range(n_sites):
         # Add chemical potential
-        mean_field_dwave_model += number_operator(
-            n_spin_orbitals, up_index(site), -chemical_potential)
-        mean_field_dwave_model += number_operator(
-            n_spin_orbitals, down_index(site), -chemical_potential)
+        mean_field_dwave_model.add(
+            ((up_index(site), 1), (up_index(site), 0)), -chemical_potential)
+        mean_field_dwave_model.add(
+            ((down_index(site), 1), (down_index(site), 0)),
+            -chemical_potential)
 
         # Index coupled orbitals.
         right_neighbor = site + 1
@@ -98,48 +97,36 @@ def mean_field_dwave(x_dimension, y_dimension, tunneling, sc_gap,
         if (site + 1) % x_dimension or (periodic and x_dimension > 2):
             # Add spin-up hopping term.
             operators = ((up_index(site), 1), (up_index(right_neighbor), 0))
-            hopping_term = FermionOperator(operators, -tunneling)
-            mean_field_dwave_model += hopping_term
-            mean_field_dwave_model += hermitian_conjugated(hopping_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, -tunneling)
             # Add spin-down hopping term
             operators = ((down_index(site), 1),
                          (down_index(right_neighbor), 0))
-            hopping_term = FermionOperator(operators, -tunneling)
-            mean_field_dwave_model += hopping_term
-            mean_field_dwave_model += hermitian_conjugated(hopping_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, -tunneling)
 
             # Add pairing term
             operators = ((up_index(site), 1),
                          (down_index(right_neighbor), 1))
-            pairing_term = FermionOperator(operators, sc_gap / 2.)
+            mean_field_dwave_model.add_hermitian_pair(operators, -sc_gap / 2.)
             operators = ((down_index(site), 1),
                          (up_index(right_neighbor), 1))
-            pairing_term += FermionOperator(operators, -sc_gap / 2.)
-            mean_field_dwave_model -= pairing_term
-            mean_field_dwave_model -= hermitian_conjugated(pairing_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, sc_gap / 2.)
 
         # Add transition to neighbor below.
         if site + x_dimension + 1 <= n_sites or (periodic and y_dimension > 2):
             # Add spin-up hopping term.
             operators = ((up_index(site), 1), (up_index(bottom_neighbor), 0))
-            hopping_term = FermionOperator(operators, -tunneling)
-            mean_field_dwave_model += hopping_term
-            mean_field_dwave_model += hermitian_conjugated(hopping_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, -tunneling)
             # Add spin-down hopping term
             operators = ((down_index(site), 1),
                          (down_index(bottom_neighbor), 0))
-            hopping_term = FermionOperator(operators, -tunneling)
-            mean_field_dwave_model += hopping_term
-            mean_field_dwave_model += hermitian_conjugated(hopping_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, -tunneling)
 
             # Add pairing term
             operators = ((up_index(site), 1),
                          (down_index(bottom_neighbor), 1))
-            pairing_term = FermionOperator(operators, -sc_gap / 2.)
+            mean_field_dwave_model.add_hermitian_pair(operators, sc_gap / 2.)
             operators = ((down_index(site), 1),
                          (up_index(bottom_neighbor), 1))
-            pairing_term += FermionOperator(operators, sc_gap / 2.)
-            mean_field_dwave_model -= pairing_term
-            mean_field_dwave_model -= hermitian_conjugated(pairing_term)
+            mean_field_dwave_model.add_hermitian_pair(operators, -sc_gap / 2.)
     # Return.
-    return mean_field_dwave_model
+    return mean_field_dwave_model.build()
@@ -13,6 +13,7 @@
 """Construct Hamiltonians in plan wave basis and its dual in 3D."""
 from __future__ import absolute_import
 
+from openfermion._profiling import profiled
 import openfermion.utils._operator_utils
 
 from openfermion.hamiltonians._jellium import *
@@ -41,7 +42,7 @@ def dual_basis_external_potential(grid, geometry, spinless):
         FermionOperator: The dual basis operator.
     """
     prefactor = -4.0 * numpy.pi / grid.volume_scale()
-    operator = None
+    operator = FermionOperator.builder()
     if spinless:
         spins = [None]
     else:
@@ -64,11 +65,8 @@ def dual_basis_external_potential(grid, geometry, spinless):
                 for spin_p in spins:
                     orbital_p = grid.orbital_id(pos_indices, spin_p)
                     operators = ((orbital_p, 1), (orbital_p, 0))
-                    if operator is None:
-                        operator = FermionOperator(operators, coefficient)
-                    else:
-                        operator += FermionOperator(operators, coefficient)
-    return operator
+                    operator.add(operators, coefficient)
+    return operator.build()
 
 
 def plane_wave_external_potential(grid, geometry, spinless, e_cutoff=None):
@@ -100,6 +98,7 @@ def plane_wave_external_potential(grid, geometry, spinless, e_cutoff=None):
     return operator
 
 
+@profiled
 def plane_wave_hamiltonian(grid, geometry=None,
                            spinless=False, plane_wave=True,
                            include_constant=False, e_cutoff=None):
@@ -181,7 +180,7 @@ def jordan_wigner_dual_basis_hamiltonian(grid, geometry=None, spinless=False,
     else:
         n_qubits = 2 * n_orbitals
     prefactor = -2 * numpy.pi / volume
-    external_potential = QubitOperator()
+    external_potential = QubitOperator.builder()
 
     for k_indices in grid.all_points_indices():
         momenta = grid.momentum_vector(k_indices)
@@ -200,7 +199,7 @@ def jordan_wigner_dual_basis_hamiltonian(grid, geometry=None, spinless=False,
                 coefficient = (prefactor / momenta_squared *
                                periodic_hash_table[nuclear_term[0]] *
                                numpy.cos(cos_index))
-                external_potential += (QubitOperator((), coefficient) -
-                                       QubitOperator(((p, 'Z'),), coefficient))
+                external_potential.add((), coefficient)
+                external_potential.add(((p, 'Z'),), -coefficient)
 
-    return jellium_op + external_potential
+    return jellium_op + external_potential.build()
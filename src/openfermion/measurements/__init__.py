@@ -10,10 +10,14 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from ._equality_constraint_projection import (apply_constraints,
+from ._equality_constraint_projection import (ConstraintProjectionResult,
+                                              apply_constraints,
                                               constraint_matrix,
+                                              linear_program_constraint_matrix,
                                               linearize_term,
                                               unlinearize_term)
 
 from ._rdm_equality_constraints import (one_body_fermion_constraints,
                                         two_body_fermion_constraints)
+
+from ._pauli_term_grouping import PauliTermGroup, partition_pauli_terms
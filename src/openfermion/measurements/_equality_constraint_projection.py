@@ -11,14 +11,17 @@
 #   limitations under the License.
 
 """Module to reduce operator variance using equality RDM constraints."""
+import time
+
 import numpy
 import scipy
+import scipy.optimize
+import scipy.sparse
+from numpy.lib import NumpyVersion
 
 from openfermion.ops import FermionOperator
 from openfermion.utils import count_qubits, hermitian_conjugated
 
-from ._rdm_equality_constraints import two_body_fermion_constraints
-
 
 def linearize_term(term, n_orbitals):
     """Function to return integer index of term indices.
@@ -93,6 +96,100 @@ def unlinearize_term(index, n_orbitals):
         return ((p, 1), (q, 1), (r, 0), (s, 0))
 
 
+def constraint_triplets(n_orbitals, n_fermions):
+    """Generates the two-body RDM equality constraints as sparse triplets.
+
+    This is an array-based counterpart of two_body_fermion_constraints: the
+    constraints are numbered in the same order and have the same terms, but
+    each family of constraints is produced at once with numpy index
+    arithmetic instead of one FermionOperator per constraint.
+
+    Args:
+        n_orbitals(int): The number of orbitals in the simulation.
+        n_fermions(int): The number of particles in the simulation.
+
+    Yields:
+        For each family of constraints, a tuple (constraint_ids,
+        term_indices, values) of numpy arrays giving the constraint number,
+        the index of the term (see linearize_term) and the coefficient of
+        every nonzero entry of the constraints.
+    """
+    if not n_orbitals:
+        return
+
+    def one_body_index(p, q):
+        return 1 + p + q * n_orbitals
+
+    def two_body_index(p, q, r, s):
+        return (1 + n_orbitals ** 2 +
+                p +
+                q * n_orbitals +
+                r * n_orbitals ** 2 +
+                s * n_orbitals ** 3)
+
+    n_pairs = n_orbitals ** 2
+    pair_first = numpy.arange(n_pairs) // n_orbitals
+    pair_second = numpy.arange(n_pairs) % n_orbitals
+    offset = 0
+
+    # Two-body trace condition.
+    i, j = pair_first, pair_second
+    constraint_ids = numpy.zeros(n_pairs, int)
+    term_indices = two_body_index(i, j, j, i)
+    values = numpy.ones(n_pairs)
+    constant = n_fermions * (n_fermions - 1)
+    if constant:
+        constraint_ids = numpy.append(constraint_ids, 0)
+        term_indices = numpy.append(term_indices, 0)
+        values = numpy.append(values, -constant)
+    yield constraint_ids, term_indices, values
+    offset += 1
+
+    # Two-body Hermiticity condition.
+    pq, rs = numpy.triu_indices(n_pairs, 1)
+    p, q = pair_first[pq], pair_second[pq]
+    r, s = pair_first[rs], pair_second[rs]
+    constraint_ids = offset + numpy.arange(pq.shape[0])
+    yield (numpy.concatenate((constraint_ids, constraint_ids)),
+           numpy.concatenate((two_body_index(p, q, s, r),
+                              two_body_index(r, s, q, p))),
+           numpy.concatenate((numpy.ones(pq.shape[0]),
+                              -numpy.ones(pq.shape[0]))))
+    offset += pq.shape[0]
+
+    # Contraction to One-RDM from Two-RDM.
+    ij = numpy.repeat(numpy.arange(n_pairs), n_orbitals)
+    p = numpy.tile(numpy.arange(n_orbitals), n_pairs)
+    i, j = pair_first[ij], pair_second[ij]
+    constraint_ids = offset + ij
+    term_indices = two_body_index(i, p, p, j)
+    values = numpy.ones(ij.shape[0])
+    if n_fermions != 1:
+        constraint_ids = numpy.concatenate(
+            (constraint_ids, offset + numpy.arange(n_pairs)))
+        term_indices = numpy.concatenate(
+            (term_indices, one_body_index(pair_first, pair_second)))
+        values = numpy.concatenate(
+            (values, -(n_fermions - 1.) * numpy.ones(n_pairs)))
+    yield constraint_ids, term_indices, values
+    offset += n_pairs
+
+    # Linear relations between two-particle matrices (G-matrix condition).
+    # The one-body terms of these constraints cancel, and the two two-body
+    # terms coincide when q == r.
+    pq, rs = numpy.triu_indices(n_pairs)
+    p, q = pair_first[pq], pair_second[pq]
+    r, s = pair_first[rs], pair_second[rs]
+    constraint_ids = offset + numpy.arange(pq.shape[0])
+    distinct = q != r
+    yield (numpy.concatenate((constraint_ids, constraint_ids[distinct])),
+           numpy.concatenate((two_body_index(p, s, r, q),
+                              two_body_index(p[distinct], s[distinct],
+                                             q[distinct], r[distinct]))),
+           numpy.concatenate((2. - distinct,
+                              numpy.ones(numpy.count_nonzero(distinct)))))
+
+
 def constraint_matrix(n_orbitals, n_fermions):
     """Function to generate matrix of constraints.
 
@@ -103,23 +200,22 @@ def constraint_matrix(n_orbitals, n_fermions):
     Returns:
         constraint_matrix(scipy.sparse.coo_matrix): The matrix of constraints.
     """
-    # Very inefficiently count constraints.
-    n_constraints = 0
-    for constraint in two_body_fermion_constraints(n_orbitals, n_fermions):
-        n_constraints += 1
-
-    # Initialize constraint matrix.
+    constraint_ids = [numpy.zeros(0, int)]
+    term_indices = [numpy.zeros(0, int)]
+    values = [numpy.zeros(0, float)]
+    for triplets in constraint_triplets(n_orbitals, n_fermions):
+        constraint_ids.append(triplets[0])
+        term_indices.append(triplets[1])
+        values.append(triplets[2])
+    constraint_ids = numpy.concatenate(constraint_ids)
+    term_indices = numpy.concatenate(term_indices)
+    values = numpy.concatenate(values)
+
+    # Every constraint has at least one nonzero entry.
+    n_constraints = constraint_ids.max() + 1 if constraint_ids.size else 0
     n_terms = 1 + n_orbitals ** 2 + n_orbitals ** 4
-    constraint_matrix = scipy.sparse.dok_matrix((n_constraints, n_terms))
-
-    # Populate constraint matrix.
-    constraint_number = 0
-    for constraint in two_body_fermion_constraints(n_orbitals, n_fermions):
-        for term, coefficient in constraint.terms.items():
-            term_index = linearize_term(term, n_orbitals)
-            constraint_matrix[constraint_number, term_index] = coefficient
-        constraint_number += 1
-    return constraint_matrix
+    return scipy.sparse.coo_matrix((values, (constraint_ids, term_indices)),
+                                   shape=(n_constraints, n_terms))
 
 
 def operator_to_vector(operator):
@@ -158,28 +254,132 @@ def vector_to_operator(vector, n_orbitals):
     return operator
 
 
-def apply_constraints(operator, n_fermions, use_scipy=True):
+class ConstraintProjectionResult(object):
+    """Outcome of reducing the norm of an operator with equality constraints.
+
+    Attributes:
+        operator(FermionOperator): The operator with reduced norm.
+        initial_bound(float): Bound on measurements from the original
+            operator.
+        solution_bound(float): Bound on measurements implied by the solution
+            vector of the linear program.
+        final_bound(float): Bound on measurements from the modified operator.
+        success(bool): Whether the linear program terminated successfully.
+        message(str): Status message of the linear programming solver.
+        n_iterations(int): Number of iterations of the solver, or None if the
+            solver does not report it.
+        timings(dict): Wall-clock times in seconds of the stages
+            'constraints', 'assembly', 'solve', 'operator' and 'total'.
+    """
+
+    def __init__(self, operator, initial_bound, solution_bound, final_bound,
+                 success, message, n_iterations, timings):
+        self.operator = operator
+        self.initial_bound = initial_bound
+        self.solution_bound = solution_bound
+        self.final_bound = final_bound
+        self.success = success
+        self.message = message
+        self.n_iterations = n_iterations
+        self.timings = timings
+
+    def __repr__(self):
+        return ('ConstraintProjectionResult(success={}, initial_bound={}, '
+                'final_bound={}, total_time={})'.format(
+                    self.success, self.initial_bound, self.final_bound,
+                    self.timings.get('total')))
+
+
+def linear_program_constraint_matrix(constraints):
+    """Assemble the linear program used to apply equality constraints.
+
+    The variables of the linear program are the weights of the n_constraints
+    constraints followed by the n_terms residuals, and the inequalities bound
+    the absolute value of each term of the modified operator by its residual.
+    The matrix is assembled directly from the nonzero entries of the
+    constraint matrix.
+
+    Args:
+        constraints(scipy.sparse matrix): The matrix of constraints, of shape
+            (n_constraints, n_terms).
+
+    Returns:
+        lp_constraint_matrix(scipy.sparse.csr_matrix): The inequality
+            constraint matrix, of shape
+            (2 * n_terms, n_constraints + n_terms).
+    """
+    constraints = scipy.sparse.coo_matrix(constraints)
+    n_constraints, n_terms = constraints.shape
+
+    # Constraint weights; the constant term is not constrained.
+    keep = constraints.col != 0
+    constraint_ids = constraints.row[keep]
+    term_ids = constraints.col[keep]
+    values = constraints.data[keep]
+
+    # Residuals.
+    residual_ids = numpy.arange(n_terms)
+
+    rows = numpy.concatenate((term_ids, n_terms + term_ids,
+                              residual_ids, n_terms + residual_ids))
+    columns = numpy.concatenate((constraint_ids, constraint_ids,
+                                 n_constraints + residual_ids,
+                                 n_constraints + residual_ids))
+    data = numpy.concatenate((values, -values,
+                              -numpy.ones(2 * n_terms)))
+    return scipy.sparse.coo_matrix(
+        (data, (rows, columns)),
+        shape=(2 * n_terms, n_constraints + n_terms)).tocsr()
+
+
+def _default_linprog_method():
+    """Return the best sparse method of scipy.optimize.linprog available."""
+    if NumpyVersion(scipy.__version__) >= '1.6.0':
+        return 'highs'
+    return 'interior-point'
+
+
+def apply_constraints(operator, n_fermions, use_scipy=True, method=None,
+                      return_result=False):
     """Function to use linear programming to apply constraints.
 
+    The linear program is assembled and solved in sparse format throughout.
+
     Args:
         operator(FermionOperator): FermionOperator with only 1- and 2-body
             terms that we wish to vectorize.
         n_fermions(int): The number of particles in the simulation.
         use_scipy(bool): Whether to use scipy (True) or cvxopt (False).
+        method(str): The method of scipy.optimize.linprog to use. Defaults
+            to 'highs' if available and to 'interior-point' otherwise.
+            Only used if use_scipy is True.
+        return_result(bool): Whether to return a ConstraintProjectionResult
+            reporting bounds and timings instead of the operator alone.
 
     Returns:
         modified_operator(FermionOperator): The operator with reduced norm
-            that has been modified with equality constraints.
+            that has been modified with equality constraints. If
+            return_result is True, a ConstraintProjectionResult holding
+            this operator is returned instead; if the linear program
+            failed, its operator is the original operator and its success
+            is False.
+
+    Raises:
+        ValueError: The linear program failed and return_result is False.
     """
+    timings = {}
+    start_time = time.time()
+
     # Get constraint matrix.
     n_orbitals = count_qubits(operator)
     constraints = constraint_matrix(n_orbitals, n_fermions)
-    n_constraints, n_terms = constraints.get_shape()
+    n_constraints, n_terms = constraints.shape
+    timings['constraints'] = time.time() - start_time
 
     # Get vectorized operator.
+    stage_time = time.time()
     vectorized_operator = operator_to_vector(operator)
     initial_bound = numpy.sum(numpy.absolute(vectorized_operator[1::])) ** 2
-    print('Initial bound on measurements is %f.' % initial_bound)
 
     # Get linear programming coefficient vector.
     n_variables = n_constraints + n_terms
@@ -187,37 +387,38 @@ def apply_constraints(operator, n_fermions, use_scipy=True):
     lp_vector[-n_terms:] = 1.
 
     # Get linear programming constraint matrix.
-    lp_constraint_matrix = scipy.sparse.dok_matrix((2 * n_terms, n_variables))
-    for (i, j), value in constraints.items():
-        if j:
-            lp_constraint_matrix[j, i] = value
-            lp_constraint_matrix[n_terms + j, i] = -value
-    for i in range(n_terms):
-        lp_constraint_matrix[i, n_constraints + i] = -1.
-        lp_constraint_matrix[n_terms + i, n_constraints + i] = -1.
+    lp_constraint_matrix = linear_program_constraint_matrix(constraints)
 
     # Get linear programming constraint vector.
     lp_constraint_vector = numpy.zeros(2 * n_terms, float)
     lp_constraint_vector[:n_terms] = vectorized_operator
     lp_constraint_vector[-n_terms:] = -vectorized_operator
+    timings['assembly'] = time.time() - stage_time
 
     # Perform linear programming.
-    print('Starting linear programming.')
+    stage_time = time.time()
     if use_scipy:
+        if method is None:
+            method = _default_linprog_method()
         options = {'maxiter': int(1e6)}
+        if method == 'interior-point':
+            # The presolve of the interior-point method stalls on the
+            # redundant rows of the constraint matrix.
+            options['sparse'] = True
+            options['presolve'] = False
         bound = n_constraints * [(None, None)] + n_terms * [(0, None)]
         solution = scipy.optimize.linprog(c=lp_vector,
-                                          A_ub=lp_constraint_matrix.toarray(),
+                                          A_ub=lp_constraint_matrix,
                                           b_ub=lp_constraint_vector,
                                           bounds=bound,
+                                          method=method,
                                           options=options)
 
         # Analyze results.
-        print(solution['message'])
-        assert solution['success']
         solution_vector = solution['x']
-        objective = solution['fun'] ** 2
-        print('Program terminated after %i iterations.' % solution['nit'])
+        success = bool(solution['success'])
+        message = solution['message']
+        n_iterations = solution.get('nit')
 
     else:
         # Convert to CVXOpt sparse matrix.
@@ -236,13 +437,23 @@ def apply_constraints(operator, n_fermions, use_scipy=True):
                               solver='glpk')
 
         # Analyze results.
-        print(solution['status'])
         solution_vector = numpy.array(solution['x']).transpose()[0]
+        success = solution['status'] == 'optimal'
+        message = solution['status']
+        n_iterations = None
+    timings['solve'] = time.time() - stage_time
+    if not success:
+        if return_result:
+            timings['total'] = time.time() - start_time
+            return ConstraintProjectionResult(operator, initial_bound, None,
+                                              initial_bound, success,
+                                              message, n_iterations, timings)
+        raise ValueError('Linear program failed: {}'.format(message))
 
     # Alternative bound.
+    stage_time = time.time()
     residuals = solution_vector[-n_terms:]
-    alternative_bound = numpy.sum(numpy.absolute(residuals[1::])) ** 2
-    print('Bound implied by solution vector is %f.' % alternative_bound)
+    solution_bound = numpy.sum(numpy.absolute(residuals[1::])) ** 2
 
     # Make sure residuals are positive.
     for residual in residuals:
@@ -251,13 +462,21 @@ def apply_constraints(operator, n_fermions, use_scipy=True):
     # Get bound on updated Hamiltonian.
     weights = solution_vector[:n_constraints]
     final_vectorized_operator = (vectorized_operator -
-                                 constraints.transpose() * weights)
+                                 constraints.transpose().dot(weights))
     final_bound = numpy.sum(
         numpy.absolute(final_vectorized_operator[1::])) ** 2
-    print('Actual bound determined is %f.' % final_bound)
 
-    # Return modified operator.
+    # Get modified operator.
     modified_operator = vector_to_operator(
         final_vectorized_operator, n_orbitals)
-    return (modified_operator +
-            hermitian_conjugated(modified_operator)) / 2.
+    modified_operator = (modified_operator +
+                         hermitian_conjugated(modified_operator)) / 2.
+    timings['operator'] = time.time() - stage_time
+    timings['total'] = time.time() - start_time
+
+    if return_result:
+        return ConstraintProjectionResult(modified_operator, initial_bound,
+                                          solution_bound, final_bound,
+                                          success, message, n_iterations,
+                                          timings)
+    return modified_operator
@@ -13,16 +13,21 @@
 """Tests for _variance_reduction.py"""
 import numpy
 import os
+import scipy.optimize
+import scipy.sparse
 import unittest
 
 from ._equality_constraint_projection import (apply_constraints,
                                               constraint_matrix,
+                                              constraint_triplets,
+                                              linear_program_constraint_matrix,
                                               linearize_term,
                                               operator_to_vector,
                                               unlinearize_term,
                                               vector_to_operator)
 
 from openfermion.config import THIS_DIRECTORY
+from openfermion.measurements import two_body_fermion_constraints
 from openfermion.hamiltonians import MolecularData
 from openfermion.transforms import get_fermion_operator, get_sparse_operator
 from openfermion.utils import (count_qubits,
@@ -100,6 +105,86 @@ class EqualityConstraintProjectionTest(unittest.TestCase):
         modified_energy = expectation(sparse_modified, wavefunction)
         self.assertAlmostEqual(modified_energy, energy)
 
+    def test_constraint_matrix_matches_fermion_constraints(self):
+        for n_orbitals, n_fermions in ((4, 2), (3, 1), (3, 0)):
+            constraints = constraint_matrix(n_orbitals, n_fermions)
+
+            # Build the matrix from the constraint operators.
+            n_terms = 1 + n_orbitals ** 2 + n_orbitals ** 4
+            expected = []
+            for constraint in two_body_fermion_constraints(n_orbitals,
+                                                           n_fermions):
+                row = numpy.zeros(n_terms)
+                for term, coefficient in constraint.terms.items():
+                    row[linearize_term(term, n_orbitals)] = coefficient
+                expected.append(row)
+            expected = numpy.array(expected)
+
+            self.assertEqual(constraints.shape, expected.shape)
+            self.assertAlmostEqual(
+                numpy.amax(numpy.absolute(constraints.toarray() - expected)),
+                0.)
+
+    def test_constraint_triplets_no_orbitals(self):
+        self.assertEqual(list(constraint_triplets(0, 0)), [])
+        self.assertEqual(constraint_matrix(0, 0).shape, (0, 1))
+
+    def test_linear_program_constraint_matrix(self):
+        constraints = constraint_matrix(self.n_orbitals, self.n_fermions)
+        n_constraints, n_terms = constraints.shape
+
+        # Build the matrix entry by entry.
+        expected = scipy.sparse.dok_matrix(
+            (2 * n_terms, n_constraints + n_terms))
+        for i, j, value in zip(constraints.row, constraints.col,
+                               constraints.data):
+            if j:
+                expected[j, i] = value
+                expected[n_terms + j, i] = -value
+        for i in range(n_terms):
+            expected[i, n_constraints + i] = -1.
+            expected[n_terms + i, n_constraints + i] = -1.
+
+        lp_constraint_matrix = linear_program_constraint_matrix(constraints)
+        self.assertTrue(scipy.sparse.isspmatrix_csr(lp_constraint_matrix))
+        self.assertEqual(lp_constraint_matrix.shape, expected.shape)
+        self.assertAlmostEqual(
+            abs(lp_constraint_matrix - expected.tocsr()).max(), 0.)
+
+    def test_apply_constraints_result(self):
+        result = apply_constraints(self.fermion_hamiltonian, self.n_fermions,
+                                   return_result=True)
+        self.assertTrue(result.success)
+        self.assertLess(result.final_bound, result.initial_bound)
+        self.assertAlmostEqual(result.final_bound, result.solution_bound,
+                               places=5)
+        for stage in ('constraints', 'assembly', 'solve', 'operator',
+                      'total'):
+            self.assertGreaterEqual(result.timings[stage], 0.)
+
+        modified_operator = apply_constraints(self.fermion_hamiltonian,
+                                              self.n_fermions)
+        self.assertTrue(result.operator == modified_operator)
+
+    def test_apply_constraints_failure(self):
+        def failed_linprog(*args, **kwargs):
+            return {'success': False, 'x': None, 'message': 'failed',
+                    'nit': 1}
+
+        linprog = scipy.optimize.linprog
+        scipy.optimize.linprog = failed_linprog
+        try:
+            result = apply_constraints(self.fermion_hamiltonian,
+                                       self.n_fermions, return_result=True)
+            with self.assertRaises(ValueError):
+                apply_constraints(self.fermion_hamiltonian, self.n_fermions)
+        finally:
+            scipy.optimize.linprog = linprog
+        self.assertFalse(result.success)
+        self.assertEqual(result.message, 'failed')
+        self.assertTrue(result.operator == self.fermion_hamiltonian)
+        self.assertEqual(result.final_bound, result.initial_bound)
+
     def test_apply_constraints(self):
 
         # Get norm of original operator.
@@ -0,0 +1,126 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Module to partition Pauli terms into groups measured together."""
+from __future__ import absolute_import, division
+
+import numpy
+
+from openfermion.ops import QubitOperator
+from openfermion.utils import commuting_term_groups
+
+
+class PauliTermGroup(object):
+    """Pauli terms of a QubitOperator that are measured together.
+
+    Attributes:
+        terms(list): The Pauli strings of the group, as QubitOperator
+            terms dictionary keys.
+        coefficients(list): The coefficients of the terms.
+        weight(float): The sum of the absolute values of the coefficients,
+            which bounds the standard deviation of one measurement of the
+            group.
+        shots(int): The estimated number of measurements of the group.
+        measurement_basis(tuple): For groups of qubit-wise commuting terms,
+            the Pauli operator measured on each qubit, as a QubitOperator
+            term; None for groups of commuting terms.
+    """
+
+    def __init__(self, terms, coefficients, weight, shots,
+                 measurement_basis):
+        self.terms = terms
+        self.coefficients = coefficients
+        self.weight = weight
+        self.shots = shots
+        self.measurement_basis = measurement_basis
+
+    def operator(self):
+        """Return the sum of the terms of the group as a QubitOperator."""
+        operator = QubitOperator()
+        for term, coefficient in zip(self.terms, self.coefficients):
+            operator += QubitOperator(term, coefficient)
+        return operator
+
+    def __repr__(self):
+        return 'PauliTermGroup(n_terms={}, weight={}, shots={})'.format(
+            len(self.terms), self.weight, self.shots)
+
+
+def partition_pauli_terms(qubit_operator, grouping='qubit_wise',
+                          precision=1e-3):
+    """Partition the terms of a QubitOperator into groups measured together.
+
+    Terms are assigned greedily, in order of decreasing coefficient
+    magnitude, to the first group they are compatible with, by
+    commuting_term_groups, so that operators with 10 ** 5 terms are
+    partitioned in seconds.
+
+    Groups of qubit-wise commuting terms are measured by measuring each
+    qubit in the basis of the Pauli operator of the group on it. Groups
+    of commuting terms are fewer, but need entangling gates to be
+    measured.
+
+    Shots are allocated to the groups in proportion to their weights,
+    which minimizes the bound on the variance of the estimate of the
+    expectation value, sum_g weight_g ** 2 / shots_g, for a total number
+    of shots. The total is the smallest for which this bound is
+    precision ** 2.
+
+    The identity term is not measured and belongs to no group.
+
+    Args:
+        qubit_operator(QubitOperator): The operator to measure.
+        grouping(str): 'qubit_wise' for groups of qubit-wise commuting
+            terms, which act with the same Pauli operator on each qubit
+            they share, or 'commuting' for groups of commuting terms.
+        precision(float): The target standard deviation of the estimate of
+            the expectation value of the operator.
+
+    Returns:
+        groups(list): The PauliTermGroups, in order of creation: the first
+            group holds the largest term.
+
+    Raises:
+        TypeError: Input must be a QubitOperator.
+        ValueError: Invalid grouping or precision.
+    """
+    if not isinstance(qubit_operator, QubitOperator):
+        raise TypeError('Input must be a QubitOperator.')
+    if grouping not in ('qubit_wise', 'commuting'):
+        raise ValueError('Invalid grouping: {}.'.format(grouping))
+    if precision <= 0:
+        raise ValueError('precision must be positive.')
+
+    # The identity term commutes with all others, so leaving it out does
+    # not change the other groups.
+    members = [[term for term in group if term]
+               for group in commuting_term_groups(
+                   qubit_operator, qubit_wise=grouping == 'qubit_wise',
+                   sort_groups=False)]
+    members = [group_terms for group_terms in members if group_terms]
+    weights = [float(sum(abs(qubit_operator.terms[term])
+                         for term in group_terms))
+               for group_terms in members]
+    total_weight = sum(weights)
+
+    groups = []
+    for group_terms, weight in zip(members, weights):
+        measurement_basis = None
+        if grouping == 'qubit_wise':
+            measurement_basis = tuple(sorted(set(
+                pauli for term in group_terms for pauli in term)))
+        shots = int(numpy.ceil(weight * total_weight / precision ** 2))
+        groups.append(PauliTermGroup(
+            group_terms,
+            [qubit_operator.terms[term] for term in group_terms],
+            weight, shots, measurement_basis))
+    return groups
@@ -0,0 +1,148 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _pauli_term_grouping.py"""
+import os
+import unittest
+
+import numpy
+
+from openfermion.config import THIS_DIRECTORY
+from openfermion.hamiltonians import MolecularData
+from openfermion.measurements import PauliTermGroup, partition_pauli_terms
+from openfermion.ops import FermionOperator, QubitOperator
+from openfermion.transforms import jordan_wigner
+
+
+def commute(term_a, term_b):
+    actions_a = dict(term_a)
+    return not sum(1 for index, action in term_b
+                   if actions_a.get(index, action) != action) % 2
+
+
+def qubit_wise_commute(term_a, term_b):
+    actions_a = dict(term_a)
+    return all(actions_a.get(index, action) == action
+               for index, action in term_b)
+
+
+def first_fit_groups(qubit_operator, compatible):
+    # Reference partition, checking each term against each group.
+    terms = sorted((term for term in qubit_operator.terms if term),
+                   key=lambda term: (-abs(qubit_operator.terms[term]),
+                                     term))
+    groups = []
+    for term in terms:
+        for group in groups:
+            if all(compatible(term, other) for other in group):
+                group.append(term)
+                break
+        else:
+            groups.append([term])
+    return groups
+
+
+def random_qubit_operator(n_terms, n_qubits, seed):
+    random_state = numpy.random.RandomState(seed)
+    qubit_operator = QubitOperator()
+    for _ in range(n_terms):
+        actions = random_state.randint(4, size=n_qubits)
+        term = tuple((index, 'XYZ'[action - 1])
+                     for index, action in enumerate(actions) if action)
+        qubit_operator += QubitOperator(term, random_state.randn())
+    return qubit_operator
+
+
+class PartitionPauliTermsTest(unittest.TestCase):
+
+    def setUp(self):
+        filename = os.path.join(THIS_DIRECTORY, 'data',
+                                'H1-Li1_sto-3g_singlet_1.45')
+        molecule = MolecularData(filename=filename)
+        self.hamiltonian = jordan_wigner(
+            molecule.get_molecular_hamiltonian())
+
+    def assert_partition(self, groups, qubit_operator):
+        operator = QubitOperator((), qubit_operator.terms.get((), 0.))
+        for group in groups:
+            self.assertIsInstance(group, PauliTermGroup)
+            operator += group.operator()
+        self.assertTrue(operator == qubit_operator)
+        self.assertEqual(sum(len(group.terms) for group in groups),
+                         len([term for term in qubit_operator.terms
+                              if term]))
+
+    def test_qubit_wise(self):
+        groups = partition_pauli_terms(self.hamiltonian)
+        self.assert_partition(groups, self.hamiltonian)
+        for group in groups:
+            basis = dict(group.measurement_basis)
+            for term in group.terms:
+                for index, action in term:
+                    self.assertEqual(basis[index], action)
+
+    def test_commuting(self):
+        groups = partition_pauli_terms(self.hamiltonian, 'commuting')
+        self.assert_partition(groups, self.hamiltonian)
+        for group in groups:
+            self.assertIsNone(group.measurement_basis)
+            for term_a in group.terms:
+                for term_b in group.terms:
+                    self.assertTrue(commute(term_a, term_b))
+        self.assertLess(len(groups), len(
+            partition_pauli_terms(self.hamiltonian, 'qubit_wise')))
+
+    def test_matches_first_fit(self):
+        qubit_operator = random_qubit_operator(300, 6, seed=1)
+        for grouping, compatible in (('qubit_wise', qubit_wise_commute),
+                                     ('commuting', commute)):
+            groups = partition_pauli_terms(qubit_operator, grouping)
+            self.assertEqual([group.terms for group in groups],
+                             first_fit_groups(qubit_operator, compatible))
+
+    def test_many_groups(self):
+        # More groups than bits in the initial bitsets.
+        qubit_operator = random_qubit_operator(3000, 10, seed=2)
+        groups = partition_pauli_terms(qubit_operator)
+        self.assertGreater(len(groups), 1024)
+        self.assert_partition(groups, qubit_operator)
+        for group in groups:
+            for term_a in group.terms:
+                for term_b in group.terms:
+                    self.assertTrue(qubit_wise_commute(term_a, term_b))
+
+    def test_shots(self):
+        precision = 1e-2
+        groups = partition_pauli_terms(self.hamiltonian, precision=precision)
+        total_weight = sum(group.weight for group in groups)
+        self.assertAlmostEqual(total_weight, sum(
+            abs(coefficient) for term, coefficient
+            in self.hamiltonian.terms.items() if term))
+        # The bound on the variance of the estimate is precision ** 2.
+        variance = sum(group.weight ** 2 / group.shots for group in groups)
+        self.assertLessEqual(variance, precision ** 2)
+        self.assertGreater(variance, .99 * precision ** 2)
+        for group in groups:
+            self.assertAlmostEqual(
+                group.shots * precision ** 2 / total_weight, group.weight,
+                delta=precision ** 2 / total_weight)
+
+    def test_identity(self):
+        self.assertEqual(partition_pauli_terms(QubitOperator(())), [])
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            partition_pauli_terms(FermionOperator('0^ 0'))
+        with self.assertRaises(ValueError):
+            partition_pauli_terms(self.hamiltonian, grouping='general')
+        with self.assertRaises(ValueError):
+            partition_pauli_terms(self.hamiltonian, precision=0.)
@@ -14,7 +14,7 @@ from ._binary_polynomial import BinaryPolynomial
 from ._diagonal_coulomb_hamiltonian import DiagonalCoulombHamiltonian
 from ._polynomial_tensor import PolynomialTensor, general_basis_change
 from ._quadratic_hamiltonian import QuadraticHamiltonian
-from ._symbolic_operator import SymbolicOperator
+from ._symbolic_operator import SymbolicOperator, intern_factor, intern_term
 
 # Imports out of alphabetical order to avoid circular dependency.
 from ._binary_code import BinaryCode
@@ -12,6 +12,7 @@
 
 """FermionOperator stores a sum of products of fermionic ladder operators."""
 
+from openfermion._profiling import profiled
 from openfermion.ops import SymbolicOperator
 
 
@@ -85,6 +86,7 @@ def normal_ordered_term(term, coefficient):
     return ordered_term
 
 
+@profiled
 def normal_ordered(fermion_operator):
     """Compute and return the normal ordered form of a FermionOperator.
 
@@ -53,6 +53,12 @@ class FermionOperatorTest(unittest.TestCase):
         op = FermionOperator('4 3 2 1') + FermionOperator('3 2')
         self.assertTrue(op.is_normal_ordered())
 
+    def test_power_normal_ordered(self):
+        op = (FermionOperator('3^ 1', .5) + FermionOperator('1^ 3', -.3) +
+              FermionOperator('2 1^', 1.2j))
+        self.assertEqual(op.power(6, simplify=normal_ordered),
+                         normal_ordered(op ** 6))
+
     def test_normal_ordered_single_term(self):
         op = FermionOperator('4 3 2 1') + FermionOperator('3 2')
         self.assertTrue(op == normal_ordered(op))
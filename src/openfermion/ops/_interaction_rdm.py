@@ -11,7 +11,8 @@
 #   limitations under the License.
 
 """Class and functions to store reduced density matrices."""
-import copy
+import collections
+import itertools
 import numpy
 
 from openfermion.ops import (FermionOperator,
@@ -25,6 +26,146 @@ class InteractionRDMError(Exception):
     pass
 
 
+class _QubitExpectationMaps(object):
+    """Size-bounded least-recently-used cache of Pauli expectation maps.
+
+    A Pauli string on n_qubits is mapped to a pair of arrays holding flat
+    indices into the vector (1, one_body_tensor, two_body_tensor) and the
+    coefficients of the corresponding elements.
+
+    Attributes:
+        max_size(int): The maximum number of maps kept in the cache.
+    """
+
+    def __init__(self, max_size=65536):
+        self.max_size = max_size
+        self._maps = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._maps)
+
+    def clear(self):
+        """Remove all maps from the cache."""
+        self._maps.clear()
+
+    def get(self, qubit_term, n_qubits):
+        """Return the map of a Pauli string, computing it if needed."""
+        key = (qubit_term, n_qubits)
+        row = self._maps.pop(key, None)
+        if row is None:
+            row = _qubit_term_rdm_indices(qubit_term, n_qubits)
+        self._maps[key] = row
+        while len(self._maps) > self.max_size:
+            self._maps.popitem(last=False)
+        return row
+
+
+def _majorana_product_sign(left_mask, right_mask):
+    """Return the sign from multiplying two ordered Majorana monomials.
+
+    The monomials are given as bitmasks of the Majorana operators they
+    contain; the sign is that of the permutation bringing the product into
+    increasing order.
+    """
+    swaps = 0
+    while right_mask:
+        lowest = right_mask & -right_mask
+        swaps += bin(left_mask & ~((lowest << 1) - 1)).count('1')
+        right_mask ^= lowest
+    return -1 if swaps % 2 else 1
+
+
+def _qubit_term_majorana_form(qubit_term):
+    r"""Return a Pauli string as a phase times an ordered Majorana monomial.
+
+    With the Majorana operators c_{2j} = a^\dagger_j + a_j and
+    c_{2j + 1} = i a^\dagger_j - i a_j, the Jordan-Wigner transform maps
+
+        X_j -> (-i)^j c_0 c_1 ... c_{2j - 1} c_{2j},
+        Y_j -> (-i)^j c_0 c_1 ... c_{2j - 1} c_{2j + 1},
+        Z_j -> -i c_{2j} c_{2j + 1}.
+
+    Returns:
+        phase(complex): The phase of the monomial.
+        modes(list): The Majorana operators of the monomial, in order.
+    """
+    phase = 1.
+    mask = 0
+    for index, action in qubit_term:
+        if action == 'Z':
+            factor_phase = -1.j
+            factor_mask = 3 << (2 * index)
+        else:
+            factor_phase = (-1.j) ** index
+            factor_mask = ((1 << (2 * index)) - 1) | (
+                1 << (2 * index + (action == 'Y')))
+        phase *= factor_phase * _majorana_product_sign(mask, factor_mask)
+        mask ^= factor_mask
+    modes = [mode for mode in range(mask.bit_length()) if mask >> mode & 1]
+    return phase, modes
+
+
+def _qubit_term_rdm_indices(qubit_term, n_qubits):
+    """Return the RDM elements whose combination gives a Pauli expectation.
+
+    Args:
+        qubit_term(tuple): A Pauli string, as a key of QubitOperator.terms.
+        n_qubits(int): The number of qubits of the RDM.
+
+    Returns:
+        indices(ndarray): Flat indices into the vector
+            (1, one_body_tensor, two_body_tensor).
+        coefficients(ndarray): The coefficients of these elements.
+
+    Raises:
+        InteractionRDMError: Observable not contained in 1-RDM or 2-RDM.
+    """
+    phase, modes = _qubit_term_majorana_form(qubit_term)
+    if len(modes) > 4:
+        raise InteractionRDMError('Observable not contained '
+                                  'in 1-RDM or 2-RDM.')
+
+    # Expand the Majorana monomial in ladder operators and normal order it;
+    # terms with an odd number of ladder operators have zero expectation.
+    fermion_operator = FermionOperator()
+    if len(modes) % 2 == 0:
+        ladder_factors = [((1., (mode // 2, 1)), (1., (mode // 2, 0)))
+                          if mode % 2 == 0 else
+                          ((1.j, (mode // 2, 1)), (-1.j, (mode // 2, 0)))
+                          for mode in modes]
+        for factors in itertools.product(*ladder_factors):
+            coefficient = phase
+            for factor_coefficient, _ in factors:
+                coefficient *= factor_coefficient
+            fermion_operator += FermionOperator(
+                tuple(ladder for _, ladder in factors), coefficient)
+        fermion_operator = normal_ordered(fermion_operator)
+
+    indices = []
+    coefficients = []
+    for fermion_term, coefficient in fermion_operator.terms.items():
+        if not FermionOperator(fermion_term).is_molecular_term():
+            continue
+        index = 0
+        if fermion_term:
+            if max(operator[0] for operator in fermion_term) >= n_qubits:
+                raise InteractionRDMError('Observable acts on more qubits '
+                                          'than the RDM.')
+            index = 1 + (len(fermion_term) == 4) * n_qubits ** 2
+            flat_index = 0
+            for operator in fermion_term:
+                flat_index = flat_index * n_qubits + operator[0]
+            index += flat_index
+        indices.append(index)
+        coefficients.append(coefficient)
+    return (numpy.array(indices, dtype=int),
+            numpy.array(coefficients, dtype=complex))
+
+
+# The maps shared by all InteractionRDMs.
+_QUBIT_EXPECTATION_MAPS = _QubitExpectationMaps()
+
+
 class InteractionRDM(PolynomialTensor):
     """Class for storing 1- and 2-body reduced density matrices.
 
@@ -60,11 +201,10 @@ class InteractionRDM(PolynomialTensor):
             InteractionRDMError: Invalid operator provided.
         """
         if isinstance(operator, QubitOperator):
-            expectation_op = self.get_qubit_expectations(operator)
-            expectation = 0.0
-            for qubit_term in operator.terms:
-                expectation += (operator.terms[qubit_term] *
-                                expectation_op.terms[qubit_term])
+            qubit_terms = list(operator.terms)
+            expectation = numpy.dot(
+                [operator.terms[qubit_term] for qubit_term in qubit_terms],
+                self._get_qubit_term_expectations(qubit_terms))
         elif isinstance(operator, InteractionOperator):
             expectation = operator.constant
             expectation += numpy.sum(self.one_body_tensor *
@@ -78,6 +218,11 @@ class InteractionRDM(PolynomialTensor):
     def get_qubit_expectations(self, qubit_operator):
         """Return expectations of QubitOperator in new QubitOperator.
 
+        The expectation of each Pauli string is a fixed linear combination
+        of RDM elements. These combinations are cached for each number of
+        qubits, so that evaluating them on an RDM is a single gather of RDM
+        elements followed by a weighted sum.
+
         Args:
             qubit_operator: QubitOperator instance to be evaluated on
                 this InteractionRDM.
@@ -89,39 +234,32 @@ class InteractionRDM(PolynomialTensor):
         Raises:
             InteractionRDMError: Observable not contained in 1-RDM or 2-RDM.
         """
-        from openfermion.transforms import reverse_jordan_wigner
-        qubit_operator_expectations = copy.deepcopy(qubit_operator)
-        for qubit_term in qubit_operator_expectations.terms:
-            expectation = 0.
-
-            # Map qubits back to fermions.
-            reversed_fermion_operators = reverse_jordan_wigner(
-                QubitOperator(qubit_term))
-            reversed_fermion_operators = normal_ordered(
-                reversed_fermion_operators)
-
-            # Loop through fermion terms.
-            for fermion_term in reversed_fermion_operators.terms:
-                coefficient = reversed_fermion_operators.terms[fermion_term]
-
-                # Handle molecular term.
-                if FermionOperator(fermion_term).is_molecular_term():
-                    if not fermion_term:
-                        expectation += coefficient
-                    else:
-                        indices = [operator[0] for operator in fermion_term]
-                        if len(indices) == 2:
-                            # One-body term
-                            indices = tuple(zip(indices, (1, 0)))
-                        else:
-                            # Two-body term
-                            indices = tuple(zip(indices, (1, 1, 0, 0)))
-                        rdm_element = self[indices]
-                        expectation += rdm_element * coefficient
-
-                # Handle non-molecular terms.
-                elif len(fermion_term) > 4:
-                    raise InteractionRDMError('Observable not contained '
-                                              'in 1-RDM or 2-RDM.')
-            qubit_operator_expectations.terms[qubit_term] = expectation
+        qubit_terms = list(qubit_operator.terms)
+        qubit_operator_expectations = QubitOperator()
+        qubit_operator_expectations.terms = dict(
+            zip(qubit_terms, self._get_qubit_term_expectations(qubit_terms)))
         return qubit_operator_expectations
+
+    def _get_qubit_term_expectations(self, qubit_terms):
+        """Return an array with the expectations of a list of Pauli strings.
+        """
+        rows = [_QUBIT_EXPECTATION_MAPS.get(qubit_term, self.n_qubits)
+                for qubit_term in qubit_terms]
+
+        indices = numpy.concatenate([numpy.zeros(0, dtype=int)] +
+                                    [row[0] for row in rows])
+        coefficients = numpy.concatenate([numpy.zeros(0, dtype=complex)] +
+                                         [row[1] for row in rows])
+        term_ids = numpy.repeat(numpy.arange(len(rows)),
+                                [row[0].shape[0] for row in rows])
+
+        rdm_vector = numpy.concatenate(([1.],
+                                        numpy.ravel(self.one_body_tensor),
+                                        numpy.ravel(self.two_body_tensor)))
+        products = coefficients * rdm_vector[indices]
+        expectations = numpy.bincount(term_ids, products.real,
+                                      minlength=len(rows))
+        if numpy.any(products.imag):
+            expectations = expectations + 1.j * numpy.bincount(
+                term_ids, products.imag, minlength=len(rows))
+        return expectations
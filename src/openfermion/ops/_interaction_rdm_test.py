@@ -11,14 +11,16 @@
 #   limitations under the License.
 
 """Tests for interaction_rdms.py."""
+import itertools
 import os
 import unittest
 
 from openfermion.config import THIS_DIRECTORY, EQ_TOLERANCE
 from openfermion.hamiltonians import MolecularData
-from openfermion.ops import QubitOperator
-from openfermion.ops._interaction_rdm import InteractionRDMError
-from openfermion.transforms import jordan_wigner
+from openfermion.ops import FermionOperator, QubitOperator, normal_ordered
+from openfermion.ops._interaction_rdm import (InteractionRDMError,
+                                              _QubitExpectationMaps)
+from openfermion.transforms import jordan_wigner, reverse_jordan_wigner
 
 
 class InteractionRDMTest(unittest.TestCase):
@@ -47,6 +49,50 @@ class InteractionRDMTest(unittest.TestCase):
                             qubit_expectations.terms[qubit_term])
         self.assertLess(abs(test_energy - self.cisd_energy), EQ_TOLERANCE)
 
+    def test_get_qubit_expectations_all_pauli_strings(self):
+        # Compare with the expectations obtained by mapping each Pauli
+        # string back to fermions.
+        for actions in itertools.product('IXYZ', repeat=4):
+            qubit_term = tuple((index, action) for index, action in
+                               enumerate(actions) if action != 'I')
+            fermion_operator = normal_ordered(
+                reverse_jordan_wigner(QubitOperator(qubit_term), 4))
+
+            expected = 0.
+            too_long = False
+            for fermion_term, coefficient in fermion_operator.terms.items():
+                if FermionOperator(fermion_term).is_molecular_term():
+                    if fermion_term:
+                        expected += coefficient * self.rdm[fermion_term]
+                    else:
+                        expected += coefficient
+                elif len(fermion_term) > 4:
+                    too_long = True
+
+            if too_long:
+                with self.assertRaises(InteractionRDMError):
+                    self.rdm.get_qubit_expectations(
+                        QubitOperator(qubit_term))
+            else:
+                expectations = self.rdm.get_qubit_expectations(
+                    QubitOperator(qubit_term))
+                self.assertAlmostEqual(expectations.terms[qubit_term],
+                                       expected)
+
+    def test_qubit_expectation_maps_bounded(self):
+        maps = _QubitExpectationMaps(max_size=2)
+        for qubit_term in (((0, 'Z'),), ((1, 'Z'),), ((2, 'Z'),)):
+            maps.get(qubit_term, 4)
+        self.assertEqual(len(maps), 2)
+        indices, coefficients = maps.get(((0, 'Z'),), 4)
+        self.assertEqual(len(indices), len(coefficients))
+        maps.clear()
+        self.assertEqual(len(maps), 0)
+
+    def test_get_qubit_expectations_too_many_qubits(self):
+        with self.assertRaises(InteractionRDMError):
+            self.rdm.get_qubit_expectations(QubitOperator('Z6'))
+
     def test_get_qubit_expectations_nonmolecular_term(self):
         with self.assertRaises(InteractionRDMError):
             self.rdm.get_qubit_expectations(QubitOperator('X1 X2 X3 X4 Y6'))
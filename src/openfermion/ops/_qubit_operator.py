@@ -12,7 +12,7 @@
 
 """QubitOperator stores a sum of Pauli operators acting on qubits."""
 from openfermion.config import EQ_TOLERANCE
-from openfermion.ops import SymbolicOperator
+from openfermion.ops import SymbolicOperator, intern_factor
 
 
 # Define products of all Pauli operators for symbolic multiplication.
@@ -100,17 +100,19 @@ class QubitOperator(SymbolicOperator):
         """
         # Handle scalars.
         if isinstance(multiplier, (int, float, complex)):
-            for term in self.terms:
-                self.terms[term] *= multiplier
+            terms = self._terms
+            for term in terms:
+                terms[term] *= multiplier
+            self._forget_summaries()
             return self
 
         # Handle QubitOperator.
         elif isinstance(multiplier, QubitOperator):
             result_terms = dict()
-            for left_term in self.terms:
-                for right_term in multiplier.terms:
-                    new_coefficient = (self.terms[left_term] *
-                                       multiplier.terms[right_term])
+            for left_term, left_coefficient in self._terms.items():
+                for right_term, right_coefficient in (
+                        multiplier._terms.items()):
+                    new_coefficient = left_coefficient * right_coefficient
 
                     # Loop through local operators and create new sorted list
                     # of representing the product local operator:
@@ -135,17 +137,20 @@ class QubitOperator(SymbolicOperator):
 
                             # Add new term.
                             if loc_op != 'I':
-                                product_operators += [(left_qubit, loc_op)]
+                                product_operators.append(
+                                    intern_factor((left_qubit, loc_op)))
                                 new_coefficient *= scalar
                             # Note if loc_op == 'I', then scalar == 1.0
 
                         # If left_qubit > right_qubit, add right_loc_op; else,
                         # add left_loc_op.
                         elif left_qubit > right_qubit:
-                            product_operators += [(right_qubit, right_loc_op)]
+                            product_operators.append(
+                                right_term[right_operator_index])
                             right_operator_index += 1
                         else:
-                            product_operators += [(left_qubit, left_loc_op)]
+                            product_operators.append(
+                                left_term[left_operator_index])
                             left_operator_index += 1
 
                     # Finish the remaining operators:
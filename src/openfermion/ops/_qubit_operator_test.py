@@ -130,6 +130,36 @@ def test_mul_multiple_terms():
     assert res == correct
 
 
+def test_pow_uses_pauli_algebra():
+    op = QubitOperator('X0 Y1', 0.5) + QubitOperator('Z1', 1.2j)
+    product = QubitOperator(())
+    for exponent in range(1, 9):
+        product *= op
+        assert op ** exponent == product
+        assert all(len(set(index for index, _ in term)) == len(term)
+                   for term in (op ** exponent).terms)
+
+
+def test_pow_commuting_terms():
+    op = QubitOperator()
+    for index in range(5):
+        op += QubitOperator(((index, 'Z'), (index + 1, 'Z')), 0.1 * index)
+        op += QubitOperator(((index, 'Z'),), 0.3j)
+    product = QubitOperator(())
+    for exponent in range(1, 8):
+        product *= op
+        assert op ** exponent == product
+
+
+def test_mul_shares_factors():
+    op = QubitOperator('X0 Y1 Z2', 0.5) * QubitOperator('Y0 Y1 X3', 2.)
+    term, = op.terms
+    assert term == ((0, 'Z'), (2, 'Z'), (3, 'X'))
+    reference_term, = QubitOperator('Z0 Z2 X3').terms
+    assert all(factor is reference_factor
+               for factor, reference_factor in zip(term, reference_term))
+
+
 def test_renormalize_error():
     op = QubitOperator()
     with pytest.raises(ZeroDivisionError):
@@ -12,9 +12,12 @@
 
 """SymbolicOperator is the base class for FermionOperator and QubitOperator"""
 import copy
-import re
+import math
+import numbers
 import warnings
 
+import numpy
+
 from openfermion.config import EQ_TOLERANCE
 
 
@@ -22,6 +25,208 @@ class SymbolicOperatorError(Exception):
     pass
 
 
+# Table of factor tuples shared by the terms of all operators. Tuples cannot
+# be weakly referenced, so the table holds its factors; it grows only with
+# the number of distinct (index, action) pairs ever used, which is small
+# next to the number of factors in a large operator.
+_INTERNED_FACTORS = {}
+
+
+# Coefficients are rounded to this many decimal places, the resolution of
+# EQ_TOLERANCE, before they enter an operator fingerprint.
+_FINGERPRINT_DECIMALS = int(round(-math.log10(EQ_TOLERANCE)))
+_FINGERPRINT_MASK = (1 << 64) - 1
+
+
+def _term_fingerprint(term, coefficient):
+    """Return the contribution of one term to an operator fingerprint."""
+    if abs(coefficient) < EQ_TOLERANCE:
+        return 0
+    coefficient = complex(coefficient)
+    return hash((term,
+                 round(coefficient.real, _FINGERPRINT_DECIMALS),
+                 round(coefficient.imag, _FINGERPRINT_DECIMALS)))
+
+
+def intern_factor(factor):
+    """Return the shared instance of a factor.
+
+    Terms built from interned factors hold references to one tuple per
+    distinct (index, action) pair rather than allocating a tuple for every
+    factor of every term.
+
+    New factors are stored in canonical form, with a Python int index and
+    a Python int action for integer actions, so that e.g. (17, True) and
+    (numpy.int64(17), 1) are both interned as (17, 1).
+
+    Args:
+        factor (tuple): A factor of the form (index, action).
+
+    Returns:
+        The interned tuple equal to factor.
+    """
+    interned = _INTERNED_FACTORS.get(factor)
+    if interned is None:
+        index, action = factor
+        if isinstance(action, numbers.Integral):
+            action = int(action)
+        interned = (int(index), action)
+        interned = _INTERNED_FACTORS.setdefault(interned, interned)
+    return interned
+
+
+def intern_term(term):
+    """Return a term whose factors are the shared instances.
+
+    Args:
+        term (tuple): A tuple of factors.
+
+    Returns:
+        A tuple equal to term made of interned factors.
+    """
+    return tuple([_INTERNED_FACTORS.get(factor) or intern_factor(factor)
+                  for factor in term])
+
+
+class SymbolicOperatorBuilder(object):
+    """Accumulates terms of a SymbolicOperator into a single dictionary.
+
+    Building an operator with repeated `operator += Operator(term, coeff)`
+    allocates and validates a temporary operator for every term. A builder
+    instead adds raw (term, coefficient) pairs straight into the terms
+    dictionary of the operator being built. Terms whose coefficients cancel
+    are removed once, when the operator is built, rather than after every
+    addition.
+
+    Builders are usually obtained from SymbolicOperator.builder and used as
+    a context manager; leaving the block builds the operator:
+
+    .. code-block:: python
+
+        with FermionOperator.builder() as builder:
+            builder.add(((2, 1), (1, 0)), 0.5)
+            builder.add('1^ 2', 0.5)
+        operator = builder.operator
+
+    Attributes:
+        operator (SymbolicOperator): The operator being built.
+        compress (bool): Whether to compress the operator when it is built.
+        abs_tol (float): Tolerance below which terms are dropped when the
+            operator is built.
+    """
+
+    def __init__(self, operator_class, compress=False, abs_tol=EQ_TOLERANCE):
+        """
+        Args:
+            operator_class (type): The subclass of SymbolicOperator to build.
+            compress (bool, optional): If True, call compress on the
+                operator when it is built, which also removes small real and
+                imaginary parts of coefficients. Default is False.
+            abs_tol (float, optional): Tolerance used to drop terms when the
+                operator is built.
+        """
+        self.operator = operator_class()
+        self.compress = compress
+        self.abs_tol = abs_tol
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.build()
+
+    def add(self, term, coefficient=1.):
+        """Add coefficient * term to the operator.
+
+        Args:
+            term (tuple, list or str): The term, in any format accepted by
+                the operator constructor other than a long string.
+            coefficient (int, float or complex): The coefficient of the term.
+
+        Raises:
+            ValueError: Invalid term or coefficient.
+        """
+        if not isinstance(coefficient, (int, float, complex)):
+            raise ValueError('Coefficient must be a numeric type.')
+        term = self._parse(term)
+        terms = self.operator.terms
+        terms[term] = terms.get(term, 0.) + coefficient
+
+    def add_hermitian_pair(self, term, coefficient=1.):
+        """Add coefficient * term plus its Hermitian conjugate.
+
+        The term is a product of ladder operators, as in FermionOperator:
+        its conjugate is the reversed product with raising and lowering
+        operators exchanged.
+
+        Args:
+            term (tuple, list or str): The term, in any format accepted by
+                the operator constructor other than a long string.
+            coefficient (int, float or complex): The coefficient of the term.
+
+        Raises:
+            TypeError: The operator is not made of ladder operators.
+            ValueError: Invalid term or coefficient.
+        """
+        if self.operator.actions != (1, 0):
+            raise TypeError('Hermitian pairs can only be added to operators '
+                            'of ladder operators.')
+        term = self._parse(term)
+        self.add(term, coefficient)
+        self.add(tuple((index, 1 - action)
+                       for index, action in reversed(term)),
+                 coefficient.conjugate())
+
+    def _parse(self, term):
+        """Return a term given in a format of the operator constructor.
+
+        The factors of the term are interned (see intern_factor), as the
+        builder is used to build large operators.
+        """
+        if isinstance(term, (tuple, list)):
+            return intern_term(self.operator._parse_sequence(term))
+        elif isinstance(term, str):
+            return self.operator._parse_string(term)
+        raise ValueError('term specified incorrectly.')
+
+    def add_operator(self, operator, multiplier=1.):
+        """Add multiplier * operator to the operator.
+
+        Args:
+            operator (SymbolicOperator): An operator of the type being built.
+            multiplier (int, float or complex): Scalar by which to multiply
+                the terms of operator.
+
+        Raises:
+            TypeError: Cannot add invalid type.
+        """
+        if not isinstance(operator, type(self.operator)):
+            raise TypeError('Cannot add invalid type to {}.'.format(
+                            type(self.operator)))
+        terms = self.operator.terms
+        for term, coefficient in operator.terms.items():
+            terms[term] = terms.get(term, 0.) + multiplier * coefficient
+
+    def build(self):
+        """Remove cancelled terms and return the operator.
+
+        Returns:
+            operator (SymbolicOperator)
+        """
+        # Coefficients were changed in place, so summaries cached while
+        # building are stale.
+        self.operator._forget_summaries()
+        if self.compress:
+            self.operator.compress(self.abs_tol)
+        else:
+            terms = self.operator.terms
+            for term in [term for term, coefficient in terms.items()
+                         if abs(coefficient) < self.abs_tol]:
+                del terms[term]
+        return self.operator
+
+
 class SymbolicOperator(object):
     """Base class for FermionOperator and QubitOperator.
 
@@ -61,6 +266,11 @@ class SymbolicOperator(object):
             represented by a tuple of the form (`index`, `action`), and
             these tuples are collected into a larger tuple which represents
             the term as the product of its factors.
+            Terms added to or removed from the dictionary in place after
+            reading it with `operator.terms` are noticed by the cached
+            fingerprint of the operator, but coefficients of existing terms
+            changed in place are not: assign the dictionary back to
+            `operator.terms` after changing them.
     """
     actions = ()
     action_strings = ()
@@ -68,12 +278,18 @@ class SymbolicOperator(object):
     different_indices_commute = False
     __hash__ = None
 
+    # Cached summaries of the terms, computed on first use (see
+    # fingerprint), and the number of terms when they were computed.
+    _fingerprint = None
+    _one_norm = None
+    _n_summarized_terms = None
+
     def __init__(self, term=None, coefficient=1.):
         if not isinstance(coefficient, (int, float, complex)):
             raise ValueError('Coefficient must be a numeric type.')
 
         # Initialize the terms dictionary
-        self.terms = {}
+        self._terms = {}
 
         # Detect if the input is the string representation of a sum of terms;
         # if so, initialization needs to be handled differently
@@ -97,7 +313,45 @@ class SymbolicOperator(object):
             raise ValueError('term specified incorrectly.')
 
         # Add the term to the dictionary
-        self.terms[term] = coefficient
+        self._terms[term] = coefficient
+
+    @property
+    def terms(self):
+        return self._terms
+
+    @terms.setter
+    def terms(self, terms):
+        self._terms = terms
+        self._forget_summaries()
+
+    def __deepcopy__(self, memo):
+        # Terms are tuples of immutable factors and coefficients are
+        # numbers, so a copy of the dictionary is already a deep copy. The
+        # cached fingerprint and norm remain valid for the copy.
+        duplicate = self.__class__.__new__(self.__class__)
+        memo[id(self)] = duplicate
+        for name, value in self.__dict__.items():
+            if name == '_terms':
+                duplicate.__dict__[name] = dict(value)
+            else:
+                duplicate.__dict__[name] = copy.deepcopy(value, memo)
+        return duplicate
+
+    def __getstate__(self):
+        # Fingerprints use the hashes of terms, which can differ between
+        # processes, so the cached summaries are not pickled.
+        state = dict(self.__dict__)
+        for name in ('_fingerprint', '_one_norm', '_n_summarized_terms'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        # Operators pickled before terms became a property store the
+        # dictionary under its public name.
+        state = dict(state)
+        terms = state.pop('terms') if 'terms' in state else state.pop('_terms')
+        self.__dict__.update(state)
+        self.terms = terms
 
     def _long_string_init(self, long_string, coefficient):
         """
@@ -105,15 +359,29 @@ class SymbolicOperator(object):
 
         e.g. For FermionOperator:
             '1.5 [2^ 3] + 1.4 [3^ 0]'
-        """
 
-        pattern = '(.*?)\[(.*?)\]'  # regex for a term
-        for match in re.findall(pattern, long_string, flags=re.DOTALL):
+        Terms are located with str.find rather than a regular expression and
+        parsed factors are cached, so strings with millions of terms over a
+        modest number of distinct factors parse quickly.
+        """
+        factor_cache = {}
+        position = 0
+        while True:
+            # Find the next term, a coefficient followed by '[...]'
+            term_start = long_string.find('[', position)
+            if term_start == -1:
+                break
+            term_end = long_string.find(']', term_start + 1)
+            if term_end == -1:
+                break
+            coef_string = ''.join(
+                long_string[position:term_start].split())
+            term_string = long_string[term_start + 1:term_end]
+            position = term_end + 1
 
             # Determine the coefficient for this term
-            coef_string = re.sub(r"\s+", "", match[0])
-            if coef_string and coef_string[0] is '+':
-                coef_string = coef_string[1:].strip()
+            if coef_string and coef_string[0] == '+':
+                coef_string = coef_string[1:]
             if coef_string == '':
                 coef = 1.0
             elif coef_string == '-':
@@ -133,11 +401,11 @@ class SymbolicOperator(object):
             coef *= coefficient
 
             # Parse the term and add it to the dict
-            term = self._parse_string(match[1])
-            if term not in self.terms:
-                self.terms[term] = coef
-            else:
-                self.terms[term] += coef
+            term = self._parse_string(term_string, factor_cache)
+            terms = self._terms
+            if term in terms:
+                coef += terms[term]
+            terms[term] = coef
 
     def _validate_factor(self, factor):
         """Check that a factor of a term is valid."""
@@ -182,55 +450,29 @@ class SymbolicOperator(object):
             # Return a tuple
             return tuple(term)
 
-    def _parse_string(self, term):
+    def _parse_string(self, term, factor_cache=None):
         """Parse a term given as a string.
 
         e.g. For FermionOperator:
             "2^ 3" -> ((2, 1), (3, 0))
+
+        Args:
+            term (str): The string representation of the term.
+            factor_cache (dict): Optional dictionary mapping factor strings
+                to parsed factors, shared between calls that parse many
+                terms.
         """
-        factors = term.split()
+        if factor_cache is None:
+            factor_cache = {}
 
         # Convert the string representations of the factors to tuples
         processed_term = []
-        for factor in factors:
-            # Get the index and action string
-            if self.action_before_index:
-                # The index is at the end of the string; find where it starts.
-                if not factor[-1].isdigit():
-                    raise ValueError('Invalid factor {}.'.format(factor))
-                index_start = len(factor) - 1
-                while index_start > 0 and factor[index_start - 1].isdigit():
-                    index_start -= 1
-
-                index = int(factor[index_start:])
-                action_string = factor[:index_start]
-            else:
-                # The index is at the beginning of the string; find where
-                # it ends
-                if not factor[0].isdigit():
-                    raise ValueError('Invalid factor {}.'.format(factor))
-                index_end = 1
-                while (index_end <= len(factor) - 1 and
-                        factor[index_end].isdigit()):
-                    index_end += 1
-
-                index = int(factor[:index_end])
-                action_string = factor[index_end:]
-            # Check that the index is valid
-            if index < 0:
-                raise ValueError('Invalid index in factor {}. '
-                                 'The index should be a non-negative '
-                                 'integer.'.format(factor))
-            # Convert the action string to an action
-            if action_string in self.action_strings:
-                action = self.actions[self.action_strings.index(action_string)]
-            else:
-                raise ValueError('Invalid action in factor {}. '
-                                 'Valid actions are: {}'.format(
-                                     factor, self.action_strings))
-
-            # Add the factor to the list as a tuple
-            processed_term.append((index, action))
+        for factor_string in term.split():
+            factor = factor_cache.get(factor_string)
+            if factor is None:
+                factor = self._parse_factor_string(factor_string)
+                factor_cache[factor_string] = factor
+            processed_term.append(factor)
 
         # If factors with different indices commute, sort the factors
         # by index
@@ -241,6 +483,164 @@ class SymbolicOperator(object):
         # Return a tuple
         return tuple(processed_term)
 
+    def _parse_factor_string(self, factor):
+        """Parse a single factor given as a string.
+
+        e.g. For QubitOperator:
+            "X12" -> (12, 'X')
+        """
+        # Get the index and action string
+        if self.action_before_index:
+            # The index is at the end of the string; find where it starts.
+            if not factor[-1].isdigit():
+                raise ValueError('Invalid factor {}.'.format(factor))
+            index_start = len(factor) - 1
+            while index_start > 0 and factor[index_start - 1].isdigit():
+                index_start -= 1
+
+            index = int(factor[index_start:])
+            action_string = factor[:index_start]
+        else:
+            # The index is at the beginning of the string; find where
+            # it ends
+            if not factor[0].isdigit():
+                raise ValueError('Invalid factor {}.'.format(factor))
+            index_end = 1
+            while (index_end <= len(factor) - 1 and
+                    factor[index_end].isdigit()):
+                index_end += 1
+
+            index = int(factor[:index_end])
+            action_string = factor[index_end:]
+        # Check that the index is valid
+        if index < 0:
+            raise ValueError('Invalid index in factor {}. '
+                             'The index should be a non-negative '
+                             'integer.'.format(factor))
+        # Convert the action string to an action
+        if action_string in self.action_strings:
+            action = self.actions[self.action_strings.index(action_string)]
+        else:
+            raise ValueError('Invalid action in factor {}. '
+                             'Valid actions are: {}'.format(
+                                 factor, self.action_strings))
+
+        return intern_factor((index, action))
+
+    @classmethod
+    def from_arrays(cls, index_array, action_array, term_lengths,
+                    coefficients):
+        """Build an operator from flat arrays describing its terms.
+
+        The factors of all terms are concatenated, in order, into
+        index_array and action_array, and term_lengths gives the number of
+        factors in each term. The arrays are validated in bulk and the
+        terms dictionary is filled in a single pass. As with the long
+        string constructor, coefficients of repeated terms are summed.
+
+        e.g. For FermionOperator, the arrays
+            index_array = [2, 3, 1], action_array = [1, 0, 1],
+            term_lengths = [2, 1], coefficients = [0.5, -1.]
+        give 0.5 [2^ 3] - 1. [1^].
+
+        Args:
+            index_array (ndarray or list): The index of every factor.
+                These must be non-negative integers.
+            action_array (ndarray or list): The action of every factor,
+                taken from the actions of the class.
+            term_lengths (ndarray or list): The number of factors in each
+                term.
+            coefficients (ndarray or list): The coefficient of each term.
+
+        Returns:
+            operator (SymbolicOperator)
+
+        Raises:
+            ValueError: Invalid index, action or coefficient, or array
+                lengths that do not match.
+        """
+        index_array = numpy.asarray(index_array)
+        action_array = numpy.asarray(action_array)
+        term_lengths = numpy.asarray(term_lengths)
+        coefficients = numpy.asarray(coefficients)
+
+        # Validate the shapes of the arrays.
+        if index_array.ndim != 1 or action_array.shape != index_array.shape:
+            raise ValueError('index_array and action_array must be '
+                             'one-dimensional arrays of the same length.')
+        if term_lengths.ndim != 1 or coefficients.shape != term_lengths.shape:
+            raise ValueError('term_lengths and coefficients must be '
+                             'one-dimensional arrays of the same length.')
+        if term_lengths.size and (
+                not numpy.issubdtype(term_lengths.dtype, numpy.integer) or
+                term_lengths.min() < 0):
+            raise ValueError('Term lengths must be non-negative integers.')
+        if numpy.sum(term_lengths) != index_array.size:
+            raise ValueError('The term lengths sum to {} but {} factors '
+                             'were given.'.format(numpy.sum(term_lengths),
+                                                  index_array.size))
+
+        # Validate indices, actions and coefficients.
+        if index_array.size:
+            if not numpy.issubdtype(index_array.dtype, numpy.integer):
+                raise ValueError('Invalid index array of type {}. The '
+                                 'indices should be non-negative '
+                                 'integers.'.format(index_array.dtype))
+            if index_array.min() < 0:
+                raise ValueError('Invalid index {}. The index should be a '
+                                 'non-negative integer.'.format(
+                                     index_array.min()))
+        if coefficients.size and not numpy.issubdtype(coefficients.dtype,
+                                                      numpy.number):
+            raise ValueError('Coefficient must be a numeric type.')
+        distinct_actions, action_codes = numpy.unique(action_array,
+                                                      return_inverse=True)
+        actions = []
+        for action in distinct_actions.tolist():
+            if action not in cls.actions:
+                raise ValueError('Invalid action {}. Valid actions '
+                                 'are: {}'.format(action, cls.actions))
+            actions.append(cls.actions[cls.actions.index(action)])
+
+        # If factors with different indices commute, sort the factors of
+        # each term by index. The sort is stable, matching _parse_sequence.
+        if cls.different_indices_commute and index_array.size:
+            term_ids = numpy.repeat(numpy.arange(term_lengths.size),
+                                    term_lengths)
+            order = numpy.lexsort((index_array, term_ids))
+            index_array = index_array[order]
+            action_codes = action_codes[order]
+
+        factors = [intern_factor(factor) for factor in zip(
+            index_array.tolist(),
+            [actions[code] for code in action_codes.tolist()])]
+        operator = cls()
+        start = 0
+        for length, coefficient in zip(term_lengths.tolist(),
+                                       coefficients.tolist()):
+            term = tuple(factors[start:start + length])
+            start += length
+            terms = operator.terms
+            if term in terms:
+                coefficient += terms[term]
+            terms[term] = coefficient
+        return operator
+
+    @classmethod
+    def builder(cls, compress=False, abs_tol=EQ_TOLERANCE):
+        """Return a builder which accumulates terms into a new operator.
+
+        Args:
+            compress (bool, optional): If True, compress the operator when it
+                is built. Default is False.
+            abs_tol (float, optional): Tolerance below which terms are
+                dropped when the operator is built.
+
+        Returns:
+            builder (SymbolicOperatorBuilder)
+        """
+        return SymbolicOperatorBuilder(cls, compress, abs_tol)
+
     @classmethod
     def zero(cls):
         """
@@ -263,11 +663,11 @@ class SymbolicOperator(object):
 
     def __str__(self):
         """Return an easy-to-read string representation."""
-        if not self.terms:
+        if not self._terms:
             return '0'
         string_rep = ''
-        for term in self.terms:
-            tmp_string = '{} ['.format(self.terms[term])
+        for term, coefficient in self._terms.items():
+            tmp_string = '{} ['.format(coefficient)
             for factor in term:
                 index, action = factor
                 action_string = self.action_strings[self.actions.index(action)]
@@ -294,17 +694,19 @@ class SymbolicOperator(object):
         """
         # Handle scalars.
         if isinstance(multiplier, (int, float, complex)):
-            for term in self.terms:
-                self.terms[term] *= multiplier
+            terms = self._terms
+            for term in terms:
+                terms[term] *= multiplier
+            self._forget_summaries()
             return self
 
         # Handle operator of the same type
         elif isinstance(multiplier, self.__class__):
             result_terms = dict()
-            for left_term in self.terms:
-                for right_term in multiplier.terms:
-                    new_coefficient = (self.terms[left_term] *
-                                       multiplier.terms[right_term])
+            for left_term in self._terms:
+                for right_term in multiplier._terms:
+                    new_coefficient = (self._terms[left_term] *
+                                       multiplier._terms[right_term])
                     product_operators = left_term + right_term
 
                     # Update result dict.
@@ -355,17 +757,51 @@ class SymbolicOperator(object):
             TypeError: Cannot add invalid type.
         """
         if isinstance(addend, type(self)):
-            for term in addend.terms:
-                self.terms[term] = (self.terms.get(term, 0.0) +
-                                    addend.terms[term])
-                if abs(self.terms[term]) < EQ_TOLERANCE:
-                    del self.terms[term]
+            if self._fingerprint is not None or addend is self:
+                self._add_terms(addend._terms, 1)
+                return self
+            self._one_norm = None
+            terms = self._terms
+            for term, coefficient in addend._terms.items():
+                coefficient = terms.get(term, 0.0) + coefficient
+                if abs(coefficient) < EQ_TOLERANCE:
+                    terms.pop(term, None)
+                else:
+                    terms[term] = coefficient
         else:
             raise TypeError('Cannot add invalid type to {}.'.format(
                             type(self)))
 
         return self
 
+    def _add_terms(self, terms, sign):
+        """Add sign times the given terms, keeping the fingerprint current.
+
+        Also used when adding an operator to itself, for which the terms are
+        copied before the dictionary is modified.
+        """
+        self_terms = self._terms
+        if terms is self_terms:
+            terms = dict(terms)
+        self._check_summaries()
+        fingerprint = self._fingerprint
+        # Incremental sums of absolute values would drift from the norm
+        # computed by math.fsum, so the norm is recomputed when needed.
+        self._one_norm = None
+        for term in terms:
+            old_coefficient = self_terms.get(term, 0.0)
+            new_coefficient = old_coefficient + sign * terms[term]
+            if abs(new_coefficient) < EQ_TOLERANCE:
+                self_terms.pop(term, None)
+            else:
+                self_terms[term] = new_coefficient
+            if fingerprint is not None:
+                fingerprint += (_term_fingerprint(term, new_coefficient) -
+                                _term_fingerprint(term, old_coefficient))
+        if fingerprint is not None:
+            self._fingerprint = fingerprint & _FINGERPRINT_MASK
+            self._n_summarized_terms = len(self_terms)
+
     def __add__(self, addend):
         """
         Args:
@@ -391,11 +827,17 @@ class SymbolicOperator(object):
             TypeError: Cannot subtract invalid type.
         """
         if isinstance(subtrahend, type(self)):
-            for term in subtrahend.terms:
-                self.terms[term] = (self.terms.get(term, 0.0) -
-                                    subtrahend.terms[term])
-                if abs(self.terms[term]) < EQ_TOLERANCE:
-                    del self.terms[term]
+            if self._fingerprint is not None or subtrahend is self:
+                self._add_terms(subtrahend._terms, -1)
+                return self
+            self._one_norm = None
+            terms = self._terms
+            for term, coefficient in subtrahend._terms.items():
+                coefficient = terms.get(term, 0.0) - coefficient
+                if abs(coefficient) < EQ_TOLERANCE:
+                    terms.pop(term, None)
+                else:
+                    terms[term] = coefficient
         else:
             raise TypeError('Cannot subtract invalid type from {}.'.format(
                             type(self)))
@@ -489,6 +931,33 @@ class SymbolicOperator(object):
         Returns:
             exponentiated (SymbolicOperator)
 
+        Raises:
+            ValueError: Can only raise SymbolicOperator to non-negative
+                integer powers.
+        """
+        return self.power(exponent)
+
+    def power(self, exponent, abs_tol=None, simplify=None):
+        """Exponentiate the SymbolicOperator by repeated squaring.
+
+        Only O(log(exponent)) products are formed, and each uses the
+        multiplication of the subclass, e.g. Pauli algebra for
+        QubitOperators. If the terms commute, e.g. for sums of Z strings,
+        large operators are instead expanded with the multinomial theorem.
+
+        Args:
+            exponent (int): The exponent with which to raise the operator.
+            abs_tol (float, optional): If given, each intermediate product
+                is compressed with this tolerance so that cancelled terms
+                are not carried into later products.
+            simplify (callable, optional): A function returning an operator
+                equal to its argument, applied to each intermediate product.
+                For example, passing normal_ordered for a FermionOperator
+                keeps the intermediate products normal ordered.
+
+        Returns:
+            exponentiated (SymbolicOperator)
+
         Raises:
             ValueError: Can only raise SymbolicOperator to non-negative
                 integer powers.
@@ -499,14 +968,91 @@ class SymbolicOperator(object):
                 'exponent must be a non-negative int, but was {} {}'.format(
                     type(exponent), repr(exponent)))
 
-        # Initialized identity.
-        exponentiated = self.__class__(())
+        def reduce_product(product):
+            if simplify is not None:
+                product = simplify(product)
+            if abs_tol is not None:
+                product.compress(abs_tol)
+            return product
 
-        # Handle non-zero exponents.
-        for _ in range(exponent):
-            exponentiated *= self
+        # Handle zero exponent.
+        if exponent == 0:
+            return self.__class__(())
+
+        # The multinomial expansion forms about
+        # len(self.terms) * exponent ** 2 / 2 products with a single term,
+        # which is faster than squaring for many terms and large exponents.
+        if (exponent > 3 and len(self.terms) > 8 and
+                self._terms_commute()):
+            return self._commuting_power(exponent, reduce_product)
+
+        # Multiply together the squarings of self selected by the bits of
+        # the exponent.
+        exponentiated = None
+        square = self
+        while True:
+            if exponent & 1:
+                if exponentiated is None:
+                    exponentiated = square
+                else:
+                    exponentiated = reduce_product(exponentiated * square)
+            exponent >>= 1
+            if not exponent:
+                break
+            square = reduce_product(square * square)
+
+        if exponentiated is self:
+            exponentiated = reduce_product(copy.deepcopy(self))
         return exponentiated
 
+    def _terms_commute(self):
+        """Return whether the products of any two terms are equal in both
+        orders, as the multinomial theorem requires."""
+        terms = [self.__class__(term) for term in self.terms]
+        for index, left in enumerate(terms):
+            for right in terms[index + 1:]:
+                if (left * right).terms != (right * left).terms:
+                    return False
+        return True
+
+    def _commuting_power(self, exponent, reduce_product):
+        """Exponentiate an operator whose terms commute.
+
+        By the multinomial theorem, the powers of the sum of the first j
+        terms follow from those of the first j - 1 terms and of term j,
+        (S + T) ** m = sum_l binomial(m, l) S ** l T ** (m - l). Each
+        product has a single term on one side, so no product of two whole
+        operators is formed.
+        """
+        # Binomial coefficients, binomials[m][l] = binomial(m, l).
+        binomials = [[1]]
+        for _ in range(exponent):
+            previous = binomials[-1]
+            binomials.append([1] + [left + right for left, right in
+                                    zip(previous, previous[1:])] + [1])
+
+        terms = [self.__class__(term, coefficient)
+                 for term, coefficient in self.terms.items()]
+        powers = [self.__class__(())]
+        for _ in range(exponent):
+            powers.append(reduce_product(powers[-1] * terms[0]))
+        for index, term in enumerate(terms[1:]):
+            term_powers = [self.__class__(())]
+            for _ in range(exponent):
+                term_powers.append(term_powers[-1] * term)
+            last = index == len(terms) - 2
+            new_powers = []
+            for total in range(exponent + 1):
+                if last and total < exponent:
+                    continue
+                summed = self.__class__()
+                for part in range(total + 1):
+                    summed += (binomials[total][part] * powers[part] *
+                               term_powers[total - part])
+                new_powers.append(reduce_product(summed))
+            powers = new_powers
+        return powers[-1]
+
     def __eq__(self, other):
         """
         Returns True if other (SymbolicOperator) is close to self.
@@ -518,29 +1064,97 @@ class SymbolicOperator(object):
         Args:
             other(SymbolicOperator): SymbolicOperator to compare against.
         """
+        if other is self:
+            return True
         if not isinstance(other, type(self)):
             return False
 
+        # Equal operators have one-norms differing by at most the sum of
+        # the tolerances of their terms. Once the norms are cached, as they
+        # are after a first comparison, unequal operators are usually
+        # rejected here without looking at their terms.
+        self_norm = self._coefficient_one_norm()
+        other_norm = other._coefficient_one_norm()
+        n_terms = len(self._terms) + len(other._terms)
+        allowed = EQ_TOLERANCE * (n_terms + self_norm + other_norm)
+        # Allow for rounding in the norms themselves.
+        allowed += 4. * numpy.finfo(float).eps * (self_norm + other_norm)
+        if abs(self_norm - other_norm) > allowed:
+            return False
+
+        self_terms = self._terms
+        other_terms = other._terms
         # terms which are in both:
-        for term in set(self.terms).intersection(set(other.terms)):
-            a = self.terms[term]
-            b = other.terms[term]
+        for term in set(self_terms).intersection(set(other_terms)):
+            a = self_terms[term]
+            b = other_terms[term]
             # math.isclose does this in Python >=3.5
             if not abs(a - b) <= max(EQ_TOLERANCE,
                                      EQ_TOLERANCE * max(abs(a), abs(b))):
                 return False
         # terms only in one (compare to 0.0 so only abs_tol)
-        for term in set(self.terms).symmetric_difference(set(other.terms)):
-            if term in self.terms:
-                if not abs(self.terms[term]) <= EQ_TOLERANCE:
+        for term in set(self_terms).symmetric_difference(set(other_terms)):
+            if term in self_terms:
+                if not abs(self_terms[term]) <= EQ_TOLERANCE:
                     return False
-            elif not abs(other.terms[term]) <= EQ_TOLERANCE:
+            elif not abs(other_terms[term]) <= EQ_TOLERANCE:
                 return False
         return True
 
     def __ne__(self, other):
         return not (self == other)
 
+    def _forget_summaries(self):
+        """Forget the cached fingerprint and coefficient one-norm."""
+        self._fingerprint = None
+        self._one_norm = None
+
+    def _check_summaries(self):
+        """Forget the cached summaries if terms were added or removed.
+
+        Terms added or removed in place through the terms dictionary change
+        its length, which is cheap to compare with the number of terms the
+        summaries were computed from.
+        """
+        n_terms = len(self._terms)
+        if self._n_summarized_terms != n_terms:
+            self._forget_summaries()
+            self._n_summarized_terms = n_terms
+
+    def _coefficient_one_norm(self):
+        """Return the cached sum of the absolute values of coefficients."""
+        self._check_summaries()
+        if self._one_norm is None:
+            self._one_norm = math.fsum(
+                abs(coefficient) for coefficient in self._terms.values())
+        return self._one_norm
+
+    def fingerprint(self):
+        """Return a hash of the terms and their rounded coefficients.
+
+        The fingerprint does not depend on the order in which terms were
+        added. Coefficients are rounded to the resolution of EQ_TOLERANCE
+        and terms with coefficients below it are ignored, so operators that
+        differ only by round-off usually share a fingerprint. It is cached
+        and kept up to date by += and -=, which makes it a cheap key for
+        caches of expensive results computed from operators.
+
+        Operators are mutable and so are not hashable. A coefficient lying
+        close to a rounding boundary can also give operators that compare
+        equal different fingerprints, and distinct operators can collide.
+        Caches keyed by fingerprint should therefore confirm hits with ==.
+
+        Returns:
+            fingerprint (int): A 64-bit unsigned integer.
+        """
+        self._check_summaries()
+        if self._fingerprint is None:
+            fingerprint = 0
+            for term, coefficient in self._terms.items():
+                fingerprint += _term_fingerprint(term, coefficient)
+            self._fingerprint = fingerprint & _FINGERPRINT_MASK
+        return self._fingerprint
+
     def compress(self, abs_tol=EQ_TOLERANCE):
         """
         Eliminates all terms with coefficients close to zero and removes
@@ -550,8 +1164,7 @@ class SymbolicOperator(object):
             abs_tol(float): Absolute tolerance, must be at least 0.0
         """
         new_terms = {}
-        for term in self.terms:
-            coeff = self.terms[term]
+        for term, coeff in self._terms.items():
 
             # Remove small imaginary and real parts
             if abs(coeff.imag) <= abs_tol:
@@ -579,7 +1192,7 @@ class SymbolicOperator(object):
             order(int): the order of the induced norm.
         """
         norm = 0.
-        for coefficient in self.terms.values():
+        for coefficient in self._terms.values():
             norm += abs(coefficient) ** order
         return norm ** (1. / order)
 
@@ -592,11 +1205,11 @@ class SymbolicOperator(object):
         Returns:
             int
         """
-        if not self.terms:
+        if not self._terms:
             # Zero operator
             return 0
         else:
-            return max(len(term) for term, coeff in self.terms.items()
+            return max(len(term) for term, coeff in self._terms.items()
                        if abs(coeff) > EQ_TOLERANCE)
 
     # DEPRECATED FUNCTIONS
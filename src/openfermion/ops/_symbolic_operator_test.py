@@ -19,7 +19,8 @@ import numpy
 from openfermion.config import EQ_TOLERANCE
 from openfermion.utils._testing_utils import EqualsTester
 
-from openfermion.ops._symbolic_operator import SymbolicOperator
+from openfermion.ops._symbolic_operator import (
+    SymbolicOperator, intern_factor, intern_term)
 
 
 class DummyOperator1(SymbolicOperator):
@@ -244,6 +245,25 @@ class SymbolicOperatorTest1(unittest.TestCase):
         correct = DummyOperator1('3^ 2', complex(-2.3, -1.7))
         self.assertEqual(len((fermion_op-correct).terms), 0)
 
+    def test_init_long_str_many_terms(self):
+        terms = [((p, 1), (q, 0)) for p in range(6) for q in range(6)]
+        long_string = ' +\n'.join(
+            '{} [{}^ {}]'.format(p + .5 * q + 1, p, q)
+            for (p, _), (q, _) in terms)
+        fermion_op = DummyOperator1(long_string)
+        correct = DummyOperator1()
+        for (p, _), (q, _) in terms:
+            correct += DummyOperator1(((p, 1), (q, 0)), p + .5 * q + 1)
+        self.assertEqual(fermion_op.terms, correct.terms)
+
+    def test_init_long_str_ignores_trailing_text(self):
+        fermion_op = DummyOperator1('2. [0^ 1] + 3. [')
+        self.assertEqual(fermion_op.terms, {((0, 1), (1, 0)): 2.})
+
+    def test_init_long_str_bad_coefficient(self):
+        with self.assertRaises(ValueError):
+            DummyOperator1('2.x [0^ 1]')
+
     def test_merges_multiple_whitespace(self):
         fermion_op = DummyOperator1('        \n ')
         self.assertEqual(fermion_op.terms, {(): 1})
@@ -653,6 +673,50 @@ class SymbolicOperatorTest1(unittest.TestCase):
         with self.assertRaises(ValueError):
             DummyOperator1('3 2^') ** 0.5
 
+    def test_pow_matches_repeated_multiplication(self):
+        op = (DummyOperator1('3^ 1', .5) + DummyOperator1('1^ 3', -.3j) +
+              DummyOperator1('', 1.2))
+        product = DummyOperator1(())
+        for exponent in range(1, 8):
+            product *= op
+            self.assertEqual(op ** exponent, product)
+
+    def test_pow_commuting_terms(self):
+        # Terms that are powers of one factor commute.
+        op = DummyOperator1()
+        for power in range(9):
+            op += DummyOperator1(((1, 1),) * power, .5 + .1j * power)
+        product = DummyOperator1(())
+        for exponent in range(1, 7):
+            product *= op
+            self.assertTrue(op ** exponent == product)
+
+    def test_pow_one_returns_copy(self):
+        op = DummyOperator1('3^ 1', .5)
+        powered = op ** 1
+        self.assertIsNot(powered, op)
+        powered *= 2.
+        self.assertEqual(op, DummyOperator1('3^ 1', .5))
+
+    def test_power_abs_tol(self):
+        op = DummyOperator1('0^', 1.) + DummyOperator1('1^', 1e-5)
+        powered = op.power(2, abs_tol=1e-9)
+        self.assertEqual(set(powered.terms), {((0, 1), (0, 1)),
+                                              ((0, 1), (1, 1)),
+                                              ((1, 1), (0, 1))})
+        self.assertEqual(len((op ** 2).terms), 4)
+
+    def test_power_simplify(self):
+        calls = []
+
+        def simplify(operator):
+            calls.append(len(operator.terms))
+            return operator
+
+        op = DummyOperator1('3^ 1', .5) + DummyOperator1('1^ 3', -.3)
+        self.assertEqual(op.power(5, simplify=simplify), op ** 5)
+        self.assertEqual(calls, [4, 16, 32])
+
     def test_compress_terms(self):
         op = (DummyOperator1('3^ 1', 0.3 + 3e-11j) +
               DummyOperator1('2^ 3', 5e-10) +
@@ -1009,3 +1073,305 @@ class DeprecatedFunctionsTest(unittest.TestCase):
         b = DummyOperator2(((1, 'X'),), -0.1j)
         self.assertTrue(not b == a)
         self.assertTrue(not a == b)
+
+
+class FromArraysTest(unittest.TestCase):
+    """Test the from_arrays constructor."""
+
+    def test_from_arrays_matches_constructor(self):
+        op = DummyOperator1.from_arrays(
+            numpy.array([2, 3, 1, 0]), numpy.array([1, 0, 1, 1]),
+            numpy.array([2, 1, 0, 1]), numpy.array([.5, -1., 2.j, 3]))
+        correct = (DummyOperator1('2^ 3', .5) + DummyOperator1('1^', -1.) +
+                   DummyOperator1('', 2.j) + DummyOperator1('0^', 3))
+        self.assertEqual(op.terms, correct.terms)
+
+    def test_from_arrays_lists(self):
+        op = DummyOperator2.from_arrays([3, 1], ['X', 'Z'], [2], [1.5])
+        self.assertEqual(op.terms, {((1, 'Z'), (3, 'X')): 1.5})
+
+    def test_from_arrays_sorts_commuting_factors(self):
+        op = DummyOperator2.from_arrays(
+            numpy.array([5, 2, 2, 4, 0]),
+            numpy.array(['X', 'Z', 'Y', 'X', 'Y']),
+            numpy.array([3, 2]), numpy.array([1., 2.]))
+        correct = (DummyOperator2([(5, 'X'), (2, 'Z'), (2, 'Y')], 1.) +
+                   DummyOperator2([(4, 'X'), (0, 'Y')], 2.))
+        self.assertEqual(op.terms, correct.terms)
+
+    def test_from_arrays_sums_repeated_terms(self):
+        op = DummyOperator1.from_arrays(
+            [0, 1, 0, 1], [1, 0, 1, 0], [2, 2], [1., .25])
+        self.assertEqual(op.terms, {((0, 1), (1, 0)): 1.25})
+
+    def test_from_arrays_native_types(self):
+        op = DummyOperator1.from_arrays(
+            numpy.array([4]), numpy.array([0]), numpy.array([1]),
+            numpy.array([1.j]))
+        (term, coefficient), = op.terms.items()
+        self.assertIs(type(term[0][0]), int)
+        self.assertIs(type(coefficient), complex)
+
+    def test_from_arrays_empty(self):
+        op = DummyOperator1.from_arrays([], [], [], [])
+        self.assertEqual(op, DummyOperator1.zero())
+
+    def test_from_arrays_bad_action(self):
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0], [2], [1], [1.])
+        with self.assertRaises(ValueError):
+            DummyOperator2.from_arrays([0], ['W'], [1], [1.])
+
+    def test_from_arrays_bad_index(self):
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([-1], [1], [1], [1.])
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0.5], [1], [1], [1.])
+
+    def test_from_arrays_bad_coefficient(self):
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0], [1], [1], ['1.'])
+
+    def test_from_arrays_bad_lengths(self):
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0, 1], [1], [1], [1.])
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0, 1], [1, 0], [1], [1.])
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0, 1], [1, 0], [2], [1., 2.])
+        with self.assertRaises(ValueError):
+            DummyOperator1.from_arrays([0, 1], [1, 0], [3, -1], [1., 2.])
+
+
+class BuilderTest(unittest.TestCase):
+    """Test the operator builder."""
+
+    def test_builder_matches_iadd(self):
+        with DummyOperator1.builder() as builder:
+            builder.add(((2, 1), (3, 0)), .5)
+            builder.add('3^ 2', .5j)
+            builder.add([(2, 1), (3, 0)], 1.)
+            builder.add((), 2)
+        correct = DummyOperator1()
+        correct += DummyOperator1(((2, 1), (3, 0)), .5)
+        correct += DummyOperator1('3^ 2', .5j)
+        correct += DummyOperator1([(2, 1), (3, 0)], 1.)
+        correct += DummyOperator1((), 2)
+        self.assertEqual(builder.operator.terms, correct.terms)
+
+    def test_builder_sorts_commuting_factors(self):
+        builder = DummyOperator2.builder()
+        builder.add(((3, 'X'), (1, 'Z')), 1.)
+        builder.add('Z1 X3', 1.)
+        self.assertEqual(builder.build().terms,
+                         {((1, 'Z'), (3, 'X')): 2.})
+
+    def test_builder_removes_cancelled_terms(self):
+        builder = DummyOperator1.builder()
+        builder.add('0^ 1', 1.)
+        builder.add('0^ 1', -1.)
+        builder.add('1^ 0', 1.)
+        self.assertEqual(builder.build().terms, {((1, 1), (0, 0)): 1.})
+
+    def test_builder_compress(self):
+        builder = DummyOperator1.builder(compress=True, abs_tol=1e-3)
+        builder.add('0^ 1', 1. + 1e-4j)
+        builder.add('1^ 0', 1e-4)
+        operator = builder.build()
+        self.assertEqual(operator.terms, {((0, 1), (1, 0)): 1.})
+        self.assertIsInstance(operator.terms[((0, 1), (1, 0))], float)
+
+    def test_builder_add_operator(self):
+        operator = DummyOperator1('0^ 1', 2.) + DummyOperator1('1^ 0', 3.)
+        with DummyOperator1.builder() as builder:
+            builder.add_operator(operator)
+            builder.add_operator(operator, -.5)
+        self.assertEqual(builder.operator, operator * .5)
+
+    def test_builder_add_hermitian_pair(self):
+        with DummyOperator1.builder() as builder:
+            builder.add_hermitian_pair(((2, 1), (3, 0)), .5j)
+            builder.add_hermitian_pair('0^ 1^', 2)
+        self.assertEqual(builder.operator.terms,
+                         {((2, 1), (3, 0)): .5j, ((3, 1), (2, 0)): -.5j,
+                          ((0, 1), (1, 1)): 2, ((1, 0), (0, 0)): 2})
+        with self.assertRaises(TypeError):
+            DummyOperator2.builder().add_hermitian_pair('X0', 1.)
+
+    def test_builder_add_operator_bad_type(self):
+        builder = DummyOperator1.builder()
+        with self.assertRaises(TypeError):
+            builder.add_operator(DummyOperator2('X0'))
+
+    def test_builder_bad_term(self):
+        builder = DummyOperator1.builder()
+        with self.assertRaises(ValueError):
+            builder.add(((0, 2),), 1.)
+        with self.assertRaises(ValueError):
+            builder.add(3, 1.)
+        with self.assertRaises(ValueError):
+            builder.add('0^', '1.')
+
+
+class InternTest(unittest.TestCase):
+    """Test interning of factors."""
+
+    def test_bulk_constructors_share_factors(self):
+        builder = DummyOperator1.builder()
+        builder.add(((0, 1), (1, 0)), 2.)
+        builder.add([(0, 1), (1, 0)], 3.)
+        operators = [DummyOperator1('0^ 1', 1.),
+                     builder.build(),
+                     DummyOperator1.from_arrays([0, 1], [1, 0], [2], [4.]),
+                     DummyOperator1('1.5 [0^ 1] + 2. [2^]')]
+        terms = [list(operator.terms)[0] for operator in operators]
+        for term in terms[1:]:
+            self.assertEqual(term, terms[0])
+            self.assertIs(term[0], terms[0][0])
+            self.assertIs(term[1], terms[0][1])
+
+    def test_intern_canonicalizes_actions(self):
+        builder = DummyOperator1.builder()
+        builder.add(((17, True), (18, False)))
+        term, = builder.build().terms
+        self.assertEqual(term, ((17, 1), (18, 0)))
+        self.assertIs(type(term[0][1]), int)
+        self.assertIs(term[0], DummyOperator1('17^').terms.popitem()[0][0])
+
+    def test_intern_factor_canonical(self):
+        factor = intern_factor((numpy.int64(23), 'X'))
+        self.assertEqual(factor, (23, 'X'))
+        self.assertIs(type(factor[0]), int)
+        self.assertIs(intern_factor((23, 'X')), factor)
+        factor = intern_factor((numpy.int64(24), True))
+        self.assertIs(type(factor[0]), int)
+        self.assertIs(type(factor[1]), int)
+        self.assertIs(intern_term(((24, 1),))[0], factor)
+
+    def test_intern_term(self):
+        term = intern_term(((3, 'X'), (4, 'Y')))
+        self.assertEqual(term, ((3, 'X'), (4, 'Y')))
+        self.assertIs(term[1], intern_factor((4, 'Y')))
+        self.assertIs(term[0], list(DummyOperator2('X3').terms)[0][0])
+
+
+class FingerprintTest(unittest.TestCase):
+    """Test fingerprints and the fast paths of equality."""
+
+    def test_fingerprint_ignores_order_and_round_off(self):
+        op1 = DummyOperator1('0^ 1', 0.5) + DummyOperator1('2^', 1.j)
+        op2 = DummyOperator1('2^', 1.j) + DummyOperator1(
+            '0^ 1', 0.5 + 0.1 * EQ_TOLERANCE)
+        op2 += DummyOperator1('3^', 0.1 * EQ_TOLERANCE)
+        self.assertEqual(op1.fingerprint(), op2.fingerprint())
+        self.assertNotEqual(op1.fingerprint(),
+                            DummyOperator1('0^ 1', 0.5).fingerprint())
+        self.assertNotEqual(op1.fingerprint(),
+                            (op1 * 2.).fingerprint())
+        self.assertEqual(DummyOperator1().fingerprint(),
+                         DummyOperator1('1^', 0.).fingerprint())
+
+    def test_fingerprint_maintained_by_add_and_sub(self):
+        operator = DummyOperator1('0^ 1', 0.5)
+        operator.fingerprint()
+        operator += DummyOperator1('2^ 3', 2.)
+        operator -= DummyOperator1('0^ 1', 0.25)
+        operator += operator
+        operator -= DummyOperator1('2^ 3', 4.)
+        self.assertEqual(operator.fingerprint(),
+                         DummyOperator1('0^ 1', 0.5).fingerprint())
+        operator -= operator
+        self.assertEqual(operator.fingerprint(),
+                         DummyOperator1().fingerprint())
+
+    def test_fingerprint_after_modification(self):
+        operator = DummyOperator2('X0 Y1', 1.)
+        fingerprint = operator.fingerprint()
+        operator.terms[((2, 'Z'),)] = 1.
+        self.assertNotEqual(operator.fingerprint(), fingerprint)
+        operator *= 2.
+        self.assertEqual(operator.fingerprint(),
+                         DummyOperator2('2. [X0 Y1] + 2. [Z2]').fingerprint())
+        operator *= DummyOperator2('X3')
+        self.assertEqual(operator.fingerprint(),
+                         DummyOperator2('2. [X0 Y1 X3] + 2. [Z2 X3]')
+                         .fingerprint())
+        operator.terms = {}
+        self.assertEqual(operator.fingerprint(), 0)
+        copied = copy.deepcopy(DummyOperator2('X0', 3.))
+        self.assertEqual(copied.fingerprint(),
+                         DummyOperator2('X0', 3.).fingerprint())
+
+    def test_fingerprint_as_cache_key(self):
+        cache = {}
+        for coefficient in (1., 2., 1. + 0.1 * EQ_TOLERANCE):
+            operator = DummyOperator1('1^ 0', coefficient)
+            cache.setdefault(operator.fingerprint(), operator)
+        self.assertEqual(len(cache), 2)
+
+    def test_equality_uses_cached_norms(self):
+        op1 = DummyOperator1('0^ 1', 1.) + DummyOperator1('2^', 1.)
+        op2 = DummyOperator1('0^ 1', 1.) + DummyOperator1('2^', 1.5)
+        self.assertFalse(op1 == op2)
+        self.assertIsNotNone(op1._one_norm)
+        self.assertFalse(op1 == op2)
+        op2 -= DummyOperator1('2^', 0.5)
+        self.assertTrue(op1 == op2)
+        self.assertTrue(op1 == op1)
+
+    def test_held_terms_modification(self):
+        op1 = DummyOperator2('X0', 1.) + DummyOperator2('Y1', 1.)
+        op2 = DummyOperator2('X0', 2.) + DummyOperator2('Y1', 1.)
+        terms = op1.terms
+        fingerprint = op1.fingerprint()
+        self.assertFalse(op1 == op2)
+        terms[((0, 'X'),)] = 2.
+        op1.terms = terms
+        self.assertTrue(op1 == op2)
+        self.assertEqual(op1.fingerprint(), op2.fingerprint())
+        for modify in (lambda: terms.pop(((0, 'X'),)),
+                       lambda: terms.update({((0, 'X'),): 2.}),
+                       lambda: terms.setdefault(((2, 'Z'),), 1.),
+                       lambda: terms.__delitem__(((2, 'Z'),)),
+                       lambda: terms.popitem(),
+                       terms.clear):
+            op1 == op2
+            modify()
+            self.assertEqual(op1 == op2, dict(terms) == dict(op2.terms))
+            fresh = DummyOperator2()
+            fresh.terms = dict(terms)
+            self.assertEqual(op1.fingerprint(), fresh.fingerprint())
+            op1.fingerprint()
+        self.assertEqual(op1.fingerprint(), DummyOperator2().fingerprint())
+        self.assertNotEqual(fingerprint, op1.fingerprint())
+
+    def test_builder_forgets_fingerprint(self):
+        builder = DummyOperator1.builder()
+        builder.add('1^', 1.)
+        fingerprint = builder.operator.fingerprint()
+        builder.add('1^', 1.)
+        self.assertNotEqual(builder.build().fingerprint(), fingerprint)
+
+    def test_reading_terms_keeps_fingerprint(self):
+        operator = DummyOperator1('0^ 1', 0.5)
+        operator.fingerprint()
+        len(operator.terms)
+        self.assertIsNotNone(operator._fingerprint)
+
+    def test_equality_within_tolerance_of_norm_bound(self):
+        n_terms = 100
+        op1 = DummyOperator1()
+        op2 = DummyOperator1()
+        for index in range(n_terms):
+            op1 += DummyOperator1(((index, 1),), 1.)
+            op2 += DummyOperator1(((index, 1),), 1. + 0.9 * EQ_TOLERANCE)
+        op2 += DummyOperator1(((n_terms, 1),), 0.9 * EQ_TOLERANCE)
+        self.assertTrue(op1 == op2)
+        self.assertTrue(op2 == op1)
+
+    def test_legacy_pickle_state(self):
+        operator = DummyOperator1.__new__(DummyOperator1)
+        operator.__setstate__({'terms': {((1, 1),): 2.}})
+        self.assertEqual(operator, DummyOperator1('1^', 2.))
+        self.assertEqual(operator.fingerprint(),
+                         DummyOperator1('1^', 2.).fingerprint())
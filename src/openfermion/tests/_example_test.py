@@ -12,7 +12,6 @@
 
 """Tests the code in the examples directory of the git repo."""
 import nbformat
-import numpy
 import os
 import subprocess
 import sys
@@ -126,29 +125,36 @@ class ExampleTest(unittest.TestCase):
 
     def test_performance_benchmarks(self):
 
-        # Import performance benchmarks and seed random number generator.
+        # Import the benchmark suite.
         sys.path.append(self.directory)
-        from performance_benchmarks import (
-            benchmark_fermion_math_and_normal_order,
-            benchmark_jordan_wigner_sparse,
-            benchmark_molecular_operator_jordan_wigner)
-        numpy.random.seed(1)
-
-        # Run InteractionOperator.jordan_wigner_transform() benchmark.
-        n_qubits = 10
-        runtime = benchmark_molecular_operator_jordan_wigner(n_qubits)
-        self.assertLess(runtime, 600)
-
-        # Run benchmark on FermionOperator math and normal-ordering.
-        n_qubits = 10
-        term_length = 5
-        power = 5
-        runtime_math, runtime_normal = benchmark_fermion_math_and_normal_order(
-            n_qubits, term_length, power)
-        self.assertLess(runtime_math, 600)
-        self.assertLess(runtime_normal, 600)
-
-        # Run FermionOperator.jordan_wigner_sparse() benchmark.
-        n_qubits = 10
-        runtime = benchmark_jordan_wigner_sparse(n_qubits)
-        self.assertLess(runtime, 600)
+        from performance_benchmarks import (BENCHMARKS, compare_results,
+                                            run_suite)
+
+        # Run the smallest size of two cheap benchmarks once; the full
+        # sweep is left to the script.
+        names = ['fermion_power', 'normal_ordered']
+        results = run_suite(names, quick=True, repeat=1)
+        self.assertEqual(set(results['metadata']),
+                         {'openfermion', 'python', 'numpy', 'scipy',
+                          'platform', 'date', 'seed', 'repeat'})
+        self.assertEqual([result['name'] for result in
+                          results['benchmarks']], names)
+        for result in results['benchmarks']:
+            self.assertEqual(set(result),
+                             {'name', 'parameters', 'times', 'min_time',
+                              'median_time', 'peak_memory'})
+            _, sweep = BENCHMARKS[result['name']]
+            self.assertEqual(result['parameters'],
+                             {parameter: values[0] for parameter, values
+                              in sweep.items()})
+            self.assertEqual(len(result['times']), 1)
+            self.assertEqual(result['min_time'], result['times'][0])
+
+        # Results are not regressions of themselves, but slower ones are.
+        self.assertEqual(compare_results(results, results), [])
+        slower = {'benchmarks': [dict(result, min_time=2. * result['min_time'])
+                                 for result in results['benchmarks']]}
+        self.assertEqual(
+            [(name, quantity) for name, _, quantity, _ in
+             compare_results(results, slower)],
+            [(name, 'min_time') for name in names])
@@ -0,0 +1,63 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests the lazy loading of the top level openfermion package."""
+from __future__ import absolute_import
+
+import importlib
+import subprocess
+import sys
+import unittest
+
+import openfermion
+
+
+def _modules_loaded_by(statement):
+    """Run statement in a new interpreter and return the loaded modules."""
+    output = subprocess.check_output(
+        [sys.executable, '-c',
+         statement + '\nimport sys\nprint(" ".join(sys.modules))'])
+    return set(output.decode().split())
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_names_match_subpackages(self):
+        for subpackage, names in openfermion._SUBPACKAGE_NAMES.items():
+            module = importlib.import_module('openfermion.' + subpackage)
+            public_names = {name for name in vars(module)
+                            if not name.startswith('_')}
+            self.assertEqual(set(names), public_names, subpackage)
+
+    def test_names_resolve_to_subpackage_values(self):
+        from openfermion.ops import FermionOperator
+        from openfermion.utils import count_qubits
+        self.assertIs(openfermion.FermionOperator, FermionOperator)
+        self.assertIs(getattr(openfermion, 'count_qubits'), count_qubits)
+        self.assertIs(openfermion.utils,
+                      importlib.import_module('openfermion.utils'))
+        self.assertIn('jordan_wigner', dir(openfermion))
+        self.assertIn('jordan_wigner', openfermion.__all__)
+        with self.assertRaises(AttributeError):
+            openfermion.not_a_name
+
+    def test_import_does_not_load_subpackages(self):
+        loaded = _modules_loaded_by('import openfermion')
+        for module in ('openfermion.ops', 'openfermion.utils', 'scipy',
+                       'h5py'):
+            self.assertNotIn(module, loaded)
+
+        loaded = _modules_loaded_by('from openfermion import QubitOperator')
+        self.assertIn('openfermion.ops', loaded)
+        for module in ('openfermion.utils', 'openfermion.hamiltonians',
+                       'h5py', 'scipy.sparse.linalg'):
+            self.assertNotIn(module, loaded)
@@ -15,6 +15,7 @@
 
 import numpy
 
+from openfermion._profiling import profiled
 from openfermion.ops import (BinaryCode,
                              FermionOperator,
                              QubitOperator,
@@ -89,6 +90,7 @@ def make_parity_list(code):
     return parity_binaries
 
 
+@profiled
 def binary_code_transform(hamiltonian, code):
     """ Transforms a Hamiltonian written in fermionic basis into a Hamiltonian
     written in qubit basis, via a binary code.
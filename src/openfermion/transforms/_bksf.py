@@ -16,10 +16,12 @@ from __future__ import absolute_import
 import networkx
 import numpy
 
+from openfermion._profiling import profiled
 from openfermion.ops import InteractionOperator, QubitOperator
 from openfermion.utils import count_qubits
 
 
+@profiled
 def bravyi_kitaev_fast(operator):
     """
     Find the Pauli-representation of InteractionOperator for Bravyi-Kitaev
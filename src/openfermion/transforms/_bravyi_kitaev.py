@@ -12,10 +12,12 @@
 
 """Bravyi-Kitaev transform on fermionic operators."""
 
+from openfermion._profiling import profiled
 from openfermion.ops import QubitOperator
 from openfermion.utils import count_qubits, inline_sum
 
 
+@profiled
 def bravyi_kitaev(operator, n_qubits=None):
     """Apply the Bravyi-Kitaev transform.
 
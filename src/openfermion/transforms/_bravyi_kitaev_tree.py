@@ -13,12 +13,14 @@
 """Bravyi-Kitaev transform on fermionic operators."""
 from __future__ import absolute_import
 
+from openfermion._profiling import profiled
 from openfermion.ops import QubitOperator
 from openfermion.utils import inline_sum
 from openfermion.transforms._bravyi_kitaev import inline_product
 from openfermion.transforms._fenwick_tree import FenwickTree
 
 
+@profiled
 def bravyi_kitaev_tree(operator, n_qubits=None):
     """Apply the "tree" Bravyi-Kitaev transform.
 
@@ -18,6 +18,7 @@ import itertools
 import numpy
 from future.utils import iteritems
 
+from openfermion._profiling import profiled
 from openfermion.config import EQ_TOLERANCE
 from openfermion.hamiltonians import MolecularData
 from openfermion.ops import (DiagonalCoulombHamiltonian,
@@ -36,6 +37,7 @@ from openfermion.utils import (count_qubits,
                                qubit_operator_sparse)
 
 
+@profiled
 def get_sparse_operator(operator, n_qubits=None):
     """Map an operator to a sparse matrix.
 
@@ -52,6 +54,7 @@ def get_sparse_operator(operator, n_qubits=None):
             type(operator).__name__))
 
 
+@profiled
 def get_interaction_rdm(qubit_operator, n_qubits=None):
     """Build an InteractionRDM from measured qubit operators.
 
@@ -82,6 +85,7 @@ def get_interaction_rdm(qubit_operator, n_qubits=None):
     return InteractionRDM(one_rdm, two_rdm)
 
 
+@profiled
 def get_interaction_operator(fermion_operator, n_qubits=None):
     """Convert a 2-body fermionic operator to InteractionOperator.
 
@@ -156,6 +160,7 @@ def get_interaction_operator(fermion_operator, n_qubits=None):
     return interaction_operator
 
 
+@profiled
 def get_quadratic_hamiltonian(fermion_operator,
                               chemical_potential=0., n_qubits=None):
     """Convert a quadratic fermionic operator to QuadraticHamiltonian.
@@ -272,6 +277,7 @@ def get_quadratic_hamiltonian(fermion_operator,
     return quadratic_hamiltonian
 
 
+@profiled
 def get_diagonal_coulomb_hamiltonian(fermion_operator, n_qubits=None):
     """Convert a FermionOperator to a DiagonalCoulombHamiltonian."""
     if not isinstance(fermion_operator, FermionOperator):
@@ -328,6 +334,7 @@ def get_diagonal_coulomb_hamiltonian(fermion_operator, n_qubits=None):
     return DiagonalCoulombHamiltonian(one_body, two_body, constant)
 
 
+@profiled
 def get_fermion_operator(operator):
     """Convert to FermionOperator.
 
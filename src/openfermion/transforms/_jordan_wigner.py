@@ -15,12 +15,14 @@ import itertools
 
 import numpy
 
+from openfermion._profiling import profiled
 from openfermion.config import EQ_TOLERANCE
 from openfermion.ops import (DiagonalCoulombHamiltonian, FermionOperator,
                              InteractionOperator, QubitOperator)
 from openfermion.utils import count_qubits
 
 
+@profiled
 def jordan_wigner(operator):
     """ Apply the Jordan-Wigner transform to a FermionOperator or
     InteractionOperator to convert to a QubitOperator.
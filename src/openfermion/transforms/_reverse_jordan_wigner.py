@@ -15,11 +15,13 @@ from __future__ import absolute_import
 
 import copy
 
+from openfermion._profiling import profiled
 from openfermion.ops import (FermionOperator,
                              QubitOperator)
 from openfermion.utils import count_qubits, number_operator
 
 
+@profiled
 def reverse_jordan_wigner(qubit_operator, n_qubits=None):
     """Transforms a QubitOperator into a FermionOperator using the
     Jordan-Wigner transform.
@@ -17,11 +17,13 @@ import itertools
 import networkx
 import numpy
 
+from openfermion._profiling import profiled
 from openfermion.ops import FermionOperator, QubitOperator
 from openfermion.transforms import jordan_wigner
 from openfermion.utils import majorana_operator 
 
 
+@profiled
 def verstraete_cirac_2d_square(operator, x_dimension, y_dimension,
                                add_auxiliary_hamiltonian=True,
                                snake=False):
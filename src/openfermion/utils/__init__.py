@@ -19,14 +19,18 @@ from ._commutators import anticommutator, commutator, double_commutator
 
 from ._grid import Grid
 
+from openfermion._profiling import Profile, profiled
+
 from ._lcu_util import preprocess_lcu_coefficients_for_reversible_sampling
 
 from ._operator_utils import (count_qubits, eigenspectrum, fourier_transform,
                               freeze_orbitals, get_file_path,
                               hermitian_conjugated, inline_sum,
                               inverse_fourier_transform,
-                              is_hermitian, is_identity, prune_unused_indices,
-                              reorder, up_then_down,
+                              is_hermitian, is_identity,
+                              iterate_operator_chunks, iterate_operator_terms,
+                              prune_unused_indices, reorder,
+                              transform_operator_file, up_then_down,
                               load_operator, save_operator)
 
 from ._rdm_mapping_functions import (kronecker_delta,
@@ -49,11 +53,14 @@ from ._special_operators import (majorana_operator, number_operator,
                                  sx_operator, sy_operator, sz_operator,
                                  up_index, down_index)
 
+from ._transform_cache import TransformCache
+
 from ._trotter_error import error_bound, error_operator
 
 from ._trotter_exp_to_qgates import (pauli_exp_to_qasm,
                                      trotterize_exp_qubop_to_qasm,
-                                     trotter_operator_grouping)
+                                     trotter_operator_grouping,
+                                     write_trotterized_qasm)
 
 from ._unitary_cc import (uccsd_convert_amplitude_format,
                           uccsd_generator,
@@ -62,13 +69,18 @@ from ._unitary_cc import (uccsd_convert_amplitude_format,
                           uccsd_singlet_paramsize)
 
 # Imports out of alphabetical order to avoid circular dependency.
+from ._fci_hamiltonian import FCIHamiltonian
+
 from ._jellium_hf_state import hartree_fock_state_jellium
 
 from ._low_depth_trotter_error import (
     low_depth_second_order_trotter_error_bound,
     low_depth_second_order_trotter_error_operator)
 
-from ._sparse_tools import (expectation,
+from ._sparse_tools import (DavidsonError,
+                            PauliTermCache,
+                            davidson,
+                            expectation,
                             expectation_computational_basis_state,
                             get_density_matrix,
                             get_gap,
@@ -78,12 +90,23 @@ from ._sparse_tools import (expectation,
                             jw_configuration_state,
                             jw_hartree_fock_state,
                             jw_get_gaussian_state,
+                            jw_get_interaction_rdm,
                             jw_get_ground_states_by_particle_number,
                             jw_number_restrict_operator,
                             jw_number_restrict_state,
+                            jw_operator_diagonal,
                             jw_slater_determinant,
                             jw_sz_restrict_operator,
                             jw_sz_restrict_state,
                             qubit_operator_sparse,
                             sparse_eigenspectrum,
                             variance)
+
+from ._commuting_term_groups import commuting_term_groups
+
+from ._spectral_window import SpectralWindowSolver, get_eigenpairs_in_window
+
+from ._time_evolution import KrylovPropagator, evolve_state
+
+from ._trotter_exp_to_state import (pauli_exp_to_state,
+                                    trotterize_exp_qubop_to_state)
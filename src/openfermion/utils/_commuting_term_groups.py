@@ -0,0 +1,203 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Partition of the terms of a QubitOperator into commuting groups."""
+from __future__ import absolute_import
+
+import numpy
+
+from openfermion.utils import count_qubits
+from openfermion.utils._sparse_tools import _pauli_term_masks
+
+# Codes of the Pauli operators, and the codes of the two others of each.
+_PAULI_CODES = {'X': 0, 'Y': 1, 'Z': 2}
+_OTHER_PAULIS = numpy.array([[1, 2], [0, 2], [0, 1]])
+
+# Initial number of 64-bit words of the bitsets over groups.
+_INITIAL_GROUP_WORDS = 16
+
+
+def _pauli_string_arrays(terms):
+    """Return the qubits and Pauli codes of Pauli strings, concatenated.
+
+    Returns:
+        qubits(ndarray): The qubits of the Pauli operators of all strings.
+        codes(ndarray): The codes of the Pauli operators.
+        offsets(list): The Pauli operators of string i are those from
+            offsets[i] to offsets[i + 1].
+    """
+    qubits = []
+    codes = []
+    offsets = [0]
+    for term in terms:
+        for qubit, action in term:
+            qubits.append(qubit)
+            codes.append(_PAULI_CODES[action])
+        offsets.append(len(qubits))
+    return (numpy.array(qubits, dtype=int), numpy.array(codes, dtype=int),
+            offsets)
+
+
+def _grown(bitsets, axis):
+    """Return bitsets with twice as many words along an axis."""
+    shape = list(bitsets.shape)
+    shape[axis] *= 2
+    grown = numpy.zeros(shape, dtype=numpy.uint64)
+    grown[tuple(slice(0, size) for size in bitsets.shape)] = bitsets
+    return grown
+
+
+def _qubit_wise_groups(qubits, codes, offsets, n_qubits):
+    """Assign Pauli strings first-fit to qubit-wise commuting groups.
+
+    Bit g of the bitset conflicts[q, p] is set when group g acts on qubit
+    q with a Pauli operator other than p, so the groups a string
+    conflicts with are the union of the bitsets of its Pauli operators.
+
+    Returns:
+        The group index of each string.
+    """
+    n_terms = len(offsets) - 1
+    assignments = numpy.zeros(n_terms, dtype=int)
+    conflicts = numpy.zeros((n_qubits, 3, _INITIAL_GROUP_WORDS),
+                            dtype=numpy.uint64)
+    n_groups = 0
+    for index in range(n_terms):
+        term_qubits = qubits[offsets[index]:offsets[index + 1]]
+        term_codes = codes[offsets[index]:offsets[index + 1]]
+        term_conflicts = numpy.bitwise_or.reduce(
+            conflicts[term_qubits, term_codes], axis=0)
+
+        # The first group without conflict, at most n_groups.
+        free_words = numpy.flatnonzero(~term_conflicts)
+        if len(free_words):
+            word = free_words[0]
+            free_bits = ~int(term_conflicts[word])
+            group = 64 * word + (free_bits & -free_bits).bit_length() - 1
+        else:
+            group = n_groups
+        if group == n_groups:
+            n_groups += 1
+            if n_groups > 64 * conflicts.shape[2]:
+                conflicts = _grown(conflicts, 2)
+
+        conflicts[term_qubits[:, None], _OTHER_PAULIS[term_codes],
+                  group // 64] |= numpy.uint64(1 << group % 64)
+        assignments[index] = group
+    return assignments
+
+
+def _commuting_groups(terms, qubits, codes, offsets, n_qubits):
+    """Assign Pauli strings first-fit to commuting groups.
+
+    The symplectic product that decides commutation is bilinear, so a
+    string commutes with all terms of a group if and only if it commutes
+    with a basis of their span over GF(2). As the span is isotropic, its
+    dimension is at most n_qubits. Bit r of the bitset
+    anticommutes[q, p, g] is set when the basis row r of group g acts on
+    qubit q with a Pauli operator other than the identity and p, so the
+    rows a string anticommutes with are the exclusive or of the bitsets of
+    its Pauli operators.
+
+    Returns:
+        The group index of each string.
+    """
+    n_terms = len(offsets) - 1
+    assignments = numpy.zeros(n_terms, dtype=int)
+    row_words = max(1, -(-n_qubits // 64))
+    anticommutes = numpy.zeros(
+        (n_qubits, 3, 64 * _INITIAL_GROUP_WORDS, row_words),
+        dtype=numpy.uint64)
+    # The basis of the span of each group, by leading bit of the integer
+    # with the Z-mask of a string above its X-mask.
+    bases = []
+    for index in range(n_terms):
+        term_qubits = qubits[offsets[index]:offsets[index + 1]]
+        term_codes = codes[offsets[index]:offsets[index + 1]]
+        blocked = numpy.bitwise_xor.reduce(
+            anticommutes[term_qubits, term_codes, :len(bases)],
+            axis=0).any(axis=1)
+        free_groups = numpy.flatnonzero(~blocked)
+        if len(free_groups):
+            group = free_groups[0]
+        else:
+            group = len(bases)
+            bases.append({})
+            if len(bases) > anticommutes.shape[2]:
+                anticommutes = _grown(anticommutes, 2)
+        assignments[index] = group
+
+        # Reduce the string by the basis of the group, from the leading
+        # bit down, and add it to the basis if it is independent.
+        basis = bases[group]
+        x_mask, z_mask = _pauli_term_masks(terms[index], n_qubits)
+        reduced = x_mask | z_mask << n_qubits
+        while reduced:
+            leading_bit = reduced.bit_length() - 1
+            if leading_bit not in basis:
+                row = len(basis)
+                basis[leading_bit] = reduced
+                anticommutes[term_qubits[:, None],
+                             _OTHER_PAULIS[term_codes], group,
+                             row // 64] |= numpy.uint64(1 << row % 64)
+                break
+            reduced ^= basis[leading_bit]
+    return assignments
+
+
+def commuting_term_groups(qubit_operator, qubit_wise=False,
+                          sort_groups=True):
+    """Partition the terms of a QubitOperator into commuting groups.
+
+    Terms are placed greedily, in order of decreasing coefficient
+    magnitude, in the first group whose terms they all commute with, i.e.
+    the commutation graph of the terms is colored first-fit with the
+    largest terms first. The graph is never built: the groups a term
+    conflicts with are found at once by combining bitsets over the groups,
+    packed in 64-bit words, for each of its Pauli operators, so that
+    operators with 10 ** 5 terms are partitioned in seconds.
+
+    By default, the terms of each group are sorted, so that consecutive
+    terms share as long a prefix of Pauli operators as possible: the
+    change of basis gates and CNOT ladders of that prefix then cancel
+    between their exponentials (see pauli_exp_to_qasm).
+
+    Args:
+        qubit_operator (QubitOperator): The operator whose terms to group.
+        qubit_wise (bool): Whether terms of a group must commute qubit by
+            qubit, i.e. act with the same Pauli operator on each qubit
+            they share, rather than only commute.
+        sort_groups (bool): Whether to sort the terms of each group rather
+            than keep them in order of decreasing coefficient magnitude.
+
+    Returns:
+        A list of groups, in order of creation, each a list of
+        QubitOperator terms dictionary keys.
+    """
+    terms = sorted(qubit_operator.terms,
+                   key=lambda term: (-abs(qubit_operator.terms[term]), term))
+    if not terms:
+        return []
+    n_qubits = count_qubits(qubit_operator)
+    qubits, codes, offsets = _pauli_string_arrays(terms)
+    if qubit_wise:
+        assignments = _qubit_wise_groups(qubits, codes, offsets, n_qubits)
+    else:
+        assignments = _commuting_groups(terms, qubits, codes, offsets,
+                                        n_qubits)
+
+    groups = [[] for _ in range(assignments.max() + 1)]
+    for term, group in zip(terms, assignments):
+        groups[group].append(term)
+    if sort_groups:
+        groups = [sorted(group) for group in groups]
+    return groups
@@ -0,0 +1,74 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _commuting_term_groups.py."""
+from __future__ import absolute_import
+
+import unittest
+
+from openfermion.ops import QubitOperator
+from openfermion.utils import commutator, commuting_term_groups
+
+
+class CommutingTermGroupsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hamiltonian = (QubitOperator('X0 X1', 1.) +
+                            QubitOperator('Y0 Y1', .8) +
+                            QubitOperator('Z0 Z1', .6) +
+                            QubitOperator('Z0', .5) +
+                            QubitOperator('X0 Z2', .4) +
+                            QubitOperator('Y1 X2', .3) +
+                            QubitOperator('', .1))
+
+    def assert_partition(self, groups):
+        terms = [term for group in groups for term in group]
+        self.assertEqual(sorted(terms), sorted(self.hamiltonian.terms))
+        for group in groups:
+            self.assertEqual(group, sorted(group))
+
+    def test_commuting(self):
+        groups = commuting_term_groups(self.hamiltonian)
+        self.assert_partition(groups)
+        for group in groups:
+            for term_a in group:
+                for term_b in group:
+                    self.assertEqual(
+                        commutator(QubitOperator(term_a),
+                                   QubitOperator(term_b)),
+                        QubitOperator())
+        # The largest term comes first and gathers its commuting terms.
+        self.assertEqual(groups[0], [(), ((0, 'X'), (1, 'X')),
+                                     ((0, 'Y'), (1, 'Y')),
+                                     ((0, 'Z'), (1, 'Z'))])
+
+    def test_qubit_wise(self):
+        groups = commuting_term_groups(self.hamiltonian, qubit_wise=True)
+        self.assert_partition(groups)
+        for group in groups:
+            actions = {}
+            for term in group:
+                for index, action in term:
+                    self.assertEqual(actions.setdefault(index, action),
+                                     action)
+        self.assertEqual(len(groups), 3)
+
+    def test_unsorted_groups(self):
+        groups = commuting_term_groups(self.hamiltonian, sort_groups=False)
+        self.assertEqual([sorted(group) for group in groups],
+                         commuting_term_groups(self.hamiltonian))
+        self.assertEqual(groups[0], [((0, 'X'), (1, 'X')),
+                                     ((0, 'Y'), (1, 'Y')),
+                                     ((0, 'Z'), (1, 'Z')), ()])
+
+    def test_empty(self):
+        self.assertEqual(commuting_term_groups(QubitOperator()), [])
@@ -0,0 +1,337 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Matrix-free molecular Hamiltonians on alpha and beta occupation strings."""
+from __future__ import absolute_import
+
+import itertools
+
+import numpy
+import scipy.sparse
+import scipy.sparse.linalg
+
+import openfermion.hamiltonians
+from openfermion.config import *
+from openfermion.ops import InteractionOperator
+
+
+def _occupation_strings(n_orbitals, n_electrons):
+    """Return the occupations of all strings of n_electrons in n_orbitals.
+
+    Returns:
+        occupations (ndarray): An array of 0s and 1s whose rows are the
+            strings in lexicographic order of their occupied orbitals.
+    """
+    strings = list(itertools.combinations(range(n_orbitals), n_electrons))
+    occupations = numpy.zeros((len(strings), n_orbitals), dtype=int)
+    for index, occupied_orbitals in enumerate(strings):
+        occupations[index, list(occupied_orbitals)] = 1
+    return occupations
+
+
+def _excitation_table(occupations):
+    """Tabulate the single excitations E_ps = a^dagger_p a_s of strings.
+
+    Args:
+        occupations (ndarray): The strings, as returned by
+            _occupation_strings.
+
+    Returns:
+        A list with, for each pair (p, s) in row-major order, the indices
+        of the strings not annihilated by E_ps, the indices of their images
+        and the signs of the images. Each string has at most one image, so
+        the images of one pair are distinct.
+    """
+    n_strings, n_orbitals = occupations.shape
+    powers = 2 ** numpy.arange(n_orbitals)
+    index = {code: i for i, code in enumerate(occupations.dot(powers))}
+    # Occupied orbitals below each orbital, which fix the signs.
+    below = numpy.cumsum(occupations, axis=1) - occupations
+
+    table = []
+    for p, s in itertools.product(range(n_orbitals), repeat=2):
+        if p == s:
+            sources = numpy.flatnonzero(occupations[:, s])
+            table.append((sources, sources, numpy.ones(len(sources))))
+            continue
+        sources = numpy.flatnonzero(occupations[:, s] &
+                                    (1 - occupations[:, p]))
+        codes = occupations[sources].dot(powers) - 2 ** s + 2 ** p
+        targets = numpy.array([index[code] for code in codes], dtype=int)
+        # Removing s passes the orbitals below it, adding p those below p
+        # other than s.
+        parities = (below[sources, s] + below[sources, p] -
+                    (1 if s < p else 0))
+        table.append((sources, targets, (-1.) ** parities))
+    return table
+
+
+class FCIHamiltonian(scipy.sparse.linalg.LinearOperator):
+    """A molecular Hamiltonian restricted to fixed numbers of electrons.
+
+    The Hamiltonian acts on the determinants with n_alpha spin-up and
+    n_beta spin-down electrons. A determinant is the product of creation
+    operators of its occupied alpha orbitals in ascending order, followed
+    by those of its beta orbitals. Vectors are indexed by (alpha string,
+    beta string) in row-major order, i.e. a vector reshaped into
+    (n_alpha_strings, n_beta_strings) is the matrix of coefficients used
+    by the sigma build.
+
+    Products with vectors never build a matrix. Writing the Hamiltonian as
+
+    .. math::
+
+        H = c + \\sum k_{ps} E_{ps} + \\sum G_{ps,qr} E_{ps} E_{qr},
+
+    where E_ps = a^dagger_p a_s are spin-conserving excitations, each
+    product applies the precomputed single-excitation tables of the alpha
+    and beta strings, contracts with G as one matrix product and applies
+    the tables again. Memory scales as n_orbitals ** 2 times the number of
+    determinants, far less than a Jordan-Wigner matrix.
+
+    As a LinearOperator, an FCIHamiltonian can be passed to
+    get_ground_state, get_gap, davidson and expectation. The jw_state and
+    fci_vector methods convert between its vectors and Jordan-Wigner
+    states.
+
+    Attributes:
+        n_orbitals (int): The number of spatial orbitals.
+        n_alpha (int): The number of spin-up electrons.
+        n_beta (int): The number of spin-down electrons.
+        constant (complex): The constant of the Hamiltonian.
+        alpha_occupations (ndarray): The 0/1 occupations of the spatial
+            orbitals by each alpha string.
+        beta_occupations (ndarray): The same for the beta strings.
+    """
+
+    def __init__(self, hamiltonian, n_alpha, n_beta):
+        """
+        Args:
+            hamiltonian (InteractionOperator or MolecularData): The
+                Hamiltonian, with even modes spin-up and odd modes
+                spin-down. It must conserve the numbers of electrons of
+                each spin.
+            n_alpha (int): The number of spin-up electrons.
+            n_beta (int): The number of spin-down electrons.
+
+        Raises:
+            TypeError: Invalid hamiltonian.
+            ValueError: Invalid numbers of electrons or hamiltonian not
+                conserving the numbers of electrons of each spin.
+        """
+        if isinstance(hamiltonian, openfermion.hamiltonians.MolecularData):
+            hamiltonian = hamiltonian.get_molecular_hamiltonian()
+        if not isinstance(hamiltonian, InteractionOperator):
+            raise TypeError('hamiltonian must be an InteractionOperator or '
+                            'MolecularData.')
+        n_qubits = hamiltonian.n_qubits
+        if n_qubits % 2:
+            raise ValueError('hamiltonian must act on an even number of '
+                             'modes.')
+        self.n_orbitals = n_qubits // 2
+        if not (0 <= n_alpha <= self.n_orbitals and
+                0 <= n_beta <= self.n_orbitals):
+            raise ValueError('Invalid numbers of electrons.')
+        self.n_alpha = n_alpha
+        self.n_beta = n_beta
+        self.constant = hamiltonian.constant
+
+        self.alpha_occupations = _occupation_strings(self.n_orbitals,
+                                                     n_alpha)
+        self.beta_occupations = _occupation_strings(self.n_orbitals, n_beta)
+        self._alpha_table = _excitation_table(self.alpha_occupations)
+        self._beta_table = _excitation_table(self.beta_occupations)
+        self._set_coefficients(hamiltonian.one_body_tensor,
+                               hamiltonian.two_body_tensor)
+
+        dimension = (len(self.alpha_occupations) *
+                     len(self.beta_occupations))
+        dtype = numpy.result_type(float, numpy.asarray(self.constant),
+                                  hamiltonian.one_body_tensor,
+                                  hamiltonian.two_body_tensor)
+        super(FCIHamiltonian, self).__init__(dtype, (dimension, dimension))
+
+    def _set_coefficients(self, one_body, two_body):
+        """Split the coefficients of the Hamiltonian into spin blocks."""
+        spins = (slice(0, None, 2), slice(1, None, 2))
+        for sigma, tau in ((0, 1), (1, 0)):
+            if numpy.any(abs(one_body[spins[sigma], spins[tau]]) >
+                         EQ_TOLERANCE):
+                raise ValueError('hamiltonian must conserve the numbers of '
+                                 'electrons of each spin.')
+        for pattern in itertools.product((0, 1), repeat=4):
+            if (pattern[0] + pattern[1] != pattern[2] + pattern[3] and
+                    numpy.any(abs(two_body[tuple(spins[spin] for spin
+                                                 in pattern)]) >
+                              EQ_TOLERANCE)):
+                raise ValueError('hamiltonian must conserve the numbers of '
+                                 'electrons of each spin.')
+
+        # Rewrite a^p a^q a_r a_s = E_ps E_qr - delta_qs E_pr, using
+        # anticommutation to move terms whose p and s have opposite spins
+        # onto ones whose p and s have the same spin.
+        n_pairs = self.n_orbitals ** 2
+        self._one_body_coefficients = []
+        self._pair_coefficients = [[None, None], [None, None]]
+        self._coulomb = [[None, None], [None, None]]
+        self._exchange = []
+        for sigma, tau in itertools.product((0, 1), repeat=2):
+            coefficients = two_body[spins[sigma], spins[tau],
+                                    spins[tau], spins[sigma]]
+            if sigma != tau:
+                coefficients = coefficients - two_body[
+                    spins[sigma], spins[tau], spins[sigma],
+                    spins[tau]].transpose(0, 1, 3, 2)
+            self._pair_coefficients[sigma][tau] = coefficients.transpose(
+                0, 3, 1, 2).reshape(n_pairs, n_pairs)
+            self._coulomb[sigma][tau] = numpy.einsum('pqqp->pq',
+                                                     coefficients)
+            if sigma == tau:
+                self._one_body_coefficients.append(
+                    one_body[spins[sigma], spins[sigma]] -
+                    numpy.einsum('pqrq->pr', coefficients))
+                exchange = numpy.einsum('pqpq->pq', coefficients).copy()
+                numpy.fill_diagonal(exchange, 0.)
+                self._exchange.append(exchange)
+
+    def sigma(self, coefficients):
+        """Apply the Hamiltonian to a matrix of determinant coefficients.
+
+        Args:
+            coefficients (ndarray): The coefficients of the determinants as
+                an (n_alpha_strings, n_beta_strings) array.
+
+        Returns:
+            The coefficients of the product, as an array of the same shape.
+        """
+        dtype = numpy.result_type(self.dtype, coefficients)
+        coefficients = numpy.asarray(coefficients, dtype=dtype)
+        n_pairs = self.n_orbitals ** 2
+        shape = coefficients.shape
+
+        # Apply every excitation of each spin to the coefficients.
+        excited = [numpy.zeros((n_pairs,) + shape, dtype),
+                   numpy.zeros((n_pairs,) + shape, dtype)]
+        for pair, (sources, targets, signs) in enumerate(self._alpha_table):
+            excited[0][pair, targets] = (signs[:, None] *
+                                         coefficients[sources])
+        for pair, (sources, targets, signs) in enumerate(self._beta_table):
+            excited[1][pair][:, targets] = (coefficients[:, sources] *
+                                            signs)
+
+        product = self.constant * coefficients
+        for sigma in (0, 1):
+            product += numpy.tensordot(
+                self._one_body_coefficients[sigma].ravel(), excited[sigma],
+                axes=1)
+
+        # Contract the excitations with the two-body coefficients and
+        # apply the excitations again.
+        flat = [array.reshape(n_pairs, -1) for array in excited]
+        for sigma, table in ((0, self._alpha_table), (1, self._beta_table)):
+            contracted = (
+                self._pair_coefficients[sigma][0].dot(flat[0]) +
+                self._pair_coefficients[sigma][1].dot(flat[1])).reshape(
+                    (n_pairs,) + shape)
+            for pair, (sources, targets, signs) in enumerate(table):
+                if sigma == 0:
+                    product[targets] += (signs[:, None] *
+                                         contracted[pair, sources])
+                else:
+                    product[:, targets] += (contracted[pair][:, sources] *
+                                            signs)
+        return product
+
+    def _matvec(self, vector):
+        shape = (len(self.alpha_occupations), len(self.beta_occupations))
+        return self.sigma(numpy.reshape(vector, shape)).reshape(
+            numpy.shape(vector))
+
+    def _adjoint(self):
+        # The Hamiltonian is assumed Hermitian.
+        return self
+
+    def diagonal(self):
+        """Return the energies of the determinants, i.e. the diagonal."""
+        occupations = (self.alpha_occupations, self.beta_occupations)
+        spin_energies = []
+        for sigma in (0, 1):
+            occupation = occupations[sigma]
+            pair_energies = (self._coulomb[sigma][sigma] -
+                             self._exchange[sigma])
+            spin_energies.append(
+                occupation.dot(numpy.diag(
+                    self._one_body_coefficients[sigma])) +
+                occupation.dot(self._exchange[sigma].sum(axis=1)) +
+                numpy.einsum('ip,pq,iq->i', occupation, pair_energies,
+                             occupation))
+        diagonal = (self.constant + spin_energies[0][:, None] +
+                    spin_energies[1][None, :] +
+                    occupations[0].dot(self._coulomb[0][1]).dot(
+                        occupations[1].T) +
+                    occupations[1].dot(self._coulomb[1][0]).dot(
+                        occupations[0].T).T)
+        return diagonal.ravel()
+
+    def _jw_indices_and_signs(self):
+        """Return the Jordan-Wigner basis states of the determinants.
+
+        Returns:
+            indices (ndarray): The index of each determinant in the
+                Jordan-Wigner basis.
+            signs (ndarray): The sign of each determinant relative to its
+                Jordan-Wigner basis state, whose creation operators are in
+                ascending order of mode.
+        """
+        n_qubits = 2 * self.n_orbitals
+        alpha_powers = 2 ** (n_qubits - 1 - 2 * numpy.arange(
+            self.n_orbitals))
+        indices = (self.alpha_occupations.dot(alpha_powers)[:, None] +
+                   self.beta_occupations.dot(alpha_powers // 2)[None, :])
+        # Interleaving the modes moves each beta orbital before the alpha
+        # orbitals of higher index.
+        lower = numpy.tril(numpy.ones((self.n_orbitals, self.n_orbitals),
+                                      dtype=int), -1)
+        transpositions = self.alpha_occupations.dot(lower).dot(
+            self.beta_occupations.T)
+        return indices.ravel(), (-1.) ** transpositions.ravel()
+
+    def jw_state(self, vector):
+        """Return the Jordan-Wigner state of a vector of determinants.
+
+        Args:
+            vector (ndarray): The coefficients of the determinants.
+
+        Returns:
+            state (ndarray): The state on 2 * n_orbitals qubits.
+        """
+        indices, signs = self._jw_indices_and_signs()
+        state = numpy.zeros(2 ** (2 * self.n_orbitals),
+                            dtype=numpy.result_type(float, vector))
+        state[indices] = signs * numpy.ravel(vector)
+        return state
+
+    def fci_vector(self, state):
+        """Return the coefficients of the determinants in a state.
+
+        Args:
+            state (ndarray or sparse): A Jordan-Wigner state on
+                2 * n_orbitals qubits. Its components outside the space of
+                the determinants are ignored.
+
+        Returns:
+            vector (ndarray): The coefficients of the determinants.
+        """
+        if scipy.sparse.issparse(state):
+            state = state.toarray()
+        indices, signs = self._jw_indices_and_signs()
+        return signs * numpy.ravel(state)[indices]
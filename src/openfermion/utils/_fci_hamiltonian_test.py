@@ -0,0 +1,131 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _fci_hamiltonian.py."""
+from __future__ import absolute_import
+
+import itertools
+import os
+import unittest
+
+import numpy
+
+from openfermion.config import DATA_DIRECTORY
+from openfermion.hamiltonians import MolecularData
+from openfermion.ops import InteractionOperator
+from openfermion.transforms import get_sparse_operator
+from openfermion.utils import (davidson, expectation, get_gap,
+                               get_ground_state, jw_configuration_state)
+from openfermion.utils._fci_hamiltonian import FCIHamiltonian
+from openfermion.utils._testing_utils import random_interaction_operator
+
+
+def random_spin_conserving_operator(n_qubits, real=True):
+    """Return a random InteractionOperator conserving each spin's number."""
+    operator = random_interaction_operator(n_qubits, real=real)
+    spins = (slice(0, None, 2), slice(1, None, 2))
+    operator.one_body_tensor[spins[0], spins[1]] = 0.
+    operator.one_body_tensor[spins[1], spins[0]] = 0.
+    for pattern in itertools.product((0, 1), repeat=4):
+        if pattern[0] + pattern[1] != pattern[2] + pattern[3]:
+            operator.two_body_tensor[
+                tuple(spins[spin] for spin in pattern)] = 0.
+    return operator
+
+
+class FCIHamiltonianTest(unittest.TestCase):
+
+    def setUp(self):
+        self.molecule = MolecularData(filename=os.path.join(
+            DATA_DIRECTORY, 'H1-Li1_sto-3g_singlet_1.45'))
+
+    def assert_matches_jordan_wigner(self, operator, n_alpha, n_beta):
+        fci_hamiltonian = FCIHamiltonian(operator, n_alpha, n_beta)
+        dimension = fci_hamiltonian.shape[0]
+        matrix = fci_hamiltonian.dot(numpy.eye(dimension))
+
+        # Map the determinants to Jordan-Wigner states.
+        basis = numpy.array([fci_hamiltonian.jw_state(vector)
+                             for vector in numpy.eye(dimension)]).T
+        expected = basis.T.dot(get_sparse_operator(operator).dot(basis))
+        self.assertTrue(numpy.allclose(matrix, expected))
+        self.assertTrue(numpy.allclose(fci_hamiltonian.diagonal(),
+                                       numpy.diag(expected)))
+
+    def test_molecule(self):
+        hamiltonian = self.molecule.get_molecular_hamiltonian()
+        self.assert_matches_jordan_wigner(hamiltonian, 2, 2)
+        self.assert_matches_jordan_wigner(hamiltonian, 3, 1)
+
+    def test_random_spin_conserving_operator(self):
+        operator = random_spin_conserving_operator(8, real=False)
+        operator.constant = 0.3
+        for n_alpha, n_beta in ((0, 0), (1, 2), (2, 2), (4, 1), (4, 4)):
+            self.assert_matches_jordan_wigner(operator, n_alpha, n_beta)
+
+    def test_ground_state(self):
+        fci_hamiltonian = FCIHamiltonian(self.molecule, 2, 2)
+        energy, state = get_ground_state(fci_hamiltonian)
+        self.assertAlmostEqual(energy, self.molecule.fci_energy)
+        self.assertAlmostEqual(expectation(fci_hamiltonian, state),
+                               self.molecule.fci_energy)
+
+        energies, states = davidson(fci_hamiltonian, n_roots=2)
+        self.assertAlmostEqual(energies[0], self.molecule.fci_energy)
+        self.assertAlmostEqual(energies[1] - energies[0],
+                               get_gap(fci_hamiltonian))
+
+        # The ground state is also the ground state of the full matrix.
+        jw_state = fci_hamiltonian.jw_state(states[:, 0])
+        sparse_operator = get_sparse_operator(
+            self.molecule.get_molecular_hamiltonian())
+        self.assertAlmostEqual(expectation(sparse_operator, jw_state),
+                               self.molecule.fci_energy)
+        self.assertTrue(numpy.allclose(
+            fci_hamiltonian.fci_vector(jw_state), states[:, 0]))
+
+    def test_hartree_fock_state(self):
+        fci_hamiltonian = FCIHamiltonian(self.molecule, 2, 2)
+        vector = fci_hamiltonian.fci_vector(jw_configuration_state(
+            range(4), 12))
+        self.assertEqual(abs(vector[0]), 1.)
+        self.assertEqual(numpy.count_nonzero(vector), 1)
+        self.assertAlmostEqual(expectation(fci_hamiltonian, vector),
+                               self.molecule.hf_energy)
+
+    def test_bad_hamiltonian_type(self):
+        with self.assertRaises(TypeError):
+            FCIHamiltonian(get_sparse_operator(
+                self.molecule.get_molecular_hamiltonian()), 2, 2)
+
+    def test_odd_number_of_modes(self):
+        with self.assertRaises(ValueError):
+            FCIHamiltonian(random_interaction_operator(3), 1, 1)
+
+    def test_bad_numbers_of_electrons(self):
+        with self.assertRaises(ValueError):
+            FCIHamiltonian(self.molecule, 7, 0)
+        with self.assertRaises(ValueError):
+            FCIHamiltonian(self.molecule, 1, -1)
+
+    def test_spin_flip_one_body(self):
+        operator = random_spin_conserving_operator(4)
+        operator.one_body_tensor[0, 1] = 1.
+        with self.assertRaises(ValueError):
+            FCIHamiltonian(operator, 1, 1)
+
+    def test_spin_flip_two_body(self):
+        operator = InteractionOperator(
+            0., numpy.zeros((4, 4)), numpy.zeros((4, 4, 4, 4)))
+        operator.two_body_tensor[0, 2, 0, 1] = 1.
+        with self.assertRaises(ValueError):
+            FCIHamiltonian(operator, 1, 1)
@@ -15,6 +15,7 @@ from __future__ import absolute_import
 from future.utils import iteritems, itervalues
 
 import numpy
+from openfermion._profiling import profiled
 import openfermion.hamiltonians
 
 from openfermion.ops import FermionOperator, normal_ordered
@@ -25,6 +26,7 @@ from openfermion.utils._commutators import (
     trivially_double_commutes_dual_basis_using_term_info)
 
 
+@profiled
 def low_depth_second_order_trotter_error_operator(
         terms, indices=None, is_hopping_operator=None, jellium_only=False,
         verbose=False):
@@ -15,15 +15,21 @@ from __future__ import absolute_import
 from builtins import map, zip
 
 import copy
+import heapq
 import marshal
 import numpy
 import os
+import shutil
+import struct
+import tempfile
+import zipfile
 
 from openfermion.config import DATA_DIRECTORY, EQ_TOLERANCE
 
 from openfermion.ops import (DiagonalCoulombHamiltonian, FermionOperator,
                              InteractionOperator, InteractionRDM,
-                             PolynomialTensor, QubitOperator, normal_ordered)
+                             PolynomialTensor, QuadraticHamiltonian,
+                             QubitOperator, SymbolicOperator, normal_ordered)
 
 from scipy.sparse import spmatrix
 
@@ -40,6 +46,14 @@ def inline_sum(summands, seed):
     Returns:
         T: The result of adding all the factors into the zero value.
     """
+    if isinstance(seed, SymbolicOperator):
+        # Accumulate terms directly into a single dictionary.
+        builder = seed.builder()
+        builder.add_operator(seed)
+        for r in summands:
+            builder.add_operator(r)
+        seed.terms = builder.build().terms
+        return seed
     for r in summands:
         seed += r
     return seed
@@ -406,17 +420,437 @@ def inverse_fourier_transform(hamiltonian, grid, spinless):
                                      vec_func_2=grid.momentum_vector)
 
 
-def load_operator(file_name=None, data_directory=None, plain_text=False):
-    """Load FermionOperator or QubitOperator from file.
+# Version of the binary format written by save_operator.
+OPERATOR_FILE_FORMAT_VERSION = 1
+
+# Number of terms decoded, transformed or written at a time when streaming.
+_TERM_CHUNK_SIZE = 65536
+
+# Number of terms in each block of a sorted run.
+_RUN_BLOCK_SIZE = 4096
+
+_SYMBOLIC_OPERATOR_TYPES = {'FermionOperator': FermionOperator,
+                            'QubitOperator': QubitOperator}
+
+
+def _symbolic_operator_arrays(operator):
+    """Flatten the terms of a SymbolicOperator into columnar arrays.
+
+    Returns:
+        A dictionary with the index and action code (position in
+        operator.actions) of every factor, the offset of each term in the
+        factor arrays and the complex coefficient of each term.
+    """
+    terms = operator.terms
+    n_terms = len(terms)
+    term_lengths = numpy.fromiter((len(term) for term in terms),
+                                  numpy.int64, n_terms)
+    term_offsets = numpy.zeros(n_terms + 1, numpy.int64)
+    numpy.cumsum(term_lengths, out=term_offsets[1:])
+    n_factors = int(term_offsets[-1])
+
+    action_codes = {action: code for code, action in
+                    enumerate(operator.actions)}
+    indices = numpy.fromiter((index for term in terms for index, _ in term),
+                             numpy.int64, n_factors)
+    actions = numpy.fromiter((action_codes[action] for term in terms
+                              for _, action in term),
+                             numpy.int8, n_factors)
+    coefficients = numpy.fromiter(terms.values(), complex, n_terms)
+    return {'indices': indices, 'actions': actions,
+            'term_offsets': term_offsets, 'coefficients': coefficients}
+
+
+def _memory_map_npz(file_path):
+    """Memory-map the arrays of an uncompressed .npz archive.
+
+    numpy.load cannot memory-map arrays inside an archive, but arrays
+    stored without compression are contiguous in the file, so each one can
+    be mapped at its offset. Scalars and empty arrays are read normally.
+    """
+    arrays = {}
+    with zipfile.ZipFile(file_path) as archive, \
+            open(file_path, 'rb') as npz_file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise OperatorUtilsError(
+                    'Cannot memory-map compressed array {}.'.format(
+                        info.filename))
+
+            # Skip the local file header to reach the .npy data.
+            npz_file.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack('<HH',
+                                                      npz_file.read(4))
+            array_start = info.header_offset + 30 + name_length + extra_length
+            npz_file.seek(array_start)
+            version = numpy.lib.format.read_magic(npz_file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = (
+                    numpy.lib.format.read_array_header_1_0(npz_file))
+            else:
+                shape, fortran_order, dtype = (
+                    numpy.lib.format.read_array_header_2_0(npz_file))
+
+            name = info.filename[:-4]
+            if shape and numpy.prod(shape):
+                arrays[name] = numpy.memmap(
+                    file_path, dtype=dtype, mode='r', shape=shape,
+                    order='F' if fortran_order else 'C',
+                    offset=npz_file.tell())
+            else:
+                npz_file.seek(array_start)
+                arrays[name] = numpy.lib.format.read_array(npz_file)
+    return arrays
+
+
+def _read_operator_arrays(file_path, memory_map=False):
+    """Read the arrays of an operator saved in the binary format."""
+    if memory_map:
+        arrays = _memory_map_npz(file_path)
+    else:
+        with numpy.load(file_path) as npz_file:
+            arrays = {name: npz_file[name] for name in npz_file.files}
+
+    version = int(arrays['format_version'])
+    if version > OPERATOR_FILE_FORMAT_VERSION:
+        raise OperatorUtilsError(
+            'Operator file format version {} is newer than the supported '
+            'version {}.'.format(version, OPERATOR_FILE_FORMAT_VERSION))
+    return str(arrays['operator_type']), arrays
+
+
+def _read_legacy_operator_terms(file_path):
+    """Read the operator type and terms dictionary from a marshal file."""
+    with open(file_path, 'rb') as f:
+        data = marshal.load(f)
+    return data[0], data[1]
+
+
+def _iterate_term_arrays(actions, arrays):
+    """Decode (term, coefficient) pairs from columnar operator arrays."""
+    term_offsets = arrays['term_offsets']
+    n_terms = term_offsets.shape[0] - 1
+
+    for chunk_start in range(0, n_terms, _TERM_CHUNK_SIZE):
+        chunk_stop = min(chunk_start + _TERM_CHUNK_SIZE, n_terms)
+        offsets = term_offsets[chunk_start:chunk_stop + 1].tolist()
+        indices = arrays['indices'][offsets[0]:offsets[-1]].tolist()
+        codes = arrays['actions'][offsets[0]:offsets[-1]].tolist()
+        factors = list(zip(indices, [actions[code] for code in codes]))
+        coefficients = arrays['coefficients'][chunk_start:chunk_stop].tolist()
+        for i, coefficient in enumerate(coefficients):
+            yield (tuple(factors[offsets[i] - offsets[0]:
+                                 offsets[i + 1] - offsets[0]]),
+                   coefficient)
+
+
+def _read_symbolic_operator_file(file_path):
+    """Open a saved FermionOperator or QubitOperator for streaming.
+
+    Returns:
+        The class of the saved operator and an iterator over its
+        (term, coefficient) pairs.
+
+    Raises:
+        TypeError: Operator of invalid type.
+    """
+    if zipfile.is_zipfile(file_path):
+        operator_type, arrays = _read_operator_arrays(file_path,
+                                                      memory_map=True)
+        if operator_type not in _SYMBOLIC_OPERATOR_TYPES:
+            raise TypeError('Operator of invalid type.')
+        operator_class = _SYMBOLIC_OPERATOR_TYPES[operator_type]
+        return operator_class, _iterate_term_arrays(operator_class.actions,
+                                                    arrays)
+
+    operator_type, operator_terms = _read_legacy_operator_terms(file_path)
+    if operator_type not in _SYMBOLIC_OPERATOR_TYPES:
+        raise TypeError('Operator of invalid type.')
+    return (_SYMBOLIC_OPERATOR_TYPES[operator_type],
+            iter(operator_terms.items()))
+
+
+def iterate_operator_terms(file_name=None, data_directory=None):
+    """Iterate over the terms of a saved FermionOperator or QubitOperator.
+
+    The file is memory-mapped and terms are decoded a chunk at a time, so
+    operators too large to build in memory can be processed term by term.
+
+    Args:
+        file_name: The name of the saved file.
+        data_directory: Optional data directory to change from default data
+                        directory specified in config file.
+
+    Yields:
+        (term, coefficient) pairs, where term is a tuple of factors as in
+        SymbolicOperator.terms.
+
+    Raises:
+        TypeError: Operator of invalid type.
+    """
+    file_path = get_file_path(file_name, data_directory)
+    _, terms = _read_symbolic_operator_file(file_path)
+    for term, coefficient in terms:
+        yield term, coefficient
+
+
+def _chunk_terms(operator_class, terms, chunk_size):
+    """Group (term, coefficient) pairs into operators of chunk_size terms."""
+    chunk = operator_class()
+    for term, coefficient in terms:
+        chunk.terms[term] = coefficient
+        if len(chunk.terms) == chunk_size:
+            yield chunk
+            chunk = operator_class()
+    if chunk.terms:
+        yield chunk
+
+
+def iterate_operator_chunks(file_name=None, data_directory=None,
+                            chunk_size=_TERM_CHUNK_SIZE):
+    """Iterate over a saved FermionOperator or QubitOperator in chunks.
+
+    Args:
+        file_name: The name of the saved file.
+        data_directory: Optional data directory to change from default data
+                        directory specified in config file.
+        chunk_size (int): The maximum number of terms in each chunk.
+
+    Yields:
+        Operators of the saved type whose sum is the saved operator.
+
+    Raises:
+        TypeError: Operator of invalid type.
+    """
+    file_path = get_file_path(file_name, data_directory)
+    operator_class, terms = _read_symbolic_operator_file(file_path)
+    for chunk in _chunk_terms(operator_class, terms, chunk_size):
+        yield chunk
+
+
+def _write_sorted_run(file_path, terms):
+    """Write the items of a terms dictionary to file, sorted by term."""
+    items = sorted((term, complex(coefficient))
+                   for term, coefficient in terms.items())
+    with open(file_path, 'wb') as f:
+        for start in range(0, len(items), _RUN_BLOCK_SIZE):
+            marshal.dump(items[start:start + _RUN_BLOCK_SIZE], f)
+
+
+def _read_sorted_run(file_path, run_id):
+    """Yield (term, run_id, coefficient) triples from a sorted run.
+
+    The run_id separates equal terms from different runs, so that merging
+    never compares coefficients.
+    """
+    with open(file_path, 'rb') as f:
+        while True:
+            try:
+                block = marshal.load(f)
+            except EOFError:
+                return
+            for term, coefficient in block:
+                yield term, run_id, coefficient
+
+
+def _merge_sorted_runs(run_paths):
+    """Merge sorted runs, summing the coefficients of equal terms."""
+    runs = [_read_sorted_run(run_path, run_id)
+            for run_id, run_path in enumerate(run_paths)]
+    current_term = None
+    current_coefficient = 0.
+    for term, _, coefficient in heapq.merge(*runs):
+        if term == current_term:
+            current_coefficient += coefficient
+        else:
+            if current_term is not None:
+                yield current_term, current_coefficient
+            current_term = term
+            current_coefficient = coefficient
+    if current_term is not None:
+        yield current_term, current_coefficient
+
+
+def _write_npy_from_raw(npy_path, raw_path, dtype, length):
+    """Write a one-dimensional .npy file from raw array data on disk."""
+    header = {'descr': numpy.lib.format.dtype_to_descr(numpy.dtype(dtype)),
+              'fortran_order': False, 'shape': (length,)}
+    with open(npy_path, 'wb') as npy_file, open(raw_path, 'rb') as raw_file:
+        numpy.lib.format.write_array_header_1_0(npy_file, header)
+        shutil.copyfileobj(raw_file, npy_file)
+
+
+def _write_operator_terms(file_path, operator_class, terms, work_directory):
+    """Save (term, coefficient) pairs in the binary format of save_operator.
+
+    The columns are written to disk as they are produced, so memory use
+    does not depend on the number of terms.
+    """
+    operator_type = operator_class.__name__
+    action_codes = {action: code for code, action in
+                    enumerate(operator_class.actions)}
+    columns = (('indices', numpy.int64), ('actions', numpy.int8),
+               ('term_offsets', numpy.int64), ('coefficients', complex))
+    raw_paths = {name: os.path.join(work_directory, name + '.raw')
+                 for name, _ in columns}
+    raw_files = {name: open(raw_paths[name], 'wb') for name, _ in columns}
+    try:
+        lengths = {name: 0 for name, _ in columns}
+        buffers = {name: [] for name, _ in columns}
+
+        def flush():
+            for name, dtype in columns:
+                raw_files[name].write(
+                    numpy.array(buffers[name], dtype=dtype).tobytes())
+                lengths[name] += len(buffers[name])
+                buffers[name] = []
+
+        n_factors = 0
+        buffers['term_offsets'].append(0)
+        for term, coefficient in terms:
+            n_factors += len(term)
+            buffers['indices'].extend(index for index, _ in term)
+            buffers['actions'].extend(action_codes[action]
+                                      for _, action in term)
+            buffers['term_offsets'].append(n_factors)
+            buffers['coefficients'].append(coefficient)
+            if len(buffers['coefficients']) == _TERM_CHUNK_SIZE:
+                flush()
+        flush()
+    finally:
+        for raw_file in raw_files.values():
+            raw_file.close()
+
+    npy_paths = {}
+    for name, dtype in columns:
+        npy_paths[name] = os.path.join(work_directory, name + '.npy')
+        _write_npy_from_raw(npy_paths[name], raw_paths[name], dtype,
+                            lengths[name])
+        os.remove(raw_paths[name])
+    for name, value in (('format_version', OPERATOR_FILE_FORMAT_VERSION),
+                        ('operator_type', operator_type)):
+        npy_paths[name] = os.path.join(work_directory, name + '.npy')
+        numpy.save(npy_paths[name], numpy.array(value))
+
+    with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_STORED,
+                         allowZip64=True) as archive:
+        for name, npy_path in npy_paths.items():
+            archive.write(npy_path, name + '.npy')
+
+
+def transform_operator_file(transform, input_file_name, output_file_name,
+                            data_directory=None, chunk_size=_TERM_CHUNK_SIZE,
+                            allow_overwrite=False, compress=False,
+                            abs_tol=EQ_TOLERANCE, work_directory=None):
+    """Apply a linear transform to a saved operator, chunk by chunk.
+
+    The saved FermionOperator or QubitOperator is read in chunks of at
+    most chunk_size terms. Each chunk is transformed and its terms are
+    written to disk as a sorted run. The runs are then merged, summing the
+    coefficients of duplicate terms, and the result is saved in the format
+    of save_operator. Peak memory is therefore set by the chunk size (and
+    the size of a transformed chunk) rather than by the whole operator.
+
+    Since chunks are transformed independently, the transform must be
+    linear and must not depend on which terms are present. For instance,
+    pass functools.partial(bravyi_kitaev, n_qubits=n_qubits) rather than
+    bravyi_kitaev, which otherwise counts the qubits of each chunk.
+
+    The sorted runs hold every transformed term before duplicates are
+    merged, in marshal format, and the merged columns are staged in raw
+    files before the output is written, so the work directory needs free
+    space of roughly the size of the unmerged transformed operator plus
+    that of the output file. Temporary files are removed on return.
+
+    Args:
+        transform (callable): A function mapping a FermionOperator or
+            QubitOperator to a FermionOperator or QubitOperator, such as
+            jordan_wigner or normal_ordered. If None, terms are copied
+            unchanged, which together with compress=True compresses the
+            saved operator.
+        input_file_name: The name of the file holding the operator.
+        output_file_name: The name of the file to write the result to.
+        data_directory: Optional data directory to change from default data
+                        directory specified in config file.
+        chunk_size (int): The maximum number of terms transformed at once.
+        allow_overwrite: Whether to allow the output file to be overwritten.
+        compress (bool): Whether to remove small real and imaginary parts of
+            the merged coefficients, as in SymbolicOperator.compress.
+        abs_tol (float): Merged terms with smaller coefficients are dropped.
+        work_directory (str): The directory in which the temporary files
+            are created. Defaults to the directory of the output file.
+
+    Raises:
+        OperatorUtilsError: Not saved, file already exists, or the input
+            and output files are the same.
+        TypeError: Operator of invalid type.
+    """
+    input_path = get_file_path(input_file_name, data_directory)
+    output_path = get_file_path(output_file_name, data_directory)
+    if os.path.abspath(input_path) == os.path.abspath(output_path):
+        raise OperatorUtilsError('The input and output files must differ.')
+    if os.path.isfile(output_path) and not allow_overwrite:
+        raise OperatorUtilsError("Not saved, file already exists.")
+
+    operator_class, terms = _read_symbolic_operator_file(input_path)
+    if work_directory is None:
+        work_directory = os.path.dirname(os.path.abspath(output_path))
+    work_directory = tempfile.mkdtemp(dir=work_directory)
+    try:
+        # Transform each chunk and write its terms as a sorted run.
+        output_class = None
+        run_paths = []
+        for chunk in _chunk_terms(operator_class, terms, chunk_size):
+            if transform is not None:
+                chunk = transform(chunk)
+            if not isinstance(chunk, (FermionOperator, QubitOperator)):
+                raise TypeError('Operator of invalid type.')
+            output_class = type(chunk)
+            run_paths.append(os.path.join(work_directory,
+                                          'run{}'.format(len(run_paths))))
+            _write_sorted_run(run_paths[-1], chunk.terms)
+        if output_class is None:
+            output_class = (operator_class if transform is None else
+                            type(transform(operator_class())))
+
+        # Merge the runs, combining duplicate terms.
+        def merged_terms():
+            for term, coefficient in _merge_sorted_runs(run_paths):
+                if compress:
+                    if abs(coefficient.imag) <= abs_tol:
+                        coefficient = coefficient.real
+                    if abs(coefficient.real) <= abs_tol:
+                        coefficient = 1.j * coefficient.imag
+                    if abs(coefficient) > abs_tol:
+                        yield term, coefficient
+                elif abs(coefficient) >= abs_tol:
+                    yield term, coefficient
+
+        _write_operator_terms(output_path, output_class, merged_terms(),
+                              work_directory)
+    finally:
+        shutil.rmtree(work_directory)
+
+
+def load_operator(file_name=None, data_directory=None, plain_text=False,
+                  memory_map=False):
+    """Load an operator from file.
+
+    FermionOperator, QubitOperator, InteractionOperator, InteractionRDM and
+    QuadraticHamiltonian are supported, as well as files written in the
+    earlier marshal format.
 
     Args:
         file_name: The name of the saved file.
         data_directory: Optional data directory to change from default data
                         directory specified in config file.
         plain_text: Whether the input file is plain text
+        memory_map: Whether to memory-map the arrays in the file. The
+            tensors of a loaded InteractionOperator or InteractionRDM are
+            then read-only views of the file.
 
     Returns:
-        operator: The stored FermionOperator or QubitOperator
+        operator: The stored operator
 
     Raises:
         TypeError: Operator of invalid type.
@@ -434,20 +868,39 @@ def load_operator(file_name=None, data_directory=None, plain_text=False):
             operator = QubitOperator(operator_terms)
         else:
             raise TypeError('Operator of invalid type.')
-    else:
-        with open(file_path, 'rb') as f:
-            data = marshal.load(f)
-            operator_type = data[0]
-            operator_terms = data[1]
 
-        if operator_type == 'FermionOperator':
-            operator = FermionOperator()
-            for term in operator_terms:
-                operator += FermionOperator(term, operator_terms[term])
-        elif operator_type == 'QubitOperator':
-            operator = QubitOperator()
-            for term in operator_terms:
-                operator += QubitOperator(term, operator_terms[term])
+    elif not zipfile.is_zipfile(file_path):
+        operator_type, operator_terms = _read_legacy_operator_terms(
+            file_path)
+        if operator_type not in _SYMBOLIC_OPERATOR_TYPES:
+            raise TypeError('Operator of invalid type.')
+        operator = _SYMBOLIC_OPERATOR_TYPES[operator_type].builder()
+        for term in operator_terms:
+            operator.add(term, operator_terms[term])
+        operator = operator.build()
+
+    else:
+        operator_type, arrays = _read_operator_arrays(file_path, memory_map)
+        if operator_type in _SYMBOLIC_OPERATOR_TYPES:
+            operator_class = _SYMBOLIC_OPERATOR_TYPES[operator_type]
+            actions = numpy.array(operator_class.actions)
+            operator = operator_class.from_arrays(
+                arrays['indices'], actions[arrays['actions']],
+                numpy.diff(arrays['term_offsets']), arrays['coefficients'])
+        elif operator_type == 'InteractionOperator':
+            operator = InteractionOperator(arrays['constant'].item(),
+                                           arrays['one_body_tensor'],
+                                           arrays['two_body_tensor'])
+        elif operator_type == 'InteractionRDM':
+            operator = InteractionRDM(arrays['one_body_tensor'],
+                                      arrays['two_body_tensor'])
+        elif operator_type == 'QuadraticHamiltonian':
+            operator = QuadraticHamiltonian(
+                arrays['combined_hermitian_part'],
+                arrays.get('antisymmetric_part'),
+                arrays['constant'].item())
+            operator.chemical_potential = (
+                arrays['chemical_potential'].item())
         else:
             raise TypeError('Operator of invalid type.')
 
@@ -456,10 +909,17 @@ def load_operator(file_name=None, data_directory=None, plain_text=False):
 
 def save_operator(operator, file_name=None, data_directory=None,
                   allow_overwrite=False, plain_text=False):
-    """Save FermionOperator or QubitOperator to file.
+    """Save an operator to file.
+
+    The binary format is an uncompressed NumPy .npz archive holding the
+    format version, the operator type and the operator data: flat
+    index and action arrays, term offsets and complex coefficients for
+    FermionOperator and QubitOperator, and the tensors themselves for
+    InteractionOperator, InteractionRDM and QuadraticHamiltonian.
 
     Args:
-        operator: An instance of FermionOperator or QubitOperator.
+        operator: An instance of FermionOperator, QubitOperator,
+            InteractionOperator, InteractionRDM or QuadraticHamiltonian.
         file_name: The name of the saved file.
         data_directory: Optional data directory to change from default data
                         directory specified in config file.
@@ -470,31 +930,67 @@ def save_operator(operator, file_name=None, data_directory=None,
     Raises:
         OperatorUtilsError: Not saved, file already exists.
         TypeError: Operator of invalid type.
+        NotImplementedError: Plain text is only supported for
+            FermionOperator and QubitOperator.
     """
     file_path = get_file_path(file_name, data_directory)
 
     if os.path.isfile(file_path) and not allow_overwrite:
         raise OperatorUtilsError("Not saved, file already exists.")
 
-    if isinstance(operator, FermionOperator):
-        operator_type = "FermionOperator"
-    elif isinstance(operator, QubitOperator):
-        operator_type = "QubitOperator"
-    elif (isinstance(operator, InteractionOperator) or
-          isinstance(operator, InteractionRDM)):
-        raise NotImplementedError('Not yet implemented for InteractionOperator'
-                                  ' or InteractionRDM.')
-    else:
-        raise TypeError('Operator of invalid type.')
+    operator_type = _operator_type(operator)
 
     if plain_text:
+        if operator_type not in _SYMBOLIC_OPERATOR_TYPES:
+            raise NotImplementedError('Plain text is not implemented for '
+                                      '{}.'.format(operator_type))
         with open(file_path, 'w') as f:
             f.write(operator_type + ":\n" + str(operator))
+        return
+
+    with open(file_path, 'wb') as f:
+        _write_operator(f, operator)
+
+
+def _operator_type(operator):
+    """Return the name under which an operator type is saved."""
+    if isinstance(operator, FermionOperator):
+        return "FermionOperator"
+    elif isinstance(operator, QubitOperator):
+        return "QubitOperator"
+    elif isinstance(operator, InteractionOperator):
+        return "InteractionOperator"
+    elif isinstance(operator, InteractionRDM):
+        return "InteractionRDM"
+    elif isinstance(operator, QuadraticHamiltonian):
+        return "QuadraticHamiltonian"
+    raise TypeError('Operator of invalid type.')
+
+
+def _write_operator(file_object, operator):
+    """Write an operator in the binary format to an open file."""
+    operator_type = _operator_type(operator)
+    if operator_type in _SYMBOLIC_OPERATOR_TYPES:
+        arrays = _symbolic_operator_arrays(operator)
+    elif operator_type == 'InteractionOperator':
+        arrays = {'constant': numpy.array(operator.constant),
+                  'one_body_tensor': operator.one_body_tensor,
+                  'two_body_tensor': operator.two_body_tensor}
+    elif operator_type == 'InteractionRDM':
+        arrays = {'one_body_tensor': operator.one_body_tensor,
+                  'two_body_tensor': operator.two_body_tensor}
     else:
-        tm = operator.terms
-        with open(file_path, 'wb') as f:
-            marshal.dump((operator_type,
-                          dict(zip(tm.keys(), map(complex, tm.values())))), f)
+        arrays = {'constant': numpy.array(operator.constant),
+                  'chemical_potential': numpy.array(
+                      operator.chemical_potential),
+                  'combined_hermitian_part':
+                      operator.combined_hermitian_part}
+        if (1, 1) in operator.n_body_tensors:
+            arrays['antisymmetric_part'] = operator.antisymmetric_part
+
+    numpy.savez(file_object, format_version=numpy.array(
+                    OPERATOR_FILE_FORMAT_VERSION),
+                operator_type=numpy.array(operator_type), **arrays)
 
 
 def reorder(operator, order_function, num_modes=None, reverse=False):
@@ -13,7 +13,11 @@
 """Tests for operator_utils."""
 from __future__ import absolute_import
 
+import functools
+import marshal
 import os
+import shutil
+import tempfile
 import unittest
 
 import numpy
@@ -371,7 +375,7 @@ class SaveLoadOperatorTest(unittest.TestCase):
     def test_basic_save(self):
         save_operator(self.fermion_operator, self.file_name)
 
-    def test_save_interaction_operator_not_implemented(self):
+    def test_save_and_load_interaction_operator(self):
         constant = 100.0
         one_body = numpy.zeros((self.n_qubits, self.n_qubits), float)
         two_body = numpy.zeros((self.n_qubits, self.n_qubits,
@@ -380,8 +384,96 @@ class SaveLoadOperatorTest(unittest.TestCase):
         two_body[1, 2, 3, 4] = 12.0
         interaction_operator = InteractionOperator(
             constant, one_body, two_body)
+        save_operator(interaction_operator, self.file_name)
+        for memory_map in (False, True):
+            loaded_operator = load_operator(self.file_name,
+                                            memory_map=memory_map)
+            self.assertIsInstance(loaded_operator, InteractionOperator)
+            self.assertEqual(loaded_operator, interaction_operator)
+            self.assertEqual(loaded_operator.constant, constant)
+        self.assertIsInstance(loaded_operator.two_body_tensor, numpy.memmap)
+
+    def test_save_and_load_interaction_rdm(self):
+        one_body = numpy.arange(9.).reshape((3, 3))
+        two_body = numpy.arange(81.).reshape((3, 3, 3, 3)) * 1.j
+        interaction_rdm = InteractionRDM(one_body, two_body)
+        save_operator(interaction_rdm, self.file_name)
+        for memory_map in (False, True):
+            loaded_rdm = load_operator(self.file_name, memory_map=memory_map)
+            self.assertIsInstance(loaded_rdm, InteractionRDM)
+            numpy.testing.assert_array_equal(loaded_rdm.one_body_tensor,
+                                             one_body)
+            numpy.testing.assert_array_equal(loaded_rdm.two_body_tensor,
+                                             two_body)
+
+    def test_save_and_load_quadratic_hamiltonian(self):
+        hermitian_part = numpy.array([[1., 2.j], [-2.j, 3.]])
+        antisymmetric_part = numpy.array([[0., .5], [-.5, 0.]])
+        for antisymmetric in (None, antisymmetric_part):
+            quadratic_hamiltonian = QuadraticHamiltonian(
+                hermitian_part, antisymmetric, 1.5, .25)
+            save_operator(quadratic_hamiltonian, self.file_name,
+                          allow_overwrite=True)
+            loaded_hamiltonian = load_operator(self.file_name)
+            self.assertIsInstance(loaded_hamiltonian, QuadraticHamiltonian)
+            self.assertEqual(loaded_hamiltonian, quadratic_hamiltonian)
+            self.assertEqual(loaded_hamiltonian.chemical_potential, .25)
+            self.assertEqual(loaded_hamiltonian.constant, 1.5)
+            numpy.testing.assert_array_equal(
+                loaded_hamiltonian.antisymmetric_part,
+                quadratic_hamiltonian.antisymmetric_part)
+
+    def test_save_interaction_operator_plain_text_not_implemented(self):
+        interaction_rdm = InteractionRDM(numpy.zeros((2, 2)),
+                                         numpy.zeros((2, 2, 2, 2)))
         with self.assertRaises(NotImplementedError):
-            save_operator(interaction_operator, self.file_name)
+            save_operator(interaction_rdm, self.file_name, plain_text=True)
+
+    def test_save_and_load_memory_mapped_qubit_operator(self):
+        save_operator(self.qubit_operator, self.file_name)
+        loaded_qubit_operator = load_operator(self.file_name,
+                                              memory_map=True)
+        self.assertEqual(loaded_qubit_operator.terms,
+                         self.qubit_operator.terms)
+
+    def test_save_and_load_empty_operator(self):
+        save_operator(FermionOperator(), self.file_name)
+        self.assertEqual(load_operator(self.file_name), FermionOperator())
+        self.assertEqual(list(iterate_operator_terms(self.file_name)), [])
+
+    def test_iterate_operator_terms(self):
+        operator = QubitOperator('', 2.)
+        for i in range(100):
+            operator += QubitOperator('X{} Z{}'.format(i, i + 1), i + 1.j)
+        save_operator(operator, self.file_name)
+        self.assertEqual(dict(iterate_operator_terms(self.file_name)),
+                         operator.terms)
+
+    def test_iterate_operator_terms_bad_type(self):
+        save_operator(InteractionRDM(numpy.zeros((2, 2)),
+                                     numpy.zeros((2, 2, 2, 2))),
+                      self.file_name)
+        with self.assertRaises(TypeError):
+            list(iterate_operator_terms(self.file_name))
+
+    def test_load_legacy_format(self):
+        file_path = os.path.join(DATA_DIRECTORY, self.file_name + '.data')
+        terms = {term: complex(coefficient) for term, coefficient in
+                 self.fermion_operator.terms.items()}
+        with open(file_path, 'wb') as f:
+            marshal.dump(('FermionOperator', terms), f)
+        self.assertEqual(load_operator(self.file_name),
+                         self.fermion_operator)
+        self.assertEqual(dict(iterate_operator_terms(self.file_name)), terms)
+
+    def test_load_newer_format_version(self):
+        file_path = os.path.join(DATA_DIRECTORY, self.file_name + '.data')
+        with open(file_path, 'wb') as f:
+            numpy.savez(f, format_version=numpy.array(
+                            OPERATOR_FILE_FORMAT_VERSION + 1),
+                        operator_type=numpy.array('FermionOperator'))
+        with self.assertRaises(OperatorUtilsError):
+            load_operator(self.file_name)
 
     def test_save_on_top_of_existing_operator_utils_error(self):
         save_operator(self.fermion_operator, self.file_name)
@@ -411,6 +503,114 @@ class SaveLoadOperatorTest(unittest.TestCase):
             save_operator('ping', 'somewhere')
 
 
+class TransformOperatorFileTest(unittest.TestCase):
+    def setUp(self):
+        self.fermion_operator = fermi_hubbard(3, 2, 1., 4., 0.5)
+        self.fermion_operator += FermionOperator('2 3^ 1^ 0', 0.25 + 1.j)
+        self.input_file_name = 'test_stream_input'
+        self.output_file_name = 'test_stream_output'
+        save_operator(self.fermion_operator, self.input_file_name)
+
+    def tearDown(self):
+        for file_name in (self.input_file_name, self.output_file_name):
+            file_path = os.path.join(DATA_DIRECTORY, file_name + '.data')
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+
+    def test_iterate_operator_chunks(self):
+        chunks = list(iterate_operator_chunks(self.input_file_name,
+                                              chunk_size=7))
+        self.assertTrue(all(len(chunk.terms) <= 7 for chunk in chunks))
+        self.assertEqual(sum(len(chunk.terms) for chunk in chunks),
+                         len(self.fermion_operator.terms))
+        self.assertEqual(inline_sum(chunks, FermionOperator()),
+                         self.fermion_operator)
+
+    def test_jordan_wigner(self):
+        transform_operator_file(jordan_wigner, self.input_file_name,
+                                self.output_file_name, chunk_size=5)
+        qubit_operator = load_operator(self.output_file_name)
+        self.assertIsInstance(qubit_operator, QubitOperator)
+        self.assertEqual(qubit_operator, jordan_wigner(self.fermion_operator))
+        self.assertEqual(set(qubit_operator.terms),
+                         set(jordan_wigner(self.fermion_operator).terms))
+        self.assertEqual(load_operator(self.output_file_name,
+                                       memory_map=True), qubit_operator)
+
+    def test_work_directory(self):
+        # By default, temporary files are made next to the output file.
+        entries = set(os.listdir(DATA_DIRECTORY))
+        transform_operator_file(jordan_wigner, self.input_file_name,
+                                self.output_file_name, chunk_size=5)
+        self.assertEqual(set(os.listdir(DATA_DIRECTORY)),
+                         entries | {self.output_file_name + '.data'})
+
+        work_directory = tempfile.mkdtemp()
+        try:
+            transform_operator_file(jordan_wigner, self.input_file_name,
+                                    self.output_file_name, chunk_size=5,
+                                    allow_overwrite=True,
+                                    work_directory=work_directory)
+            self.assertEqual(os.listdir(work_directory), [])
+        finally:
+            shutil.rmtree(work_directory)
+        self.assertEqual(load_operator(self.output_file_name),
+                         jordan_wigner(self.fermion_operator))
+
+    def test_bravyi_kitaev(self):
+        n_qubits = count_qubits(self.fermion_operator)
+        transform_operator_file(
+            functools.partial(bravyi_kitaev, n_qubits=n_qubits),
+            self.input_file_name, self.output_file_name, chunk_size=4)
+        self.assertEqual(load_operator(self.output_file_name),
+                         bravyi_kitaev(self.fermion_operator, n_qubits))
+
+    def test_normal_ordered(self):
+        transform_operator_file(normal_ordered, self.input_file_name,
+                                self.output_file_name, chunk_size=3)
+        self.assertEqual(load_operator(self.output_file_name),
+                         normal_ordered(self.fermion_operator))
+
+    def test_compress(self):
+        operator = QubitOperator('X0', 1. + 1e-12j) + QubitOperator('Z1', 1e-3)
+        save_operator(operator, self.input_file_name, allow_overwrite=True)
+        transform_operator_file(None, self.input_file_name,
+                                self.output_file_name, compress=True,
+                                abs_tol=1e-2)
+        compressed = load_operator(self.output_file_name)
+        self.assertEqual(compressed.terms, {((0, 'X'),): 1.})
+
+    def test_empty_operator(self):
+        save_operator(FermionOperator(), self.input_file_name,
+                      allow_overwrite=True)
+        transform_operator_file(jordan_wigner, self.input_file_name,
+                                self.output_file_name)
+        self.assertEqual(load_operator(self.output_file_name),
+                         QubitOperator())
+
+    def test_output_file_exists(self):
+        save_operator(self.fermion_operator, self.output_file_name)
+        with self.assertRaises(OperatorUtilsError):
+            transform_operator_file(jordan_wigner, self.input_file_name,
+                                    self.output_file_name)
+        transform_operator_file(jordan_wigner, self.input_file_name,
+                                self.output_file_name, allow_overwrite=True)
+        self.assertIsInstance(load_operator(self.output_file_name),
+                              QubitOperator)
+
+    def test_same_input_and_output(self):
+        with self.assertRaises(OperatorUtilsError):
+            transform_operator_file(jordan_wigner, self.input_file_name,
+                                    self.input_file_name,
+                                    allow_overwrite=True)
+
+    def test_bad_transform(self):
+        with self.assertRaises(TypeError):
+            transform_operator_file(get_interaction_operator,
+                                    self.input_file_name,
+                                    self.output_file_name)
+
+
 class FourierTransformTest(unittest.TestCase):
 
     def test_fourier_transform(self):
@@ -9,16 +9,37 @@
 #   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
-"""Mapping RDMs to other RDMs"""
+"""Mapping RDMs to other RDMs
+
+The maps act on the last two (one-body) or four (two-body) axes of their
+arguments, so a stack of RDMs with leading batch axes is mapped in one call.
+"""
 from __future__ import division
 import numpy
-from itertools import product
 
 
 def kronecker_delta(i, j):
     return float(i == j)
 
 
+def _one_body_delta_terms(opdm):
+    """Return the one-body terms shared by the two-body RDM maps.
+
+    Returns:
+        The tensor with elements
+        opdm[p, s] delta_{qr} + opdm[q, r] delta_{ps}
+        - opdm[q, s] delta_{pr} - opdm[p, r] delta_{qs}
+        + delta_{qs} delta_{pr} - delta_{ps} delta_{qr}.
+    """
+    identity_matrix = numpy.eye(opdm.shape[-1])
+    return (numpy.einsum('...ps,qr->...pqrs', opdm, identity_matrix) +
+            numpy.einsum('...qr,ps->...pqrs', opdm, identity_matrix) -
+            numpy.einsum('...qs,pr->...pqrs', opdm, identity_matrix) -
+            numpy.einsum('...pr,qs->...pqrs', opdm, identity_matrix) +
+            numpy.einsum('qs,pr->pqrs', identity_matrix, identity_matrix) -
+            numpy.einsum('ps,qr->pqrs', identity_matrix, identity_matrix))
+
+
 def map_two_pdm_to_one_pdm(tpdm, particle_number):
     """
     Contract a 2-RDM to a 1-RDM
@@ -32,7 +53,7 @@ def map_two_pdm_to_one_pdm(tpdm, particle_number):
     Returns:
         opdm (numpy.ndarray): The 1-RDM contracted from the tpdm.
     """
-    return numpy.einsum('prrq', tpdm) / (particle_number - 1)
+    return numpy.einsum('...prrq->...pq', tpdm) / (particle_number - 1)
 
 
 def map_two_pdm_to_two_hole_dm(tpdm, opdm):
@@ -50,18 +71,9 @@ def map_two_pdm_to_two_hole_dm(tpdm, opdm):
     Returns:
         tqdm (numpy.ndarray): The 2-hole matrix.
     """
-    ldim = opdm.shape[0]
-    tqdm = numpy.zeros_like(tpdm)
-    for p, q, r, s in product(range(ldim), repeat=4):
-        term1 = (opdm[p, s] * kronecker_delta(q, r) +
-                 opdm[q, r] * kronecker_delta(p, s))
-        term2 = -1 * (opdm[q, s] * kronecker_delta(p, r) +
-                      opdm[p, r] * kronecker_delta(q, s))
-        term3 = (kronecker_delta(q, s) * kronecker_delta(p, r) -
-                 kronecker_delta(p, s) * kronecker_delta(q, r))
-        tqdm[s, r, q, p] = tpdm[p, q, r, s] - term1 - term2 - term3
-
-    return tqdm
+    # tqdm[s, r, q, p] = tpdm[p, q, r, s] - one-body terms.
+    return numpy.ascontiguousarray(numpy.einsum(
+        '...pqrs->...srqp', tpdm - _one_body_delta_terms(opdm)))
 
 
 def map_two_hole_dm_to_two_pdm(tqdm, opdm):
@@ -79,18 +91,9 @@ def map_two_hole_dm_to_two_pdm(tqdm, opdm):
     Returns:
         tpdm (numpy.ndarray): The 2-RDM matrix.
     """
-    ldim = opdm.shape[0]
-    tpdm = numpy.zeros_like(tqdm)
-    for p, q, r, s in product(range(ldim), repeat=4):
-        term1 = (opdm[p, s] * kronecker_delta(q, r) +
-                 opdm[q, r] * kronecker_delta(p, s))
-        term2 = -1 * (opdm[q, s] * kronecker_delta(p, r) +
-                      opdm[p, r] * kronecker_delta(q, s))
-        term3 = (kronecker_delta(q, s) * kronecker_delta(p, r) -
-                 kronecker_delta(p, s) * kronecker_delta(q, r))
-        tpdm[p, q, r, s] = tqdm[r, s, p, q] + term1 + term2 + term3
-
-    return tpdm
+    # tpdm[p, q, r, s] = tqdm[r, s, p, q] + one-body terms.
+    return (numpy.einsum('...rspq->...pqrs', tqdm) +
+            _one_body_delta_terms(opdm))
 
 
 def map_two_hole_dm_to_one_hole_dm(tqdm, hole_number):
@@ -108,7 +111,7 @@ def map_two_hole_dm_to_one_hole_dm(tqdm, hole_number):
     Returns:
         oqdm (numpy.ndarray): The 1-hole-RDM contracted from the tqdm.
     """
-    return numpy.einsum('prrq', tqdm) / (hole_number - 1)
+    return numpy.einsum('...prrq->...pq', tqdm) / (hole_number - 1)
 
 
 def map_one_pdm_to_one_hole_dm(opdm):
@@ -123,7 +126,7 @@ def map_one_pdm_to_one_hole_dm(opdm):
     Returns:
         oqdm (numpy.ndarray): the 1-hole-RDM transformed from a 1-RDM.
     """
-    identity_matrix = numpy.eye(opdm.shape[0])
+    identity_matrix = numpy.eye(opdm.shape[-1])
     return identity_matrix - opdm
 
 
@@ -139,7 +142,7 @@ def map_one_hole_dm_to_one_pdm(oqdm):
     Returns:
         oqdm (numpy.ndarray): the 1-hole-RDM transformed from a 1-RDM.
     """
-    identity_matrix = numpy.eye(oqdm.shape[0])
+    identity_matrix = numpy.eye(oqdm.shape[-1])
     return identity_matrix - oqdm
 
 
@@ -158,13 +161,11 @@ def map_two_pdm_to_particle_hole_dm(tpdm, opdm):
     Returns:
         phdm (numpy.ndarray): The particle-hole matrix.
     """
-    ldim = opdm.shape[0]
-    phdm = numpy.zeros_like(tpdm)
-    for p, q, r, s in product(range(ldim), repeat=4):
-        phdm[p, r, q, s] = (opdm[p, s] * kronecker_delta(q, r) -
-                            tpdm[p, q, r, s])
-
-    return phdm
+    # phdm[p, r, q, s] = opdm[p, s] delta_{qr} - tpdm[p, q, r, s].
+    identity_matrix = numpy.eye(opdm.shape[-1])
+    return numpy.ascontiguousarray(numpy.einsum(
+        '...pqrs->...prqs',
+        numpy.einsum('...ps,qr->...pqrs', opdm, identity_matrix) - tpdm))
 
 
 def map_particle_hole_dm_to_two_pdm(phdm, opdm):
@@ -182,13 +183,9 @@ def map_particle_hole_dm_to_two_pdm(phdm, opdm):
     Returns:
         tpdm (numpy.ndarray): The 2-RDM matrix.
     """
-    ldim = opdm.shape[0]
-    tpdm = numpy.zeros_like(phdm)
-    for p, q, r, s in product(range(ldim), repeat=4):
-        tpdm[p, q, r, s] = (opdm[p, s] * kronecker_delta(q, r) -
-                            phdm[p, r, q, s])
-
-    return tpdm
+    identity_matrix = numpy.eye(opdm.shape[-1])
+    return (numpy.einsum('...ps,qr->...pqrs', opdm, identity_matrix) -
+            numpy.einsum('...prqs->...pqrs', phdm))
 
 
 def map_particle_hole_dm_to_one_pdm(phdm, num_particles, num_basis_functions):
@@ -206,5 +203,5 @@ def map_particle_hole_dm_to_one_pdm(phdm, num_particles, num_basis_functions):
     Returns:
         opdm (numpy.ndarray): the 1-RDM transformed from a 1-RDM.
     """
-    return numpy.einsum('prrq', phdm) / (num_basis_functions -
-                                         num_particles + 1)
+    return numpy.einsum('...prrq->...pq', phdm) / (num_basis_functions -
+                                                   num_particles + 1)
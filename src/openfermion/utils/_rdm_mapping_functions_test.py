@@ -219,3 +219,38 @@ class RDMMappingTest(unittest.TestCase):
         test_tpdm = map_particle_hole_dm_to_two_pdm(true_phdm,
                                                     molecule.fci_one_rdm)
         assert numpy.allclose(test_tpdm, molecule.fci_two_rdm)
+
+    def test_batched_maps_match_individual_maps(self):
+        filenames = ["H2_sto-3g_singlet_1.4.hdf5",
+                     "H2_sto-3g_singlet_0.7414.hdf5"]
+        molecules = [MolecularData(
+            filename=os.path.join(DATA_DIRECTORY, filename))
+            for filename in filenames]
+        opdms = numpy.array([molecule.fci_one_rdm for molecule in molecules])
+        tpdms = numpy.array([molecule.fci_two_rdm for molecule in molecules])
+        n_electrons = molecules[0].n_electrons
+        n_qubits = molecules[0].n_qubits
+
+        tqdms = map_two_pdm_to_two_hole_dm(tpdms, opdms)
+        phdms = map_two_pdm_to_particle_hole_dm(tpdms, opdms)
+        oqdms = map_one_pdm_to_one_hole_dm(opdms)
+        self.assertEqual(tqdms.shape, tpdms.shape)
+        self.assertEqual(phdms.shape, tpdms.shape)
+        for index, (opdm, tpdm) in enumerate(zip(opdms, tpdms)):
+            tqdm = map_two_pdm_to_two_hole_dm(tpdm, opdm)
+            phdm = map_two_pdm_to_particle_hole_dm(tpdm, opdm)
+            assert numpy.allclose(tqdms[index], tqdm)
+            assert numpy.allclose(phdms[index], phdm)
+            assert numpy.allclose(oqdms[index], map_one_pdm_to_one_hole_dm(
+                opdm))
+
+        assert numpy.allclose(map_two_pdm_to_one_pdm(tpdms, n_electrons),
+                              opdms)
+        assert numpy.allclose(map_two_hole_dm_to_two_pdm(tqdms, opdms), tpdms)
+        assert numpy.allclose(map_two_hole_dm_to_one_hole_dm(
+            tqdms, n_qubits - n_electrons), oqdms)
+        assert numpy.allclose(map_one_hole_dm_to_one_pdm(oqdms), opdms)
+        assert numpy.allclose(map_particle_hole_dm_to_two_pdm(phdms, opdms),
+                              tpdms)
+        assert numpy.allclose(map_particle_hole_dm_to_one_pdm(
+            phdms, n_electrons, n_qubits), opdms)
@@ -16,6 +16,7 @@ from __future__ import absolute_import
 from functools import reduce
 from future.utils import iteritems
 
+import collections
 import itertools
 import numpy
 import numpy.linalg
@@ -24,9 +25,11 @@ import scipy.sparse
 import scipy.sparse.linalg
 import warnings
 
+from openfermion._profiling import profiled
 from openfermion.config import *
-from openfermion.ops import (FermionOperator, QuadraticHamiltonian,
-                             QubitOperator, normal_ordered)
+from openfermion.ops import (FermionOperator, InteractionRDM,
+                             QuadraticHamiltonian, QubitOperator,
+                             normal_ordered)
 from openfermion.utils import (Grid, commutator, count_qubits,
                                fourier_transform,
                                gaussian_state_preparation_circuit,
@@ -46,6 +49,15 @@ pauli_matrix_map = {'I': identity_csc, 'X': pauli_x_csc,
                     'Y': pauli_y_csc, 'Z': pauli_z_csc}
 
 
+class DavidsonError(Exception):
+    pass
+
+
+# With profiling enabled, the eigensolver is instrumented so that profiles
+# show the time spent in it.
+_eigsh = profiled(scipy.sparse.linalg.eigsh, name='eigsh')
+
+
 def wrapped_kronecker(operator_1, operator_2):
     """Return the Kronecker product of two sparse.csc_matrix operators."""
     return scipy.sparse.kron(operator_1, operator_2, 'csc')
@@ -81,6 +93,7 @@ def jordan_wigner_ladder_sparse(n_qubits, tensor_factor, ladder_type):
     return operator
 
 
+@profiled
 def jordan_wigner_sparse(fermion_operator, n_qubits=None):
     """Initialize a Scipy sparse matrix from a FermionOperator.
 
@@ -140,12 +153,138 @@ def jordan_wigner_sparse(fermion_operator, n_qubits=None):
     return sparse_operator
 
 
-def qubit_operator_sparse(qubit_operator, n_qubits=None):
+def _popcount_parity(values):
+    """Return the parity of the number of set bits of each integer."""
+    values = numpy.array(values, dtype=numpy.int64)
+    shift = 32
+    while shift:
+        values ^= values >> shift
+        shift //= 2
+    return values & 1
+
+
+class PauliTermCache(object):
+    """Size-bounded least-recently-used cache of Pauli string patterns.
+
+    A Pauli string P on n_qubits maps each computational basis state b to
+    a multiple of a single basis state, P |b> = phase * sign(b) |b ^ x>,
+    where x is the bitmask of the qubits acted on by X or Y and sign(b) is
+    +1 or -1. The cache stores (x, phase, sign vector) for each
+    (Pauli string, n_qubits) key so that operators sharing Pauli strings,
+    e.g. Hamiltonians along a geometry scan, are converted to sparse
+    matrices without recomputing them. The sign vector of a Pauli string
+    acting with Y or Z uses 2 ** n_qubits bytes, so the cache is bounded
+    both by its number of patterns and by the total size of their sign
+    vectors, 256 MiB by default.
+
+    Attributes:
+        max_size(int): The maximum number of patterns kept in the cache.
+        max_bytes(int): The maximum total size of the sign vectors.
+        hits(int): The number of lookups served from the cache.
+        misses(int): The number of lookups that computed a pattern.
+    """
+
+    def __init__(self, max_size=4096, max_bytes=2 ** 28):
+        """
+        Args:
+            max_size(int): The maximum number of patterns kept in the cache.
+            max_bytes(int): The maximum total size in bytes of the sign
+                vectors kept in the cache.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._patterns = collections.OrderedDict()
+        self._n_bytes = 0
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def nbytes(self):
+        """Return the total size in bytes of the cached sign vectors."""
+        return self._n_bytes
+
+    def clear(self):
+        """Remove all patterns from the cache."""
+        self._patterns.clear()
+        self._n_bytes = 0
+
+    def get(self, qubit_term, n_qubits):
+        """Return the pattern of a Pauli string, computing it if needed.
+
+        Args:
+            qubit_term(tuple): A Pauli string, as a key of
+                QubitOperator.terms.
+            n_qubits(int): Number of qubits.
+
+        Returns:
+            The pattern (x_mask, phase, signs) of the Pauli string, where
+            signs is None if all signs are +1.
+        """
+        key = (qubit_term, n_qubits)
+        pattern = self._patterns.pop(key, None)
+        if pattern is None:
+            self.misses += 1
+            pattern = _pauli_term_pattern(qubit_term, n_qubits)
+            if pattern[2] is not None:
+                self._n_bytes += pattern[2].nbytes
+        else:
+            self.hits += 1
+        self._patterns[key] = pattern
+        while self._patterns and (len(self._patterns) > self.max_size or
+                                  self._n_bytes > self.max_bytes):
+            _, (_, _, signs) = self._patterns.popitem(last=False)
+            if signs is not None:
+                self._n_bytes -= signs.nbytes
+        return pattern
+
+
+def _pauli_term_masks(qubit_term, n_qubits):
+    """Return the X and Z bitmasks of a Pauli string.
+
+    Qubit i is bit n_qubits - 1 - i, as in the indices of basis states, of
+    x_mask if it is acted on by X or Y and of z_mask if by Y or Z.
+    """
+    x_mask = 0
+    z_mask = 0
+    for index, action in qubit_term:
+        bit = 1 << (n_qubits - 1 - index)
+        if action != 'Z':
+            x_mask |= bit
+        if action != 'X':
+            z_mask |= bit
+    return x_mask, z_mask
+
+
+def _pauli_term_pattern(qubit_term, n_qubits):
+    """Return the pattern (x_mask, phase, signs) of a Pauli string.
+
+    The Pauli string maps the basis state b to phase * signs[b] |b ^ x_mask>;
+    signs is None if all signs are +1.
+    """
+    x_mask, z_mask = _pauli_term_masks(qubit_term, n_qubits)
+    phase = 1.j ** bin(x_mask & z_mask).count('1')
+    signs = None
+    if z_mask:
+        signs = (1 - 2 * _popcount_parity(
+            numpy.arange(2 ** n_qubits) & z_mask)).astype(numpy.int8)
+    return x_mask, phase, signs
+
+
+@profiled
+def qubit_operator_sparse(qubit_operator, n_qubits=None, term_cache=None):
     """Initialize a Scipy sparse matrix from a QubitOperator.
 
+    Terms are converted through their patterns (see PauliTermCache), and
+    terms flipping the same qubits share a sparsity pattern, so their
+    weighted patterns are summed into a single set of matrix entries.
+
     Args:
         qubit_operator(QubitOperator): instance of the QubitOperator class.
         n_qubits (int): Number of qubits.
+        term_cache (PauliTermCache): Optional cache of the patterns of
+            Pauli strings, to reuse across calls.
 
     Returns:
         The corresponding Scipy sparse matrix.
@@ -155,45 +294,32 @@ def qubit_operator_sparse(qubit_operator, n_qubits=None):
     if n_qubits < count_qubits(qubit_operator):
         raise ValueError('Invalid number of qubits specified.')
 
-    # Construct the Scipy sparse matrix.
+    # Sum the weighted patterns of the terms, grouped by flipped qubits.
     n_hilbert = 2 ** n_qubits
-    values_list = [[]]
-    row_list = [[]]
-    column_list = [[]]
-
-    # Loop through the terms.
-    for qubit_term in qubit_operator.terms:
-        tensor_factor = 0
-        coefficient = qubit_operator.terms[qubit_term]
-        sparse_operators = [coefficient]
-        for pauli_operator in qubit_term:
-
-            # Grow space for missing identity operators.
-            if pauli_operator[0] > tensor_factor:
-                identity_qubits = pauli_operator[0] - tensor_factor
-                identity = scipy.sparse.identity(
-                    2 ** identity_qubits, dtype=complex, format='csc')
-                sparse_operators += [identity]
-
-            # Add actual operator to the list.
-            sparse_operators += [pauli_matrix_map[pauli_operator[1]]]
-            tensor_factor = pauli_operator[0] + 1
-
-        # Grow space at end of string unless operator acted on final qubit.
-        if tensor_factor < n_qubits or not qubit_term:
-            identity_qubits = n_qubits - tensor_factor
-            identity = scipy.sparse.identity(
-                2 ** identity_qubits, dtype=complex, format='csc')
-            sparse_operators += [identity]
-
-        # Extract triplets from sparse_term.
-        sparse_matrix = kronecker_operators(sparse_operators)
-        values_list.append(sparse_matrix.tocoo(copy=False).data)
-        (column, row) = sparse_matrix.nonzero()
-        column_list.append(column)
-        row_list.append(row)
+    values_by_mask = {}
+    for qubit_term, coefficient in qubit_operator.terms.items():
+        if term_cache is None:
+            x_mask, phase, signs = _pauli_term_pattern(qubit_term, n_qubits)
+        else:
+            x_mask, phase, signs = term_cache.get(qubit_term, n_qubits)
+        values = values_by_mask.get(x_mask)
+        if values is None:
+            values = numpy.zeros(n_hilbert, dtype=complex)
+            values_by_mask[x_mask] = values
+        if signs is None:
+            values += coefficient * phase
+        else:
+            values += (coefficient * phase) * signs
 
     # Create sparse operator.
+    columns = numpy.arange(n_hilbert)
+    values_list = [numpy.zeros(0, dtype=complex)]
+    row_list = [numpy.zeros(0, dtype=int)]
+    column_list = [numpy.zeros(0, dtype=int)]
+    for x_mask, values in values_by_mask.items():
+        values_list.append(values)
+        row_list.append(columns ^ x_mask)
+        column_list.append(columns)
     values_list = numpy.concatenate(values_list)
     row_list = numpy.concatenate(row_list)
     column_list = numpy.concatenate(column_list)
@@ -336,6 +462,15 @@ def jw_sz_indices(sz_value, n_qubits, n_electrons=None):
     return indices
 
 
+def _restrict_operator(operator, indices):
+    """Return the block of an operator on the given basis states."""
+    if scipy.sparse.issparse(operator):
+        # Selecting rows and then columns avoids the dense grid of index
+        # pairs that numpy.ix_ makes sparse matrices build.
+        return operator[indices][:, indices]
+    return operator[numpy.ix_(indices, indices)]
+
+
 def jw_number_restrict_operator(operator, n_electrons, n_qubits=None):
     """Restrict a Jordan-Wigner encoded operator to a given particle number
 
@@ -353,7 +488,7 @@ def jw_number_restrict_operator(operator, n_electrons, n_qubits=None):
         n_qubits = int(numpy.log2(operator.shape[0]))
 
     select_indices = jw_number_indices(n_electrons, n_qubits)
-    return operator[numpy.ix_(select_indices, select_indices)]
+    return _restrict_operator(operator, select_indices)
 
 
 def jw_sz_restrict_operator(operator, sz_value,
@@ -377,7 +512,7 @@ def jw_sz_restrict_operator(operator, sz_value,
         n_qubits = int(numpy.log2(operator.shape[0]))
 
     select_indices = jw_sz_indices(sz_value, n_qubits, n_electrons=n_electrons)
-    return operator[numpy.ix_(select_indices, select_indices)]
+    return _restrict_operator(operator, select_indices)
 
 
 def jw_number_restrict_state(state, n_electrons, n_qubits=None):
@@ -423,6 +558,165 @@ def jw_sz_restrict_state(state, sz_value, n_electrons=None, n_qubits=None):
     return state[select_indices]
 
 
+def _jw_lower_modes_mask(mode, n_qubits):
+    """Return the bitmask of the modes with index smaller than mode.
+
+    In the Jordan-Wigner encoding used throughout this module, mode p
+    corresponds to bit n_qubits - 1 - p of a computational basis index.
+    """
+    return ((1 << mode) - 1) << (n_qubits - mode)
+
+
+def _jw_state_support(state, n_qubits=None, n_electrons=None):
+    """Return the basis indices and amplitudes of the nonzero entries of a
+    (possibly number-restricted) Jordan-Wigner encoded state."""
+    if scipy.sparse.issparse(state):
+        state = state.toarray()
+    state = numpy.ravel(state)
+    dimension = state.shape[0]
+
+    if n_qubits is None:
+        n_qubits = int(numpy.log2(dimension))
+        if 2 ** n_qubits != dimension:
+            raise ValueError('n_qubits must be specified for '
+                             'number-restricted states.')
+
+    if dimension == 2 ** n_qubits:
+        basis = numpy.arange(dimension, dtype=numpy.int64)
+    elif n_electrons is not None:
+        basis = numpy.array(jw_number_indices(n_electrons, n_qubits),
+                            dtype=numpy.int64)
+        if basis.shape[0] != dimension:
+            raise ValueError('State dimension does not match the number of '
+                             'states with {} particles in {} '
+                             'qubits.'.format(n_electrons, n_qubits))
+    else:
+        raise ValueError('n_electrons must be specified for '
+                         'number-restricted states.')
+
+    support = numpy.flatnonzero(state)
+    return basis[support], state[support], n_qubits
+
+
+def _jw_annihilated_vectors(basis, amplitudes, mode_tuples, n_qubits,
+                            n_workers=1):
+    """Return the vectors obtained by applying products of annihilation
+    operators to a state.
+
+    The state is given by its support; mode_tuples is a list of tuples of
+    increasing modes (p, q, ...), and column j of the returned matrix is
+    a_p a_q ... |state> for the j-th tuple, expressed in a common basis made
+    of all basis states reached by any of the tuples.
+    """
+    def excitation_table(columns):
+        # Compute, for a block of columns, the basis states reached and the
+        # amplitudes there using bitmask arithmetic on the whole support.
+        targets, values, column_ids = [], [], []
+        for column in columns:
+            mask = 0
+            parity = numpy.zeros(basis.shape, dtype=numpy.int64)
+            for mode in mode_tuples[column]:
+                mask |= 1 << (n_qubits - 1 - mode)
+                parity ^= _popcount_parity(
+                    basis & _jw_lower_modes_mask(mode, n_qubits))
+            occupied = (basis & mask) == mask
+            targets.append(basis[occupied] ^ mask)
+            values.append((1 - 2 * parity[occupied]) * amplitudes[occupied])
+            column_ids.append(numpy.full(numpy.count_nonzero(occupied),
+                                         column, dtype=numpy.int64))
+        return targets, values, column_ids
+
+    n_columns = len(mode_tuples)
+    if n_workers > 1 and n_columns > 1:
+        from multiprocessing.pool import ThreadPool
+        blocks = numpy.array_split(numpy.arange(n_columns),
+                                   min(n_workers, n_columns))
+        pool = ThreadPool(n_workers)
+        try:
+            tables = pool.map(excitation_table, blocks)
+        finally:
+            pool.close()
+    else:
+        tables = [excitation_table(range(n_columns))]
+
+    targets = numpy.concatenate(
+        [numpy.zeros(0, dtype=numpy.int64)] +
+        [target for table in tables for target in table[0]])
+    values = numpy.concatenate(
+        [numpy.zeros(0, dtype=complex)] +
+        [value for table in tables for value in table[1]])
+    column_ids = numpy.concatenate(
+        [numpy.zeros(0, dtype=numpy.int64)] +
+        [column for table in tables for column in table[2]])
+
+    unique_targets, rows = numpy.unique(targets, return_inverse=True)
+    vectors = numpy.zeros((unique_targets.shape[0], n_columns), dtype=complex)
+    vectors[rows, column_ids] = values
+    return vectors
+
+
+def jw_get_interaction_rdm(state, n_qubits=None, n_electrons=None,
+                           n_workers=1):
+    r"""Compute the one- and two-body reduced density matrices of a state.
+
+    The RDMs are computed without building any operator matrix. For every
+    mode q (pair of modes r < s) the vector a_q|state> (a_r a_s|state>) is
+    gathered from the support of the state using bitstring arithmetic, and
+    the RDMs are obtained as Gram matrices of these vectors:
+
+        <a^\dagger_p a_q> = <a_p state|a_q state>,
+        <a^\dagger_p a^\dagger_q a_r a_s> = -<a_p a_q state|a_r a_s state>.
+
+    Only the pairs p < q and r < s of the two-body RDM are computed; the
+    remaining entries follow from antisymmetry.
+
+    Args:
+        state(ndarray or sparse): A Jordan-Wigner encoded state, either on
+            the full space of n_qubits or restricted to the states with
+            n_electrons particles (ordered as in jw_number_restrict_state).
+        n_qubits(int, optional): Number of qubits. Required if the state is
+            number-restricted.
+        n_electrons(int, optional): Number of particles. Required if the
+            state is number-restricted.
+        n_workers(int, optional): Number of threads used to build the
+            excitation tables, which are split into blocks of orbitals.
+            Default is 1.
+
+    Returns:
+        rdm(InteractionRDM): The RDMs <a^\dagger_p a_q> and
+            <a^\dagger_p a^\dagger_q a_r a_s> of the state.
+
+    Raises:
+        ValueError: Dimension of the state is inconsistent with the
+            specified number of qubits and electrons.
+    """
+    basis, amplitudes, n_qubits = _jw_state_support(
+        state, n_qubits, n_electrons)
+
+    # One-RDM.
+    vectors = _jw_annihilated_vectors(
+        basis, amplitudes, [(p,) for p in range(n_qubits)], n_qubits,
+        n_workers)
+    one_rdm = vectors.conj().T.dot(vectors)
+
+    # Two-RDM.
+    pairs = list(itertools.combinations(range(n_qubits), 2))
+    two_rdm = numpy.zeros((n_qubits,) * 4, dtype=complex)
+    if pairs:
+        vectors = _jw_annihilated_vectors(
+            basis, amplitudes, pairs, n_qubits, n_workers)
+        block = -vectors.conj().T.dot(vectors)
+        p, q = (numpy.array(index) for index in zip(*pairs))
+        p_row, q_row = p[:, numpy.newaxis], q[:, numpy.newaxis]
+        two_rdm[p_row, q_row, p, q] = block
+        two_rdm[q_row, p_row, p, q] = -block
+        two_rdm[p_row, q_row, q, p] = -block
+        two_rdm[q_row, p_row, q, p] = block
+
+    return InteractionRDM(one_rdm, two_rdm)
+
+
+@profiled
 def jw_get_ground_states_by_particle_number(sparse_operator, particle_number,
                                             sparse=True, num_eigs=3):
     """For a Jordan-Wigner encoded Hermitian operator, compute the lowest
@@ -476,9 +770,9 @@ def jw_get_ground_states_by_particle_number(sparse_operator, particle_number,
 
     # Compute eigenvalues and eigenvectors
     if sparse:
-        eigvals, eigvecs = scipy.sparse.linalg.eigsh(restricted_operator,
-                                                     k=num_eigs,
-                                                     which='SA')
+        eigvals, eigvecs = _eigsh(restricted_operator,
+                                  k=num_eigs,
+                                  which='SA')
         if abs(max(eigvals) - min(eigvals)) < EQ_TOLERANCE:
             warnings.warn('The lowest {} eigenvalues are degenerate. '
                           'There may be more ground states; increase '
@@ -664,6 +958,7 @@ def get_density_matrix(states, probabilities):
     return density_matrix
 
 
+@profiled
 def get_ground_state(sparse_operator, initial_guess=None):
     """Compute lowest eigenvalue and eigenstate.
 
@@ -679,10 +974,11 @@ def get_ground_state(sparse_operator, initial_guess=None):
         eigenstate:
             The lowest eigenstate in scipy.sparse csc format.
     """
-    if not is_hermitian(sparse_operator):
+    if (not isinstance(sparse_operator, scipy.sparse.linalg.LinearOperator)
+            and not is_hermitian(sparse_operator)):
         raise ValueError('sparse_operator must be Hermitian.')
 
-    values, vectors = scipy.sparse.linalg.eigsh(
+    values, vectors = _eigsh(
         sparse_operator, k=1, v0=initial_guess, which='SA', maxiter=1e7)
 
     order = numpy.argsort(values)
@@ -693,6 +989,167 @@ def get_ground_state(sparse_operator, initial_guess=None):
     return eigenvalue, eigenstate.T
 
 
+@profiled
+def davidson(operator, n_roots=1, initial_guess=None, diagonal=None,
+             tolerance=1e-8, max_subspace=None, max_iterations=1000):
+    """Compute the lowest eigenpairs of a Hermitian operator by Davidson.
+
+    Each iteration expands a subspace with the residuals of the current
+    Ritz vectors, preconditioned by the inverse of (ritz value - diagonal).
+    For molecular Hamiltonians the diagonal, the energies of computational
+    basis states, dominates the matrix, so the method needs far fewer
+    products with the operator than Lanczos. The diagonal of an operator
+    given only as a LinearOperator can be computed cheaply from the
+    FermionOperator with jw_operator_diagonal.
+
+    Args:
+        operator (sparse matrix, ndarray or LinearOperator): A Hermitian
+            operator.
+        n_roots (int, optional): The number of lowest eigenpairs to
+            compute. Default is 1.
+        initial_guess (ndarray, optional): A vector, or an array whose
+            columns are vectors, spanning an initial guess of the
+            eigenspace, e.g. the eigenvectors of a nearby operator.
+            Missing vectors are filled in with the computational basis
+            states of lowest diagonal energy.
+        diagonal (ndarray, optional): The diagonal of the operator. Read
+            from the operator if it has a diagonal method, as matrices and
+            FCIHamiltonians do; otherwise there is no preconditioning.
+        tolerance (float, optional): The largest norm of the residual
+            of a converged eigenvector. Default is 1e-8.
+        max_subspace (int, optional): The dimension of the subspace at
+            which the iteration restarts from the current Ritz vectors.
+            Defaults to max(20, 8 * n_roots).
+        max_iterations (int, optional): The largest number of
+            iterations. Default is 1000.
+
+    Returns
+    -------
+        eigenvalues:
+            The n_roots lowest eigenvalues in ascending order, an ndarray.
+        eigenvectors:
+            An ndarray whose columns are the corresponding eigenvectors.
+
+    Raises:
+        ValueError: Invalid number of roots or initial guess.
+        DavidsonError: The iteration did not converge.
+    """
+    dimension = operator.shape[0]
+    if not 0 < n_roots <= dimension:
+        raise ValueError('n_roots must be between 1 and the dimension.')
+    if diagonal is None and hasattr(operator, 'diagonal'):
+        diagonal = operator.diagonal()
+    if diagonal is not None:
+        diagonal = numpy.real(numpy.asarray(diagonal)).ravel()
+    if max_subspace is None:
+        max_subspace = max(20, 8 * n_roots)
+    max_subspace = min(max(max_subspace, 2 * n_roots), dimension)
+    linear_operator = scipy.sparse.linalg.aslinearoperator(operator)
+    dtype = numpy.result_type(linear_operator.dtype, float)
+
+    # Start from the guess, completed by the lowest basis states.
+    if initial_guess is None:
+        guess = numpy.zeros((dimension, 0), dtype)
+    else:
+        guess = numpy.asarray(initial_guess)
+        guess = guess.reshape(dimension, -1)
+        dtype = numpy.result_type(dtype, guess.dtype)
+    if diagonal is None:
+        filling = numpy.random.RandomState(0).randn(dimension, n_roots)
+    else:
+        filling = numpy.zeros((dimension, n_roots))
+        lowest = numpy.argsort(diagonal, kind='mergesort')[:n_roots]
+        filling[lowest, numpy.arange(n_roots)] = 1.
+    basis = _orthonormal_extension(
+        numpy.zeros((dimension, 0), dtype),
+        numpy.hstack([guess.astype(dtype), filling]))[:, :max_subspace]
+    if basis.shape[1] < n_roots:
+        raise ValueError('initial_guess does not span enough vectors.')
+    image = _as_matrix(linear_operator.matmat(basis), dtype)
+
+    for _ in range(max_iterations):
+        # Rayleigh-Ritz on the subspace.
+        subspace_operator = numpy.dot(basis.conj().T, image)
+        subspace_operator = (subspace_operator +
+                             subspace_operator.conj().T) / 2.
+        values, rotation = numpy.linalg.eigh(subspace_operator)
+        values = values[:n_roots]
+        vectors = numpy.dot(basis, rotation[:, :n_roots])
+        vector_images = numpy.dot(image, rotation[:, :n_roots])
+        residuals = vector_images - vectors * values
+        residual_norms = numpy.linalg.norm(residuals, axis=0)
+        unconverged = residual_norms > tolerance
+        if not unconverged.any():
+            return values, vectors
+
+        # Precondition the residuals of the unconverged roots.
+        residuals = residuals[:, unconverged]
+        corrections = residuals
+        if diagonal is not None:
+            denominators = values[unconverged] - diagonal[:, None]
+            small = abs(denominators) < 1e-8
+            denominators[small] = numpy.where(
+                denominators[small] < 0, -1e-8, 1e-8)
+            corrections = residuals / denominators
+
+        # Restart from the Ritz vectors if the subspace is full.
+        if basis.shape[1] + corrections.shape[1] > max_subspace:
+            kept = max(n_roots, min(2 * n_roots,
+                                    max_subspace - corrections.shape[1]))
+            basis = numpy.dot(basis, rotation[:, :kept])
+            image = numpy.dot(image, rotation[:, :kept])
+        new_vectors = _orthonormal_extension(basis, corrections)
+        if not new_vectors.shape[1]:
+            # The preconditioner stalled; expand with the bare residuals.
+            new_vectors = _orthonormal_extension(basis, residuals)
+        if not new_vectors.shape[1]:
+            break
+        basis = numpy.hstack([basis, new_vectors])
+        image = numpy.hstack([
+            image, _as_matrix(linear_operator.matmat(new_vectors), dtype)])
+
+    raise DavidsonError('Davidson did not converge to a residual of {} '
+                        'in {} iterations.'.format(tolerance,
+                                                   max_iterations))
+
+
+def _as_matrix(product, dtype):
+    """Return the product of a linear operator as a dense ndarray."""
+    if scipy.sparse.issparse(product):
+        product = product.toarray()
+    return numpy.asarray(product, dtype=dtype)
+
+
+def _orthonormal_extension(basis, vectors):
+    """Orthonormalize vectors against basis, dropping dependent ones.
+
+    Args:
+        basis (ndarray): Orthonormal columns.
+        vectors (ndarray): Columns to orthonormalize.
+
+    Returns:
+        An ndarray of orthonormal columns orthogonal to basis.
+    """
+    new_vectors = []
+    for vector in vectors.T:
+        norm = numpy.linalg.norm(vector)
+        if not norm:
+            continue
+        vector = vector / norm
+        # Two passes of Gram-Schmidt keep the basis orthogonal.
+        for _ in range(2):
+            for other in [basis] + [v[:, None] for v in new_vectors]:
+                vector = vector - numpy.dot(other,
+                                            numpy.dot(other.conj().T, vector))
+        norm = numpy.linalg.norm(vector)
+        if norm > 1e-8:
+            new_vectors.append(vector / norm)
+    if not new_vectors:
+        return numpy.zeros((basis.shape[0], 0), basis.dtype)
+    return numpy.array(new_vectors, dtype=basis.dtype).T
+
+
+@profiled
 def sparse_eigenspectrum(sparse_operator):
     """Perform a dense diagonalization.
 
@@ -806,6 +1263,57 @@ def expectation_computational_basis_state(operator, computational_basis_state):
     return expectation_value
 
 
+def jw_operator_diagonal(fermion_operator, n_qubits=None):
+    """Compute the diagonal of the Jordan-Wigner matrix of an operator.
+
+    Only terms that are products of number operators after normal ordering
+    contribute, so the diagonal, i.e. the energies of all computational
+    basis states, is computed without building the matrix. It is the
+    preconditioner used by davidson.
+
+    Args:
+        fermion_operator (FermionOperator): The operator.
+        n_qubits (int, optional): The number of qubits. Defaults to the
+            number of modes the operator acts on.
+
+    Returns:
+        diagonal (ndarray): The diagonal of jordan_wigner_sparse of the
+            operator.
+
+    Raises:
+        TypeError: Operator is not a FermionOperator.
+    """
+    if not isinstance(fermion_operator, FermionOperator):
+        raise TypeError('fermion_operator must be a FermionOperator.')
+    if n_qubits is None:
+        n_qubits = count_qubits(fermion_operator)
+
+    indices = numpy.arange(2 ** n_qubits)
+    occupations = {}
+    diagonal = numpy.zeros(2 ** n_qubits, dtype=complex)
+    for term, coefficient in normal_ordered(fermion_operator).terms.items():
+        n_raising = len(term) // 2
+        raising = [mode for mode, _ in term[:n_raising]]
+        lowering = [mode for mode, _ in term[n_raising:]]
+        if (len(term) % 2 or sorted(raising) != sorted(lowering) or
+                not all(action for _, action in term[:n_raising])):
+            continue
+
+        # Lowering the modes in reverse order of raising them gives a
+        # product of number operators; otherwise count the transpositions.
+        order = [raising[::-1].index(mode) for mode in lowering]
+        inversions = sum(order[i] > order[j] for i in range(len(order))
+                         for j in range(i + 1, len(order)))
+        contribution = numpy.full(2 ** n_qubits, coefficient *
+                                  (-1) ** inversions, dtype=complex)
+        for mode in raising:
+            if mode not in occupations:
+                occupations[mode] = (indices >> (n_qubits - 1 - mode)) & 1
+            contribution *= occupations[mode]
+        diagonal += contribution
+    return diagonal
+
+
 def expectation_db_operator_with_pw_basis_state(
         operator, plane_wave_occ_orbitals, n_spatial_orbitals, grid,
         spinless):
@@ -1107,6 +1615,7 @@ def expectation_three_body_db_operator_computational_basis_state(
     return expectation_value
 
 
+@profiled
 def get_gap(sparse_operator, initial_guess=None):
     """Compute gap between lowest eigenvalue and first excited state.
 
@@ -1116,10 +1625,11 @@ def get_gap(sparse_operator, initial_guess=None):
             guess dramatically reduces the cost required to converge.
     Returns: A real float giving eigenvalue gap.
     """
-    if not is_hermitian(sparse_operator):
+    if (not isinstance(sparse_operator, scipy.sparse.linalg.LinearOperator)
+            and not is_hermitian(sparse_operator)):
         raise ValueError('sparse_operator must be Hermitian.')
 
-    values, _ = scipy.sparse.linalg.eigsh(
+    values, _ = _eigsh(
         sparse_operator, k=2, v0=initial_guess, which='SA', maxiter=1e7)
 
     gap = abs(values[1] - values[0])
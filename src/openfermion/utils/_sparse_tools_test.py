@@ -13,18 +13,23 @@
 """Tests for sparse_tools.py."""
 from __future__ import absolute_import
 
+import itertools
 import numpy
+import os
 import unittest
 
 from scipy.linalg import eigh, norm
 from scipy.sparse import csc_matrix
+from scipy.sparse.linalg import LinearOperator
 from scipy.special import comb
 
-from openfermion.hamiltonians import (fermi_hubbard, jellium_model,
+from openfermion.hamiltonians import (MolecularData, fermi_hubbard,
+                                      jellium_model,
                                       wigner_seitz_length_scale)
 from openfermion.ops import FermionOperator, normal_ordered
-from openfermion.transforms import (get_fermion_operator, get_sparse_operator,
-                                    jordan_wigner)
+from openfermion.transforms import (get_fermion_operator,
+                                    get_interaction_operator,
+                                    get_sparse_operator, jordan_wigner)
 from openfermion.utils import (Grid, fourier_transform, number_operator,
                                up_index, down_index)
 from openfermion.utils._jellium_hf_state import (
@@ -109,6 +114,85 @@ class JordanWignerSparseTest(unittest.TestCase):
             expected.A))
 
 
+class QubitOperatorSparseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.n_qubits = 4
+        self.qubit_operator = QubitOperator((), 0.3)
+        for _ in range(20):
+            actions = numpy.random.choice(list('IXYZ'), self.n_qubits)
+            term = tuple((index, action) for index, action in
+                         enumerate(actions) if action != 'I')
+            self.qubit_operator += QubitOperator(
+                term, numpy.random.randn() + 1.j * numpy.random.randn())
+
+    def test_qubit_operator_sparse_matches_kronecker_products(self):
+        expected = numpy.zeros((2 ** self.n_qubits,) * 2, dtype=complex)
+        for term, coefficient in self.qubit_operator.terms.items():
+            factors = ['I'] * self.n_qubits
+            for index, action in term:
+                factors[index] = action
+            expected += coefficient * kronecker_operators(
+                [pauli_matrix_map[action] for action in factors]).toarray()
+
+        sparse_operator = qubit_operator_sparse(self.qubit_operator)
+        self.assertTrue(numpy.allclose(sparse_operator.toarray(), expected))
+
+    def test_qubit_operator_sparse_cancellation(self):
+        qubit_operator = QubitOperator('X0 Z1') + QubitOperator('Y0 Y1', 1.j)
+        sparse_operator = qubit_operator_sparse(qubit_operator)
+        self.assertTrue(numpy.allclose(
+            sparse_operator.toarray(),
+            qubit_operator_sparse(QubitOperator('X0 Z1'), 2).toarray() +
+            1.j * kronecker_operators([pauli_y_csc, pauli_y_csc]).toarray()))
+        self.assertEqual(qubit_operator_sparse(
+            QubitOperator('Z0') - QubitOperator('Z0')).nnz, 0)
+
+    def test_term_cache(self):
+        term_cache = PauliTermCache()
+        expected = qubit_operator_sparse(self.qubit_operator, 5)
+        cached = qubit_operator_sparse(self.qubit_operator, 5, term_cache)
+        n_terms = len(self.qubit_operator.terms)
+        self.assertEqual(term_cache.misses, n_terms)
+        self.assertEqual(len(term_cache), n_terms)
+
+        cached = qubit_operator_sparse(2. * self.qubit_operator, 5,
+                                       term_cache)
+        self.assertEqual(term_cache.hits, n_terms)
+        self.assertTrue(numpy.allclose(cached.toarray(),
+                                       2. * expected.toarray()))
+
+        term_cache.clear()
+        self.assertEqual(len(term_cache), 0)
+
+    def test_term_cache_eviction(self):
+        term_cache = PauliTermCache(max_size=2)
+        term_cache.get((), 2)
+        term_cache.get(((0, 'X'),), 2)
+        term_cache.get((), 2)
+        term_cache.get(((1, 'Y'),), 2)
+        self.assertEqual(len(term_cache), 2)
+        self.assertEqual(term_cache.misses, 3)
+
+        # The least recently used pattern was evicted.
+        term_cache.get((), 2)
+        self.assertEqual(term_cache.hits, 2)
+        term_cache.get(((0, 'X'),), 2)
+        self.assertEqual(term_cache.misses, 4)
+
+    def test_term_cache_byte_limit(self):
+        # Sign vectors on 4 qubits take 16 bytes; X strings have none.
+        term_cache = PauliTermCache(max_bytes=40)
+        for term in (((0, 'Z'),), ((1, 'Z'),), ((0, 'X'),), ((2, 'Y'),)):
+            term_cache.get(term, 4)
+        self.assertEqual(len(term_cache), 3)
+        self.assertEqual(term_cache.nbytes(), 32)
+        term_cache.get(((0, 'Z'),), 4)
+        self.assertEqual(term_cache.misses, 5)
+        term_cache.clear()
+        self.assertEqual(term_cache.nbytes(), 0)
+
+
 class ComputationalBasisStateTest(unittest.TestCase):
     def test_computational_basis_state(self):
         comp_basis_state = jw_configuration_state([0, 2, 5], 7)
@@ -396,6 +480,67 @@ class JWSzRestrictStateTest(unittest.TestCase):
                                              restricted_vector))
 
 
+class JWGetInteractionRDMTest(unittest.TestCase):
+
+    def setUp(self):
+        self.n_qubits = 4
+        self.state = (numpy.random.randn(2 ** self.n_qubits) +
+                      1.j * numpy.random.randn(2 ** self.n_qubits))
+        self.state /= numpy.linalg.norm(self.state)
+
+    def test_rdm_matches_sparse_expectations(self):
+        rdm = jw_get_interaction_rdm(self.state)
+
+        for p, q in itertools.product(range(self.n_qubits), repeat=2):
+            operator = get_sparse_operator(
+                FermionOperator(((p, 1), (q, 0))), self.n_qubits)
+            self.assertAlmostEqual(rdm.one_body_tensor[p, q],
+                                   expectation(operator, self.state))
+
+        for p, q, r, s in itertools.product(range(self.n_qubits), repeat=4):
+            operator = get_sparse_operator(
+                FermionOperator(((p, 1), (q, 1), (r, 0), (s, 0))),
+                self.n_qubits)
+            self.assertAlmostEqual(rdm.two_body_tensor[p, q, r, s],
+                                   expectation(operator, self.state))
+
+    def test_sparse_state_and_threads(self):
+        rdm = jw_get_interaction_rdm(self.state)
+        sparse_state = csc_matrix(self.state.reshape(-1, 1))
+        threaded_rdm = jw_get_interaction_rdm(sparse_state, n_workers=3)
+        self.assertTrue(numpy.allclose(rdm.one_body_tensor,
+                                       threaded_rdm.one_body_tensor))
+        self.assertTrue(numpy.allclose(rdm.two_body_tensor,
+                                       threaded_rdm.two_body_tensor))
+
+    def test_number_restricted_state(self):
+        hamiltonian = fermi_hubbard(2, 2, 1., 4., periodic=False)
+        sparse_operator = get_sparse_operator(hamiltonian)
+        energy, states = jw_get_ground_states_by_particle_number(
+            sparse_operator, 2)
+        state = states[0]
+        restricted_state = jw_number_restrict_state(state, 2)
+
+        rdm = jw_get_interaction_rdm(state)
+        restricted_rdm = jw_get_interaction_rdm(
+            restricted_state, n_qubits=8, n_electrons=2)
+        self.assertTrue(numpy.allclose(rdm.two_body_tensor,
+                                       restricted_rdm.two_body_tensor))
+        self.assertAlmostEqual(numpy.trace(restricted_rdm.one_body_tensor),
+                               2.)
+        self.assertAlmostEqual(
+            restricted_rdm.expectation(get_interaction_operator(hamiltonian)),
+            energy)
+
+    def test_bad_dimension(self):
+        with self.assertRaises(ValueError):
+            jw_get_interaction_rdm(numpy.ones(6))
+        with self.assertRaises(ValueError):
+            jw_get_interaction_rdm(numpy.ones(6), n_qubits=4)
+        with self.assertRaises(ValueError):
+            jw_get_interaction_rdm(numpy.ones(5), n_qubits=4, n_electrons=2)
+
+
 class JWGetGroundStatesByParticleNumberTest(unittest.TestCase):
     def test_jw_get_ground_states_by_particle_number_herm_conserving(self):
         # Initialize a particle-number-conserving Hermitian operator
@@ -641,6 +786,91 @@ class GroundStateTest(unittest.TestCase):
             get_ground_state(get_sparse_operator(1j * QubitOperator('X1')))
 
 
+class DavidsonTest(unittest.TestCase):
+
+    def setUp(self):
+        molecule = MolecularData(
+            filename=os.path.join(DATA_DIRECTORY, 'H2_6-31g_singlet_0.75'))
+        self.hamiltonian = get_fermion_operator(
+            molecule.get_molecular_hamiltonian())
+        self.sparse_operator = get_sparse_operator(self.hamiltonian)
+        self.eigenvalues = numpy.linalg.eigvalsh(
+            self.sparse_operator.toarray())
+        self.n_products = 0
+
+    def counting_operator(self):
+        def matvec(vector):
+            self.n_products += 1
+            return self.sparse_operator.dot(vector)
+        return LinearOperator(self.sparse_operator.shape, matvec=matvec,
+                              dtype=complex)
+
+    def assert_eigenpairs(self, eigenvalues, eigenvectors, n_roots):
+        self.assertEqual(eigenvectors.shape,
+                         (self.sparse_operator.shape[0], n_roots))
+        for i in range(n_roots):
+            self.assertAlmostEqual(eigenvalues[i], self.eigenvalues[i])
+            residual = (self.sparse_operator.dot(eigenvectors[:, i]) -
+                        eigenvalues[i] * eigenvectors[:, i])
+            self.assertLess(norm(residual), 1e-7)
+        self.assertTrue(numpy.allclose(
+            eigenvectors.conj().T.dot(eigenvectors), numpy.eye(n_roots)))
+
+    def test_sparse_matrix(self):
+        eigenvalues, eigenvectors = davidson(self.sparse_operator)
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 1)
+
+    def test_multiple_roots(self):
+        eigenvalues, eigenvectors = davidson(self.sparse_operator,
+                                             n_roots=4)
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 4)
+
+    def test_dense_matrix(self):
+        eigenvalues, eigenvectors = davidson(
+            self.sparse_operator.toarray(), n_roots=2)
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 2)
+
+    def test_linear_operator_preconditioned(self):
+        diagonal = jw_operator_diagonal(self.hamiltonian)
+        eigenvalues, eigenvectors = davidson(self.counting_operator(),
+                                             diagonal=diagonal)
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 1)
+        preconditioned_products = self.n_products
+
+        self.n_products = 0
+        eigenvalues, eigenvectors = davidson(self.counting_operator())
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 1)
+        self.assertLess(2 * preconditioned_products, self.n_products)
+
+    def test_warm_start(self):
+        _, eigenvectors = davidson(self.sparse_operator, n_roots=2)
+        eigenvalues, eigenvectors = davidson(
+            self.counting_operator(), n_roots=2,
+            initial_guess=eigenvectors,
+            diagonal=self.sparse_operator.diagonal())
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 2)
+        self.assertLessEqual(self.n_products, 4)
+
+    def test_small_subspace(self):
+        eigenvalues, eigenvectors = davidson(self.sparse_operator,
+                                             n_roots=3, max_subspace=6)
+        self.assert_eigenpairs(eigenvalues, eigenvectors, 3)
+
+    def test_full_dimension(self):
+        operator = get_sparse_operator(QubitOperator('Y0 X1') +
+                                       QubitOperator('Z0 Z1'))
+        eigenvalues, _ = davidson(operator, n_roots=4)
+        self.assertTrue(numpy.allclose(eigenvalues, [-2, 0, 0, 2]))
+
+    def test_bad_n_roots(self):
+        with self.assertRaises(ValueError):
+            davidson(self.sparse_operator, n_roots=0)
+
+    def test_no_convergence(self):
+        with self.assertRaises(DavidsonError):
+            davidson(self.sparse_operator, max_iterations=1)
+
+
 class ExpectationTest(unittest.TestCase):
     def test_expectation_correct(self):
         operator = get_sparse_operator(QubitOperator('X0'), n_qubits=2)
@@ -735,6 +965,32 @@ class ExpectationComputationalBasisStateTest(unittest.TestCase):
                 QubitOperator(), csc_matrix(([1], ([6], [0])), shape=(16, 1)))
 
 
+class JWOperatorDiagonalTest(unittest.TestCase):
+
+    def test_random_operator(self):
+        operator = FermionOperator((), 0.5)
+        operator += FermionOperator('0^ 0', 1.5)
+        operator += FermionOperator('1^ 2^ 1 2', -0.7)
+        operator += FermionOperator('3^ 1^ 2^ 3 2 1', 0.3 + 0.2j)
+        operator += FermionOperator('0 0^', 2.)
+        operator += FermionOperator('0^ 1', 4.)
+        operator += FermionOperator('2^ 3^ 1 0', 1.)
+        expected = jordan_wigner_sparse(operator, 5).diagonal()
+        self.assertTrue(numpy.allclose(jw_operator_diagonal(operator, 5),
+                                       expected))
+
+    def test_hubbard(self):
+        operator = fermi_hubbard(2, 2, 1., 4., chemical_potential=0.5,
+                                 magnetic_field=0.3)
+        expected = jordan_wigner_sparse(operator).diagonal()
+        self.assertTrue(numpy.allclose(jw_operator_diagonal(operator),
+                                       expected))
+
+    def test_bad_type(self):
+        with self.assertRaises(TypeError):
+            jw_operator_diagonal(QubitOperator('Z0'))
+
+
 class ExpectationDualBasisOperatorWithPlaneWaveBasisState(unittest.TestCase):
     def setUp(self):
         grid_length = 4
@@ -0,0 +1,444 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Eigenpairs of sparse Hermitian operators in an energy window."""
+from __future__ import absolute_import
+
+import collections
+
+import numpy
+import numpy.polynomial.chebyshev
+import scipy.sparse
+import scipy.sparse.linalg
+
+from openfermion._profiling import profiled
+from openfermion.config import *
+from openfermion.utils._operator_utils import is_hermitian
+from openfermion.utils._sparse_tools import (jw_number_indices,
+                                             jw_number_restrict_operator)
+
+# Operators up to this dimension are diagonalized densely.
+_DENSE_DIMENSION = 256
+
+# Iterations without convergence after which the block is enlarged, which
+# resolves clusters of eigenvalues cut by the edge of the block.
+_STALLED_ITERATIONS = 20
+
+# Intervals are split off their midpoints, which are often degenerate
+# eigenvalues of model Hamiltonians. Rounding errors would otherwise move
+# part of such a cluster to each side, where neither interval finds it.
+_SPLIT_FRACTION = (numpy.sqrt(5.) - 1.) / 2.
+
+
+def _chebyshev_window_coefficients(lower, upper, degree):
+    """Expand the indicator function of [lower, upper] in [-1, 1].
+
+    The Chebyshev coefficients are damped with the Jackson kernel, which
+    suppresses the Gibbs oscillations of the truncated expansion so the
+    filter is nonnegative up to small errors.
+
+    Returns:
+        coefficients (ndarray): The degree + 1 coefficients.
+    """
+    orders = numpy.arange(degree + 1)
+    angle_lower = numpy.arccos(numpy.clip(lower, -1., 1.))
+    angle_upper = numpy.arccos(numpy.clip(upper, -1., 1.))
+    coefficients = numpy.empty(degree + 1)
+    coefficients[0] = (angle_lower - angle_upper) / numpy.pi
+    coefficients[1:] = 2. * (numpy.sin(orders[1:] * angle_lower) -
+                             numpy.sin(orders[1:] * angle_upper)) / (
+                                 orders[1:] * numpy.pi)
+    kernel_angle = numpy.pi / (degree + 2)
+    jackson = ((degree + 2 - orders) * numpy.cos(orders * kernel_angle) +
+               numpy.sin(orders * kernel_angle) /
+               numpy.tan(kernel_angle)) / (degree + 2)
+    return coefficients * jackson
+
+
+def _block_too_small(inside, dimension):
+    """Return whether a block has too few vectors beyond a window.
+
+    The eigenvalues in the window converge at a rate set by the first
+    eigenvalue beyond the block, so the block keeps a margin of vectors
+    outside the window, unless it spans the whole space.
+    """
+    block_size = len(inside)
+    return block_size < dimension and (numpy.count_nonzero(inside) >
+                                       block_size - max(4, block_size // 4))
+
+
+def _converged(priorities, inside, residuals, tolerance):
+    """Return whether a block iteration found all eigenpairs in a window.
+
+    The iteration converges first to the eigenvectors whose eigenvalues
+    are amplified most by the spectral transformation, i.e. have the lowest
+    priorities. It has found all those in the window once the Ritz pairs in
+    the window and the next one outside have converged.
+
+    Args:
+        priorities (ndarray): The priorities of the Ritz values.
+        inside (ndarray): Whether each Ritz value is in the window.
+        residuals (ndarray): The residual norms of the Ritz pairs.
+        tolerance (float): The residual norm of converged pairs.
+    """
+    n_needed = min(numpy.count_nonzero(inside) + 1, len(priorities))
+    nearest = numpy.argsort(priorities, kind='mergesort')[:n_needed]
+    return numpy.all(residuals[nearest] < tolerance)
+
+
+class SpectralWindowSolver(object):
+    """Finds all eigenpairs of a sparse Hermitian operator in a window.
+
+    Interior eigenvalues are found without densifying the operator, by
+    block subspace iteration with Rayleigh-Ritz projections, which is
+    robust to the large degeneracies of many-body spectra. The iteration
+    uses one of two spectral transformations:
+
+    - 'shift-invert' (the default) slices the window into intervals and
+      iterates with (operator - shift) ** -1 for the center of each. The
+      block grows until it holds more vectors than the interval has
+      eigenvalues, so none is missed. Intervals with more eigenvalues than
+      max_slice_eigenvalues are split. The sparse LU factorizations of the
+      most recently used shifts are cached, so repeated queries reuse them.
+      Each can take much more memory than the operator, so only
+      max_cached_factorizations are kept.
+    - 'polynomial' iterates with a Chebyshev expansion of the indicator
+      function of the window. It only needs products with the operator,
+      for when the factorizations do not fit in memory. The block size
+      starts from a stochastic estimate of the number of eigenvalues in the
+      window, computed with the same polynomial.
+
+    With particle_number, the operator is first restricted to the states
+    with that number of particles in the Jordan-Wigner encoding.
+
+    Attributes:
+        operator (scipy.sparse.csc_matrix): The operator, restricted to the
+            particle-number sector if one is given.
+        n_qubits (int): The number of qubits of the unrestricted operator.
+        particle_number (int): The particle number of the sector, or None.
+        max_slice_eigenvalues (int): The largest number of eigenvalues
+            computed at a single shift.
+        max_cached_factorizations (int): The largest number of LU
+            factorizations kept between queries.
+    """
+
+    def __init__(self, sparse_operator, particle_number=None, n_qubits=None,
+                 max_slice_eigenvalues=64, max_cached_factorizations=4):
+        """
+        Args:
+            sparse_operator (scipy.sparse.spmatrix): A Hermitian operator.
+            particle_number (int, optional): Restrict to the sector with
+                this number of particles.
+            n_qubits (int, optional): The number of qubits of the operator.
+                Inferred from its shape by default.
+            max_slice_eigenvalues (int, optional): The largest number of
+                eigenvalues computed at a single shift before the interval
+                is split. Default is 64.
+            max_cached_factorizations (int, optional): The largest number
+                of LU factorizations kept, the least recently used being
+                discarded first. A window split into more intervals than
+                this is factorized again when queried again, so raise it to
+                reuse all the factorizations of such a window, or set it to
+                0 to keep none. Default is 4.
+
+        Raises:
+            ValueError: Operator is not Hermitian.
+        """
+        if not is_hermitian(sparse_operator):
+            raise ValueError('sparse_operator must be Hermitian.')
+        if n_qubits is None:
+            n_qubits = int(numpy.log2(sparse_operator.shape[0]))
+        self.n_qubits = n_qubits
+        self.particle_number = particle_number
+        if particle_number is not None:
+            sparse_operator = jw_number_restrict_operator(
+                sparse_operator, particle_number, n_qubits)
+        self.operator = scipy.sparse.csc_matrix(sparse_operator)
+        if (numpy.iscomplexobj(self.operator.data) and
+                not self.operator.imag.count_nonzero()):
+            # Real arithmetic halves the memory and quarters the work.
+            self.operator = self.operator.real.tocsc()
+        self.max_slice_eigenvalues = max_slice_eigenvalues
+        self.max_cached_factorizations = max_cached_factorizations
+        self._dtype = numpy.result_type(self.operator.dtype, float)
+        self._random_state = numpy.random.RandomState(0)
+        self._factorizations = collections.OrderedDict()
+        self._extremes = None
+
+        # Gershgorin discs bound the spectrum. The bounds include zero so
+        # that an empty operator gets a valid interval.
+        diagonal = self.operator.diagonal().real
+        radii = (numpy.asarray(abs(self.operator).sum(axis=1)).ravel() -
+                 abs(diagonal))
+        self._spectrum_min = numpy.append(diagonal - radii, 0.).min()
+        self._spectrum_max = numpy.append(diagonal + radii, 0.).max()
+        self._scale = max(abs(self._spectrum_min), abs(self._spectrum_max),
+                          EQ_TOLERANCE)
+
+    def clear_cache(self):
+        """Discard the cached factorizations."""
+        self._factorizations.clear()
+
+    @profiled(name='SpectralWindowSolver.eigenpairs')
+    def eigenpairs(self, energy_min, energy_max, method='shift-invert',
+                   tolerance=1e-10, max_iterations=200, expand=True):
+        """Compute all eigenpairs with eigenvalues in [energy_min, energy_max].
+
+        Args:
+            energy_min (float): The lower end of the window.
+            energy_max (float): The upper end of the window.
+            method (str, optional): 'shift-invert' or 'polynomial'.
+            tolerance (float, optional): The largest residual norm of the
+                eigenvectors, relative to a bound of the spectral radius.
+                Default is 1e-10.
+            max_iterations (int, optional): The largest number of
+                iterations per interval. Default is 200.
+            expand (bool, optional): Whether to return the eigenvectors in
+                the full space of n_qubits rather than in the particle-number
+                sector. Default is True.
+
+        Returns
+        -------
+            eigenvalues:
+                The eigenvalues in the window in ascending order.
+            eigenvectors:
+                An ndarray whose columns are the corresponding eigenvectors.
+
+        Raises:
+            ValueError: Invalid window or method.
+            RuntimeError: The iteration did not converge.
+        """
+        if energy_min > energy_max:
+            raise ValueError('energy_min must not exceed energy_max.')
+        if method not in ('shift-invert', 'polynomial'):
+            raise ValueError('Unknown method {}.'.format(method))
+
+        tolerance *= self._scale
+        if self.operator.shape[0] <= _DENSE_DIMENSION:
+            values, vectors = numpy.linalg.eigh(self.operator.toarray())
+        else:
+            # Shifts far outside the spectrum separate eigenvalues poorly,
+            # so the window is clipped to the extreme eigenvalues.
+            lowest, highest = self._extreme_eigenvalues()
+            lower = max(energy_min, lowest - tolerance)
+            upper = min(energy_max, highest + tolerance)
+            if lower > upper:
+                values = numpy.zeros(0)
+                vectors = numpy.zeros((self.operator.shape[0], 0),
+                                      self._dtype)
+            elif method == 'shift-invert':
+                values, vectors = self._shift_invert(
+                    lower, upper, True, tolerance, max_iterations)
+            else:
+                values, vectors = self._polynomial_filter(
+                    lower, upper, tolerance, max_iterations)
+
+        inside = (values >= energy_min) & (values <= energy_max)
+        values, vectors = values[inside], vectors[:, inside]
+        order = numpy.argsort(values, kind='mergesort')
+        values, vectors = values[order], vectors[:, order]
+        if expand:
+            vectors = self.expand(vectors)
+        return values, vectors
+
+    def expand(self, vectors):
+        """Map vectors of the particle-number sector to the full space.
+
+        Args:
+            vectors (ndarray): Vectors in the sector, as columns.
+
+        Returns:
+            The vectors on n_qubits, as columns.
+        """
+        if self.particle_number is None:
+            return vectors
+        expanded = numpy.zeros((2 ** self.n_qubits,) + vectors.shape[1:],
+                               dtype=vectors.dtype)
+        expanded[jw_number_indices(self.particle_number,
+                                   self.n_qubits)] = vectors
+        return expanded
+
+    def _extreme_eigenvalues(self):
+        """Return the lowest and highest eigenvalues, found by Lanczos."""
+        if self._extremes is None:
+            self._extremes = tuple(scipy.sparse.linalg.eigsh(
+                self.operator, k=1, which=which,
+                return_eigenvectors=False)[0] for which in ('SA', 'LA'))
+        return self._extremes
+
+    def _random_block(self, size):
+        return self._random_state.randn(self.operator.shape[0],
+                                        size).astype(self._dtype)
+
+    def _rayleigh_ritz(self, vectors):
+        """Return the Ritz pairs of a block and their residual norms."""
+        vectors, _ = numpy.linalg.qr(vectors)
+        image = self.operator.dot(vectors)
+        values, rotation = numpy.linalg.eigh(
+            numpy.dot(vectors.conj().T, image))
+        vectors = numpy.dot(vectors, rotation)
+        residuals = numpy.linalg.norm(
+            numpy.dot(image, rotation) - vectors * values, axis=0)
+        return values, vectors, residuals
+
+    def _factorization(self, shift):
+        """Return the LU factorization of operator - shift.
+
+        Factorizations are cached in order of last use and the least
+        recently used are discarded beyond max_cached_factorizations.
+        """
+        factorization = self._factorizations.pop(shift, None)
+        if factorization is None:
+            factorization = scipy.sparse.linalg.splu(
+                self.operator - shift * scipy.sparse.identity(
+                    self.operator.shape[0], dtype=self._dtype,
+                    format='csc'))
+        self._factorizations[shift] = factorization
+        while len(self._factorizations) > self.max_cached_factorizations:
+            self._factorizations.popitem(last=False)
+        return factorization
+
+    def _shift_invert(self, lower, upper, include_upper, tolerance,
+                      max_iterations):
+        """Return the eigenpairs in [lower, upper), or [lower, upper]."""
+        dimension = self.operator.shape[0]
+        shift = (lower + upper) / 2.
+        radius = (upper - lower) / 2.
+        try:
+            factorization = self._factorization(shift)
+        except RuntimeError:
+            # The shift is an eigenvalue; move it slightly.
+            shift += 1e-8 * self._scale
+            radius += 1e-8 * self._scale
+            factorization = self._factorization(shift)
+
+        block_size = min(16, dimension)
+        vectors = self._random_block(block_size)
+        iterations_at_size = 0
+        for _ in range(max_iterations):
+            values, vectors, residuals = self._rayleigh_ritz(
+                factorization.solve(vectors))
+            inside = abs(values - shift) <= radius
+            iterations_at_size += 1
+            too_small = _block_too_small(inside, dimension)
+            if not too_small and _converged(abs(values - shift), inside,
+                                            residuals, tolerance):
+                if include_upper:
+                    inside = (values >= lower) & (values <= upper)
+                else:
+                    inside = (values >= lower) & (values < upper)
+                return values[inside], vectors[:, inside]
+            if block_size < dimension and (
+                    too_small or iterations_at_size >= _STALLED_ITERATIONS):
+                if (block_size >= self.max_slice_eigenvalues and too_small
+                        and upper - lower > tolerance):
+                    middle = lower + _SPLIT_FRACTION * (upper - lower)
+                    lower_values, lower_vectors = self._shift_invert(
+                        lower, middle, False, tolerance, max_iterations)
+                    upper_values, upper_vectors = self._shift_invert(
+                        middle, upper, include_upper, tolerance,
+                        max_iterations)
+                    return (numpy.concatenate([lower_values, upper_values]),
+                            numpy.hstack([lower_vectors, upper_vectors]))
+                block_size = min(2 * block_size, dimension)
+                vectors = numpy.hstack([vectors, self._random_block(
+                    block_size - vectors.shape[1])])
+                iterations_at_size = 0
+        raise RuntimeError('Shift-invert iteration did not converge in {} '
+                           'iterations.'.format(max_iterations))
+
+    def _polynomial_filter(self, lower, upper, tolerance, max_iterations,
+                           n_probes=16):
+        """Return the eigenpairs in [lower, upper] by filtered iteration."""
+        operator = self.operator
+        dimension = operator.shape[0]
+        center = (self._spectrum_max + self._spectrum_min) / 2.
+        half_width = max((self._spectrum_max - self._spectrum_min) / 2.,
+                         EQ_TOLERANCE)
+        scaled_lower = (max(lower, self._spectrum_min) - center) / half_width
+        scaled_upper = (min(upper, self._spectrum_max) - center) / half_width
+        if scaled_lower > scaled_upper:
+            return numpy.zeros(0), numpy.zeros((dimension, 0), self._dtype)
+
+        # The filter resolves eigenvalues about 1 / degree apart.
+        degree = int(numpy.clip(
+            8. / max(scaled_upper - scaled_lower, 1e-3), 32, 1000))
+        coefficients = _chebyshev_window_coefficients(
+            scaled_lower, scaled_upper, degree)
+
+        def apply_filter(vectors):
+            previous = vectors
+            current = (operator.dot(vectors) - center * vectors) / half_width
+            result = coefficients[0] * previous + coefficients[1] * current
+            for coefficient in coefficients[2:]:
+                previous, current = current, 2. * (
+                    operator.dot(current) -
+                    center * current) / half_width - previous
+                result += coefficient * current
+            return result
+
+        # Estimate the number of eigenvalues in the window by the trace of
+        # the filter.
+        probes = self._random_state.choice([-1., 1.],
+                                           size=(dimension, n_probes))
+        estimate = numpy.mean(numpy.sum(probes * apply_filter(probes),
+                                        axis=0).real)
+        block_size = min(dimension, max(16, int(1.5 * estimate) + 8))
+
+        vectors = self._random_block(block_size)
+        iterations_at_size = 0
+        for _ in range(max_iterations):
+            values, vectors, residuals = self._rayleigh_ritz(
+                apply_filter(vectors))
+            inside = (values >= lower) & (values <= upper)
+            iterations_at_size += 1
+            too_small = _block_too_small(inside, dimension)
+            priorities = -abs(numpy.polynomial.chebyshev.chebval(
+                (values - center) / half_width, coefficients))
+            if not too_small and _converged(priorities, inside, residuals,
+                                            tolerance):
+                return values, vectors
+            if block_size < dimension and (
+                    too_small or iterations_at_size >= _STALLED_ITERATIONS):
+                block_size = min(2 * block_size, dimension)
+                vectors = numpy.hstack([vectors, self._random_block(
+                    block_size - vectors.shape[1])])
+                iterations_at_size = 0
+        raise RuntimeError('Polynomial filtering did not converge in {} '
+                           'iterations.'.format(max_iterations))
+
+
+def get_eigenpairs_in_window(sparse_operator, energy_min, energy_max,
+                             particle_number=None, method='shift-invert'):
+    """Compute all eigenpairs of an operator in an energy window.
+
+    Args:
+        sparse_operator (scipy.sparse.spmatrix): A Hermitian operator.
+        energy_min (float): The lower end of the window.
+        energy_max (float): The upper end of the window.
+        particle_number (int, optional): Restrict to the Jordan-Wigner
+            sector with this number of particles.
+        method (str, optional): 'shift-invert' or 'polynomial'; see
+            SpectralWindowSolver.
+
+    Returns
+    -------
+        eigenvalues:
+            The eigenvalues in the window in ascending order.
+        eigenvectors:
+            An ndarray whose columns are the corresponding eigenvectors.
+    """
+    # The solver is not reused, so each factorization is freed once its
+    # interval is solved.
+    solver = SpectralWindowSolver(sparse_operator, particle_number,
+                                  max_cached_factorizations=0)
+    return solver.eigenpairs(energy_min, energy_max, method=method)
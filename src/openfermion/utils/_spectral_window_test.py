@@ -0,0 +1,149 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _spectral_window.py."""
+from __future__ import absolute_import
+
+import unittest
+
+import numpy
+import scipy.sparse
+
+from openfermion.hamiltonians import fermi_hubbard
+from openfermion.transforms import get_sparse_operator
+from openfermion.utils import jw_number_restrict_operator
+from openfermion.utils._spectral_window import (SpectralWindowSolver,
+                                                get_eigenpairs_in_window)
+
+
+class SpectralWindowSolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hubbard = get_sparse_operator(
+            fermi_hubbard(5, 1, 1., 4., periodic=True))
+        self.spectrum = numpy.linalg.eigvalsh(self.hubbard.toarray())
+
+    def assert_window(self, operator, spectrum, energy_min, energy_max,
+                      **kwargs):
+        expected = spectrum[(spectrum >= energy_min) &
+                            (spectrum <= energy_max)]
+        eigenvalues, eigenvectors = SpectralWindowSolver(
+            operator).eigenpairs(energy_min, energy_max, **kwargs)
+        numpy.testing.assert_allclose(eigenvalues, expected, atol=1e-8)
+        self.assertTrue(numpy.allclose(
+            operator.dot(eigenvectors), eigenvectors * eigenvalues))
+        self.assertTrue(numpy.allclose(
+            eigenvectors.conj().T.dot(eigenvectors),
+            numpy.eye(len(eigenvalues))))
+
+    def test_shift_invert(self):
+        self.assert_window(self.hubbard, self.spectrum, -.7, -.1)
+
+    def test_polynomial(self):
+        self.assert_window(self.hubbard, self.spectrum, -.7, -.1,
+                           method='polynomial')
+
+    def test_slicing(self):
+        # The window holds more eigenvalues than a slice is allowed.
+        solver = SpectralWindowSolver(self.hubbard, max_slice_eigenvalues=16)
+        eigenvalues, _ = solver.eigenpairs(-1.5, .5)
+        numpy.testing.assert_allclose(
+            eigenvalues,
+            self.spectrum[(self.spectrum >= -1.5) & (self.spectrum <= .5)],
+            atol=1e-8)
+        self.assertGreater(len(solver._factorizations), 1)
+
+    def test_particle_number(self):
+        hubbard = get_sparse_operator(
+            fermi_hubbard(6, 1, 1., 4., periodic=True))
+        solver = SpectralWindowSolver(hubbard, particle_number=6)
+        expected = numpy.linalg.eigvalsh(
+            jw_number_restrict_operator(hubbard, 6, 12).toarray())
+        expected = expected[(expected >= -3.5) & (expected <= -2.)]
+        for method in ('shift-invert', 'polynomial'):
+            eigenvalues, eigenvectors = solver.eigenpairs(
+                -3.5, -2., method=method)
+            numpy.testing.assert_allclose(eigenvalues, expected, atol=1e-8)
+            self.assertEqual(eigenvectors.shape, (2 ** 12, len(expected)))
+            self.assertTrue(numpy.allclose(
+                hubbard.dot(eigenvectors), eigenvectors * eigenvalues))
+
+        _, sector_vectors = solver.eigenpairs(-3.5, -2., expand=False)
+        self.assertEqual(sector_vectors.shape, (924, len(expected)))
+
+    def test_complex_operator(self):
+        random_state = numpy.random.RandomState(3)
+        matrix = scipy.sparse.random(300, 300, density=0.02,
+                                     random_state=random_state)
+        matrix = scipy.sparse.csc_matrix(matrix + 1j * matrix.T)
+        matrix = matrix + matrix.getH()
+        spectrum = numpy.linalg.eigvalsh(matrix.toarray())
+        for method in ('shift-invert', 'polynomial'):
+            self.assert_window(matrix, spectrum, -.5, .5, method=method)
+
+    def test_empty_window(self):
+        for method in ('shift-invert', 'polynomial'):
+            eigenvalues, eigenvectors = SpectralWindowSolver(
+                self.hubbard).eigenpairs(-20., -10., method=method)
+            self.assertEqual(eigenvalues.shape, (0,))
+            self.assertEqual(eigenvectors.shape, (2 ** 10, 0))
+
+    def test_dense_fallback(self):
+        operator = get_sparse_operator(fermi_hubbard(2, 2, 1., 4.))
+        spectrum = numpy.linalg.eigvalsh(operator.toarray())
+        self.assert_window(operator, spectrum, -3., 3.)
+
+    def test_factorizations_are_cached(self):
+        solver = SpectralWindowSolver(self.hubbard)
+        solver.eigenpairs(-.7, -.1)
+        factorizations = dict(solver._factorizations)
+        solver.eigenpairs(-.7, -.1)
+        self.assertEqual(solver._factorizations, factorizations)
+        solver.clear_cache()
+        self.assertFalse(solver._factorizations)
+
+    def test_factorization_cache_is_bounded(self):
+        expected = self.spectrum[(self.spectrum >= -1.5) &
+                                 (self.spectrum <= .5)]
+        for max_cached in (0, 2):
+            solver = SpectralWindowSolver(
+                self.hubbard, max_slice_eigenvalues=16,
+                max_cached_factorizations=max_cached)
+            for _ in range(2):
+                eigenvalues, _ = solver.eigenpairs(-1.5, .5)
+                numpy.testing.assert_allclose(eigenvalues, expected,
+                                              atol=1e-8)
+                self.assertEqual(len(solver._factorizations), max_cached)
+
+    def test_get_eigenpairs_in_window(self):
+        eigenvalues, eigenvectors = get_eigenpairs_in_window(
+            self.hubbard, -.7, -.1, particle_number=4)
+        sector = jw_number_restrict_operator(self.hubbard, 4, 10)
+        expected = numpy.linalg.eigvalsh(sector.toarray())
+        numpy.testing.assert_allclose(
+            eigenvalues, expected[(expected >= -.7) & (expected <= -.1)],
+            atol=1e-8)
+        self.assertEqual(eigenvectors.shape[0], 2 ** 10)
+
+    def test_bad_window(self):
+        with self.assertRaises(ValueError):
+            SpectralWindowSolver(self.hubbard).eigenpairs(1., 0.)
+
+    def test_bad_method(self):
+        with self.assertRaises(ValueError):
+            SpectralWindowSolver(self.hubbard).eigenpairs(
+                0., 1., method='lanczos')
+
+    def test_not_hermitian(self):
+        with self.assertRaises(ValueError):
+            SpectralWindowSolver(scipy.sparse.csc_matrix([[0., 1.],
+                                                          [0., 0.]]))
@@ -0,0 +1,335 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Time evolution of states under sparse Hamiltonians."""
+from __future__ import absolute_import
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+from numpy.lib import NumpyVersion
+
+from openfermion._profiling import profiled
+from openfermion.config import *
+from openfermion.utils._operator_utils import is_hermitian
+from openfermion.utils._sparse_tools import (jw_number_indices,
+                                             jw_number_restrict_operator)
+
+# Number of bisections of a time step that is too long for a Krylov basis.
+_STEP_BISECTIONS = 30
+
+
+def _check_times(times):
+    """Return times as an array, checking that they are valid.
+
+    Raises:
+        ValueError: Times are negative or decreasing.
+    """
+    times = numpy.asarray(times, dtype=float)
+    if numpy.any(times < 0.) or numpy.any(numpy.diff(times) < 0.):
+        raise ValueError('Times must be nonnegative and nondecreasing.')
+    return times
+
+
+def _eigh_tridiagonal(diagonal, off_diagonal):
+    """Diagonalize a real symmetric tridiagonal matrix.
+
+    scipy.linalg.eigh_tridiagonal needs scipy 1.0; with older versions the
+    small matrix is diagonalized densely.
+    """
+    if NumpyVersion(scipy.__version__) >= '1.0.0':
+        return scipy.linalg.eigh_tridiagonal(diagonal, off_diagonal)
+    return numpy.linalg.eigh(numpy.diag(diagonal) +
+                             numpy.diag(off_diagonal, 1) +
+                             numpy.diag(off_diagonal, -1))
+
+
+class KrylovPropagator(object):
+    """Evolves states under exp(-i H t) in Lanczos bases.
+
+    The propagator builds an orthonormal Krylov basis of the state with
+    the Lanczos algorithm and exponentiates the small tridiagonal
+    projection of the Hamiltonian onto it. One basis approximates the
+    evolved state over a range of times, so output times that are close
+    together share a basis; the generalized residual of the Krylov
+    approximation estimates its error, and a new basis is started from the
+    evolved state once the next time would exceed the tolerance.
+
+    Only the Lanczos vectors of one basis are kept in memory besides the
+    states, which are yielded one time at a time by propagate.
+
+    With particle_number, the Hamiltonian is restricted to the states with
+    that number of particles in the Jordan-Wigner encoding, and states
+    must lie in that sector.
+
+    Attributes:
+        operator (scipy.sparse.csr_matrix): The Hamiltonian, restricted to
+            the particle-number sector if one is given.
+        n_qubits (int): The number of qubits of the unrestricted Hamiltonian.
+        particle_number (int): The particle number of the sector, or None.
+        krylov_dimension (int): The largest dimension of a Krylov basis.
+        tolerance (float): The largest estimated error of a Krylov
+            approximation, relative to the norm of the state.
+        n_krylov_bases (int): The number of Krylov bases built by the last
+            propagation.
+    """
+
+    def __init__(self, sparse_operator, particle_number=None, n_qubits=None,
+                 krylov_dimension=30, tolerance=1e-10):
+        """
+        Args:
+            sparse_operator (scipy.sparse.spmatrix): A Hermitian operator.
+            particle_number (int, optional): Restrict to the sector with
+                this number of particles.
+            n_qubits (int, optional): The number of qubits of the operator.
+                Inferred from its shape by default.
+            krylov_dimension (int, optional): The largest dimension of a
+                Krylov basis. Default is 30.
+            tolerance (float, optional): The largest estimated error of a
+                Krylov approximation, relative to the norm of the state.
+                Default is 1e-10.
+
+        Raises:
+            ValueError: Operator is not Hermitian.
+        """
+        if not is_hermitian(sparse_operator):
+            raise ValueError('sparse_operator must be Hermitian.')
+        if n_qubits is None:
+            n_qubits = int(numpy.log2(sparse_operator.shape[0]))
+        self.n_qubits = n_qubits
+        self.particle_number = particle_number
+        if particle_number is not None:
+            sparse_operator = jw_number_restrict_operator(
+                sparse_operator, particle_number, n_qubits)
+        self.operator = scipy.sparse.csr_matrix(sparse_operator)
+        self.krylov_dimension = krylov_dimension
+        self.tolerance = tolerance
+        self.n_krylov_bases = 0
+
+    def restrict(self, state):
+        """Map a state on n_qubits to the particle-number sector.
+
+        Args:
+            state (ndarray or scipy.sparse.spmatrix): The state, as a
+                vector or a single column.
+
+        Returns:
+            The state in the sector, as an ndarray.
+
+        Raises:
+            ValueError: State is not in the particle-number sector.
+        """
+        if scipy.sparse.issparse(state):
+            state = state.toarray()
+        state = numpy.asarray(state, dtype=complex).ravel()
+        if self.particle_number is None:
+            return state
+        indices = jw_number_indices(self.particle_number, self.n_qubits)
+        restricted = state[indices]
+        outside = numpy.linalg.norm(state) ** 2 - numpy.linalg.norm(
+            restricted) ** 2
+        if outside > EQ_TOLERANCE * numpy.linalg.norm(state) ** 2:
+            raise ValueError('State has support outside the sector with '
+                             '{} particles.'.format(self.particle_number))
+        return restricted
+
+    def expand(self, state):
+        """Map a state of the particle-number sector to n_qubits."""
+        if self.particle_number is None:
+            return state
+        expanded = numpy.zeros(2 ** self.n_qubits, dtype=complex)
+        expanded[jw_number_indices(self.particle_number,
+                                   self.n_qubits)] = state
+        return expanded
+
+    def propagate(self, state, times, expand=True):
+        """Yield the evolved state exp(-i H t) state at each time.
+
+        Args:
+            state (ndarray or scipy.sparse.spmatrix): The state at time
+                zero.
+            times (sequence of floats): Nondecreasing, nonnegative times.
+            expand (bool, optional): Whether to yield states on n_qubits
+                rather than in the particle-number sector. Default is True.
+
+        Returns:
+            A generator of the state at each of the times, as ndarrays.
+
+        Raises:
+            ValueError: Times are negative or decreasing.
+        """
+        # Check the arguments now rather than at the first iteration.
+        return self._propagate(self.restrict(state), _check_times(times),
+                               expand)
+
+    def _propagate(self, state, times, expand):
+        self.n_krylov_bases = 0
+        norm = numpy.linalg.norm(state)
+        if not norm:
+            for _ in times:
+                yield self.expand(state) if expand else state
+            return
+
+        vector = state / norm
+        basis = None
+        basis_time = 0.
+        for time in times:
+            while basis is None or error(time - basis_time) > self.tolerance:
+                if basis is not None:
+                    step = self._longest_step(error, time - basis_time)
+                    vector = coefficients(step).dot(basis)
+                    vector /= numpy.linalg.norm(vector)
+                    basis_time += step
+                basis, coefficients, error = self._lanczos(vector)
+                self.n_krylov_bases += 1
+            evolved = norm * coefficients(time - basis_time).dot(basis)
+            yield self.expand(evolved) if expand else evolved
+
+    def _lanczos(self, vector):
+        """Build the Krylov basis of a normalized vector.
+
+        Returns:
+            basis (ndarray): The orthonormal Lanczos vectors, as rows.
+            coefficients (callable): Returns the coordinates in the basis
+                of the vector evolved for a time.
+            error (callable): Returns the estimated error of the evolved
+                vector at a time.
+        """
+        dimension = min(self.krylov_dimension, self.operator.shape[0])
+        basis = numpy.zeros((dimension, len(vector)), dtype=complex)
+        diagonal = numpy.zeros(dimension)
+        off_diagonal = numpy.zeros(dimension)
+        basis[0] = vector
+        for j in range(dimension):
+            image = self.operator.dot(basis[j])
+            image_norm = numpy.linalg.norm(image)
+            diagonal[j] = numpy.vdot(basis[j], image).real
+            image -= diagonal[j] * basis[j]
+            if j:
+                image -= off_diagonal[j - 1] * basis[j - 1]
+            # Reorthogonalize against the whole basis.
+            image -= basis[:j + 1].conj().dot(image).dot(basis[:j + 1])
+            off_diagonal[j] = numpy.linalg.norm(image)
+            if off_diagonal[j] <= 1e-12 * image_norm:
+                # The basis spans an invariant subspace: it is exact.
+                off_diagonal[j] = 0.
+                dimension = j + 1
+                break
+            if j + 1 < dimension:
+                basis[j + 1] = image / off_diagonal[j]
+        basis = basis[:dimension]
+        residual = off_diagonal[dimension - 1]
+
+        eigenvalues, eigenvectors = _eigh_tridiagonal(
+            diagonal[:dimension], off_diagonal[:dimension - 1])
+        first = eigenvectors[0]
+        last = eigenvectors[-1]
+
+        def coefficients(time):
+            return eigenvectors.dot(numpy.exp(-1j * eigenvalues * time) *
+                                    first)
+
+        def error(time):
+            # The generalized residual, residual * time * |e_m^T
+            # phi_1(-i T time) e_1|, with phi_1(z) = (exp(z) - 1) / z.
+            if not residual or not time:
+                return 0.
+            phases = -1j * eigenvalues * time
+            small = abs(phases) < 1e-8
+            phi = numpy.where(small, 1. + phases / 2.,
+                              numpy.expm1(phases) /
+                              numpy.where(small, 1., phases))
+            return residual * time * abs(numpy.dot(last, phi * first))
+
+        return basis, coefficients, error
+
+    def _longest_step(self, error, time):
+        """Return the longest step up to time with error within tolerance.
+
+        The error of a Krylov approximation grows with the time step, so
+        the step is found by bisection.
+        """
+        lower, upper = 0., time
+        for _ in range(_STEP_BISECTIONS):
+            middle = (lower + upper) / 2.
+            if error(middle) <= self.tolerance:
+                lower = middle
+            else:
+                upper = middle
+        return max(lower, time * 2. ** -_STEP_BISECTIONS)
+
+
+@profiled
+def evolve_state(sparse_operator, state, times, method='krylov',
+                 particle_number=None, tolerance=1e-10):
+    """Evolve a state under a Hamiltonian to several times.
+
+    Computes exp(-i H t) state for each time t. Intermediate times cost
+    little more than the last one alone, as each is reached from the
+    previous one.
+
+    Args:
+        sparse_operator (scipy.sparse.spmatrix): The Hamiltonian H.
+        state (ndarray or scipy.sparse.spmatrix): The state at time zero.
+        times (float or sequence of floats): Nondecreasing, nonnegative
+            times.
+        method (str, optional): 'krylov' propagates in Lanczos bases, see
+            KrylovPropagator; 'expm_multiply' uses
+            scipy.sparse.linalg.expm_multiply, which chooses its own
+            Taylor steps, and can be faster for evenly spaced times.
+        particle_number (int, optional): Restrict to the Jordan-Wigner
+            sector with this number of particles, which must contain the
+            state.
+        tolerance (float, optional): The largest estimated error of a
+            Krylov approximation. Ignored by 'expm_multiply'.
+
+    Returns:
+        An ndarray whose columns are the states at the times, or the state
+        if times is a single float.
+
+    Raises:
+        ValueError: Invalid times or method, or state not in the sector.
+    """
+    if method not in ('krylov', 'expm_multiply'):
+        raise ValueError('Unknown method {}.'.format(method))
+    single_time = numpy.ndim(times) == 0
+    times = _check_times(numpy.atleast_1d(times))
+    propagator = KrylovPropagator(sparse_operator, particle_number,
+                                  tolerance=tolerance)
+    if method == 'krylov':
+        states = propagator.propagate(state, times, expand=False)
+    else:
+        state = propagator.restrict(state)
+        generator = -1j * propagator.operator
+        intervals = numpy.diff(numpy.concatenate([[0.], times]))
+        if len(times) > 2 and numpy.allclose(intervals[1:], intervals[1]):
+            # Evenly spaced times are evolved by a single call.
+            if times[0]:
+                state = scipy.sparse.linalg.expm_multiply(
+                    times[0] * generator, state)
+            states = scipy.sparse.linalg.expm_multiply(
+                generator, state, start=0., stop=times[-1] - times[0],
+                num=len(times), endpoint=True)
+        else:
+            states = []
+            for interval in intervals:
+                if interval:
+                    state = scipy.sparse.linalg.expm_multiply(
+                        interval * generator, state)
+                states.append(state)
+
+    states = numpy.array([propagator.expand(evolved)
+                          for evolved in states]).T
+    if single_time:
+        return states[:, 0]
+    return states
@@ -0,0 +1,169 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _time_evolution.py."""
+from __future__ import absolute_import
+
+import unittest
+
+import numpy
+import scipy.linalg
+import scipy.sparse
+
+from openfermion.hamiltonians import fermi_hubbard
+from openfermion.transforms import get_sparse_operator
+from openfermion.utils import (get_ground_state, jw_configuration_state,
+                               jw_number_restrict_operator)
+from openfermion.utils._sparse_tools import jw_number_indices
+from openfermion.utils._time_evolution import (KrylovPropagator,
+                                               _eigh_tridiagonal,
+                                               evolve_state)
+
+
+class EvolveStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hamiltonian = get_sparse_operator(fermi_hubbard(2, 2, 1., 4.))
+        random_state = numpy.random.RandomState(0)
+        self.state = (random_state.randn(2 ** 8) +
+                      1j * random_state.randn(2 ** 8))
+        self.state /= numpy.linalg.norm(self.state)
+
+    def exact_states(self, times, state=None):
+        if state is None:
+            state = self.state
+        matrix = self.hamiltonian.toarray()
+        return numpy.array([scipy.linalg.expm(-1j * time * matrix).dot(state)
+                            for time in times]).T
+
+    def test_krylov(self):
+        times = [0., .5, 1.3, 5.]
+        states = evolve_state(self.hamiltonian, self.state, times)
+        self.assertEqual(states.shape, (2 ** 8, 4))
+        self.assertTrue(numpy.allclose(states, self.exact_states(times)))
+
+    def test_expm_multiply(self):
+        for times in ([0., .5, 1.3, 5.], numpy.linspace(.5, 3., 6)):
+            states = evolve_state(self.hamiltonian, self.state, times,
+                                  method='expm_multiply')
+            self.assertTrue(numpy.allclose(states, self.exact_states(times)))
+
+    def test_single_time(self):
+        for method in ('krylov', 'expm_multiply'):
+            state = evolve_state(self.hamiltonian, self.state, 2.,
+                                 method=method)
+            self.assertEqual(state.shape, (2 ** 8,))
+            self.assertTrue(numpy.allclose(state,
+                                           self.exact_states([2.])[:, 0]))
+
+    def test_particle_number(self):
+        # States may be given as sparse columns.
+        state = jw_configuration_state([0, 3, 4, 7], 8)
+        times = [1., 2.]
+        expected = self.exact_states(times, state.toarray().ravel())
+        for method in ('krylov', 'expm_multiply'):
+            states = evolve_state(self.hamiltonian, state, times,
+                                  method=method, particle_number=4)
+            self.assertTrue(numpy.allclose(states, expected))
+
+    def test_state_outside_sector(self):
+        with self.assertRaises(ValueError):
+            evolve_state(self.hamiltonian, self.state, 1., particle_number=4)
+
+    def test_eigenstate(self):
+        energy, state = get_ground_state(self.hamiltonian)
+        evolved = evolve_state(self.hamiltonian, state, 3.)
+        self.assertTrue(numpy.allclose(evolved,
+                                       numpy.exp(-3j * energy) * state))
+
+    def test_bad_times(self):
+        with self.assertRaises(ValueError):
+            evolve_state(self.hamiltonian, self.state, [1., .5])
+        with self.assertRaises(ValueError):
+            evolve_state(self.hamiltonian, self.state, -1.,
+                         method='expm_multiply')
+
+    def test_bad_method(self):
+        with self.assertRaises(ValueError):
+            evolve_state(self.hamiltonian, self.state, 1., method='expm')
+
+    def test_not_hermitian(self):
+        with self.assertRaises(ValueError):
+            evolve_state(scipy.sparse.csc_matrix([[0., 1.], [0., 0.]]),
+                         numpy.array([1., 0.]), 1.)
+
+
+class KrylovPropagatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hamiltonian = get_sparse_operator(fermi_hubbard(2, 2, 1., 4.))
+        self.propagator = KrylovPropagator(self.hamiltonian, particle_number=4,
+                                           krylov_dimension=10)
+        random_state = numpy.random.RandomState(0)
+        self.state = numpy.zeros(2 ** 8, dtype=complex)
+        self.state[jw_number_indices(4, 8)] = (random_state.randn(70) +
+                                               1j * random_state.randn(70))
+        self.state /= numpy.linalg.norm(self.state)
+
+    def test_bases_are_reused(self):
+        times = numpy.linspace(0., 1., 50)
+        states = list(self.propagator.propagate(self.state, times))
+        self.assertLess(self.propagator.n_krylov_bases, len(times) // 2)
+        matrix = self.hamiltonian.toarray()
+        for time, state in zip(times, states):
+            self.assertTrue(numpy.allclose(
+                state, scipy.linalg.expm(-1j * time * matrix).dot(
+                    self.state)))
+
+    def test_long_time_steps(self):
+        state, = self.propagator.propagate(self.state, [20.])
+        self.assertGreater(self.propagator.n_krylov_bases, 1)
+        self.assertAlmostEqual(numpy.linalg.norm(state), 1.)
+        self.assertTrue(numpy.allclose(
+            state, scipy.linalg.expm(
+                -20j * self.hamiltonian.toarray()).dot(self.state)))
+
+    def test_sector_states(self):
+        sector_state = self.propagator.restrict(self.state)
+        self.assertEqual(sector_state.shape, (70,))
+        evolved, = self.propagator.propagate(self.state, [1.], expand=False)
+        sector = jw_number_restrict_operator(self.hamiltonian, 4, 8)
+        self.assertTrue(numpy.allclose(
+            evolved, scipy.linalg.expm(-1j * sector.toarray()).dot(
+                sector_state)))
+        self.assertTrue(numpy.allclose(
+            self.propagator.expand(sector_state), self.state))
+
+    def test_zero_state(self):
+        states = list(self.propagator.propagate(numpy.zeros(2 ** 8),
+                                                [0., 1.]))
+        self.assertEqual(len(states), 2)
+        self.assertFalse(numpy.any(states[1]))
+
+    def test_arguments_checked_eagerly(self):
+        with self.assertRaises(ValueError):
+            self.propagator.propagate(self.state, [2., 1.])
+
+    def test_tridiagonal_fallback(self):
+        diagonal = numpy.array([1., -2., 0.5])
+        off_diagonal = numpy.array([0.3, 1.2])
+        eigenvalues, eigenvectors = _eigh_tridiagonal(diagonal, off_diagonal)
+        version = scipy.__version__
+        scipy.__version__ = '0.19.1'
+        try:
+            old_eigenvalues, old_eigenvectors = _eigh_tridiagonal(
+                diagonal, off_diagonal)
+        finally:
+            scipy.__version__ = version
+        numpy.testing.assert_allclose(old_eigenvalues, eigenvalues)
+        numpy.testing.assert_allclose(abs(old_eigenvectors),
+                                      abs(eigenvectors), atol=1e-12)
@@ -0,0 +1,271 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""On-disk cache of the results of expensive operator transforms."""
+from __future__ import absolute_import
+
+import functools
+import glob
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy
+import scipy.sparse
+
+from openfermion import config
+from openfermion._version import __version__
+from openfermion.ops import (DiagonalCoulombHamiltonian, PolynomialTensor,
+                             SymbolicOperator)
+from openfermion.utils._operator_utils import (_operator_type,
+                                               _write_operator,
+                                               load_operator)
+
+# Entries are stored as <key>.data in the cache directory.
+_ENTRY_SUFFIX = '.data'
+
+
+def _update_digest(digest, value):
+    """Feed a canonical encoding of value into a hashlib digest.
+
+    The encoding does not depend on the process, so keys are stable across
+    runs; operator fingerprints are not suitable because string hashes are
+    salted per process.
+    """
+    if isinstance(value, SymbolicOperator):
+        digest.update(type(value).__name__.encode())
+        digest.update(repr(sorted(value.terms.items())).encode())
+    elif isinstance(value, (PolynomialTensor, DiagonalCoulombHamiltonian)):
+        digest.update(type(value).__name__.encode())
+        _update_digest(digest, vars(value))
+    elif isinstance(value, numpy.ndarray):
+        value = numpy.ascontiguousarray(value)
+        digest.update('ndarray{}{}'.format(value.dtype.str,
+                                           value.shape).encode())
+        digest.update(value.tobytes())
+    elif scipy.sparse.issparse(value):
+        value = value.tocsr()
+        value.sort_indices()
+        digest.update('spmatrix{}'.format(value.shape).encode())
+        for array in (value.data, value.indices, value.indptr):
+            _update_digest(digest, array)
+    elif isinstance(value, dict):
+        digest.update('dict{}'.format(len(value)).encode())
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update('{}{}'.format(type(value).__name__,
+                                    len(value)).encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif value is None or isinstance(value, (bool, int, float, complex, str,
+                                             numpy.generic)):
+        digest.update('{}{!r};'.format(type(value).__name__,
+                                       value).encode())
+    else:
+        raise TypeError('Cannot compute a content hash of {}.'.format(
+            type(value).__name__))
+
+
+def _function_identity(function):
+    """Return a description of a callable for the key of a cache entry.
+
+    functools.partial objects are described by their function and bound
+    arguments. Other callables are described by their module and
+    qualified name, or by their repr if they have no name, e.g. callable
+    instances; entries keyed by a repr holding a memory address are only
+    found again within the same process.
+    """
+    if isinstance(function, functools.partial):
+        return ('partial', _function_identity(function.func),
+                function.args, function.keywords or {})
+    name = (getattr(function, '__qualname__', None) or
+            getattr(function, '__name__', None) or repr(function))
+    return getattr(function, '__module__', None), name
+
+
+class TransformCache(object):
+    """A size-bounded on-disk cache of the results of transforms.
+
+    Results are keyed by a hash of the contents of the input operator,
+    the name of the function, the remaining arguments and the OpenFermion
+    version, so that re-running a calculation on the same inputs, even in
+    a new process, loads the result instead of recomputing it. Operators are
+    stored in the format of save_operator and sparse matrices and arrays in
+    uncompressed .npz files. Results of other types are returned without
+    being cached.
+
+    When the entries exceed the size limit, the least recently used ones
+    are deleted. Using the cache is opt-in:
+
+    .. code-block:: python
+
+        cache = TransformCache()
+        qubit_hamiltonian = cache(jordan_wigner, fermion_hamiltonian)
+        sparse_hamiltonian = cache(get_sparse_operator, qubit_hamiltonian)
+
+    Attributes:
+        directory (str): The directory holding the entries.
+        max_bytes (int): The maximum total size of the entries.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        """
+        Args:
+            directory (str, optional): The cache directory, created if
+                needed. Defaults to config.TRANSFORM_CACHE_DIRECTORY.
+            max_bytes (int, optional): The size limit of the cache.
+                Defaults to config.TRANSFORM_CACHE_MAX_BYTES.
+        """
+        if directory is None:
+            directory = config.TRANSFORM_CACHE_DIRECTORY
+        if max_bytes is None:
+            max_bytes = config.TRANSFORM_CACHE_MAX_BYTES
+        self.directory = directory
+        self.max_bytes = max_bytes
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def key(self, function, operator, *args, **kwargs):
+        """Return the key under which a call is cached.
+
+        Args:
+            function (callable): The transform.
+            operator: The operator passed as first argument to function.
+            args, kwargs: The remaining arguments of function.
+
+        Returns:
+            key (str): A hexadecimal SHA-256 digest.
+
+        Raises:
+            TypeError: Cannot compute a content hash of an argument.
+        """
+        digest = hashlib.sha256()
+        _update_digest(digest, (__version__,) + _function_identity(function))
+        _update_digest(digest, operator)
+        _update_digest(digest, args)
+        _update_digest(digest, kwargs)
+        return digest.hexdigest()
+
+    def __call__(self, function, operator, *args, **kwargs):
+        """Return function(operator, *args, **kwargs), using the cache.
+
+        Args:
+            function (callable): The transform.
+            operator: The operator passed as first argument to function.
+            args, kwargs: The remaining arguments of function.
+
+        Returns:
+            The result of the function, loaded from the cache if present.
+        """
+        key = self.key(function, operator, *args, **kwargs)
+        file_path = os.path.join(self.directory, key + _ENTRY_SUFFIX)
+        if os.path.isfile(file_path):
+            try:
+                result = self._read_entry(key)
+            except (IOError, OSError, ValueError, KeyError,
+                    zipfile.BadZipfile):
+                # The entry is unreadable, e.g. it was truncated; replace it.
+                self._remove(file_path)
+            else:
+                # Mark the entry as recently used.
+                os.utime(file_path, None)
+                return result
+
+        result = function(operator, *args, **kwargs)
+        if self._write_entry(file_path, result):
+            self._evict()
+        return result
+
+    def _read_entry(self, key):
+        """Load the result stored under key."""
+        file_path = os.path.join(self.directory, key + _ENTRY_SUFFIX)
+        with numpy.load(file_path) as data:
+            names = set(data.files)
+        if 'operator_type' in names:
+            return load_operator(key, self.directory)
+        elif 'format' in names:
+            return scipy.sparse.load_npz(file_path)
+        with numpy.load(file_path) as data:
+            return data['array']
+
+    def _write_entry(self, file_path, result):
+        """Store a result, returning whether its type could be stored."""
+        try:
+            _operator_type(result)
+        except TypeError:
+            if not (scipy.sparse.issparse(result) or
+                    (isinstance(result, numpy.ndarray) and
+                     result.dtype != object)):
+                return False
+
+        # Write to a temporary file first so that other processes never
+        # read a partial entry.
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as f:
+                if scipy.sparse.issparse(result):
+                    scipy.sparse.save_npz(f, result, compressed=False)
+                elif isinstance(result, numpy.ndarray):
+                    numpy.savez(f, array=result)
+                else:
+                    _write_operator(f, result)
+            os.rename(temporary_path, file_path)
+        except Exception:
+            self._remove(temporary_path)
+            raise
+        return True
+
+    def _entries(self):
+        """Return (last use, size, path) of the entries, oldest first."""
+        entries = []
+        for file_path in glob.glob(os.path.join(self.directory,
+                                                '*' + _ENTRY_SUFFIX)):
+            try:
+                status = os.stat(file_path)
+            except OSError:
+                # Removed by another process.
+                continue
+            entries.append((status.st_mtime, status.st_size, file_path))
+        return sorted(entries)
+
+    def _evict(self):
+        """Delete least recently used entries until under the size limit."""
+        entries = self._entries()
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, file_path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(file_path)
+            total_bytes -= size
+
+    def size(self):
+        """Return the total size in bytes of the entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self):
+        return len(self._entries())
+
+    def clear(self):
+        """Delete all entries."""
+        for _, _, file_path in self._entries():
+            self._remove(file_path)
+
+    @staticmethod
+    def _remove(file_path):
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
@@ -0,0 +1,180 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _transform_cache.py."""
+from __future__ import absolute_import
+
+import functools
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy
+
+from openfermion import config
+from openfermion.hamiltonians import fermi_hubbard
+from openfermion.ops import FermionOperator, QubitOperator
+from openfermion.transforms import (bravyi_kitaev, get_interaction_operator,
+                                    get_sparse_operator, jordan_wigner)
+from openfermion.utils import TransformCache
+
+
+class CountingFunction(object):
+    """Wraps a function and counts its calls."""
+
+    def __init__(self, function):
+        self.function = function
+        self.__module__ = function.__module__
+        self.__name__ = function.__name__
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.function(*args, **kwargs)
+
+
+class TransformCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = TransformCache(self.directory)
+        self.hamiltonian = fermi_hubbard(2, 2, 1., 4.)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_results_match_uncached(self):
+        qubit_hamiltonian = jordan_wigner(self.hamiltonian)
+        for _ in range(2):
+            self.assertEqual(self.cache(jordan_wigner, self.hamiltonian),
+                             qubit_hamiltonian)
+            self.assertEqual(self.cache(bravyi_kitaev, self.hamiltonian),
+                             bravyi_kitaev(self.hamiltonian))
+            self.assertEqual(
+                self.cache(get_interaction_operator, self.hamiltonian),
+                get_interaction_operator(self.hamiltonian))
+            sparse_operator = self.cache(get_sparse_operator,
+                                         qubit_hamiltonian, n_qubits=8)
+            self.assertEqual(
+                abs(sparse_operator -
+                    get_sparse_operator(qubit_hamiltonian, 8)).max(), 0.)
+        self.assertEqual(len(self.cache), 4)
+
+    def test_hit_skips_recomputation(self):
+        transform = CountingFunction(jordan_wigner)
+        self.cache(transform, self.hamiltonian)
+        self.cache(transform, fermi_hubbard(2, 2, 1., 4.))
+        self.assertEqual(transform.calls, 1)
+
+        # A new cache on the same directory, as in a later run, hits too.
+        TransformCache(self.directory)(transform, self.hamiltonian)
+        self.assertEqual(transform.calls, 1)
+
+    def test_key_depends_on_contents_and_arguments(self):
+        key = self.cache.key(jordan_wigner, self.hamiltonian)
+        self.assertEqual(key, self.cache.key(jordan_wigner,
+                                             fermi_hubbard(2, 2, 1., 4.)))
+        self.assertNotEqual(key, self.cache.key(
+            jordan_wigner, fermi_hubbard(2, 2, 1., 4.5)))
+        self.assertNotEqual(key, self.cache.key(bravyi_kitaev,
+                                                self.hamiltonian))
+        self.assertNotEqual(key, self.cache.key(jordan_wigner,
+                                                self.hamiltonian, 8))
+        self.assertNotEqual(
+            self.cache.key(get_sparse_operator, QubitOperator('X0'),
+                           n_qubits=1),
+            self.cache.key(get_sparse_operator, QubitOperator('X0'),
+                           n_qubits=2))
+
+        # The key does not depend on the order in which terms were added.
+        operator = FermionOperator('1^ 0', 2.) + FermionOperator('3^', 1.j)
+        reordered = FermionOperator('3^', 1.j) + FermionOperator('1^ 0', 2.)
+        self.assertEqual(self.cache.key(jordan_wigner, operator),
+                         self.cache.key(jordan_wigner, reordered))
+
+        with self.assertRaises(TypeError):
+            self.cache.key(jordan_wigner, self.hamiltonian, object())
+
+    def test_key_of_partials_and_callable_instances(self):
+        transform = functools.partial(get_sparse_operator, n_qubits=2)
+        key = self.cache.key(transform, QubitOperator('X0'))
+        self.assertEqual(key, self.cache.key(
+            functools.partial(get_sparse_operator, n_qubits=2),
+            QubitOperator('X0')))
+        self.assertNotEqual(key, self.cache.key(
+            functools.partial(get_sparse_operator, n_qubits=3),
+            QubitOperator('X0')))
+        self.assertEqual(
+            abs(self.cache(transform, QubitOperator('X0')) -
+                get_sparse_operator(QubitOperator('X0'), 2)).max(), 0.)
+
+        class Transform(object):
+            def __call__(self, operator):
+                return jordan_wigner(operator)
+
+        self.assertEqual(self.cache(Transform(), self.hamiltonian),
+                         jordan_wigner(self.hamiltonian))
+
+    def test_evicts_least_recently_used(self):
+        operators = [FermionOperator(((index, 1),)) for index in range(3)]
+        self.cache(jordan_wigner, operators[0])
+        entry_size = self.cache.size()
+        self.cache.max_bytes = 2 * entry_size + entry_size // 2
+        self.cache(jordan_wigner, operators[1])
+        paths = [os.path.join(self.directory,
+                              self.cache.key(jordan_wigner, operator) +
+                              '.data') for operator in operators]
+        os.utime(paths[0], (1000, 1000))
+        os.utime(paths[1], (2000, 2000))
+
+        # Using the first entry makes the second the least recently used.
+        transform = CountingFunction(jordan_wigner)
+        self.cache(transform, operators[0])
+        self.cache(jordan_wigner, operators[2])
+        self.assertEqual(transform.calls, 0)
+        self.assertTrue(os.path.isfile(paths[0]))
+        self.assertFalse(os.path.isfile(paths[1]))
+        self.assertTrue(os.path.isfile(paths[2]))
+        self.assertLessEqual(self.cache.size(), self.cache.max_bytes)
+
+    def test_arrays_and_uncacheable_results(self):
+        array = self.cache(numpy.diag, numpy.arange(3.))
+        numpy.testing.assert_array_equal(array, numpy.diag(numpy.arange(3.)))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache(str, self.hamiltonian),
+                         str(self.hamiltonian))
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_unreadable_entry_is_recomputed(self):
+        self.cache(jordan_wigner, self.hamiltonian)
+        file_path = os.path.join(
+            self.directory,
+            self.cache.key(jordan_wigner, self.hamiltonian) + '.data')
+        with open(file_path, 'wb') as f:
+            f.write(b'truncated')
+        self.assertEqual(self.cache(jordan_wigner, self.hamiltonian),
+                         jordan_wigner(self.hamiltonian))
+
+    def test_default_directory_from_config(self):
+        directory = os.path.join(self.directory, 'default')
+        old_directory = config.TRANSFORM_CACHE_DIRECTORY
+        config.TRANSFORM_CACHE_DIRECTORY = directory
+        try:
+            cache = TransformCache()
+        finally:
+            config.TRANSFORM_CACHE_DIRECTORY = old_directory
+        self.assertEqual(cache.directory, directory)
+        self.assertTrue(os.path.isdir(directory))
+        self.assertEqual(cache.max_bytes, config.TRANSFORM_CACHE_MAX_BYTES)
@@ -16,6 +16,7 @@ from future.utils import iteritems
 from math import sqrt, ceil
 from scipy.linalg import expm
 
+from openfermion._profiling import profiled
 from openfermion.config import *
 from openfermion.ops import normal_ordered, QubitOperator
 
@@ -73,6 +74,7 @@ def trivially_double_commutes(term_a, term_b, term_c):
             not qubits_a.intersection(set(qubits_b.union(qubits_c))))
 
 
+@profiled
 def error_operator(terms, series_order=2):
     """Determine the difference between the exact generator of unitary
     evolution and the approximate generator given by Trotter-Suzuki
@@ -109,6 +111,7 @@ def error_operator(terms, series_order=2):
     return error_operator / 12.0
 
 
+@profiled
 def error_bound(terms, tight=False):
     """
     Numerically upper bound the error in the ground state energy
@@ -13,8 +13,8 @@
 
 from openfermion.ops import QubitOperator
 from openfermion.utils import count_qubits
+from openfermion.utils._commuting_term_groups import commuting_term_groups
 import numpy
-import copy
 import collections
 
 """
@@ -30,6 +30,26 @@ Description:
 """
 
 
+def _third_order_trotter_scales(n_operators, first=0, scale=1.):
+    """Yield the 3rd-order Trotter ordering as (index, scale) pairs.
+
+    The ordering of operators first to n_operators - 1 is that of
+    operator first interleaved with three copies of the ordering of the
+    following operators, see _third_order_trotter_helper. It is generated
+    recursively, so that only one pair per operator is held in memory.
+    """
+    if first == n_operators - 1:
+        yield first, scale
+        return
+    for factor, rest_factor in ((7.0 / 24.0, 2.0 / 3.0),
+                                (3.0 / 4.0, -2.0 / 3.0),
+                                (-1.0 / 24.0, 1.0)):
+        yield first, factor * scale
+        for index, rest_scale in _third_order_trotter_scales(
+                n_operators, first + 1, rest_factor * scale):
+            yield index, rest_scale
+
+
 def _third_order_trotter_helper(op_list):
     """Iteratively find 3rd-order Trotter ordering of a QubitOperator.
 
@@ -46,36 +66,34 @@ def _third_order_trotter_helper(op_list):
     Returns:
         list of QubitOperators giving the trotterized hamiltonian
     """
-    # Create list to hold return value
-    ret_val = collections.deque([7.0 / 24.0 * op_list[-2],
-                                2.0 / 3.0 * op_list[-1],
-                                3.0 / 4.0 * op_list[-2],
-                                -2.0 / 3.0 * op_list[-1],
-                                -1.0 / 24.0 * op_list[-2],
-                                1.0 * op_list[-1]])
-
-    for i in reversed(range(len(op_list)-2)):
-        temp_ret_val = copy.deepcopy(ret_val)
-        ret_val = collections.deque()
-        ret_val.appendleft(7.0 / 24.0 * op_list[i])
-        ret_val.extend([2.0 / 3.0 * qubop for qubop in temp_ret_val])
-        ret_val.append(3.0 / 4.0 * op_list[i])
-        ret_val.extend([-2.0 / 3.0 * qubop for qubop in temp_ret_val])
-        ret_val.append(-1.0 / 24.0 * op_list[i])
-        ret_val.extend([1.0 * qubop for qubop in temp_ret_val])
-    return ret_val
+    return collections.deque(
+        scale * op_list[index]
+        for index, scale in _third_order_trotter_scales(len(op_list)))
 
 
 def trotter_operator_grouping(hamiltonian,
                               trotter_number=1,
                               trotter_order=1,
                               term_ordering=None,
-                              k_exp=1.0):
+                              k_exp=1.0,
+                              term_grouping=None):
     """Trotter-decomposes operators into groups without exponentiating.
 
     Operators are still Hermitian at the end of this method but have been
         multiplied by k_exp.
 
+    With term_grouping, the terms are partitioned with
+    commuting_term_groups and the Trotter formula is applied to the
+    groups rather than to the terms: the exponential of a group is the
+    product of those of its terms, in any order, so only commutators
+    between groups contribute to the Trotter error. Consecutive
+    exponentials of the same group, such as the halves of the first group
+    at the boundary of two second-order steps, are fused into one.
+
+    Operators are generated one at a time, so that memory does not grow
+    with the number of steps, nor with the length of the 3rd-order
+    formula.
+
     Note:
         The default term_ordering is simply the ordered keys of
         the QubitOperators.terms dict.
@@ -91,14 +109,28 @@ def trotter_operator_grouping(hamiltonian,
             order of terms when trotterizing
         k_exp (float): optional exponential factor
             to all terms when trotterizing
+        term_grouping (str): optional grouping of the terms, either
+            'commuting' or 'qubit_wise' for groups of qubit-wise commuting
+            terms. Cannot be combined with term_ordering.
 
     Yields:
         QubitOperator generator
 
     Raises:
-        ValueError if order > 3 or order <= 0,
+        ValueError if order > 3 or order <= 0, or for an invalid
+            term_grouping,
         TypeError for incorrect types
     """
+    for term, coefficient in _trotter_terms(hamiltonian, trotter_number,
+                                            trotter_order, term_ordering,
+                                            k_exp, term_grouping):
+        yield QubitOperator(term, coefficient)
+
+
+def _trotter_terms(hamiltonian, trotter_number, trotter_order,
+                   term_ordering, k_exp, term_grouping):
+    """Yield the terms of trotter_operator_grouping as pairs (term,
+    coefficient), without building QubitOperators."""
     # Check for default arguments and type errors
     if (trotter_order > 3) or (trotter_order <= 0):
         raise ValueError("Invalid trotter order: " + str(trotter_order))
@@ -106,67 +138,141 @@ def trotter_operator_grouping(hamiltonian,
         raise TypeError("Hamiltonian must be a QubitOperator.")
     if len(hamiltonian.terms) == 0:
         raise TypeError("Hamiltonian must be a non-empty QubitOperator.")
-    if term_ordering is None:
-        # To have consistent default behavior, ordering = sorted keys.
-        term_ordering = sorted(list(hamiltonian.terms.keys()))
-    if len(term_ordering) == 0:
-        raise TypeError("term_ordering must None or non-empty list.")
+    if term_grouping is not None:
+        if term_grouping not in ('commuting', 'qubit_wise'):
+            raise ValueError("Invalid term grouping: " + str(term_grouping))
+        if term_ordering is not None:
+            raise ValueError("term_ordering and term_grouping cannot be "
+                             "combined.")
+        groups = commuting_term_groups(
+            hamiltonian, qubit_wise=term_grouping == 'qubit_wise')
+    else:
+        if term_ordering is None:
+            # To have consistent default behavior, ordering = sorted keys.
+            term_ordering = sorted(list(hamiltonian.terms.keys()))
+        if len(term_ordering) == 0:
+            raise TypeError("term_ordering must None or non-empty list.")
+        groups = [[term] for term in term_ordering]
+    if trotter_order > 1 and sum(len(group) for group in groups) < 2:
+        raise ValueError("Not enough terms in the Hamiltonian to do " +
+                         ("second" if trotter_order == 2 else "third") +
+                         " order trotterization")
 
     # Enforce float
     k_exp = float(k_exp)
 
-    # First order trotter
-    if trotter_order == 1:
-        for step in range(trotter_number):
-            for op in term_ordering:
-                yield QubitOperator(
-                    op, hamiltonian.terms[op] * k_exp / trotter_number)
-
-    # Second order trotter
-    elif trotter_order == 2:
-        if len(term_ordering) < 2:
-            raise ValueError("Not enough terms in the Hamiltonian to do " +
-                             "second order trotterization")
-        for step in range(trotter_number):
-            for op in term_ordering[:-1]:
-                yield QubitOperator(
-                    op, hamiltonian.terms[op] * k_exp / (2.0 * trotter_number))
-
-            yield QubitOperator(
-                term_ordering[-1],
-                hamiltonian.terms[term_ordering[-1]] * k_exp / trotter_number)
-
-            for op in reversed(term_ordering[:-1]):
-                yield QubitOperator(
-                    op, hamiltonian.terms[op] * k_exp / (2.0 * trotter_number))
-
-    # Third order trotter
-    elif trotter_order == 3:
-        if len(term_ordering) < 2:
-            raise ValueError("Not enough terms in the Hamiltonian to do " +
-                             "third order trotterization")
-        # Make sure original hamiltonian is not modified
-        ham = hamiltonian * k_exp / float(trotter_number)
-        ham_temp = []
-        for term in term_ordering:
-            ham_temp.append(QubitOperator(term, ham.terms[term]))
-        for step in range(trotter_number):
-            for returned_op in _third_order_trotter_helper(ham_temp):
-                yield returned_op
+    scales = _trotter_scales(len(groups), trotter_number, trotter_order)
+    if term_grouping is not None:
+        scales = _fused_scales(scales)
+    for index, scale in scales:
+        for term in groups[index]:
+            yield term, hamiltonian.terms[term] * k_exp * scale
+
+
+def _trotter_scales(n_operators, trotter_number, trotter_order):
+    """Yield the Trotter formula as pairs (operator index, scale)."""
+    step_scale = 1.0 / trotter_number
+    for step in range(trotter_number):
+        # First order trotter
+        if trotter_order == 1:
+            for index in range(n_operators):
+                yield index, step_scale
+
+        # Second order trotter
+        elif trotter_order == 2:
+            for index in range(n_operators - 1):
+                yield index, step_scale / 2.0
+            yield n_operators - 1, step_scale
+            for index in reversed(range(n_operators - 1)):
+                yield index, step_scale / 2.0
+
+        # Third order trotter
+        else:
+            for index, scale in _third_order_trotter_scales(
+                    n_operators, scale=step_scale):
+                yield index, scale
+
+
+def _fused_scales(scales):
+    """Sum the scales of consecutive pairs with the same index."""
+    previous_index, previous_scale = None, 0.
+    for index, scale in scales:
+        if index == previous_index:
+            previous_scale += scale
+            continue
+        if previous_index is not None:
+            yield previous_index, previous_scale
+        previous_index, previous_scale = index, scale
+    if previous_index is not None:
+        yield previous_index, previous_scale
+
+
+# Change-of-basis gates of the Pauli operators to the Z basis, and back.
+_BASIS_CHANGES = {'X': 'H {}', 'Y': 'Rx 1.5707963267948966 {}'}
+_INVERSE_BASIS_CHANGES = {'X': 'H {}', 'Y': 'Rx -1.5707963267948966 {}'}
+
+
+def _shared_prefix_length(term_a, term_b):
+    """Return the number of leading Pauli operators two terms share."""
+    shared = 0
+    for pauli_a, pauli_b in zip(term_a, term_b):
+        if pauli_a != pauli_b:
+            break
+        shared += 1
+    return shared
+
+
+def _ladder_start_gates(term, qids, shared=0):
+    """Return the basis rotations and CNOTs before the rotation of a term.
+
+    The gates of the first shared qubits, that cancel with the end of the
+    ladder of a previous term with the same first Pauli operators, are
+    left out.
+    """
+    gates = [_BASIS_CHANGES[pop].format(qid)
+             for (_, pop), qid in zip(term[shared:], qids[shared:])
+             if pop != 'Z']
+    gates.extend('CNOT {} {}'.format(qids[i], qids[i + 1])
+                 for i in range(max(shared - 1, 0), len(qids) - 1))
+    return gates
+
+
+def _ladder_end_gates(term, qids, shared=0):
+    """Return the CNOTs and basis rotations after the rotation of a term.
+
+    The gates of the first shared qubits, that cancel with the start of
+    the ladder of a next term with the same first Pauli operators, are
+    left out.
+    """
+    gates = ['CNOT {} {}'.format(qids[i], qids[i + 1])
+             for i in reversed(range(max(shared - 1, 0), len(qids) - 1))]
+    gates.extend(_INVERSE_BASIS_CHANGES[pop].format(qid)
+                 for (_, pop), qid in zip(term[shared:], qids[shared:])
+                 if pop != 'Z')
+    return gates
 
 
 def pauli_exp_to_qasm(qubit_operator_list,
                       evolution_time=1.0,
                       qubit_list=None,
-                      ancilla=None):
+                      ancilla=None,
+                      cancel_ladders=False):
     """Exponentiate a list of QubitOperators to a QASM string generator.
 
     Exponentiates a list of QubitOperators, and yields string generators in
         QASM format using the formula:  exp(-1.0j * evolution_time * op).
 
+    With cancel_ladders, gates that cancel between consecutive
+    exponentials are left out: when two consecutive Pauli strings act with
+    the same Pauli operators on their first m qubits, the change-of-basis
+    gates of these qubits and the m - 1 CNOTs between them undo each
+    other. Sorted terms, as from commuting_term_groups, share long
+    prefixes.
+
     Args:
-        qubit_operator_list (list of QubitOperators): list of single Pauli-term
-            QubitOperators to be exponentiated
+        qubit_operator_list (iterable of QubitOperators): QubitOperators
+            to be exponentiated. It may be a generator, which is consumed
+            one operator at a time.
         evolution_time (float): evolution time of the operators in
             the list
         qubit_list: (list/tuple or None)Specifies the labels for the qubits
@@ -177,96 +283,71 @@ def pauli_exp_to_qasm(qubit_operator_list,
             If None, qubits are labeled by index (i.e. an integer).
         ancilla (string or None): if any, an ancilla qubit to perform
             the rotation conditional on (for quantum phase estimation)
+        cancel_ladders (bool): whether to leave out the gates that cancel
+            between consecutive exponentials
 
     Yields:
         string
     """
-
-    num_qubits = max([count_qubits(qubit_operator)
-                      for qubit_operator in qubit_operator_list])
-    if qubit_list is None:
-        qubit_list = list(range(num_qubits))
-    else:
+    if qubit_list is not None:
         if type(qubit_list) is not tuple and type(qubit_list) is not list:
             raise TypeError('qubit_list must be one of None, tuple, or list.')
-        if len(qubit_list) < num_qubits:
-            raise TypeError('qubit_list must have an entry for every qubit')
 
+    # The end of the ladder of each term is written with the start of the
+    # next one, so that the gates that cancel between them are left out.
+    previous_term = previous_qids = None
     for qubit_operator in qubit_operator_list:
-        # ret_val = ""
-        ret_list = []
-
-        for term in qubit_operator.terms:
-
-            term_coeff = qubit_operator.terms[term]
+        for term, term_coeff in qubit_operator.terms.items():
+            if (qubit_list is not None and term and
+                    term[-1][0] >= len(qubit_list)):
+                raise TypeError('qubit_list must have an entry for every '
+                                'qubit')
 
             # Force float
             term_coeff = float(numpy.real(term_coeff))
 
-            # List of operators and list of qubit ids
-            ops = []
-            qids = []
-            string_basis_1 = []  # Basis rotations 1
-            string_basis_2 = []  # Basis rotations 2
-
-            for p in term:  # p = single pauli term
-                qid = qubit_list[p[0]]
-                pop = p[1]  # Pauli op
-
-                qids.append(qid)  # Qubit index
-                ops.append(pop)  # Pauli operator
-
-                if pop == 'X':
-                    string_basis_1.append("H {}".format(qid))    # Hadamard
-                    string_basis_2.append("H {}".format(qid))    # Hadamard
-                elif pop == 'Y':
-                    string_basis_1.append(
-                        "Rx 1.5707963267948966 {}".format(qid))
-                    string_basis_2.append(
-                        "Rx -1.5707963267948966 {}".format(qid))
-
-            # Prep for CNOTs
-            cnot_pairs = numpy.vstack((qids[:-1], qids[1:]))
-            cnots1 = []
-            cnots2 = []
-            for i in range(cnot_pairs.shape[1]):
-                pair = cnot_pairs[:, i]
-                cnots1.append("CNOT {} {}".format(pair[0], pair[1]))
-            for i in numpy.arange(cnot_pairs.shape[1])[::-1]:
-                pair = cnot_pairs[:, i]
-                cnots2.append("CNOT {} {}".format(pair[0], pair[1]))
+            # Qubit ids of the Pauli operators
+            if qubit_list is None:
+                qids = [p[0] for p in term]
+            else:
+                qids = [qubit_list[p[0]] for p in term]
 
             # Exponentiating each Pauli string requires five parts
 
-            # 1. Perform basis rotations
-            ret_list = ret_list + string_basis_1
-
-            # 2. First set CNOTs
-            ret_list = ret_list + cnots1
+            # 4. Second set of CNOTs, and 5. rotate back to Z basis, for
+            # the previous term
+            shared = 0
+            if previous_term is not None:
+                if cancel_ladders:
+                    shared = _shared_prefix_length(previous_term, term)
+                for gate in _ladder_end_gates(previous_term, previous_qids,
+                                              shared):
+                    yield gate
+
+            # 1. Perform basis rotations, and 2. first set of CNOTs
+            for gate in _ladder_start_gates(term, qids, shared):
+                yield gate
 
             # 3. Rotation (Note kexp & Ntrot)
             if ancilla is not None:
                 if len(qids) > 0:
-                    ret_list = ret_list + ["C-Phase {} {} {}".format(
-                        -2 * term_coeff * evolution_time, ancilla, qids[-1])]
-                    ret_list = ret_list + ["Rz {} {}".format(
-                        1 * term_coeff * evolution_time, ancilla)]
+                    yield "C-Phase {} {} {}".format(
+                        -2 * term_coeff * evolution_time, ancilla, qids[-1])
+                    yield "Rz {} {}".format(
+                        1 * term_coeff * evolution_time, ancilla)
                 else:
-                    ret_list = ret_list + ["Rz {} {}".format(
-                        1 * term_coeff*evolution_time, ancilla)]
+                    yield "Rz {} {}".format(
+                        1 * term_coeff*evolution_time, ancilla)
             else:
                 if len(qids) > 0:
-                    ret_list = ret_list + ["Rz {} {}".format(
-                        term_coeff * evolution_time, qids[-1])]
-
-            # 4. Second set of CNOTs
-            ret_list = ret_list + cnots2
+                    yield "Rz {} {}".format(
+                        term_coeff * evolution_time, qids[-1])
 
-            # 5. Rotate back to Z basis
-            ret_list = ret_list + string_basis_2
+            previous_term, previous_qids = term, qids
 
-            for gate in ret_list:
-                yield gate
+    if previous_term is not None:
+        for gate in _ladder_end_gates(previous_term, previous_qids):
+            yield gate
 
 
 def trotterize_exp_qubop_to_qasm(hamiltonian,
@@ -276,13 +357,18 @@ def trotterize_exp_qubop_to_qasm(hamiltonian,
                                  term_ordering=None,
                                  k_exp=1.0,
                                  qubit_list=None,
-                                 ancilla=None):
+                                 ancilla=None,
+                                 term_grouping=None):
     """Trotterize a Qubit hamiltonian and write it to QASM format.
 
     Assumes input hamiltonian is still hermitian and -1.0j has not yet been
     applied. Therefore, signs of coefficients should reflect this. Returns
     a generator which generates a QASM file.
 
+    With term_grouping, terms are grouped as in trotter_operator_grouping
+    and the gates that cancel between consecutive exponentials are left
+    out, see pauli_exp_to_qasm.
+
     Args:
         hamiltonian (QubitOperator): hamiltonian
         trotter_number (int): optional number of trotter steps (slices) for
@@ -300,18 +386,186 @@ def trotterize_exp_qubop_to_qasm(hamiltonian,
             If None, qubits are labeled by index (i.e. an integer).
         k_exp (float): optional exponential factor to all
             terms when trotterizing
+        term_grouping (str): optional grouping of the terms, either
+            'commuting' or 'qubit_wise'
 
         Yields:
             string generator
 
     """
+    trotterized_ops = trotter_operator_grouping(hamiltonian,
+                                                trotter_number,
+                                                trotter_order,
+                                                term_ordering,
+                                                k_exp,
+                                                term_grouping)
+    for exponentiated_qasm_string in pauli_exp_to_qasm(
+            trotterized_ops, evolution_time=evolution_time,
+            qubit_list=qubit_list, ancilla=ancilla,
+            cancel_ladders=term_grouping is not None):
+        yield exponentiated_qasm_string
+
+
+# Number of QASM blocks buffered between writes by write_trotterized_qasm.
+_WRITE_BUFFER_BLOCKS = 4096
+
+
+class _QasmBlocks(object):
+    """Cache of the QASM blocks of the exponentials of Pauli strings.
+
+    The exponential of a term is written as the gates between its rotation
+    and that of the previous term, which only depend on the two terms, and
+    its rotation, where only the angle depends on the coefficient. Both
+    are built once per term, or pair of consecutive terms, as text.
+    """
 
-    for trotterized_op in trotter_operator_grouping(hamiltonian,
-                                                    trotter_number,
-                                                    trotter_order,
-                                                    term_ordering,
-                                                    k_exp):
-        for exponentiated_qasm_string in pauli_exp_to_qasm(
-                [trotterized_op], evolution_time=evolution_time,
-                qubit_list=qubit_list, ancilla=ancilla):
-            yield exponentiated_qasm_string
+    def __init__(self, evolution_time, qubit_list, ancilla,
+                 cancel_ladders):
+        self.evolution_time = evolution_time
+        self.qubit_list = qubit_list
+        self.ancilla = ancilla
+        self.cancel_ladders = cancel_ladders
+        self._qids = {}
+        self._ladders = {}
+        self._rotations = {}
+
+    def qids(self, term):
+        """Return the qubit labels of the Pauli operators of a term."""
+        try:
+            return self._qids[term]
+        except KeyError:
+            pass
+        if self.qubit_list is None:
+            qids = [p[0] for p in term]
+        else:
+            if term and term[-1][0] >= len(self.qubit_list):
+                raise TypeError('qubit_list must have an entry for every '
+                                'qubit')
+            qids = [self.qubit_list[p[0]] for p in term]
+        self._qids[term] = qids
+        return qids
+
+    def ladder(self, previous_term, term):
+        """Return the gates between the rotations of consecutive terms.
+
+        Args:
+            previous_term (tuple): The previous term, or None for the
+                first term.
+            term (tuple): The term, or None after the last term.
+        """
+        key = previous_term, term
+        try:
+            return self._ladders[key]
+        except KeyError:
+            pass
+        shared = 0
+        if (self.cancel_ladders and previous_term is not None and
+                term is not None):
+            shared = _shared_prefix_length(previous_term, term)
+        gates = []
+        if previous_term is not None:
+            gates.extend(_ladder_end_gates(
+                previous_term, self.qids(previous_term), shared))
+        if term is not None:
+            gates.extend(_ladder_start_gates(term, self.qids(term), shared))
+        ladder = ''.join(gate + '\n' for gate in gates)
+        self._ladders[key] = ladder
+        return ladder
+
+    def rotation(self, term, coefficient):
+        """Return the rotation gates of a term with a coefficient."""
+        try:
+            pieces = self._rotations[term]
+        except KeyError:
+            pieces = self._rotation_pieces(term)
+            self._rotations[term] = pieces
+        if not pieces:
+            return ''
+        term_coeff = float(numpy.real(coefficient))
+        if len(pieces) == 2:
+            return (pieces[0] + str(term_coeff * self.evolution_time) +
+                    pieces[1])
+        return (pieces[0] + str(-2 * term_coeff * self.evolution_time) +
+                pieces[1] + str(1 * term_coeff * self.evolution_time) +
+                pieces[2])
+
+    def _rotation_pieces(self, term):
+        """Return the text of the rotation of a term around its angles."""
+        qids = self.qids(term)
+        if self.ancilla is not None:
+            if qids:
+                return ('C-Phase ',
+                        ' {} {}\nRz '.format(self.ancilla, qids[-1]),
+                        ' {}\n'.format(self.ancilla))
+            return 'Rz ', ' {}\n'.format(self.ancilla)
+        if qids:
+            return 'Rz ', ' {}\n'.format(qids[-1])
+        return ()
+
+
+def write_trotterized_qasm(output,
+                           hamiltonian,
+                           evolution_time=1,
+                           trotter_number=1,
+                           trotter_order=1,
+                           term_ordering=None,
+                           k_exp=1.0,
+                           qubit_list=None,
+                           ancilla=None,
+                           term_grouping=None):
+    """Write the QASM of a Trotterized Qubit hamiltonian to a file.
+
+    Writes the gates generated by trotterize_exp_qubop_to_qasm with the
+    same arguments, one per line. The gates of each term are built once,
+    as text, and reused in all Trotter steps with only the rotation angle
+    changed, and the text is written in large chunks, so that long
+    circuits are written much faster than by joining the strings of
+    trotterize_exp_qubop_to_qasm, in memory that does not grow with the
+    number of steps.
+
+    Args:
+        output (file-like): object whose write method takes strings, e.g.
+            a file opened for writing text
+        hamiltonian (QubitOperator): hamiltonian
+        evolution_time (float): evolution time of the operators
+        trotter_number (int): optional number of trotter steps (slices) for
+            trotterization as an integer - default = 1
+        trotter_order: optional order of trotterization as an integer -
+            default = 1
+        term_ordering (list of (tuples of tuples)): list of tuples
+            (QubitOperator terms dictionary keys) that specifies
+            order of terms when trotterizing
+        k_exp (float): optional exponential factor to all
+            terms when trotterizing
+        qubit_list: (list/tuple or None) Specifies the labels for the
+            qubits to be output in qasm, as in trotterize_exp_qubop_to_qasm
+        ancilla (string or None): if any, an ancilla qubit to perform
+            the rotation conditional on (for quantum phase estimation)
+        term_grouping (str): optional grouping of the terms, either
+            'commuting' or 'qubit_wise', see trotterize_exp_qubop_to_qasm
+
+    Raises:
+        ValueError if order > 3 or order <= 0, or for an invalid
+            term_grouping,
+        TypeError for incorrect types
+    """
+    if qubit_list is not None:
+        if type(qubit_list) is not tuple and type(qubit_list) is not list:
+            raise TypeError('qubit_list must be one of None, tuple, or list.')
+    blocks = _QasmBlocks(evolution_time, qubit_list, ancilla,
+                         cancel_ladders=term_grouping is not None)
+
+    chunk = []
+    previous_term = None
+    for term, coefficient in _trotter_terms(hamiltonian, trotter_number,
+                                            trotter_order, term_ordering,
+                                            k_exp, term_grouping):
+        chunk.append(blocks.ladder(previous_term, term))
+        chunk.append(blocks.rotation(term, coefficient))
+        previous_term = term
+        if len(chunk) >= _WRITE_BUFFER_BLOCKS:
+            output.write(''.join(chunk))
+            del chunk[:]
+    if previous_term is not None:
+        chunk.append(blocks.ladder(previous_term, None))
+    output.write(''.join(chunk))
@@ -353,3 +353,129 @@ CNOT 3 4'''
             self.assertEqual(qasmstr, strcorrect1)
         except:
             self.assertEqual(qasmstr, strcorrect2)
+
+    def test_trott_ordering_grouped_2nd_ord(self):
+        # X0 and Z1 commute and form a group; the halves of that group at
+        # the boundary of the two steps are fused.
+        op_x0 = QubitOperator('X0', 1.)
+        op_z0 = QubitOperator('Z0', .5)
+        op_z1 = QubitOperator('Z1', .25)
+        ham = op_x0 + op_z0 + op_z1
+
+        res = list(trotter_operator_grouping(ham, trotter_number=2,
+                                             trotter_order=2,
+                                             term_grouping='commuting'))
+
+        gold = [op_x0 * .25, op_z1 * .25, op_z0 * .5, op_x0 * .5,
+                op_z1 * .5, op_z0 * .5, op_x0 * .25, op_z1 * .25]
+        self.assertEqual(len(res), len(gold))
+        self.compare_qubop_lists(gold, res)
+
+    def test_trott_ordering_grouped_single_group(self):
+        # Commuting terms are exponentiated exactly, once.
+        ham = QubitOperator('Z0', 1.) + QubitOperator('Z1', 2.)
+        res = list(trotter_operator_grouping(ham, trotter_number=3,
+                                             trotter_order=2,
+                                             term_grouping='qubit_wise'))
+        self.compare_qubop_lists([QubitOperator('Z0', 1.),
+                                  QubitOperator('Z1', 2.)], res)
+        self.assertEqual(len(res), 2)
+
+    def test_trott_ordering_grouped_exceptions(self):
+        with self.assertRaises(ValueError):
+            list(trotter_operator_grouping(self.qo1,
+                                           term_grouping='anticommuting'))
+        with self.assertRaises(ValueError):
+            list(trotter_operator_grouping(
+                self.qo1, term_ordering=sorted(self.qo1.terms),
+                term_grouping='commuting'))
+
+    def test_qasm_string_cancelled_ladders(self):
+        # X0 Z1 Z2 and X0 Z1 Y3 commute, and share the Pauli operators on
+        # qubits 0 and 1, whose gates cancel between the exponentials.
+        ham = self.opA + QubitOperator('X0 Z1 Z2', 0.2)
+
+        qasmstr = "\n".join(trotterize_exp_qubop_to_qasm(
+            ham, term_grouping='commuting'))
+
+        strcorrect = '''H 0
+CNOT 0 1
+CNOT 1 2
+Rz 0.2 2
+CNOT 1 2
+Rx 1.5707963267948966 3
+CNOT 1 3
+Rz 0.5 3
+CNOT 1 3
+CNOT 0 1
+H 0
+Rx -1.5707963267948966 3'''
+
+        self.assertEqual(qasmstr, strcorrect)
+
+    def test_qasm_from_generator(self):
+        ops = [self.opA, self.opB, 0.3 * self.opA]
+        qubit_list = ['q{}'.format(i) for i in range(5)]
+        self.assertEqual(
+            list(pauli_exp_to_qasm(iter(ops), qubit_list=qubit_list)),
+            list(pauli_exp_to_qasm(ops, qubit_list=qubit_list)))
+        with self.assertRaises(TypeError):
+            list(pauli_exp_to_qasm(iter(ops), qubit_list=qubit_list[:4]))
+
+
+class TextOutput(object):
+    # Collects the text written to it.
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+    def getvalue(self):
+        return ''.join(self.chunks)
+
+
+class WriteTrotterizedQasmTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hamiltonian = (QubitOperator('X0 Z1 Y3', 0.5) +
+                            QubitOperator('X0 Z1 Z2', 0.2) +
+                            QubitOperator('Z3 Z4', 0.6) +
+                            QubitOperator('Y0 X1', -0.3) +
+                            QubitOperator('', 1.0))
+
+    def assert_matches_generator(self, **kwargs):
+        output = TextOutput()
+        write_trotterized_qasm(output, self.hamiltonian, **kwargs)
+        self.assertEqual(output.getvalue(), ''.join(
+            gate + '\n' for gate in trotterize_exp_qubop_to_qasm(
+                self.hamiltonian, **kwargs)))
+
+    def test_matches_generator(self):
+        self.assert_matches_generator()
+        self.assert_matches_generator(evolution_time=0.3, trotter_number=3,
+                                      trotter_order=2, k_exp=-1.5)
+        self.assert_matches_generator(trotter_order=3, ancilla='ancilla')
+        self.assert_matches_generator(
+            trotter_number=2, trotter_order=2, term_grouping='commuting',
+            qubit_list=['q{}'.format(i) for i in range(5)])
+
+    def test_buffered_writes(self):
+        output = TextOutput()
+        write_trotterized_qasm(output, self.hamiltonian, trotter_number=1000)
+        self.assertGreater(len(output.chunks), 1)
+        self.assertEqual(output.getvalue(), ''.join(
+            gate + '\n' for gate in trotterize_exp_qubop_to_qasm(
+                self.hamiltonian, trotter_number=1000)))
+
+    def test_exceptions(self):
+        with self.assertRaises(TypeError):
+            write_trotterized_qasm(TextOutput(), self.hamiltonian,
+                                   qubit_list='q0')
+        with self.assertRaises(TypeError):
+            write_trotterized_qasm(TextOutput(), self.hamiltonian,
+                                   qubit_list=['q0', 'q1'])
+        with self.assertRaises(ValueError):
+            write_trotterized_qasm(TextOutput(), self.hamiltonian,
+                                   trotter_order=4)
@@ -0,0 +1,235 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Simulation of Trotterized evolutions on state vectors."""
+from __future__ import absolute_import
+
+import numpy
+
+from openfermion._profiling import profiled
+from openfermion.utils._sparse_tools import _pauli_term_masks
+from openfermion.utils._trotter_exp_to_qgates import trotter_operator_grouping
+
+# Largest number of rotations applied in one pass, so that the sign
+# combinations of the Pauli strings are indexed by bytes.
+_MAX_BATCH = 8
+
+
+def _sign_codes(z_masks, n_qubits):
+    """Return the codes of the signs of Pauli strings on the basis states.
+
+    Bit k of codes[b] is the parity of b & z_masks[k], i.e. it is set where
+    the k-th Pauli string has sign -1 (see _apply_rotations). The codes
+    are built qubit by qubit, from the least significant bit of the index
+    up, by doubling an array of bytes.
+    """
+    codes = numpy.zeros(1, dtype=numpy.uint8)
+    for bit in range(n_qubits):
+        qubit_code = numpy.uint8(sum(((z_mask >> bit) & 1) << k
+                                     for k, z_mask in enumerate(z_masks)))
+        codes = numpy.concatenate((codes, codes ^ qubit_code))
+    return codes
+
+
+def _rotate_pairs(state, x_mask, n_qubits, cosines, factors, codes):
+    """Set state[b] to cosines * state[b] + factors * state[b ^ x_mask].
+
+    The coefficients are numbers, or tables indexed by codes[b]. The pairs
+    of amplitudes are updated in place through views of the two halves of
+    the state split on a flipped qubit; the other flipped qubits are
+    reversed axes of the second half.
+    """
+    qubit = n_qubits - x_mask.bit_length()
+    flips = tuple(slice(None, None, -1)
+                  if x_mask >> (n_qubits - 1 - other) & 1 else slice(None)
+                  for other in range(qubit + 1, n_qubits))
+    tensor = state.reshape((2,) * n_qubits)
+    low = tensor[(slice(None),) * qubit + (0,)]
+    high = tensor[(slice(None),) * qubit + (1,) + flips]
+    if codes is None:
+        low_codes = high_codes = None
+    else:
+        codes = codes.reshape((2,) * n_qubits)
+        low_codes = codes[(slice(None),) * qubit + (0,)]
+        high_codes = codes[(slice(None),) * qubit + (1,) + flips]
+
+    def scaled(table, half_codes, half):
+        # The coefficients times a half, as a single new array.
+        if half_codes is None:
+            return table * half
+        product = table.take(half_codes)
+        product *= half
+        return product
+
+    old_low = low.copy()
+    low *= cosines if low_codes is None else cosines.take(low_codes)
+    low += scaled(factors, low_codes, high)
+    high *= cosines if high_codes is None else cosines.take(high_codes)
+    high += scaled(factors, high_codes, old_low)
+
+
+def _apply_rotations(state, rotations, n_qubits):
+    """Apply exp(-i angle P) in place for commuting P sharing an X-mask.
+
+    A Pauli string P with X-mask x and Z-mask z (see _pauli_term_masks)
+    maps the basis state b to phase * signs[b] |b ^ x>, with phase = i **
+    n_Y and signs[b] = (-1) ** parity(b & z). Since
+    signs[b ^ x] = (-1) ** n_Y * signs[b],
+    (P state)[b] = conj(phase) * signs[b] * state[b ^ x].
+
+    All Pauli strings P_k of the batch map each pair of basis states
+    {b, b ^ x} to itself, and as they commute, P_k = d_k(b) P_1 on the
+    pair with d_k(b) = conj(phase_1) * phase_k * signs_1[b] * signs_k[b],
+    which is +1 or -1. The product of the rotations is then the single
+    rotation exp(-i angle(b) P_1), with angle(b) = sum_k angle_k d_k(b).
+    The angle only depends on the signs of the strings, so the
+    trigonometric functions are tabulated for each combination of signs,
+    indexed by a code whose bit k is set where signs_k is -1.
+
+    Besides the byte per amplitude of the codes, the temporary arrays
+    take at most as much memory as the state.
+
+    Args:
+        state (ndarray): The state, modified in place.
+        rotations (list): At most _MAX_BATCH pairs (Pauli string, angle).
+        n_qubits (int): The number of qubits.
+    """
+    masks = [_pauli_term_masks(term, n_qubits) for term, _ in rotations]
+    phases = [1.j ** bin(x_mask & z_mask).count('1')
+              for x_mask, z_mask in masks]
+    x_mask, phase = masks[0][0], phases[0]
+    weights = numpy.array([
+        angle * (phase.conjugate() * term_phase).real
+        for (_, angle), term_phase in zip(rotations, phases)])
+
+    if not any(z_mask for _, z_mask in masks):
+        # No string has signs: the rotation is the same for all states.
+        angle = numpy.sum(weights)
+        if x_mask:
+            _rotate_pairs(state, x_mask, n_qubits, numpy.cos(angle),
+                          -1.j * phase.conjugate() * numpy.sin(angle), None)
+        else:
+            state *= numpy.exp(-1.j * angle)
+        return
+
+    # The sign of each string for each code, and the angles.
+    codes = _sign_codes([z_mask for _, z_mask in masks], n_qubits)
+    table_signs = 1 - 2 * (numpy.arange(2 ** len(rotations))[:, None] >>
+                           numpy.arange(len(rotations)) & 1)
+    if not x_mask:
+        # Diagonal rotations multiply each amplitude by a phase.
+        state *= numpy.exp(-1.j * table_signs.dot(weights)).take(codes)
+        return
+
+    angles = table_signs[:, 0] * table_signs.dot(weights)
+    _rotate_pairs(state, x_mask, n_qubits, numpy.cos(angles),
+                  -1.j * phase.conjugate() * table_signs[:, 0] *
+                  numpy.sin(angles), codes)
+
+
+@profiled
+def pauli_exp_to_state(qubit_operator_list, state, evolution_time=1.0):
+    """Apply exponentiated QubitOperators to a state vector in place.
+
+    Applies exp(-1.0j * evolution_time * coefficient * P) for each term
+    coefficient * P of each operator in the list, in order, as
+    pauli_exp_to_qasm does in circuits, directly to the amplitudes: no
+    matrix is built. Consecutive commuting terms that flip the same qubits
+    are applied together, in a single pass over the state. Each pass
+    needs temporary memory of up to about 1.06 times that of the state.
+
+    Args:
+        qubit_operator_list (iterable of QubitOperators): Operators whose
+            terms are exponentiated, e.g. from trotter_operator_grouping.
+            Imaginary parts of coefficients are ignored.
+        state (ndarray): A complex state vector on n qubits, in the basis
+            of qubit_operator_sparse. It is modified in place.
+        evolution_time (float): Evolution time of the operators.
+
+    Returns:
+        The state.
+
+    Raises:
+        TypeError: State is not a complex ndarray of length 2 ** n.
+        ValueError: An operator acts on more qubits than the state.
+    """
+    if (not isinstance(state, numpy.ndarray) or state.ndim != 1 or
+            not numpy.iscomplexobj(state)):
+        raise TypeError('state must be a one-dimensional complex ndarray.')
+    n_qubits = int(numpy.log2(len(state)))
+    if len(state) != 2 ** n_qubits:
+        raise TypeError('The length of state must be a power of 2.')
+
+    batch = []
+    for qubit_operator in qubit_operator_list:
+        for term, coefficient in qubit_operator.terms.items():
+            if term and term[-1][0] >= n_qubits:
+                raise ValueError('Operator acts on more qubits than the '
+                                 'state.')
+            angle = float(numpy.real(coefficient)) * evolution_time
+            x_mask, z_mask = _pauli_term_masks(term, n_qubits)
+            # Pauli strings commute when they anticommute on an even number
+            # of qubits.
+            if batch and (x_mask != batch_x_mask or
+                          len(batch) == _MAX_BATCH or
+                          bin(x_mask & batch_z_mask ^
+                              z_mask & batch_x_mask).count('1') % 2):
+                _apply_rotations(state, batch, n_qubits)
+                batch = []
+            if not batch:
+                batch_x_mask, batch_z_mask = x_mask, z_mask
+            batch.append((term, angle))
+    if batch:
+        _apply_rotations(state, batch, n_qubits)
+    return state
+
+
+def trotterize_exp_qubop_to_state(hamiltonian,
+                                  state,
+                                  evolution_time=1,
+                                  trotter_number=1,
+                                  trotter_order=1,
+                                  term_ordering=None,
+                                  k_exp=1.0,
+                                  term_grouping=None):
+    """Apply the Trotterized evolution under a Qubit hamiltonian to a state.
+
+    Applies exp(-1.0j * evolution_time * op) for each op yielded by
+    trotter_operator_grouping, i.e. the evolution that
+    trotterize_exp_qubop_to_qasm writes as a circuit with the same
+    arguments, in place. Comparing the result with the exact evolution,
+    e.g. from evolve_state, measures the actual Trotter error.
+
+    Args:
+        hamiltonian (QubitOperator): hamiltonian
+        state (ndarray): A complex state vector, modified in place.
+        evolution_time (float): evolution time of the operators
+        trotter_number (int): optional number of trotter steps (slices) for
+            trotterization as an integer - default = 1
+        trotter_order: optional order of trotterization as an integer -
+            default = 1
+        term_ordering (list of (tuples of tuples)): list of tuples
+            (QubitOperator terms dictionary keys) that specifies
+            order of terms when trotterizing
+        k_exp (float): optional exponential factor to all
+            terms when trotterizing
+        term_grouping (str): optional grouping of the terms, either
+            'commuting' or 'qubit_wise', see trotter_operator_grouping
+
+    Returns:
+        The state.
+    """
+    return pauli_exp_to_state(
+        trotter_operator_grouping(hamiltonian, trotter_number,
+                                  trotter_order, term_ordering, k_exp,
+                                  term_grouping),
+        state, evolution_time=evolution_time)
@@ -0,0 +1,156 @@
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""Tests for _trotter_exp_to_state.py."""
+from __future__ import absolute_import
+
+import unittest
+
+import numpy
+
+from openfermion.hamiltonians import fermi_hubbard
+from openfermion.ops import QubitOperator
+from openfermion.transforms import jordan_wigner
+from openfermion.utils import (error_bound, evolve_state,
+                               qubit_operator_sparse,
+                               trotter_operator_grouping)
+from openfermion.utils._trotter_exp_to_state import (
+    _sign_codes, pauli_exp_to_state, trotterize_exp_qubop_to_state)
+
+
+def random_state(n_qubits, seed=0):
+    random_state = numpy.random.RandomState(seed)
+    state = (random_state.randn(2 ** n_qubits) +
+             1j * random_state.randn(2 ** n_qubits))
+    return state / numpy.linalg.norm(state)
+
+
+def exponentials_product(qubit_operator_list, state, n_qubits,
+                         evolution_time=1.):
+    # Pauli strings square to the identity, so
+    # exp(-i angle P) = cos(angle) - i sin(angle) P.
+    for qubit_operator in qubit_operator_list:
+        for term, coefficient in qubit_operator.terms.items():
+            pauli_string = qubit_operator_sparse(QubitOperator(term),
+                                                 n_qubits)
+            angle = coefficient * evolution_time
+            state = (numpy.cos(angle) * state -
+                     1.j * numpy.sin(angle) * pauli_string.dot(state))
+    return state
+
+
+class PauliExpToStateTest(unittest.TestCase):
+
+    def assert_matches_exponentials(self, qubit_operator_list, n_qubits,
+                                    evolution_time=1.):
+        state = random_state(n_qubits)
+        expected = exponentials_product(qubit_operator_list, state, n_qubits,
+                                        evolution_time)
+        result = pauli_exp_to_state(qubit_operator_list, state,
+                                    evolution_time=evolution_time)
+        self.assertIs(result, state)
+        self.assertTrue(numpy.allclose(state, expected))
+
+    def test_single_terms(self):
+        for term in ('X0', 'Y1', 'Z2', '', 'X0 Y1 Z2', 'Y0 Y2', 'Z0 X1'):
+            self.assert_matches_exponentials([QubitOperator(term, .7)], 3)
+
+    def test_evolution_time(self):
+        self.assert_matches_exponentials(
+            [QubitOperator('X0 Y1', .3), QubitOperator('Z1', -.2)], 2,
+            evolution_time=2.5)
+
+    def test_commuting_terms_with_same_flips(self):
+        # Y0 Y2 and X0 X2 Z1 commute and flip qubits 0 and 2, and the
+        # diagonal terms commute, so each group is applied in one pass.
+        self.assert_matches_exponentials(
+            [QubitOperator('Y0 Y2', -.7), QubitOperator('X0 X2 Z1', .2),
+             QubitOperator('X0 Z1 X2 Z3', .4), QubitOperator('Z1 Z3', .4),
+             QubitOperator('Z0', 1.1), QubitOperator((), .5)], 4)
+
+    def test_anticommuting_terms_with_same_flips(self):
+        # X0 Y2 Z4 and Y0 Y2 anticommute, so their order matters.
+        self.assert_matches_exponentials(
+            [QubitOperator('X0 Y2 Z4', .3), QubitOperator('Y0 Y2', -.7),
+             QubitOperator('X0 Y2 Z4', .5)], 5)
+
+    def test_multiple_terms_per_operator(self):
+        self.assert_matches_exponentials(
+            [QubitOperator('X0 X1', .3) + QubitOperator('Y0 Y1', .3),
+             QubitOperator('Z0', .1) + QubitOperator('X1', .2)], 3)
+
+    def test_sign_codes(self):
+        z_masks = [0b101, 0b011, 0]
+        codes = _sign_codes(z_masks, 3)
+        for index, code in enumerate(codes):
+            for k, z_mask in enumerate(z_masks):
+                self.assertEqual(code >> k & 1,
+                                 bin(index & z_mask).count('1') % 2)
+
+    def test_real_state(self):
+        with self.assertRaises(TypeError):
+            pauli_exp_to_state([QubitOperator('X0')], numpy.ones(2))
+
+    def test_bad_state_length(self):
+        with self.assertRaises(TypeError):
+            pauli_exp_to_state([QubitOperator('X0')],
+                               numpy.ones(3, dtype=complex))
+
+    def test_too_many_qubits(self):
+        with self.assertRaises(ValueError):
+            pauli_exp_to_state([QubitOperator('X2')], random_state(2))
+
+
+class TrotterizeExpQubopToStateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.hamiltonian = jordan_wigner(fermi_hubbard(2, 2, 1., 4.))
+        self.hamiltonian.compress()
+        self.state = numpy.zeros(2 ** 8, dtype=complex)
+        self.state[0b10010110] = 1.
+
+    def test_matches_trotter_operator_grouping(self):
+        # The third order formula has exponentially many factors, so it is
+        # tested with fewer terms.
+        small_hamiltonian = (QubitOperator('X0 X1', .3) +
+                             QubitOperator('Z0', .5) +
+                             QubitOperator('Y1 Z2', -.2))
+        for hamiltonian, n_qubits, trotter_order, term_grouping in (
+                (self.hamiltonian, 8, 1, None), (self.hamiltonian, 8, 2, None),
+                (self.hamiltonian, 8, 2, 'commuting'),
+                (small_hamiltonian, 3, 3, None)):
+            state = random_state(n_qubits)
+            operators = list(trotter_operator_grouping(
+                hamiltonian, trotter_number=2, trotter_order=trotter_order,
+                term_grouping=term_grouping))
+            expected = exponentials_product(operators, state, n_qubits, .5)
+            trotterize_exp_qubop_to_state(
+                hamiltonian, state, evolution_time=.5, trotter_number=2,
+                trotter_order=trotter_order, term_grouping=term_grouping)
+            self.assertTrue(numpy.allclose(state, expected))
+
+    def test_trotter_error(self):
+        exact = evolve_state(qubit_operator_sparse(self.hamiltonian),
+                             self.state, 1.)
+        terms = [QubitOperator(term, coefficient) for term, coefficient
+                 in sorted(self.hamiltonian.terms.items())]
+        bound = error_bound(terms)
+        errors = []
+        for trotter_number in (4, 8):
+            state = trotterize_exp_qubop_to_state(
+                self.hamiltonian, self.state.copy(),
+                trotter_number=trotter_number, trotter_order=2)
+            errors.append(numpy.linalg.norm(state - exact))
+            self.assertLess(errors[-1], bound / trotter_number ** 2)
+
+        # The error of the second order formula is quadratic in the step.
+        self.assertAlmostEqual(errors[0] / errors[1], 4., delta=.2)
@@ -50,7 +50,7 @@ def uccsd_generator(single_amplitudes, double_amplitudes, anti_hermitian=True):
         uccsd_generator(FermionOperator): Anti-hermitian fermion operator that
         is the generator for the uccsd wavefunction.
     """
-    generator = FermionOperator()
+    generator = FermionOperator.builder()
 
     # Re-format inputs (ndarrays to lists) if necessary
     if (isinstance(single_amplitudes, numpy.ndarray) or
@@ -62,20 +62,18 @@ def uccsd_generator(single_amplitudes, double_amplitudes, anti_hermitian=True):
     # Add single excitations
     for (i, j), t_ij in single_amplitudes:
         i, j = int(i), int(j)
-        generator += FermionOperator(((i, 1), (j, 0)), t_ij)
+        generator.add(((i, 1), (j, 0)), t_ij)
         if anti_hermitian:
-            generator += FermionOperator(((j, 1), (i, 0)), -t_ij)
+            generator.add(((j, 1), (i, 0)), -t_ij)
 
     # Add double excitations
     for (i, j, k, l), t_ijkl in double_amplitudes:
         i, j, k, l = int(i), int(j), int(k), int(l)
-        generator += FermionOperator(
-            ((i, 1), (j, 0), (k, 1), (l, 0)), t_ijkl)
+        generator.add(((i, 1), (j, 0), (k, 1), (l, 0)), t_ijkl)
         if anti_hermitian:
-            generator += FermionOperator(
-                ((l, 1), (k, 0), (j, 1), (i, 0)), -t_ijkl)
+            generator.add(((l, 1), (k, 0), (j, 1), (i, 0)), -t_ijkl)
 
-    return generator
+    return generator.build()
 
 
 def uccsd_convert_amplitude_format(single_amplitudes, double_amplitudes):
@@ -251,7 +249,7 @@ def uccsd_singlet_generator(packed_amplitudes, n_qubits, n_electrons,
     t2_2 = packed_amplitudes[2 * n_single_amplitudes:]
 
     # Initialize operator
-    generator = FermionOperator()
+    generator = FermionOperator.builder()
 
     # Generate excitations
     spin_index_functions = [up_index, down_index]
@@ -278,26 +276,26 @@ def uccsd_singlet_generator(packed_amplitudes, n_qubits, n_electrons,
 
             # Generate single excitations
             coeff = t1[i]
-            generator += FermionOperator((
+            generator.add((
                 (virtual_this, 1),
                 (occupied_this, 0)),
                 coeff)
             if anti_hermitian:
-                generator += FermionOperator((
+                generator.add((
                     (occupied_this, 1),
                     (virtual_this, 0)),
                     -coeff)
 
             # Generate double excitation
             coeff = t2_1[i]
-            generator += FermionOperator((
+            generator.add((
                 (virtual_this, 1),
                 (occupied_this, 0),
                 (virtual_other, 1),
                 (occupied_other, 0)),
                 coeff)
             if anti_hermitian:
-                generator += FermionOperator((
+                generator.add((
                     (occupied_other, 1),
                     (virtual_other, 0),
                     (occupied_this, 1),
@@ -331,18 +329,18 @@ def uccsd_singlet_generator(packed_amplitudes, n_qubits, n_electrons,
             virtual_2_b = index_b(virtual_spatial_2)
             occupied_2_b = index_b(occupied_spatial_2)
 
-            generator += FermionOperator((
+            generator.add((
                 (virtual_1_a, 1),
                 (occupied_1_a, 0),
                 (virtual_2_b, 1),
                 (occupied_2_b, 0)),
                 coeff)
             if anti_hermitian:
-                generator += FermionOperator((
+                generator.add((
                     (occupied_2_b, 1),
                     (virtual_2_b, 0),
                     (occupied_1_a, 1),
                     (virtual_1_a, 0)),
                     -coeff)
 
-    return generator
+    return generator.build()